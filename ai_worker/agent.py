@@ -12,9 +12,17 @@ from ai_worker.personality import PROFILES, BALANCED
 from ai_worker.strategies.difficulty import DifficultyLevel, apply_difficulty_to_play, apply_difficulty_to_bid, get_bid_noise
 from ai_worker.strategies.components.personality_filter import apply_personality_to_play
 from ai_worker.memory import CardMemory
+from ai_worker.knowledge import KnowledgeRegistry
 
 # Core Architecture Modules
 from ai_worker.brain_client import BrainClient
+from server.metrics import metrics
+
+STAGE_METRIC = 'baloot_bot_stage_seconds'
+SHERLOCK_STAGE = metrics.histogram(STAGE_METRIC, stage='sherlock')
+BRAIN_STAGE = metrics.histogram(STAGE_METRIC, stage='brain')
+NEURAL_STAGE = metrics.histogram(STAGE_METRIC, stage='neural')
+BIDDING_STAGE = metrics.histogram(STAGE_METRIC, stage='bidding')
 
 # Logging
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -39,8 +47,11 @@ class BotAgent:
 
         # Core Components
         self.brain = BrainClient()
+        # Per-(room, seat) card memory kept current by game events
+        self.knowledge = KnowledgeRegistry()
 
         
+    @metrics.timed('baloot_bot_decision_seconds')
     def get_decision(self, game_state, player_index):
         try:
              # RESET: If no Qayd active, ensure flag is cleared (prevents permanent blocking)
@@ -84,7 +95,9 @@ class BotAgent:
                        pass
 
              # Use Typed Context
-             ctx = BotContext(game_state, player_index, personality=profile, difficulty=difficulty)
+             memory, tracker = self.knowledge.lookup(game_state, player_index)
+             ctx = BotContext(game_state, player_index, personality=profile, difficulty=difficulty,
+                              memory=memory, tracker=tracker)
 
              # 1. Sawa check handled by PlayingStrategy.project_logic
              
@@ -107,7 +120,8 @@ class BotAgent:
              
              # Let's delegate to Sherlock entirely for this.
              if hasattr(self.sherlock, 'detect_invalid_projects'):
-                  qayd = self.sherlock.detect_invalid_projects(game_state)
+                  with metrics.timing(SHERLOCK_STAGE):
+                       qayd = self.sherlock.detect_invalid_projects(game_state)
                   if qayd: return qayd
              
              # Pub Sub: Theory of Mind (if active)
@@ -121,7 +135,8 @@ class BotAgent:
                       pass 
 
              # 1.15 SHERLOCK (The Detective) - Delegated
-             sherlock_action = self.sherlock.scan_for_crimes(ctx, game_state)
+             with metrics.timing(SHERLOCK_STAGE):
+                  sherlock_action = self.sherlock.scan_for_crimes(ctx, game_state)
              if sherlock_action:
                   return sherlock_action
 
@@ -141,7 +156,8 @@ class BotAgent:
                        context_hash = hashlib.md5(state_str.encode()).hexdigest()
                        
                        # Lookup
-                       brain_move = self.brain.lookup_move(context_hash)
+                       with metrics.timing(BRAIN_STAGE):
+                            brain_move = self.brain.lookup_move(context_hash)
                        
                        if brain_move:
                             logger.info(f"\U0001f9e0 THE BRAIN found a move for {context_hash}!")
@@ -193,7 +209,8 @@ class BotAgent:
  
              # 4. NEURAL DIRECT EXECUTION
              if ctx.phase == 'PLAYING' and use_neural_direct:
-                  neural_move = self.neural_strategy.get_decision(ctx)
+                  with metrics.timing(NEURAL_STAGE):
+                       neural_move = self.neural_strategy.get_decision(ctx)
                   if neural_move:
                        return self._enforce_legality(ctx, neural_move)
  
@@ -203,7 +220,8 @@ class BotAgent:
 
              # 5. STRATEGY DISPATCH (MCTS + Heuristics)
              if ctx.phase in ['BIDDING', 'DOUBLING']:
-                  bid_decision = self.bidding_strategy.get_decision(ctx)
+                  with metrics.timing(BIDDING_STAGE):
+                       bid_decision = self.bidding_strategy.get_decision(ctx)
                   # Difficulty filter: occasionally downgrade bids for lower levels
                   try:
                        bid_decision = apply_difficulty_to_bid(bid_decision, ctx.difficulty, ctx)
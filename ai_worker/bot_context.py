@@ -7,9 +7,34 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+
+def build_card_tracker(game_state: dict, hand: list, position: str):
+    """Builds a CardTracker from the full round history in game_state."""
+    from ai_worker.strategies.components.card_tracker import CardTracker
+    raw_history_data = game_state.get('currentRoundTricks', [])
+    raw_table = game_state.get('tableCards', [])
+
+    # Normalize: currentRoundTricks can be list-of-dicts (trick objects with 'cards' key)
+    # or list-of-lists (already flat play entries). CardTracker expects list[list[dict]].
+    normalized_history = []
+    for trick in raw_history_data:
+        if isinstance(trick, dict):
+            # Trick object: extract the 'cards' list
+            cards = trick.get('cards', [])
+            if cards:
+                normalized_history.append(cards)
+        elif isinstance(trick, list):
+            # Already a list of play entries
+            if trick:
+                normalized_history.append(trick)
+
+    return CardTracker(hand, normalized_history, raw_table, position)
+
+
 class BotContext:
     """Typed wrapper for game state to simplify bot logic."""
-    def __init__(self, game_state: dict, player_index: int, personality: PersonalityProfile = BALANCED, difficulty: DifficultyLevel = DifficultyLevel.HARD):
+    def __init__(self, game_state: dict, player_index: int, personality: PersonalityProfile = BALANCED, difficulty: DifficultyLevel = DifficultyLevel.HARD,
+                 memory=None, tracker=None):
         self.raw_state = game_state
         self.player_index = player_index
         self.personality = personality
@@ -18,7 +43,7 @@ class BotContext:
         self._parse_player(game_state, player_index)
         self._parse_game_info(game_state)
         self._parse_table(game_state)
-        self._build_memory(game_state)
+        self._build_memory(game_state, memory, tracker)
 
     def _parse_player(self, game_state: dict, player_index: int):
         """Extract player identity, hand, and team from game state."""
@@ -110,35 +135,27 @@ class BotContext:
             self.winning_card = best_card
             self.winner_pos = self.table_cards[best_idx]['playedBy']
 
-    def _build_memory(self, game_state: dict):
-        """Initialize card memory, card tracker, and populate from game history."""
+    def _build_memory(self, game_state: dict, memory=None, tracker=None):
+        """
+        Initialize card memory and card tracker. Persistent ones kept current by
+        game events (ai_worker.knowledge) are used as-is; otherwise both are
+        rebuilt from the game history.
+        """
         from ai_worker.memory import CardMemory
         from ai_worker.mind_client import mind_client
-        from ai_worker.strategies.components.card_tracker import CardTracker
-        self.memory = CardMemory()
-        self.memory.populate_from_state(self.raw_state)
+        if memory is None:
+            memory = CardMemory()
+            memory.populate_from_state(self.raw_state)
+        self.memory = memory
         self.mind = mind_client
         self.played_cards = self.memory.played_cards
 
         # Card Tracker — real-time deck tracking with void inference
-        raw_history_data = game_state.get('currentRoundTricks', [])
-        raw_table = game_state.get('tableCards', [])
-
-        # Normalize: currentRoundTricks can be list-of-dicts (trick objects with 'cards' key)
-        # or list-of-lists (already flat play entries). CardTracker expects list[list[dict]].
-        normalized_history = []
-        for trick in raw_history_data:
-            if isinstance(trick, dict):
-                # Trick object: extract the 'cards' list
-                cards = trick.get('cards', [])
-                if cards:
-                    normalized_history.append(cards)
-            elif isinstance(trick, list):
-                # Already a list of play entries
-                if trick:
-                    normalized_history.append(trick)
-
-        self.tracker = CardTracker(self.hand, normalized_history, raw_table, self.position)
+        if tracker is None:
+            tracker = build_card_tracker(game_state, self.hand, self.position)
+        else:
+            tracker.set_hand(self.hand)
+        self.tracker = tracker
 
     @property
     def bidding_phase(self) -> BiddingPhase:
@@ -269,13 +286,15 @@ class BotContext:
 
         Algorithm:
         1. Get all unseen cards (not in my hand, not played)
-        2. For each opponent, eliminate suits they are void in
-        3. Distribute remaining cards proportionally using Bayesian probs
+        2. Each opponent gets exactly its remaining card count, none of a suit
+           it is void in
+        3. Draw one such deal, weighted by the Bayesian suit probabilities
+           (exact sampling, see ai_worker.mcts.deal_sampler)
         Returns dict of {position: [Card]} or None if data insufficient.
         """
         from game_engine.models.card import Card as CardModel
+        from ai_worker.mcts.deal_sampler import DealSampler, weights_from_memory
         positions = ['Bottom', 'Right', 'Top', 'Left']
-        partner_pos = positions[(self.player_index + 2) % 4]
         others = [p for p in positions if p != self.position]
 
         # Get unseen cards (not in our hand, not played)
@@ -289,59 +308,16 @@ class BotContext:
         # Cards each player should have (estimated)
         cards_per_player = self.memory.cards_remaining
 
-        # Build void sets per player
-        void_sets = {}
-        for pos in others:
-            void_sets[pos] = set()
-            for s in ['♠', '♥', '♦', '♣']:
-                if self.memory.is_void(pos, s):
-                    void_sets[pos].add(s)
-
-        # Filter eligible cards per player (not void)
-        eligible = {}
-        for pos in others:
-            eligible[pos] = [c for c in unseen_cards if c.suit not in void_sets[pos]]
-
-        # Greedy assignment: assign cards to players respecting voids
-        # Sort by most-constrained player first (fewest eligible cards)
-        assigned = {pos: [] for pos in others}
-        remaining_pool = list(unseen_cards)
-
-        for pos in sorted(others, key=lambda p: len(eligible.get(p, []))):
-            target_count = cards_per_player.get(pos, 0)
-            if target_count <= 0:
-                continue
-
-            # Pick from remaining pool, respecting voids, using Bayesian probs
-            valid = [c for c in remaining_pool if c.suit not in void_sets[pos]]
-            if not valid:
-                continue
-
-            # Sort by probability (higher Bayesian prob for this player's suit first)
-            def _prob_key(card):
-                return -self.memory.get_suit_probability(pos, card.suit)
-            valid.sort(key=_prob_key)
-
-            picked = valid[:target_count]
-            assigned[pos] = picked
-            for c in picked:
-                remaining_pool.remove(c)
-
-        # Distribute any leftover cards (rounding errors)
-        for c in remaining_pool:
-            for pos in others:
-                if len(assigned[pos]) < cards_per_player.get(pos, 0):
-                    if c.suit not in void_sets[pos]:
-                        assigned[pos].append(c)
-                        break
-
-        # Validate: all players should have the right number of cards
-        for pos in others:
-            expected = cards_per_player.get(pos, 0)
-            if len(assigned[pos]) != expected:
-                return None  # Reconstruction failed
-
-        return assigned
+        sampler = DealSampler(
+            unseen_cards,
+            {pos: cards_per_player.get(pos, 0) for pos in others},
+            voids={pos: [s for s in ['♠', '♥', '♦', '♣'] if self.memory.is_void(pos, s)]
+                   for pos in others},
+            weights=weights_from_memory(self.memory, others),
+        )
+        if not sampler.feasible:
+            return None  # Reconstruction failed
+        return sampler.sample()
 
     def read_partner_info(self) -> dict | None:
         """Infer partner's likely holdings from bids and trick history.
@@ -3,7 +3,12 @@ import time
 import json
 import logging
 import hashlib
+import threading
 import traceback
+from collections import OrderedDict, deque
+from multiprocessing import util
+
+from server.metrics import metrics
 
 # Settings
 try:
@@ -20,16 +25,67 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+CORRECT_PREFIX = "brain:correct:"
+OVERRIDE_KEY = "brain:move:FORCE_OVERRIDE_TEST"
+ANALYZE_QUEUE = "bot:analyze_queue"
+
+# Local lookup cache (per process): LRU size and TTLs in seconds
+CACHE_SIZE = int(os.environ.get('BALOOT_BRAIN_CACHE_SIZE', '4096'))
+CACHE_TTL = float(os.environ.get('BALOOT_BRAIN_CACHE_TTL', '60'))
+NEGATIVE_TTL = float(os.environ.get('BALOOT_BRAIN_NEGATIVE_TTL', '10'))
+# Snapshot of the known brain:correct hashes, refreshed in the background;
+# lookups stop trusting it when a refresh is this many intervals late
+SNAPSHOT_INTERVAL = float(os.environ.get('BALOOT_BRAIN_SNAPSHOT_INTERVAL', '10'))
+SNAPSHOT_MAX_AGE = 3 * SNAPSHOT_INTERVAL
+# Analysis enqueues are sent in one LPUSH per batch (or per QUEUE_FLUSH_SECONDS)
+QUEUE_BATCH = int(os.environ.get('BALOOT_BRAIN_QUEUE_BATCH', '32'))
+QUEUE_FLUSH_SECONDS = 1.0
+
+# Where each lookup was answered, as baloot_brain_lookups_total{result}. Pool
+# workers count into their own registry; it reaches /metrics with the
+# decision's drained metrics (server/bot_workers.py)
+_LOOKUPS = {result: metrics.counter('baloot_brain_lookups_total', result=result)
+            for result in ('hit', 'negative_hit', 'snapshot_miss', 'redis')}
+
 class BrainClient:
     """
     Handles all interactions with 'The Brain' (Redis Layer).
     - Looks up learned moves.
     - Queues game states for analysis (The Scout).
     - Captures data for the Flywheel.
+
+    Nearly every lookup misses, so lookups are answered locally where
+    possible: an LRU+TTL cache of recent answers (negative ones included)
+    and a snapshot of every known brain:correct hash, refreshed by a
+    background thread. Only a hash in the snapshot (or no usable
+    snapshot) costs a Redis round trip, and then a single pipelined one.
+
+    The same thread sends analysis payloads that have waited
+    QUEUE_FLUSH_SECONDS, and a multiprocessing finalizer sends the rest when
+    a pool worker exits (workers skip atexit). A terminated worker loses at
+    most the last QUEUE_FLUSH_SECONDS of payloads.
     """
-    def __init__(self):
-        self.redis_client = None
-        self._connect()
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client
+        if redis_client is None:
+            self._connect()
+
+        self._cache = OrderedDict()  # context_hash -> (expires_at, move JSON or None)
+        self._snapshot = None        # (set of known hashes, OVERRIDE_KEY exists)
+        self._snapshot_at = 0.0
+        self._refresher = None
+        self._wake = None
+        self._refresh_wanted = False
+        self._exit_flush = None      # multiprocessing Finalize of this process
+        self._finalizer_pid = None
+        self._queue = deque()        # Appended and drained from both threads
+        self._queue_since = 0.0
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0, 'negative_hits': 0, 'snapshot_misses': 0,
+            'redis_lookups': 0, 'redis_ms': 0.0, 'redis_max_ms': 0.0,
+            'snapshots': 0, 'queued': 0, 'queue_flushes': 0,
+        }
 
     def _connect(self):
         if OFFLINE_MODE:
@@ -43,6 +99,8 @@ class BrainClient:
             except Exception as e:
                 logger.error(f"[BRAIN] Redis connection failed: {e}")
 
+    # ── Lookups ──────────────────────────────────────────────────────
+
     def lookup_move(self, context_hash: str):
         """
         Check if The Brain has a correct move for this exact context.
@@ -50,44 +108,170 @@ class BrainClient:
         """
         if not self.redis_client: return None
 
+        now = time.monotonic()
+        if self._queue and now - self._queue_since >= QUEUE_FLUSH_SECONDS:
+            self.flush_analysis()
+        self._maybe_refresh(now)
+        absent = self._known_absent(context_hash, now)
+        entry = self._cache.get(context_hash)
+        # A cached answer the snapshot contradicts (move taught or deleted since) is refetched
+        if entry is not None and entry[0] > now and (absent is None or absent == (entry[1] is None)):
+            self._cache.move_to_end(context_hash)
+            if entry[1] is None:
+                self.counters['negative_hits'] += 1
+                _LOOKUPS['negative_hit'].inc()
+                return None
+            self.counters['hits'] += 1
+            _LOOKUPS['hit'].inc()
+            return json.loads(entry[1])  # Fresh dict: callers may modify it
+        if absent:
+            self.counters['snapshot_misses'] += 1
+            _LOOKUPS['snapshot_miss'].inc()
+            return None
+
         try:
             start = time.perf_counter()
-            # 1. Check for "Certified Correct" move
-            key = f"brain:correct:{context_hash}"
-            move_json = self.redis_client.get(key)
-
-            # 2. Fallback: Check for "Manual Test Override" (for debugging)
-            if not move_json:
-                manual_key = "brain:move:FORCE_OVERRIDE_TEST"
-                move_json = self.redis_client.get(manual_key)
-                if move_json:
-                     logger.info(f"[BRAIN] Force Override Triggered for {context_hash}")
+            # 1. "Certified Correct" move, 2. "Manual Test Override" (debugging)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(f"{CORRECT_PREFIX}{context_hash}")
+            pipe.get(OVERRIDE_KEY)
+            move_json, override_json = pipe.execute()
+            if not move_json and override_json:
+                 logger.info(f"[BRAIN] Force Override Triggered for {context_hash}")
+                 move_json = override_json
 
             duration = (time.perf_counter() - start) * 1000
+            self.counters['redis_lookups'] += 1
+            _LOOKUPS['redis'].inc()
+            self.counters['redis_ms'] += duration
+            self.counters['redis_max_ms'] = max(self.counters['redis_max_ms'], duration)
+            metrics.observe('baloot_brain_redis_seconds', duration / 1000)
             if duration > 50: # strict perf log
                  logger.debug(f"[BRAIN] Lookup took {duration:.2f}ms")
 
-            if move_json:
-                return json.loads(move_json)
-            
-            return None
+            self._remember(context_hash, move_json or None, now)
+            return json.loads(move_json) if move_json else None
 
         except Exception as e:
             logger.error(f"[BRAIN] Lookup Error: {e}")
             return None
 
+    def _remember(self, context_hash, move_json, now):
+        ttl = CACHE_TTL if move_json is not None else NEGATIVE_TTL
+        cache = self._cache
+        cache[context_hash] = (now + ttl, move_json)
+        cache.move_to_end(context_hash)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _known_absent(self, context_hash, now):
+        """True/False from the snapshot, None when there is no usable one."""
+        snapshot = self._snapshot
+        if snapshot is None or now - self._snapshot_at >= SNAPSHOT_MAX_AGE:
+            return None
+        known, override = snapshot
+        return not override and context_hash not in known
+
+    def _maybe_refresh(self, now):
+        """Asks the background thread for a snapshot refresh when the current one is due."""
+        if now - self._snapshot_at < SNAPSHOT_INTERVAL:
+            return
+        self._refresh_wanted = True
+        self._ensure_background()
+        self._wake.set()
+
+    def _ensure_background(self):
+        """Starts the background thread (and this process's exit flush) if not running."""
+        with self._lock:
+            # After a fork the parent's thread is gone: is_alive() is False
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            if self._finalizer_pid != os.getpid():
+                self._finalizer_pid = os.getpid()
+                self._exit_flush = util.Finalize(self, self.flush_analysis, exitpriority=0)
+            self._wake = threading.Event()
+            self._refresher = threading.Thread(target=self._background, args=(self._wake,),
+                                               name="brain-snapshot", daemon=True)
+            self._refresher.start()
+
+    def _background(self, wake):
+        """Snapshot refreshes when lookups ask for one, and flushes of payloads left waiting."""
+        while True:
+            if self._refresh_wanted and time.monotonic() - self._snapshot_at >= SNAPSHOT_INTERVAL:
+                self._refresh_wanted = False
+                self.refresh_snapshot()
+            if self._queue and time.monotonic() - self._queue_since >= QUEUE_FLUSH_SECONDS:
+                self.flush_analysis()
+            wake.wait(QUEUE_FLUSH_SECONDS / 2)
+            wake.clear()
+
+    def refresh_snapshot(self):
+        """Reloads the set of known brain:correct hashes (SCAN, not KEYS)."""
+        try:
+            known = {key[len(CORRECT_PREFIX):]
+                     for key in self.redis_client.scan_iter(match=f"{CORRECT_PREFIX}*", count=1000)}
+            override = bool(self.redis_client.exists(OVERRIDE_KEY))
+        except Exception as e:
+            logger.warning(f"[BRAIN] Snapshot refresh failed: {e}")
+            self._snapshot_at = time.monotonic() - SNAPSHOT_INTERVAL / 2  # Retry soon
+            return
+        self._snapshot = (known, override)
+        self._snapshot_at = time.monotonic()
+        self.counters['snapshots'] += 1
+
+    # ── Analysis Queue ───────────────────────────────────────────────
+
     def queue_analysis(self, ctx_payload: dict):
         """
         Push current context to the analysis queue for asynchronous processing.
+        Buffered, and sent as one LPUSH per QUEUE_BATCH payloads (or once
+        the oldest has waited QUEUE_FLUSH_SECONDS).
         """
         if not self.redis_client: return
 
         try:
-            self.redis_client.lpush("bot:analyze_queue", json.dumps(ctx_payload))
+            now = time.monotonic()
+            if not self._queue:
+                self._queue_since = now
+            self._queue.append(json.dumps(ctx_payload))
+            self.counters['queued'] += 1
+            self._ensure_background()
+            if len(self._queue) >= QUEUE_BATCH or now - self._queue_since >= QUEUE_FLUSH_SECONDS:
+                self.flush_analysis()
         except Exception as e:
             # Silent fail for fire-and-forget
             pass
 
+    def flush_analysis(self):
+        """Sends the buffered analysis payloads (same order as one LPUSH each)."""
+        batch = []
+        try:
+            while True:
+                batch.append(self._queue.popleft())
+        except IndexError:
+            pass
+        if not batch or not self.redis_client:
+            return
+        try:
+            self.redis_client.lpush(ANALYZE_QUEUE, *batch)
+            self.counters['queue_flushes'] += 1
+        except Exception as e:
+            logger.debug(f"[BRAIN] Dropped {len(batch)} analysis payloads: {e}")
+
+    def stats(self) -> dict:
+        """
+        This client's counters (this process only) plus cache size and mean
+        Redis lookup latency (ms).
+        """
+        c = dict(self.counters)
+        lookups = c['hits'] + c['negative_hits'] + c['snapshot_misses'] + c['redis_lookups']
+        c['lookups'] = lookups
+        c['local_rate'] = (lookups - c['redis_lookups']) / lookups if lookups else 0.0
+        c['redis_mean_ms'] = c['redis_ms'] / c['redis_lookups'] if c['redis_lookups'] else 0.0
+        c['cache_entries'] = len(self._cache)
+        c['known_hashes'] = len(self._snapshot[0]) if self._snapshot is not None else None
+        return c
+
     def capture_round_data(self, round_snapshot: dict):
         """
         Push finished round data to the analytics stream.
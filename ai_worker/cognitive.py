@@ -1,22 +1,67 @@
 
 import logging
+import os
+from collections import OrderedDict
 from ai_worker.bot_context import BotContext
+from ai_worker.mcts.bitboard import card_id
 from ai_worker.mcts.mcts import MCTSSolver
-from ai_worker.mcts.utils import generate_random_distribution
+from ai_worker.mcts.pimc import PIMCSolver
+from ai_worker.mcts.parallel import ParallelSolver
+from ai_worker.mcts.utils import generate_distributions
 from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.transposition import TranspositionTable, DEFAULT_TT_ENTRIES
 from ai_worker.learning.dataset_logger import DatasetLogger
 
 logger = logging.getLogger(__name__)
 
+SEARCH_SINGLE = 'single'        # One sampled deal, full budget (legacy)
+SEARCH_PIMC = 'pimc'            # Budget split across N sampled deals, root stats merged
+
+# Search mode of the bots' optimizers (opt in to PIMC with BALOOT_MCTS_SEARCH=pimc)
+DEFAULT_SEARCH_MODE = os.environ.get('BALOOT_MCTS_SEARCH', SEARCH_SINGLE)
+DEFAULT_NUM_WORLDS = int(os.environ.get('BALOOT_MCTS_WORLDS', '8'))
+
+# Root-parallel worker processes per decision (0/1 = search in-process)
+DEFAULT_MCTS_WORKERS = int(os.environ.get('BALOOT_MCTS_WORKERS', '0'))
+
+# Leaves priced per policy-net forward pass when a neural strategy is attached
+DEFAULT_NEURAL_BATCH = int(os.environ.get('BALOOT_MCTS_NEURAL_BATCH', '32'))
+
+# Searched worlds kept per (room, seat) for subtree reuse; oldest games dropped first
+MAX_CARRIED_GAMES = 2048
+
+POS_TO_IDX = {'Bottom': 0, 'Right': 1, 'Top': 2, 'Left': 3}
+
 class CognitiveOptimizer:
     """
     The 'Brain' of the AI: Handles simulation-based decision making.
     Encapsulates MCTS, Hand Estimation, and Fast Simulation.
     """
-    def __init__(self, use_inference=True, neural_strategy=None):
-        self.solver = MCTSSolver(neural_strategy=neural_strategy)
+    def __init__(self, use_inference=True, neural_strategy=None,
+                 search_mode=DEFAULT_SEARCH_MODE, num_worlds=DEFAULT_NUM_WORLDS, timeout_ms=500,
+                 adaptive_budget=True,
+                 parallel_workers=DEFAULT_MCTS_WORKERS, reuse_tree=True, tt_entries=DEFAULT_TT_ENTRIES,
+                 neural_batch_size=DEFAULT_NEURAL_BATCH):
+        # Transposition table shared by every search of this optimizer; it also
+        # holds the subtrees that carried-over worlds resume from
+        self.transposition_table = TranspositionTable(tt_entries) if reuse_tree else None
+        self.solver = MCTSSolver(neural_strategy=neural_strategy,
+                                 transposition_table=self.transposition_table,
+                                 batch_size=neural_batch_size)
+        self.pimc_solver = PIMCSolver(self.solver)
+        self.parallel_solver = ParallelSolver(self.solver, workers=parallel_workers)
         self.use_inference = use_inference
         self.enabled = True
+        # Search configuration
+        self.search_mode = search_mode
+        self.num_worlds = num_worlds
+        self.timeout_ms = timeout_ms
+        # False = bounded by timeout_ms only (equal wall-clock comparisons)
+        self.adaptive_budget = adaptive_budget
+        # >1 fans the search out to a shared process pool (degrades to serial)
+        self.parallel_workers = parallel_workers
+        # (room_id, seat) -> (round plays seen, worlds searched); LRU-bounded
+        self._carried = OrderedDict()
         # YOLO Configuration: Only log highly confident moves (95%)
         # Buffer 50 moves before writing to disk
         self.dataset_logger = DatasetLogger(min_confidence=0.95, buffer_size=50)
@@ -33,42 +78,16 @@ class CognitiveOptimizer:
             
         try:
             # 1. Probabilistic Inference (Hand Estimation)
-            # Guess opponent hands based on voids and played cards
-            hands = generate_random_distribution(ctx)
-            
-            # 2. Simulation Environment Setup
-            # Map BotContext (Rich State) -> FastGame (Lite State)
-            
-            # Note: FastGame expects hands[0] to be the current player's hand?
-            # generate_random_distribution puts ctx.hand at index 0.
-            # And FastGame simulation starts from 'current_turn'.
-            # If it's MY turn (Bot), then current_turn should be 0 (relative to hands[0]).
-            
-            # Ideally, FastGame is initialized with absolute positions and turn.
-            # But FastGame logic is simplified.
-            # Let's align with the confirmed working logic in playing.py:
-            # "current_turn=0 # Bot is acting now"
-            
-            fast_game = FastGame(
-                players_hands=hands,
-                trump=ctx.trump,
-                mode=ctx.mode,
-                current_turn=0, # Bot perspective: I am 0, and it is my turn.
-                dealer_index=ctx.raw_state.get('dealerIndex', 0), # This might need mapping if dealer relative to bot?
-                table_cards=ctx.raw_state.get('tableCards', [])
-            )
-            
+            # Guess opponent hands based on voids and played cards, and
+            # 2. map each guess to a FastGame (one world per sampled deal)
+            worlds = self._sample_worlds(ctx)
+
             # 3. Execution (The Oracle)
             # Calculate Adaptive Budget
-            budget = self._calculate_budget(ctx)
-            
-            # 3. Execution (The Oracle)
-            best_idx, details = self.solver.search_with_details(
-                fast_game, 
-                timeout_ms=500, # Increased timeout
-                max_iterations=budget
-            )
-            
+            budget = self._calculate_budget(ctx) if self.adaptive_budget else None
+            best_idx, details = self._search(worlds, self.timeout_ms, budget)
+            self._remember_worlds(ctx, worlds)
+
             # DATASET LOGGING (Neural Net Training)
             try:
                 if self.dataset_logger:
@@ -78,7 +97,7 @@ class CognitiveOptimizer:
             
             return {
                 "cardIndex": best_idx,
-                "reasoning": f"Oracle (MCTS) - Budget {budget} - Verified {len(ctx.hand)} cards"
+                "reasoning": f"Oracle (MCTS) - Budget {budget} - Worlds {len(worlds)} - Verified {len(ctx.hand)} cards"
             }
             
         except Exception as e:
@@ -117,21 +136,12 @@ class CognitiveOptimizer:
         if not self.enabled: return None
         
         try:
-            # 1. Probabilistic Inference
-            hands = generate_random_distribution(ctx)
-            
-            # 2. Simulation Environment Setup
-            fast_game = FastGame(
-                players_hands=hands,
-                trump=ctx.trump,
-                mode=ctx.mode,
-                current_turn=0,
-                dealer_index=ctx.raw_state.get('dealerIndex', 0),
-                table_cards=ctx.raw_state.get('tableCards', [])
-            )
-            
+            # 1. Probabilistic Inference + 2. Simulation Environment Setup
+            worlds = self._sample_worlds(ctx)
+
             # 3. Execution
-            best_idx, details = self.solver.search_with_details(fast_game, timeout_ms=300)
+            best_idx, details = self._search(worlds, 300, None)
+            self._remember_worlds(ctx, worlds)
             
             return {
                 "best_move": best_idx,
@@ -141,3 +151,141 @@ class CognitiveOptimizer:
         except Exception as e:
             logger.error(f"Cognitive Analysis Failed: {e}", exc_info=False)
             return None
+
+    def _sample_worlds(self, ctx: BotContext) -> list:
+        """
+        Determinizes the hidden hands into FastGame worlds.
+        SINGLE mode samples one deal; PIMC samples num_worlds deals, or just one
+        when the unseen cards cannot be arranged differently.
+        """
+        n_worlds = 1
+        if self.search_mode == SEARCH_PIMC:
+            n_worlds = self.num_worlds
+            # hands[1..3] hold every unseen card: if at most one opponent seat
+            # still has cards, every sample is the same deal.
+            remaining = ctx.memory.cards_remaining or {}
+            holders = [pos for pos in ('Right', 'Top', 'Left') if remaining.get(pos, 1) > 0]
+            if len(holders) <= 1:
+                n_worlds = 1
+
+        worlds = self._carry_over_worlds(ctx, n_worlds)
+        if len(worlds) < n_worlds:
+            for hands in generate_distributions(ctx, n_worlds - len(worlds)):
+                worlds.append(self._build_fast_game(ctx, hands))
+        return worlds
+
+    def _reuse_enabled(self) -> bool:
+        # Pool workers grow their own trees, so there is nothing to resume
+        return self.transposition_table is not None and self.parallel_workers <= 1
+
+    @staticmethod
+    def _game_key(ctx: BotContext):
+        room = ctx.raw_state.get('roomId') or ctx.raw_state.get('gameId')
+        return (room, ctx.player_index) if room else None
+
+    @staticmethod
+    def _round_plays(ctx: BotContext):
+        """
+        Cards played so far this round as [(seat, card_id)], None if unreadable.
+        Seats are bot-relative (the bot is 0), like the worlds they replay into.
+        """
+        plays = []
+        entries = []
+        for trick in ctx.raw_state.get('currentRoundTricks', []):
+            entries.extend(trick.get('cards', []) if isinstance(trick, dict) else trick)
+        entries.extend(ctx.raw_state.get('tableCards', []))
+        for entry in entries:
+            if not isinstance(entry, dict) or 'card' not in entry:
+                return None
+            p_idx = POS_TO_IDX.get(entry.get('playedBy'))
+            cid = card_id(entry['card'])
+            if p_idx is None or cid < 0:
+                return None
+            plays.append(((p_idx - ctx.player_index) % 4, cid))
+        return plays
+
+    def _carry_over_worlds(self, ctx: BotContext, n_worlds: int) -> list:
+        """
+        Worlds searched for this bot's previous decision, advanced by the cards
+        played since. A world survives only if every observed card was in that
+        player's sampled hand and was a legal play there, so it still agrees
+        with what the table has shown (voids included). Its root is then found
+        in the transposition table and the search resumes from that subtree.
+        """
+        if not self._reuse_enabled():
+            return []
+        key = self._game_key(ctx)
+        entry = self._carried.get(key) if key else None
+        plays = self._round_plays(ctx) if entry else None
+        if plays is None:
+            return []
+        seen, previous = entry
+        if plays[:len(seen)] != seen:
+            return []  # New round (or history rewritten)
+
+        new_plays = plays[len(seen):]
+        hand_ids = [card_id(c) for c in ctx.hand]
+        worlds = []
+        for world in previous:
+            world = world.clone()
+            if not self._replay(world, new_plays):
+                continue
+            if world.current_turn != 0 or [card_id(c) for c in world.hands[0]] != hand_ids:
+                continue  # Hand order changed: move indices would not line up
+            worlds.append(world)
+            if len(worlds) == n_worlds:
+                break
+        return worlds
+
+    @staticmethod
+    def _replay(world: FastGame, plays) -> bool:
+        for p_idx, cid in plays:
+            if world.current_turn != p_idx or world.is_terminal():
+                return False
+            hand = [card_id(c) for c in world.hands[p_idx]]
+            if cid not in hand:
+                return False
+            move = hand.index(cid)
+            if move not in world.get_legal_moves():
+                return False
+            world.apply_move(move)
+        return True
+
+    def _remember_worlds(self, ctx: BotContext, worlds: list):
+        if not self._reuse_enabled():
+            return
+        key = self._game_key(ctx)
+        plays = self._round_plays(ctx) if key else None
+        if plays is None:
+            return
+        self._carried[key] = (plays, worlds)
+        self._carried.move_to_end(key)
+        while len(self._carried) > MAX_CARRIED_GAMES:
+            self._carried.popitem(last=False)
+
+    def _build_fast_game(self, ctx: BotContext, hands) -> FastGame:
+        # Map BotContext (Rich State) -> FastGame (Lite State)
+        # generate_distributions puts ctx.hand at index 0, and it is
+        # the bot's turn: "current_turn=0 # Bot is acting now"
+        return FastGame(
+            players_hands=hands,
+            trump=ctx.trump,
+            mode=ctx.mode,
+            current_turn=0, # Bot perspective: I am 0, and it is my turn.
+            dealer_index=ctx.raw_state.get('dealerIndex', 0), # This might need mapping if dealer relative to bot?
+            table_cards=ctx.raw_state.get('tableCards', [])
+        )
+
+    def _search(self, worlds: list, timeout_ms: int, max_iterations):
+        if self.parallel_workers > 1:
+            self.parallel_solver.workers = self.parallel_workers
+            return self.parallel_solver.search_with_details(
+                worlds, timeout_ms=timeout_ms, max_iterations=max_iterations
+            )
+        if len(worlds) == 1:
+            return self.solver.search_with_details(
+                worlds[0], timeout_ms=timeout_ms, max_iterations=max_iterations
+            )
+        return self.pimc_solver.search_with_details(
+            worlds, timeout_ms=timeout_ms, max_iterations=max_iterations
+        )
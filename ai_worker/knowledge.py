@@ -0,0 +1,207 @@
+import logging
+import os
+from collections import OrderedDict
+
+from ai_worker.bot_context import build_card_tracker
+from ai_worker.memory import CardMemory
+from game_engine.models.card import Card
+
+logger = logging.getLogger(__name__)
+
+MAX_ROOMS = int(os.environ.get('BALOOT_KNOWLEDGE_ROOMS', '1024'))
+# Rebuild from state on every lookup and compare (debugging / soak tests)
+VERIFY = os.environ.get('BALOOT_KNOWLEDGE_VERIFY', '0') == '1'
+
+
+class SeatKnowledge:
+    """What one seat knows about the current round, kept current by game events."""
+
+    def __init__(self, round_key, memory, tracker):
+        self.round_key = round_key
+        self.memory = memory
+        self.tracker = tracker
+
+
+class KnowledgeRegistry:
+    """
+    Persistent per-(room, seat) CardMemory + CardTracker.
+
+    Attached to a Game as an observer, every played card and collected trick
+    is applied in O(1) instead of BotContext replaying the whole round on each
+    decision. lookup() checks the incremental view against the game_state it
+    is asked about. When the view is only behind (same round, a prefix of the
+    plays in game_state) the missing plays are applied from the state; that is
+    how a decision worker process, which never sees the game's events, keeps
+    its memory incremental. Anything else falls back to a full rebuild (which
+    then becomes the new incremental base): Sawa claims, a worker restart, a
+    new round.
+    """
+
+    def __init__(self, max_rooms=MAX_ROOMS, verify=VERIFY):
+        self.max_rooms = max_rooms
+        self.verify = verify
+        self._rooms = OrderedDict()  # room_id -> {player_index: SeatKnowledge}
+        self.hits = 0
+        self.rebuilds = 0
+        self.catch_ups = 0
+        self.mismatches = 0
+
+    # ── Wiring ───────────────────────────────────────────────────────
+
+    def attach(self, game):
+        """Subscribes to a Game's events (idempotent; games loaded from Redis start unsubscribed)."""
+        observers = getattr(game, 'observers', None)
+        if observers is None:
+            game.observers = observers = []
+        if self not in observers:
+            observers.append(self)
+
+    def forget(self, room_id):
+        self._rooms.pop(room_id, None)
+
+    # ── Game events ──────────────────────────────────────────────────
+
+    def on_card_played(self, game, entry):
+        seats = self._rooms.get(game.room_id)
+        if not seats:
+            return
+        card = entry['card']
+        led_suit = game.table_cards[0]['card'].suit
+        round_key = len(game.past_round_results or [])
+        for idx, seat in list(seats.items()):
+            memory = seat.memory
+            if (seat.round_key != round_key or memory.tricks_done != len(game.round_history)
+                    or len(memory.pending_plays) != len(game.table_cards) - 1):
+                del seats[idx]  # Out of step: next lookup rebuilds
+                continue
+            memory.observe_play(entry['playedBy'], card.rank, card.suit)
+            seat.tracker.observe_play(entry['playedBy'], card.rank, card.suit, led_suit)
+
+    def on_trick_resolved(self, game, trick):
+        seats = self._rooms.get(game.room_id)
+        if not seats:
+            return
+        for idx, seat in list(seats.items()):
+            memory = seat.memory
+            if (memory.tricks_done != len(game.round_history) - 1
+                    or len(memory.pending_plays) != len(trick.get('cards', []))):
+                del seats[idx]
+                continue
+            memory.observe_trick_end()
+
+    def on_round_reset(self, game):
+        self.forget(game.room_id)
+
+    # ── Lookup ───────────────────────────────────────────────────────
+
+    def lookup(self, game_state, player_index):
+        """(memory, tracker) for this seat, consistent with game_state."""
+        room_id = game_state.get('roomId') or game_state.get('gameId')
+        if room_id is None:
+            return self._rebuild(game_state, player_index)
+
+        seats = self._rooms.get(room_id)
+        if seats is None:
+            seats = self._rooms[room_id] = {}
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+        else:
+            self._rooms.move_to_end(room_id)
+
+        seat = seats.get(player_index)
+        if seat is not None and (self._in_sync(seat, game_state) or self._catch_up(seat, game_state)):
+            self.hits += 1
+            hand = [Card(c['suit'], c['rank']) for c in game_state['players'][player_index]['hand']]
+            seat.tracker.set_hand(hand)
+            if self.verify:
+                self._verify(seat, game_state, player_index)
+            return seat.memory, seat.tracker
+
+        self.rebuilds += 1
+        memory, tracker = self._rebuild(game_state, player_index)
+        seats[player_index] = SeatKnowledge(len(game_state.get('roundHistory') or []), memory, tracker)
+        return memory, tracker
+
+    def _in_sync(self, seat, game_state):
+        memory = seat.memory
+        tricks = game_state.get('currentRoundTricks', [])
+        table = game_state.get('tableCards', [])
+        if (seat.round_key != len(game_state.get('roundHistory') or [])
+                or memory.trump != game_state.get('trumpSuit')
+                or memory.mode != game_state.get('gameMode')
+                or memory.tricks_done != len(tricks)
+                or len(memory.pending_plays) != len(table)
+                or memory.plays_seen != sum(len(t.get('cards', [])) for t in tricks) + len(table)):
+            return False
+        if table:
+            pos, rank, suit = memory.pending_plays[-1]
+            last = table[-1]
+            return (pos, rank, suit) == (last.get('playedBy'), last['card']['rank'], last['card']['suit'])
+        return True
+
+    def _catch_up(self, seat, game_state):
+        """
+        Applies the plays game_state has beyond this seat's view, when the
+        view is a prefix of them. Returns whether the seat is then in sync.
+        """
+        memory = seat.memory
+        tricks = [CardMemory.trick_plays(t) for t in game_state.get('currentRoundTricks', [])]
+        tricks = [[p for p in trick if all(p)] for trick in tricks]
+        table = [(tc.get('playedBy'), tc['card']['rank'], tc['card']['suit'])
+                 for tc in game_state.get('tableCards', [])]
+        done, pending = memory.tricks_done, memory.pending_plays
+        if (seat.round_key != len(game_state.get('roundHistory') or [])
+                or memory.trump != game_state.get('trumpSuit')
+                or memory.mode != game_state.get('gameMode')
+                or done > len(tricks)):
+            return False
+        seen = [p for trick in tricks[:done] for p in trick]
+        current = tricks[done] if done < len(tricks) else table
+        if (memory.plays_seen != len(seen) + len(pending) or current[:len(pending)] != pending
+                or any(f"{rank}{suit}" not in memory.played_cards for _, rank, suit in seen)):
+            return False
+
+        start = len(pending)
+        for k in range(done, len(tricks) + 1):
+            plays = tricks[k] if k < len(tricks) else table
+            led_suit = plays[0][2] if plays else None
+            for pos, rank, suit in plays[start:]:
+                memory.observe_play(pos, rank, suit)
+                seat.tracker.observe_play(pos, rank, suit, led_suit)
+            if k < len(tricks):
+                memory.observe_trick_end()
+            start = 0
+        self.catch_ups += 1
+        return self._in_sync(seat, game_state)
+
+    @staticmethod
+    def _rebuild(game_state, player_index):
+        memory = CardMemory()
+        memory.populate_from_state(game_state)
+        p_data = game_state['players'][player_index]
+        hand = [Card(c['suit'], c['rank']) for c in p_data['hand']]
+        tracker = build_card_tracker(game_state, hand, p_data.get('position', 'Unknown'))
+        return memory, tracker
+
+    def _verify(self, seat, game_state, player_index):
+        fresh, _ = self._rebuild(game_state, player_index)
+        live = seat.memory
+        if (live.played_cards != fresh.played_cards or live.voids != fresh.voids
+                or live.cards_remaining != fresh.cards_remaining
+                or live.suit_probability != fresh.suit_probability
+                or live.discards != fresh.discards):
+            self.mismatches += 1
+            logger.error(f"[KNOWLEDGE] Incremental memory diverged from rebuild "
+                         f"(room {game_state.get('roomId')}, seat {player_index}); reseeding")
+            seat.memory = fresh
+
+    def stats(self):
+        total = self.hits + self.rebuilds
+        return {
+            'rooms': len(self._rooms),
+            'hits': self.hits,
+            'rebuilds': self.rebuilds,
+            'catch_ups': self.catch_ups,
+            'mismatches': self.mismatches,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Per-inference latency and resident memory of the bot models, per backend.
+# Each backend runs in a fresh interpreter so RSS is not shared between them.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT)
+
+
+def _rss_mb():
+    import psutil
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _time_calls(fn, runs):
+    fn()  # Warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {'p50_us': _percentile(samples, 0.5), 'p99_us': _percentile(samples, 0.99)}
+
+
+def _child(backend, runs):
+    """Measures one backend in this process and prints a JSON line."""
+    import numpy as np
+    rss_start = _rss_mb()
+
+    from ai_worker.learning.inference import load_session
+    from ai_worker.strategies.neural import NeuralStrategy, _build_strategy_net
+    from ai_worker.mind_client import _build_mind_reader
+
+    models_dir = os.path.join(ROOT, 'ai_worker', 'models')
+    strategy = load_session(os.path.join(models_dir, 'strategy_net_best.pth'), _build_strategy_net, backend=backend)
+    mind = load_session(os.path.join(models_dir, 'mind_reader_v1.pth'), _build_mind_reader, backend=backend)
+
+    features = np.random.rand(1, 138).astype(np.float32)
+    features_32 = np.random.rand(32, 138).astype(np.float32)
+    tokens = np.random.randint(0, 100, (1, 40)).astype(np.int64)
+
+    result = {
+        'backend': strategy.backend,
+        'strategy_b1': _time_calls(lambda: strategy.run(features), runs),
+        'strategy_b32': _time_calls(lambda: strategy.run(features_32), runs),
+        'mind_reader': _time_calls(lambda: mind.run(tokens), runs),
+        'rss_mb': _rss_mb() - rss_start,
+        'torch_imported': 'torch' in sys.modules,
+    }
+    print(json.dumps(result))
+
+
+def run_inference_benchmark(runs=2000):
+    print("--- BENCHMARKING INFERENCE BACKENDS ---")
+    for backend in ('torch', 'onnx'):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', backend, str(runs)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            print(f"{backend:>5}: failed\n{proc.stderr.strip()[-500:]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{backend:>5} (served by {r['backend']}): "
+              f"strategy b1 p50 {r['strategy_b1']['p50_us']:.0f}us / p99 {r['strategy_b1']['p99_us']:.0f}us, "
+              f"b32 p50 {r['strategy_b32']['p50_us']:.0f}us, "
+              f"mind p50 {r['mind_reader']['p50_us']:.0f}us / p99 {r['mind_reader']['p99_us']:.0f}us, "
+              f"+{r['rss_mb']:.0f} MB RSS, torch imported: {r['torch_imported']}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        _child(sys.argv[2], int(sys.argv[3]))
+    else:
+        run_inference_benchmark()
@@ -1,25 +1,28 @@
-
 import logging
 import os
-import json
 import time
 from typing import List, Dict
+
+import numpy as np
+
 from ai_worker.bot_context import BotContext
+from ai_worker.learning.dataset_shards import MODES, NUM_CARDS, SAMPLE_DTYPE, ShardWriter
 from ai_worker.learning.feature_extractor import FeatureExtractor
 
 logger = logging.getLogger(__name__)
 
 class DatasetLogger:
     """
-    Logs game states and MCTS decisions to a JSONL dataset.
+    Logs game states and MCTS decisions to binary training shards.
     Features:
     - Buffering (flush every N records)
     - Thresholding (only log high-confidence moves)
-    - JSONL format (efficient for ML)
+    - Fixed-size records (see dataset_shards), memory-mapped at training time
     """
     def __init__(self, data_dir="ai_worker/data/training", min_confidence=0.95, buffer_size=50):
         self.data_dir = data_dir
-        self.file_path = os.path.join(data_dir, "yolo_dataset.jsonl")
+        self.shard_dir = os.path.join(data_dir, "yolo_shards")
+        self.writer = ShardWriter(self.shard_dir)
         self.extractor = FeatureExtractor()
         
         self.min_confidence = min_confidence
@@ -27,7 +30,7 @@ class DatasetLogger:
         self.buffer = []
         
         # Ensure dir exists
-        os.makedirs(data_dir, exist_ok=True)
+        os.makedirs(self.shard_dir, exist_ok=True)
 
     def log_sample(self, ctx: BotContext, mcts_move_idx: int, details: Dict):
         """
@@ -53,26 +56,32 @@ class DatasetLogger:
             if win_rate < self.min_confidence:
                 return # Skip low confidence moves
 
-            # 2. Extract Features
-            vector = self.extractor.encode(ctx)
-            # JSON-serializable list
-            vector_list = [round(v, 4) for v in vector]
-            
-            # 3. Target info
+            # 2. Target card (label) and MCTS visit share per card (policy)
             target_card = ctx.hand[mcts_move_idx] if mcts_move_idx < len(ctx.hand) else None
-            # target_str = str(target_card) if target_card else "None" # Redundant if index is reliable, but good for debug
-            
+            label = self.extractor._get_card_index(target_card) if target_card else -1
+            if label == -1:
+                return
+
+            policy = np.zeros(NUM_CARDS, dtype=np.float32)
+            for hand_idx, stats in details.items():
+                if isinstance(hand_idx, int) and 0 <= hand_idx < len(ctx.hand):
+                    card_idx = self.extractor._get_card_index(ctx.hand[hand_idx])
+                    if card_idx != -1:
+                        policy[card_idx] += stats.get('visits', 0)
+            if policy.sum() > 0:
+                policy /= policy.sum()
+
+            # 3. Extract Features
+            vector = self.extractor.encode_batch([ctx])[0]
+
             # 4. Construct Record
-            record = {
-                "ts": int(time.time()),
-                "game_id": ctx.raw_state.get('gameId', 'unknown'),
-                "mode": ctx.mode,
-                "vector": vector_list,
-                "target_idx": mcts_move_idx,
-                "target_card": str(target_card),
-                "confidence": win_rate,
-                "visits": visits
-            }
+            game_id = str(ctx.raw_state.get('gameId', 'unknown'))
+            record = (
+                vector, policy, label,
+                MODES.index(ctx.mode) if ctx.mode in MODES else 0,
+                win_rate, visits, int(time.time()),
+                game_id.encode('utf-8')[:24],
+            )
             
             # 5. Buffer & Flush
             self.buffer.append(record)
@@ -88,10 +97,7 @@ class DatasetLogger:
         if not self.buffer: return
         
         try:
-            with open(self.file_path, 'a', encoding='utf-8') as f:
-                for record in self.buffer:
-                    f.write(json.dumps(record) + '\n')
-            
+            self.writer.append(np.array(self.buffer, dtype=SAMPLE_DTYPE))
             self.buffer.clear()
         except Exception as e:
             logger.error(f"Failed to flush Yolo Buffer: {e}")
@@ -0,0 +1,243 @@
+"""
+Binary, append-only training-data shards.
+
+A shard is a flat file of fixed-size SAMPLE_DTYPE records: writers append
+raw bytes and readers np.memmap the file, so nothing is parsed and no
+per-sample Python objects are kept. Features are stored as float16 (136 of
+the 138 are 0/1, the two score ratios keep ~3 significant digits, same as
+the 4-decimal rounding of the old JSONL), next to the label and the MCTS
+visit share of every card.
+
+    data_dir/format.json                 dtype of the records
+    data_dir/shard-<time>-<pid>-<n>.bin  one file per writer, rolled every SHARD_ROWS
+
+Every writer appends to its own files, so concurrent bot processes never
+interleave records; a record cut short by a crash is ignored on read.
+
+    python -m ai_worker.learning.dataset_shards convert yolo_dataset.jsonl dataset.csv --out DIR
+"""
+import csv
+import glob
+import itertools
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from ai_worker.learning.feature_extractor import FeatureExtractor
+
+try:
+    import torch
+    from torch.utils.data import BatchSampler, DataLoader, Dataset, SubsetRandomSampler
+except ImportError:
+    torch = None
+    Dataset = object
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIM = 138
+NUM_CARDS = 32
+SHARD_ROWS = 1 << 16
+SHARD_GLOB = "shard-*.bin"
+FORMAT_FILE = "format.json"
+MODES = ("SUN", "HOKUM")
+
+SAMPLE_DTYPE = np.dtype([
+    ("features", "<f2", (FEATURE_DIM,)),
+    ("policy", "<f2", (NUM_CARDS,)),  # MCTS visit share per card, zeros if unknown
+    ("label", "<i2"),                 # Card played, 0-31 (FeatureExtractor order)
+    ("mode", "u1"),                   # Index into MODES
+    ("confidence", "<f4"),
+    ("visits", "<i4"),
+    ("ts", "<i8"),
+    ("game_id", "S24"),
+])
+
+_writer_ids = itertools.count()
+
+
+class ShardWriter:
+    """Appends SAMPLE_DTYPE records to this writer's own shard files."""
+
+    def __init__(self, data_dir, shard_rows=SHARD_ROWS):
+        self.data_dir = data_dir
+        self.shard_rows = shard_rows
+        self._name = f"shard-{int(time.time())}-{os.getpid()}-{next(_writer_ids)}"
+        self._seq = 0
+        self._rows = 0  # In the current shard
+
+    @property
+    def path(self):
+        return os.path.join(self.data_dir, f"{self._name}-{self._seq:04d}.bin")
+
+    def append(self, rows):
+        """Append a SAMPLE_DTYPE array, starting a new shard every shard_rows."""
+        rows = np.ascontiguousarray(rows, dtype=SAMPLE_DTYPE)
+        if not len(rows):
+            return
+        os.makedirs(self.data_dir, exist_ok=True)
+        _check_format(self.data_dir)
+        while len(rows):
+            if self._rows >= self.shard_rows:
+                self._seq, self._rows = self._seq + 1, 0
+            take = min(len(rows), self.shard_rows - self._rows)
+            with open(self.path, "ab") as f:
+                f.write(rows[:take].tobytes())
+            self._rows += take
+            rows = rows[take:]
+
+
+def _check_format(data_dir):
+    path = os.path.join(data_dir, FORMAT_FILE)
+    descr = json.loads(json.dumps(SAMPLE_DTYPE.descr))
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f)["dtype"] != descr:
+                raise ValueError(f"{data_dir} holds shards of a different format")
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"dtype": descr}, f)
+    os.replace(tmp, path)
+
+
+def shard_paths(data_dir):
+    """Shard files in data_dir, oldest writer first."""
+    return sorted(glob.glob(os.path.join(data_dir, SHARD_GLOB)))
+
+
+def open_shards(data_dir):
+    """Read-only memory maps of every non-empty shard."""
+    shards = []
+    for path in shard_paths(data_dir):
+        count = os.path.getsize(path) // SAMPLE_DTYPE.itemsize
+        if count:
+            shards.append(np.memmap(path, dtype=SAMPLE_DTYPE, mode="r", shape=(count,)))
+    return shards
+
+
+# ── Torch Dataset ────────────────────────────────────────────────────
+
+class ShardDataset(Dataset):
+    """
+    Memory-mapped view over one or more shard directories.
+    Indexing with a list/array of indices returns a whole batch at once
+    (see loader()), so an epoch costs one gather per batch, not per sample.
+    """
+
+    def __init__(self, *data_dirs):
+        if torch is None:
+            raise ImportError("ShardDataset requires torch")
+        self.data_dirs = data_dirs
+        self.shards = [s for d in data_dirs for s in open_shards(d)]
+        self.offsets = np.cumsum([0] + [len(s) for s in self.shards])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def rows(self, indices):
+        """Gather records by global index (a copy; the shards stay mapped)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(self.shards) == 1:
+            return self.shards[0][indices]
+        out = np.empty(len(indices), dtype=SAMPLE_DTYPE)
+        shard_of = np.searchsorted(self.offsets, indices, side="right") - 1
+        for s in np.unique(shard_of):
+            hit = shard_of == s
+            out[hit] = self.shards[s][indices[hit] - self.offsets[s]]
+        return out
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return {k: v[0] for k, v in self[[idx]].items()}
+        rows = self.rows(idx)
+        # torch widens float16 much faster than numpy does
+        return {
+            'vector': torch.from_numpy(rows['features'].copy()).float(),
+            'label': torch.from_numpy(rows['label'].astype(np.int64)),
+            'policy': torch.from_numpy(rows['policy'].copy()).float(),
+        }
+
+    def loader(self, indices, batch_size, shuffle=False):
+        """DataLoader yielding batch dicts drawn from the given sample indices."""
+        sampler = SubsetRandomSampler(indices) if shuffle else list(indices)
+        return DataLoader(self, sampler=BatchSampler(sampler, batch_size, drop_last=False),
+                          batch_size=None)
+
+
+# ── Legacy Conversion ────────────────────────────────────────────────
+
+def card_label(extractor, text):
+    """'A♥', '♥A', '10H' -> card index 0-31, or -1."""
+    if not text or text == 'None':
+        return -1
+    if text[0] in extractor.suit_map:
+        suit, rank = text[0], text[1:]
+    else:
+        suit, rank = text[-1], text[:-1]
+    norm_suit = extractor.suit_map.get(suit)
+    if not norm_suit:
+        return -1
+    return extractor.card_to_idx.get(f"{norm_suit}{rank}", -1)
+
+
+def _legacy_records(path):
+    """(vector, target card, mode, confidence, visits, ts, game_id) per legacy row."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            # DatasetLogger CSV: ts, game_id, vector_str, mcts_move_idx, target_str, win_rate
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) < 5:
+                    continue
+                conf = float(row[5]) if len(row) > 5 and row[5] else 0.0
+                yield row[2].split(','), row[4], None, conf, 0, row[0], row[1]
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                r = json.loads(line)
+                yield (r.get('vector', []), r.get('target_card'), r.get('mode'),
+                       r.get('confidence', 0.0), r.get('visits', 0), r.get('ts', 0), r.get('game_id', ''))
+
+
+def convert_legacy(paths, data_dir, chunk=SHARD_ROWS):
+    """
+    Converts DatasetLogger JSONL / CSV files into shards in data_dir.
+    Rows without a known target card or a 138-float vector are skipped,
+    as the old CSV loader did. Returns the number of samples written.
+    """
+    extractor = FeatureExtractor()
+    writer = ShardWriter(data_dir)
+    buf, written = [], 0
+    for path in paths:
+        for vector, target, mode, conf, visits, ts, game_id in _legacy_records(path):
+            label = card_label(extractor, target)
+            if label == -1 or len(vector) != FEATURE_DIM:
+                continue
+            features = np.asarray(vector, dtype=np.float32).astype(np.float16)
+            buf.append((features, np.zeros(NUM_CARDS, np.float16), label,
+                        MODES.index(mode) if mode in MODES else 0, conf, visits,
+                        int(float(ts or 0)), str(game_id).encode('utf-8')[:24]))
+            if len(buf) >= chunk:
+                writer.append(np.array(buf, dtype=SAMPLE_DTYPE))
+                written, buf = written + len(buf), []
+    if buf:
+        writer.append(np.array(buf, dtype=SAMPLE_DTYPE))
+        written += len(buf)
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert legacy training data to binary shards")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="JSONL/CSV files -> shards")
+    conv.add_argument("files", nargs="+")
+    conv.add_argument("--out", required=True, help="shard directory")
+    args = parser.parse_args()
+    n = convert_legacy(args.files, args.out)
+    print(f"Wrote {n} samples to {args.out}")
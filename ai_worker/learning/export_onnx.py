@@ -0,0 +1,74 @@
+import os
+import sys
+import numpy as np
+import torch
+
+# Ensure project root is importable when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai_worker.learning.inference import OnnxSession, TorchSession, onnx_path_for, record_export
+from ai_worker.learning.model import StrategyNet
+from ai_worker.learning.mind_reader import MindReaderNet
+
+# Exports the bot models next to their checkpoints (model.pth -> model.onnx),
+# where learning.inference picks them up, with the checkpoint's digest
+# (model.onnx.sha256). Re-run after retraining: until then the stale export
+# is ignored and torch serves the new checkpoint.
+# MindReader needs the dynamo exporter (pip install onnx onnxscript): the
+# legacy tracer bakes the sequence length into the attention reshapes.
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def export_strategy_net(weights_path, onnx_path=None):
+    onnx_path = onnx_path or onnx_path_for(weights_path)
+    model = StrategyNet()
+    model.load_state_dict(torch.load(weights_path, map_location='cpu'))
+    model.eval()
+    torch.onnx.export(
+        model,
+        (torch.zeros(1, 138),),
+        onnx_path,
+        input_names=['features'],
+        output_names=['logits'],
+        dynamic_axes={'features': {0: 'batch'}, 'logits': {0: 'batch'}},
+        dynamo=False,
+    )
+    _verify(model, onnx_path, np.random.rand(16, 138).astype(np.float32))
+    record_export(weights_path, onnx_path)
+    return onnx_path
+
+
+def export_mind_reader(weights_path, onnx_path=None):
+    onnx_path = onnx_path or onnx_path_for(weights_path)
+    model = MindReaderNet()
+    model.load_state_dict(torch.load(weights_path, map_location='cpu'))
+    model.eval()
+    seq = torch.export.Dim('seq', min=1, max=499)  # PositionalEncoding max_len=500
+    torch.onnx.export(
+        model,
+        (torch.zeros(1, 20, dtype=torch.long),),
+        onnx_path,
+        input_names=['tokens'],
+        output_names=['left', 'partner', 'right'],
+        dynamic_shapes={'x': {1: seq}},
+        dynamo=True,
+        external_data=False,
+    )
+    _verify(model, onnx_path, np.random.randint(0, 100, (1, 37)).astype(np.int64))
+    record_export(weights_path, onnx_path)
+    return onnx_path
+
+
+def _verify(model, onnx_path, sample):
+    expected = TorchSession(model).run(sample)
+    actual = OnnxSession(onnx_path).run(sample)
+    err = max(float(np.abs(a - e).max()) for a, e in zip(actual, expected))
+    print(f"Exported {onnx_path} (max abs diff vs torch: {err:.2e})")
+    if err > 1e-4:
+        raise RuntimeError(f"ONNX output diverges from torch for {onnx_path}")
+
+
+if __name__ == '__main__':
+    export_strategy_net(os.path.join(MODELS_DIR, 'strategy_net_best.pth'))
+    export_mind_reader(os.path.join(MODELS_DIR, 'mind_reader_v1.pth'))
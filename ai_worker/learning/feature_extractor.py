@@ -5,6 +5,12 @@ from ai_worker.bot_context import BotContext
 from game_engine.models.card import Card
 from game_engine.models.constants import SUITS, RANKS, ORDER_SUN, ORDER_HOKUM
 
+# NumPy (batched encoders)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
 class FeatureExtractor:
@@ -38,6 +44,15 @@ class FeatureExtractor:
                 self.card_to_idx[key] = idx
                 idx += 1
 
+        # Batched encoders: (suit, rank) -> card index for every suit alias,
+        # and trump alias -> context slot
+        self._pair_to_bit = {
+            (alias, r): 1 << self.card_to_idx[f"{norm}{r}"]
+            for alias, norm in self.suit_map.items() for r in RANKS
+        }
+        self._trump_slot = {alias: SUITS.index(norm) for alias, norm in self.suit_map.items()
+                            if norm in SUITS}
+
     def encode(self, ctx: BotContext, legal_moves_indices: List[int] = None) -> List[float]:
         # Initialize zero vector
         # Size = 32*4 + 10 = 138
@@ -116,6 +131,73 @@ class FeatureExtractor:
         key = f"{normalized_suit}{card.rank}"
         return self.card_to_idx.get(key, -1)
 
+    def _card_bit(self, suit, rank) -> int:
+        """Card -> 1 << index (0 if unknown), as _get_card_index would map it."""
+        bit = self._pair_to_bit.get((suit, rank))
+        if bit is None:
+            idx = self._get_card_index(Card(suit, rank))
+            bit = 1 << idx if idx >= 0 else 0
+        return bit
+
+    def encode_batch(self, states, legal_moves=None):
+        """
+        Batched encode for N BotContexts -> float32 array [N, 138].
+
+        Cards are looked up by (suit, rank) without building keys or Card
+        objects, collected into one 32-bit mask per section and expanded to
+        one-hot in a single NumPy call (same layout as encode_fast_batch).
+        ``legal_moves`` holds one list of hand indices per state, or None.
+        Row n equals encode(states[n], legal_moves[n]).
+        """
+        if np is None:
+            raise RuntimeError("encode_batch requires numpy")
+        masks = []    # (hand, table, played, legal) per state
+        context = []  # 10 context features per state
+        pair_bit = self._pair_to_bit.get
+        card_bit = self._card_bit
+        trump_slot = self._trump_slot
+        for row, ctx in enumerate(states):
+            hand = ctx.hand
+            hand_bits = [pair_bit((card.suit, card.rank)) for card in hand]
+            if None in hand_bits:
+                hand_bits = [card_bit(card.suit, card.rank) for card in hand]
+            hand_mask = sum(set(hand_bits))  # OR of the single-bit values
+
+            table_mask = 0
+            table_cards = ctx.raw_state.get('tableCards', [])
+            for item in table_cards:
+                c_data = item.get('card')
+                if c_data:
+                    if isinstance(c_data, dict):
+                        table_mask |= card_bit(c_data['suit'], c_data['rank'])
+                    else:
+                        table_mask |= card_bit(c_data.suit, c_data.rank)
+
+            legal_mask = 0
+            legal = legal_moves[row] if legal_moves is not None else None
+            if legal and hand:
+                for idx in legal:
+                    if idx < len(hand):
+                        legal_mask |= hand_bits[idx]
+            masks.append((hand_mask, table_mask, 0, legal_mask))
+
+            ctx_row = [0.0] * 10
+            t_idx = trump_slot.get(ctx.trump)
+            if t_idx is not None:
+                ctx_row[t_idx] = 1.0
+            ctx_row[4 if ctx.mode == 'SUN' else 5] = 1.0
+            scores = ctx.raw_state.get('matchScores', {})
+            ctx_row[6] = scores.get('us', 0) / 152.0
+            ctx_row[7] = scores.get('them', 0) / 152.0
+            if not table_cards:
+                ctx_row[8] = 1.0
+            context.append(ctx_row)
+
+        masks = np.array(masks, dtype='<u4').reshape(len(states), 4)
+        bits = np.unpackbits(masks.view(np.uint8), axis=1, bitorder='little')
+        context = np.array(context, dtype=np.float32).reshape(len(states), 10)
+        return np.concatenate([bits.astype(np.float32), context], axis=1)
+
     def encode_fast(self, game, legal_moves_indices: List[int] = None) -> List[float]:
         """
         Optimized encoder for FastGame state (MCTS).
@@ -188,3 +270,41 @@ class FeatureExtractor:
             
         return vec
 
+    def encode_fast_batch(self, games, legal_masks=None):
+        """
+        Batched encode_fast for K FastGames -> float32 array [K, 138].
+
+        Card sections come straight from the FastGame bitmasks (bit i of a
+        mask is feature index i, see mcts.bitboard), unpacked in one NumPy
+        call. ``legal_masks`` (one int per game, as returned by
+        FastGame.legal_mask) defaults to each game's legal moves.
+        Row k equals encode_fast(games[k], games[k].get_legal_moves()).
+        """
+        if np is None:
+            raise RuntimeError("encode_fast_batch requires numpy")
+        k = len(games)
+        if legal_masks is None:
+            legal_masks = [g.legal_mask() for g in games]
+
+        masks = np.zeros((k, 4), dtype='<u4')  # hand, table, (played), legal
+        context = np.zeros((k, 10), dtype=np.float32)
+        for row, game in enumerate(games):
+            table = 0
+            for _, cid in game._trick:
+                table |= 1 << cid
+            masks[row, 0] = game.hand_masks[game.current_turn]
+            masks[row, 1] = table
+            masks[row, 3] = legal_masks[row]
+
+            ctx_row = context[row]
+            norm_trump = self.suit_map.get(game.trump, None)
+            if norm_trump and norm_trump in SUITS:
+                ctx_row[SUITS.index(norm_trump)] = 1.0
+            ctx_row[4 if game.mode == 'SUN' else 5] = 1.0
+            ctx_row[6] = game.scores.get('us', 0) / 152.0
+            ctx_row[7] = game.scores.get('them', 0) / 152.0
+            if not game._trick:
+                ctx_row[8] = 1.0
+
+        bits = np.unpackbits(masks.view(np.uint8), axis=1, bitorder='little')
+        return np.concatenate([bits.astype(np.float32), context], axis=1)
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# ONNX Runtime (preferred CPU backend)
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_AUTO = 'auto'     # ONNX Runtime if it and a current exported .onnx exist, else torch
+BACKEND_ONNX = 'onnx'
+BACKEND_TORCH = 'torch'
+
+DEFAULT_BACKEND = os.environ.get('BALOOT_INFERENCE_BACKEND', BACKEND_AUTO)
+# Bots are many small requests: one intra-op thread each keeps cores free for MCTS
+DEFAULT_THREADS = int(os.environ.get('BALOOT_INFERENCE_THREADS', '1'))
+
+
+class OnnxSession:
+    """ONNX Runtime CPU session; run() takes and returns NumPy arrays."""
+    backend = BACKEND_ONNX
+
+    def __init__(self, path: str, threads: int = DEFAULT_THREADS):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.path = path
+        self._session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+        self._input_names = [i.name for i in self._session.get_inputs()]
+
+    def run(self, *inputs: np.ndarray) -> List[np.ndarray]:
+        return self._session.run(None, dict(zip(self._input_names, inputs)))
+
+
+class TorchSession:
+    """Eager PyTorch fallback with the same run() contract as OnnxSession."""
+    backend = BACKEND_TORCH
+
+    def __init__(self, model, threads: Optional[int] = None):
+        import torch
+        if threads:
+            torch.set_num_threads(threads)  # Process-wide in torch
+        self.model = model.to(torch.device('cpu')).eval()
+
+    def run(self, *inputs: np.ndarray) -> List[np.ndarray]:
+        import torch
+        with torch.no_grad():
+            out = self.model(*[torch.from_numpy(np.ascontiguousarray(x)) for x in inputs])
+        if not isinstance(out, tuple):
+            out = (out,)
+        return [o.numpy() for o in out]
+
+
+_sessions: Dict[tuple, Optional[object]] = {}
+_sessions_lock = threading.Lock()
+
+
+def onnx_path_for(weights_path: str) -> str:
+    """Exported graph lives next to the checkpoint: model.pth -> model.onnx."""
+    return os.path.splitext(weights_path)[0] + '.onnx'
+
+
+def digest_path_for(onnx_path: str) -> str:
+    """Checkpoint digest recorded at export: model.onnx -> model.onnx.sha256."""
+    return onnx_path + '.sha256'
+
+
+def checkpoint_digest(weights_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(weights_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_export(weights_path: str, onnx_path: str):
+    """Writes the digest of the checkpoint an export was made from (sha256sum format)."""
+    with open(digest_path_for(onnx_path), 'w') as f:
+        f.write(f"{checkpoint_digest(weights_path)}  {os.path.basename(weights_path)}\n")
+
+
+def export_is_current(weights_path: str, onnx_path: str) -> bool:
+    """
+    True if ``onnx_path`` was exported from the checkpoint as it is now: its
+    recorded digest matches, or (no record) it is newer than the checkpoint.
+    An export without its checkpoint is all there is, so it counts as current.
+    """
+    if not os.path.exists(weights_path):
+        return True
+    try:
+        with open(digest_path_for(onnx_path)) as f:
+            recorded = f.read().split()[0]
+    except (OSError, IndexError):
+        return os.path.getmtime(onnx_path) >= os.path.getmtime(weights_path)
+    return recorded == checkpoint_digest(weights_path)
+
+
+def load_session(weights_path: str, build_model: Callable, backend: str = None,
+                 threads: int = None):
+    """
+    Returns the process-wide session for a model checkpoint, creating it on
+    first use, or None if no backend can load it (callers disable the model).
+
+    ``build_model`` returns an untrained torch module and is only called for
+    the torch backend, so torch is never imported when ONNX Runtime serves.
+    """
+    backend = backend or DEFAULT_BACKEND
+    threads = threads or DEFAULT_THREADS
+    key = (os.path.abspath(weights_path), backend)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = _create_session(weights_path, build_model, backend, threads)
+        return _sessions[key]
+
+
+def _create_session(weights_path, build_model, backend, threads):
+    onnx_path = onnx_path_for(weights_path)
+    if backend in (BACKEND_AUTO, BACKEND_ONNX):
+        if ort is None:
+            if backend == BACKEND_ONNX:
+                logger.warning("onnxruntime not installed, falling back to torch")
+        elif os.path.exists(onnx_path) and not export_is_current(weights_path, onnx_path):
+            logger.warning(f"{onnx_path} was not exported from the current {weights_path} "
+                           f"(re-run export_onnx), falling back to torch")
+        elif os.path.exists(onnx_path):
+            try:
+                session = OnnxSession(onnx_path, threads)
+                logger.info(f"Inference session (onnx, {threads} thread(s)): {onnx_path}")
+                return session
+            except Exception as e:
+                logger.error(f"Failed to load ONNX model {onnx_path}: {e}")
+        elif backend == BACKEND_ONNX:
+            logger.warning(f"No exported model at {onnx_path}, falling back to torch")
+
+    if not os.path.exists(weights_path):
+        logger.warning(f"Model not found at {weights_path}")
+        return None
+    try:
+        import torch
+        model = build_model()
+        model.load_state_dict(torch.load(weights_path, map_location='cpu'))
+        session = TorchSession(model, threads)
+        logger.info(f"Inference session (torch): {weights_path}")
+        return session
+    except Exception as e:
+        logger.error(f"Failed to load model {weights_path}: {e}")
+        return None
+
+
+def clear_sessions():
+    """Drops cached sessions (tests, model hot-swap)."""
+    with _sessions_lock:
+        _sessions.clear()
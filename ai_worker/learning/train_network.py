@@ -1,97 +1,43 @@
 
 import sys
 import os
-import csv
-import ast
 import random
 import time
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
 
 # Add parent directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from ai_worker.learning.feature_extractor import FeatureExtractor
+from ai_worker.learning.dataset_shards import ShardDataset, convert_legacy, shard_paths
 from ai_worker.learning.model import StrategyNet
 
 # Determine Device
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 print(f"Training on: {DEVICE}")
 
-class BalootDataset(Dataset):
-    def __init__(self, csv_file):
-        self.samples = []
-        self.extractor = FeatureExtractor()
-        
-        print(f"Loading dataset from {csv_file}...")
-        
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader, None) # Skip header
-                for row in reader:
-                    if not row: continue
-                    # row: [ts, game_id, vector_str, mcts_move_idx, target_str, win_rate]
-                    if len(row) < 5: continue
-                    
-                    vector_str = row[2]
-                    target_str = row[4] # "7S" (RankSuit)
-                    
-                    # Parse Input Vector
-                    # vector_str is comma separated floats "0.00,1.00,..."
-                    vector = [float(x) for x in vector_str.split(',')]
-                    
-                    # Parse Target (Card Label)
-                    label_idx = self._parse_target_to_idx(target_str)
-                    
-                    if label_idx != -1 and len(vector) == 138:
-                        self.samples.append({
-                            'vector': torch.tensor(vector, dtype=torch.float32),
-                            'label': torch.tensor(label_idx, dtype=torch.long)
-                        })
-                        
-            print(f"Loaded {len(self.samples)} valid samples.")
-            
-        except Exception as e:
-            print(f"Error loading dataset: {e}")
-
-    def _parse_target_to_idx(self, target_str):
-        # Format "7S", "10H", "AD" -> Rank + Suit
-        if not target_str or target_str == 'None': return -1
-        
-        # Extract Suit (Last char)
-        suit_char = target_str[-1]
-        
-        # Extract Rank (Rest)
-        rank_str = target_str[:-1]
-        
-        # Normalize Suit
-        norm_suit = self.extractor.suit_map.get(suit_char)
-        if not norm_suit: return -1
-        
-        # Construct Key for FeatureExtractor map (SuitRank e.g. "♠7")
-        key = f"{norm_suit}{rank_str}"
-        
-        return self.extractor.card_to_idx.get(key, -1)
-
-    def __len__(self):
-        return len(self.samples)
-
-    def __getitem__(self, idx):
-        return self.samples[idx]
+def load_dataset(training_dir):
+    """
+    Opens the shard dataset in training_dir/shards, converting the legacy
+    dataset.csv / yolo_dataset.jsonl into it on first use.
+    """
+    shard_dir = os.path.join(training_dir, "shards")
+    if not shard_paths(shard_dir):
+        legacy = [os.path.join(training_dir, name) for name in ("dataset.csv", "yolo_dataset.jsonl")]
+        legacy = [p for p in legacy if os.path.exists(p)]
+        if legacy:
+            print(f"Converting {', '.join(legacy)} to shards...")
+            print(f"Wrote {convert_legacy(legacy, shard_dir)} samples.")
+    # DatasetLogger output is already sharded
+    return ShardDataset(shard_dir, os.path.join(training_dir, "yolo_shards"))
 
 def train():
     # Paths
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    dataset_path = os.path.join(project_root, "ai_worker", "data", "training", "dataset.csv")
+    training_dir = os.path.join(project_root, "ai_worker", "data", "training")
     models_dir = os.path.join(project_root, "ai_worker", "models")
     os.makedirs(models_dir, exist_ok=True)
-    
-    if not os.path.exists(dataset_path):
-        print(f"Dataset not found at {dataset_path}")
-        return
 
     # Hyperparameters
     BATCH_SIZE = 64
@@ -99,17 +45,16 @@ def train():
     LR = 0.001
     
     # Data
-    full_dataset = BalootDataset(dataset_path)
+    full_dataset = load_dataset(training_dir)
     if len(full_dataset) == 0:
-        print("Dataset empty. Run generate_neural_data.py first.")
+        print(f"No training data in {training_dir}. Run generate_neural_data.py first.")
         return
+    print(f"Loaded {len(full_dataset)} samples.")
         
+    order = torch.randperm(len(full_dataset)).tolist()
     train_size = int(0.8 * len(full_dataset))
-    val_size = len(full_dataset) - train_size
-    train_dataset, val_dataset = torch.utils.data.random_split(full_dataset, [train_size, val_size])
-    
-    train_loader = DataLoader(train_dataset, batch_size=BATCH_SIZE, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=BATCH_SIZE, shuffle=False)
+    train_loader = full_dataset.loader(order[:train_size], BATCH_SIZE, shuffle=True)
+    val_loader = full_dataset.loader(sorted(order[train_size:]), BATCH_SIZE)
     
     # Model
     model = StrategyNet().to(DEVICE)
@@ -1,61 +1,176 @@
-
 import time
 import random
 import sys
 import os
+sys.path.append(os.getcwd())
+
+from game_engine.models.card import Card
+from game_engine.models.constants import (
+    SUITS, RANKS, ORDER_SUN, ORDER_HOKUM, POINT_VALUES_SUN, POINT_VALUES_HOKUM,
+)
+from game_engine.logic.validation import is_move_legal
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+
+# Compares the bitboard FastGame against the previous list-of-Card engine.
+# Target: >= 10x rollouts/sec so that the 3000-5000 iteration budgets from
+# CognitiveOptimizer._calculate_budget fit inside the 500ms decision timeout.
+
+POS_MAP = {0: 'Bottom', 1: 'Right', 2: 'Top', 3: 'Left'}
+TEAM_MAP = {'Bottom': 'us', 'Right': 'them', 'Top': 'us', 'Left': 'them'}
+TEAMS = ['us', 'them', 'us', 'them']
+
+
+class ListGame:
+    """
+    The pre-bitboard engine: hands as lists of Card objects, legality via
+    is_move_legal() once per card, strengths via ORDER_*.index().
+    Kept here only as the benchmark baseline.
+    """
+    def __init__(self, hands, trump, mode, current_turn):
+        self.hands = [h[:] for h in hands]
+        self.trump = trump
+        self.mode = mode
+        self.current_turn = current_turn
+        self.trick = []
+        self.scores = {'us': 0, 'them': 0}
+        self.is_finished = False
+
+    def get_legal_moves(self):
+        hand = self.hands[self.current_turn]
+        table = [{'card': c, 'playedBy': POS_MAP[p]} for p, c in self.trick]
+        return [i for i, c in enumerate(hand)
+                if is_move_legal(c, hand, table, self.mode, self.trump,
+                                 TEAMS[self.current_turn], TEAM_MAP)]
+
+    def _strength(self, card, lead_suit):
+        if self.mode == 'HOKUM' and card.suit == self.trump:
+            return 100 + ORDER_HOKUM.index(card.rank)
+        if card.suit == lead_suit:
+            return ORDER_SUN.index(card.rank)
+        return -1
+
+    def apply_move(self, idx):
+        p = self.current_turn
+        self.trick.append((p, self.hands[p].pop(idx)))
+        if len(self.trick) < 4:
+            self.current_turn = (p + 1) % 4
+            return
+        lead_suit = self.trick[0][1].suit
+        winner = max(self.trick, key=lambda t: self._strength(t[1], lead_suit))[0]
+        pts = 0
+        for _, c in self.trick:
+            if self.mode == 'HOKUM' and c.suit == self.trump:
+                pts += POINT_VALUES_HOKUM[c.rank]
+            else:
+                pts += POINT_VALUES_SUN[c.rank]
+        self.scores[TEAMS[winner]] += pts
+        self.trick = []
+        self.current_turn = winner
+        if not self.hands[0] and not self.hands[1]:
+            self.is_finished = True
+            self.scores[TEAMS[winner]] += 10
+
+    def play_greedy(self):
+        # Same policy shape as FastGame (lowest winning / cheapest discard)
+        while not self.is_finished:
+            legal = self.get_legal_moves()
+            if not legal:
+                break
+            hand = self.hands[self.current_turn]
+            if not self.trick:
+                choice = max(legal, key=lambda i: ORDER_SUN.index(hand[i].rank))
+            else:
+                lead_suit = self.trick[0][1].suit
+                choice = min(legal, key=lambda i: self._strength(hand[i], lead_suit))
+            self.apply_move(choice)
+
+
+def _deals(n, seed=42):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        deck = [Card(s, r) for s in SUITS for r in RANKS]
+        rng.shuffle(deck)
+        mode = 'HOKUM' if i % 2 else 'SUN'
+        trump = SUITS[i % 4] if mode == 'HOKUM' else None
+        out.append(([deck[k * 8:(k + 1) * 8] for k in range(4)], trump, mode, i % 4))
+    return out
+
+
+def _rate(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    duration = time.perf_counter() - start
+    rate = n / duration
+    print(f"{label:<34} {n:>7} in {duration:7.3f}s -> {rate:>10.0f}/s")
+    return rate
+
+
+def bench_rollouts(n):
+    deals = _deals(64)
+    fast = [FastGame(h, trump=t, mode=m, current_turn=c, dealer_index=0) for h, t, m, c in deals]
+
+    def run_fast():
+        for i in range(n):
+            fast[i & 63].clone().play_greedy()
+
+    def run_list():
+        for i in range(n // 10):
+            h, t, m, c = deals[i & 63]
+            ListGame(h, t, m, c).play_greedy()
+
+    new_rate = _rate("FastGame (bitboard) rollouts", n, run_fast)
+    old_rate = _rate("ListGame (baseline) rollouts", n // 10, run_list)
+    return new_rate, old_rate
+
+
+def bench_legal_moves(n):
+    deals = _deals(64)
+    # Mid-trick positions exercise the follow/over-trump branches
+    positions = []
+    for h, t, m, c in deals:
+        g = FastGame(h, trump=t, mode=m, current_turn=c, dealer_index=0)
+        g.apply_move(g.get_legal_moves()[-1])
+        lg = ListGame(h, t, m, c)
+        lg.apply_move(0)
+        positions.append((g, lg))
+
+    def run_fast():
+        for i in range(n):
+            positions[i & 63][0].get_legal_moves()
+
+    def run_list():
+        for i in range(n // 10):
+            positions[i & 63][1].get_legal_moves()
+
+    new_rate = _rate("FastGame.get_legal_moves", n, run_fast)
+    old_rate = _rate("ListGame.get_legal_moves", n // 10, run_list)
+    return new_rate, old_rate
+
+
+def bench_mcts(iterations):
+    h, t, m, c = _deals(1, seed=7)[0]
+    game = FastGame(h, trump=t or '♠', mode='HOKUM', current_turn=0, dealer_index=0)
+    solver = MCTSSolver()
+    return _rate("MCTS iterations (full search)", iterations,
+                 lambda: solver.search_with_details(game, timeout_ms=60_000, max_iterations=iterations))
 
-# Placeholder for the FastGame class we plan to build
-# For this benchmark, we'll simulate the operations it performs to estimate overhead.
-
-class MockFastGame:
-    def __init__(self):
-        # State: 4 players, 5-8 cards each, trump, etc.
-        self.hands = [[random.randint(0, 31) for _ in range(8)] for _ in range(4)]
-        self.current_turn = 0
-        self.trump = 'S'
-        self.tricks_played = 0
-        
-    def get_legal_moves(self, player_idx):
-        # Simulating logic: Check suit, check rank...
-        hand = self.hands[player_idx]
-        return [0, 1] if len(hand) > 1 else [0] # fast filtering
-        
-    def apply_move(self, player_idx, card_idx):
-        # Simulating state update: Pop card, update turn
-        card = self.hands[player_idx].pop(card_idx)
-        self.current_turn = (self.current_turn + 1) % 4
-        return card
-
-    def is_terminal(self):
-        return len(self.hands[0]) == 0
 
 def run_benchmark():
     print("--- BENCHMARKING SIMULATION SPEED ---")
-    
-    start_time = time.time()
-    iterations = 10000
-    
-    for _ in range(iterations):
-        game = MockFastGame()
-        # Simulate a full payout (32 moves)
-        moves = 0
-        while not game.is_terminal() and moves < 32:
-            legal = game.get_legal_moves(game.current_turn)
-            # Random Choice (MCTS Selection)
-            chosen = legal[0] 
-            game.apply_move(game.current_turn, chosen)
-            moves += 1
-            
-    end_time = time.time()
-    duration = end_time - start_time
-    
-    print(f"Iterations: {iterations}")
-    print(f"Total Time: {duration:.4f}s")
-    print(f"Games/Sec: {iterations / duration:.2f}")
-    
-    # Requirement: > 1000 Games/Sec for good MCTS
-    if (iterations / duration) > 1000:
-        print("RESULT: ✅ VIABLE (Python is fast enough)")
+    new_roll, old_roll = bench_rollouts(20000)
+    new_legal, old_legal = bench_legal_moves(100000)
+    mcts_rate = bench_mcts(5000)
+
+    print()
+    print(f"Rollout speedup:     {new_roll / old_roll:6.1f}x")
+    print(f"Legal-move speedup:  {new_legal / old_legal:6.1f}x")
+    print(f"5000-iteration search: ~{5000 / mcts_rate * 1000:.0f}ms")
+
+    # Requirement: >= 10x rollouts/sec over the list engine
+    if new_roll / old_roll >= 10:
+        print("RESULT: ✅ VIABLE (>= 10x rollout throughput)")
     else:
         print("RESULT: ⚠️ CAUTION (Optimization needed)")
 
@@ -0,0 +1,56 @@
+import time
+import random
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+from ai_worker.mcts.parallel import ParallelSolver, get_pool, shutdown_pool
+
+# Root-parallel scaling: iterations completed in a fixed 500ms decision window
+# (the CognitiveOptimizer timeout) for 1..N worker processes.
+
+def _opening_deal(seed=7):
+    rng = random.Random(seed)
+    deck = [Card(s, r) for s in SUITS for r in RANKS]
+    rng.shuffle(deck)
+    hands = [deck[i * 8:(i + 1) * 8] for i in range(4)]
+    return FastGame(hands, trump='♠', mode='HOKUM', current_turn=0, dealer_index=3)
+
+
+def run_parallel_benchmark(timeout_ms=500, repeats=3):
+    print("--- BENCHMARKING ROOT-PARALLEL MCTS ---")
+    game = _opening_deal()
+    max_workers = os.cpu_count() or 1
+    counts = [1] + [w for w in (2, 4, 8, 16) if w <= max_workers]
+
+    baseline = None
+    for workers in counts:
+        if workers == 1:
+            solver = MCTSSolver()
+            search = lambda: solver.search_with_details(game, timeout_ms=timeout_ms)
+        else:
+            parallel = ParallelSolver(workers=workers)
+            get_pool(workers)
+            parallel.search_with_details([game], timeout_ms=50)  # Warm-up: fork + import
+            search = lambda: parallel.search_with_details([game], timeout_ms=timeout_ms)
+
+        total_visits = 0
+        start = time.time()
+        for _ in range(repeats):
+            _, details = search()
+            total_visits += sum(d['visits'] for d in details.values())
+        duration = time.time() - start
+
+        rate = total_visits / duration
+        baseline = baseline or rate
+        print(f"Workers {workers:>2}: {total_visits / repeats:>8.0f} iterations/decision "
+              f"-> {rate:>9.0f} it/s  (x{rate / baseline:.2f}, ideal x{workers})")
+
+    shutdown_pool()
+
+if __name__ == "__main__":
+    run_parallel_benchmark()
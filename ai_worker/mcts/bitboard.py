@@ -0,0 +1,273 @@
+"""32-bit card masks and precomputed trick tables for fast simulation.
+
+Card id layout matches ``FeatureExtractor``: ``suit_idx * 8 + rank_idx`` with
+suits ordered ``♠ ♥ ♦ ♣`` and ranks ordered ``7 8 9 10 J Q K A``.  A hand is a
+single ``int`` whose bit *n* is set when the hand holds card id *n*.
+
+Everything that the inner loops need (trick strength, card points, greedy
+choices over an 8-bit suit slice) is computed once at import time or once
+per (mode, trump) pair, so rollouts never call ``ORDER_*.index``.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from game_engine.models.card import Card
+from game_engine.models.constants import (
+    SUITS, RANKS, ORDER_SUN, ORDER_HOKUM, POINT_VALUES_SUN, POINT_VALUES_HOKUM,
+)
+
+# Accept both symbol and letter suits (tests and tools use 'S', 'H', ...)
+SUIT_INDEX: Dict[str, int] = {
+    '♠': 0, 'S': 0, 's': 0,
+    '♥': 1, 'H': 1, 'h': 1,
+    '♦': 2, 'D': 2, 'd': 2,
+    '♣': 3, 'C': 3, 'c': 3,
+}
+RANK_INDEX: Dict[str, int] = {r: i for i, r in enumerate(RANKS)}
+
+FULL_DECK = (1 << 32) - 1
+SUIT_MASKS: Tuple[int, ...] = tuple(0xFF << (8 * s) for s in range(4))
+BIT: Tuple[int, ...] = tuple(1 << i for i in range(32))
+
+# Position of each rank (by RANKS index) inside the trick orderings
+SUN_POS: Tuple[int, ...] = tuple(ORDER_SUN.index(r) for r in RANKS)
+HOKUM_POS: Tuple[int, ...] = tuple(ORDER_HOKUM.index(r) for r in RANKS)
+
+ORD_SUN = 0
+ORD_HOKUM = 1
+_POS_BY_ORD = (SUN_POS, HOKUM_POS)
+
+
+def card_id(card) -> int:
+    """Card object or ``{'suit', 'rank'}`` dict -> id 0..31 (-1 if unknown)."""
+    if isinstance(card, dict):
+        suit, rank = card.get('suit'), card.get('rank')
+    else:
+        suit, rank = getattr(card, 'suit', None), getattr(card, 'rank', None)
+    s = SUIT_INDEX.get(suit)
+    r = RANK_INDEX.get(rank)
+    if s is None or r is None:
+        return -1
+    return s * 8 + r
+
+
+def id_to_card(cid: int) -> Card:
+    return Card(SUITS[cid >> 3], RANKS[cid & 7])
+
+
+def cards_to_mask(cards) -> int:
+    mask = 0
+    for c in cards:
+        cid = card_id(c)
+        if cid >= 0:
+            mask |= 1 << cid
+    return mask
+
+
+def mask_to_ids(mask: int) -> List[int]:
+    """Ascending card ids of every set bit."""
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def suit_index(suit: Optional[str]) -> int:
+    """Suit string -> 0..3, or -1 for None/unknown (e.g. SUN has no trump)."""
+    return SUIT_INDEX.get(suit, -1)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  8-bit suit-slice tables (indexed by [ordering][bits] or [hokum][bits])
+# ═══════════════════════════════════════════════════════════════════════
+
+def _build_above():
+    """ABOVE8[ord][rank_idx] -> ranks in the same suit that beat it."""
+    table = []
+    for pos in _POS_BY_ORD:
+        table.append(tuple(
+            sum(1 << r for r in range(8) if pos[r] > pos[x]) for x in range(8)
+        ))
+    return tuple(table)
+
+
+def _build_lowest():
+    """LOWEST8[ord][bits] -> rank idx of the weakest card in the slice."""
+    table = []
+    for pos in _POS_BY_ORD:
+        row = [-1] * 256
+        for bits in range(1, 256):
+            row[bits] = min((r for r in range(8) if bits >> r & 1), key=lambda r: pos[r])
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def _rank_points(hokum: bool) -> Tuple[int, ...]:
+    pts = POINT_VALUES_HOKUM if hokum else POINT_VALUES_SUN
+    return tuple(pts[r] for r in RANKS)
+
+
+def _build_points_extreme(highest: bool):
+    """[hokum][bits] -> (points, rank idx) of the highest/lowest point card.
+
+    Uses the plain rank point map (no trump uplift), which is what the greedy
+    rollout policy has always used for feeding and discarding.
+    """
+    table = []
+    for hokum in (False, True):
+        pts = _rank_points(hokum)
+        row = [(0, -1)] * 256
+        for bits in range(1, 256):
+            best_r, best_p = -1, None
+            for r in range(8):
+                if bits >> r & 1:
+                    p = pts[r]
+                    if best_p is None or (p > best_p if highest else p < best_p):
+                        best_p, best_r = p, r
+            row[bits] = (best_p, best_r)
+        table.append(tuple(row))
+    return tuple(table)
+
+
+_LEAD_BASE_PLAIN = {'A': 40, '10': 30, 'K': 20}
+_LEAD_BASE_TRUMP = {'J': 50, '9': 45, 'A': 40}
+_A, _K, _Q = RANK_INDEX['A'], RANK_INDEX['K'], RANK_INDEX['Q']
+
+
+def _build_lead():
+    """LEAD8[is_trump][bits] -> (score, rank idx) of the best lead in the slice.
+
+    Score = master bonus + 2 * suit length - naked-honour penalty.
+    """
+    table = []
+    for is_trump in (False, True):
+        base = _LEAD_BASE_TRUMP if is_trump else _LEAD_BASE_PLAIN
+        row = [(-100, -1)] * 256
+        for bits in range(1, 256):
+            length = bin(bits).count('1')
+            best = (-1000, -1)
+            for r in range(8):
+                if not bits >> r & 1:
+                    continue
+                score = base.get(RANKS[r], 0) + length * 2
+                if r == _K and not bits >> _A & 1:
+                    score -= 15
+                if r == _Q and not bits & ((1 << _A) | (1 << _K)):
+                    score -= 10
+                if score > best[0]:
+                    best = (score, r)
+            row[bits] = best
+        table.append(tuple(row))
+    return tuple(table)
+
+
+ABOVE8 = _build_above()
+LOWEST8 = _build_lowest()
+HIGHEST_POINTS8 = _build_points_extreme(highest=True)
+LOWEST_POINTS8 = _build_points_extreme(highest=False)
+LEAD8 = _build_lead()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  Per-(mode, trump) tables
+# ═══════════════════════════════════════════════════════════════════════
+
+class TrickTables:
+    """Strength and point tables for one (mode, trump) pair.
+
+    ``strength[lead_suit][cid]`` is comparable across a trick (-1 means the
+    card cannot win), ``points[cid]`` is the Abnat value with trump uplift.
+    """
+    __slots__ = ('hokum', 'trump', 'strength', 'points', 'follow_ord')
+
+    def __init__(self, mode: str, trump: int):
+        self.hokum = mode != 'SUN'
+        self.trump = trump if self.hokum else -1
+        strength = []
+        for lead in range(4):
+            row = [-1] * 32
+            for cid in range(32):
+                s, r = cid >> 3, cid & 7
+                if self.hokum and s == self.trump:
+                    row[cid] = 100 + HOKUM_POS[r]
+                elif s == lead:
+                    row[cid] = SUN_POS[r]
+            strength.append(tuple(row))
+        self.strength = tuple(strength)
+
+        # Trump cards score on the Hokum scale (J=20, 9=14); side suits and
+        # every SUN card use the plain scale (J=2, 9=0).
+        points = [0] * 32
+        for cid in range(32):
+            s, r = cid >> 3, cid & 7
+            scale = POINT_VALUES_HOKUM if (self.hokum and s == self.trump) else POINT_VALUES_SUN
+            points[cid] = scale[RANKS[r]]
+        self.points = tuple(points)
+
+        # Rank ordering used when comparing cards inside the lead suit
+        self.follow_ord = tuple(
+            ORD_HOKUM if (self.hokum and s == self.trump) else ORD_SUN for s in range(4)
+        )
+
+
+_TABLES: Dict[Tuple[bool, int], TrickTables] = {}
+
+
+def get_tables(mode: str, trump: Optional[str]) -> TrickTables:
+    """Cached ``TrickTables`` for a (mode, trump) pair."""
+    hokum = mode != 'SUN'
+    t_idx = suit_index(trump) if hokum else -1
+    key = (hokum, t_idx)
+    tables = _TABLES.get(key)
+    if tables is None:
+        tables = _TABLES[key] = TrickTables(mode, t_idx)
+    return tables
+
+
+def legal_mask(tables: TrickTables, hand: int, trick) -> int:
+    """Cards of ``hand`` the next seat may play onto ``trick`` [(seat, cid), ...].
+
+    Mirrors ``game_engine.logic.validation.is_move_legal``: follow suit;
+    in HOKUM, when the enemy is winning, trump if void and over-trump
+    (or over-play a trump lead) whenever possible. Seats 0/2 and 1/3 are
+    partners.
+    """
+    if not trick or not hand:
+        return hand
+    lead = trick[0][1] >> 3
+    follow = hand & SUIT_MASKS[lead]
+    trump = tables.trump
+    if not tables.hokum:
+        return follow or hand
+    if follow and lead != trump:
+        return follow
+
+    # HOKUM: who is winning?
+    strength = tables.strength[lead]
+    best_s, best_p, best_c = -2, -1, -1
+    for tp, tc in trick:
+        s = strength[tc]
+        if s > best_s:
+            best_s, best_p, best_c = s, tp, tc
+    seat = (trick[0][0] + len(trick)) & 3
+    if (best_p ^ seat) & 1 == 0:
+        return follow or hand
+
+    if follow:
+        # Trump lead: must beat the winning trump if able
+        over = follow & (ABOVE8[ORD_HOKUM][best_c & 7] << (8 * trump))
+        return over or follow
+    if trump < 0:
+        return hand
+    trumps = hand & SUIT_MASKS[trump]
+    if not trumps:
+        return hand
+    if best_c >> 3 == trump:
+        over = trumps & (ABOVE8[ORD_HOKUM][best_c & 7] << (8 * trump))
+        return over or trumps
+    return trumps
@@ -0,0 +1,181 @@
+"""Exact, rejection-free sampling of the hidden hands.
+
+The unseen cards have to be dealt to the other seats so that every seat gets
+exactly its remaining card count and no seat gets a suit it is known to be
+void in. Only the number of cards of each suit a seat receives matters for
+those constraints, so legal deals are counted per suit allocation:
+
+    deals(allocation) = prod over suits of multinomial(n_suit; a_seat,suit)
+
+and summed with a small DP over suits whose state is the capacity each seat
+has left (at most 9^3 states). Sampling walks the suits once, picking each
+suit's split with probability proportional to the number of deals it leads
+to, then shuffles the suit's cards into that split. Every legal deal is
+equally likely, the cost does not grow with the number of voids, and the DP
+is shared by every deal of a batch. Without voids or weights the DP is
+skipped: a shuffle of all the cards is already uniform.
+
+Optional per-seat, per-suit weights tilt the draw: a deal's weight is the
+product of the weights of its (seat, card suit) pairs (see
+``weights_from_memory`` for CardMemory.suit_probability).
+"""
+import random
+from bisect import bisect_right
+from math import comb
+from typing import Dict, Hashable, Iterable, List, Optional
+
+# Floor for suit_probability weights so an unlikely suit is never ruled out
+# (only known voids are hard constraints)
+WEIGHT_FLOOR = 0.1
+
+# Capacities are packed 5 bits per seat (values <= 8) with a guard bit on top
+# of each field: (left | guard) - split keeps every guard bit iff the split fits.
+_FIELD = 5
+
+
+class DealSampler:
+    """Counts and draws the deals of ``cards`` to the seats of ``capacities``."""
+
+    def __init__(self, cards: Iterable, capacities: Dict[Hashable, int],
+                 voids: Optional[Dict[Hashable, Iterable[str]]] = None,
+                 weights: Optional[Dict[Hashable, Dict[str, float]]] = None):
+        """
+        ``cards`` need a ``suit`` attribute; ``capacities`` maps each seat to
+        the number of cards it must receive; ``voids`` maps seats to suits
+        they cannot hold; ``weights`` maps seats to per-suit card weights
+        (missing entries weigh 1).
+        """
+        self.seats = list(capacities)
+        self.capacities = tuple(max(0, int(capacities[s])) for s in self.seats)
+        if max(self.capacities, default=0) >= 1 << (_FIELD - 1):
+            raise ValueError("at most 15 cards per seat")
+        by_suit = {}
+        for card in cards:
+            by_suit.setdefault(card.suit, []).append(card)
+        # Largest suit last (its split is whatever is left, no search) and
+        # the smallest just before it, where the DP has the most states
+        order = sorted(by_suit, key=lambda suit: len(by_suit[suit]), reverse=True)
+        self.suits = order[1:] + order[:1]
+        self._cards = [by_suit[s] for s in self.suits]
+
+        voids = voids or {}
+        weights = weights or {}
+        # Per suit: every split of its cards over the seats with its deal
+        # count, multinomial(n; split) * product of card weights (0 = void)
+        self._splits = []
+        self._free = True  # No voids, no weights: a plain shuffle is uniform
+        for suit, cards in zip(self.suits, self._cards):
+            factors = [0 if suit in voids.get(seat, ()) else weights.get(seat, {}).get(suit, 1)
+                       for seat in self.seats]
+            self._free = self._free and all(f == 1 for f in factors)
+            self._splits.append([(_pack(split), w, split)
+                                 for split, w in _splits(len(cards), self.capacities, factors)])
+        self._last = {packed: (w, split) for packed, w, split in self._splits[-1]} if self._splits else {}
+        self._guard = _pack([1 << (_FIELD - 1)] * len(self.seats))
+        self._table = {}  # (suit index, packed capacities left) -> (cumulative counts, [(split, left after)])
+        if sum(self.capacities) != sum(len(c) for c in self._cards):
+            self.total = 0
+        elif self._free:
+            self.total, n = 1, sum(self.capacities)
+            for c in self.capacities:
+                self.total *= comb(n, c)
+                n -= c
+        else:
+            self.total = self._count(0, _pack(self.capacities))
+
+    @property
+    def feasible(self) -> bool:
+        return self.total > 0
+
+    def sample(self, rng=random) -> Dict[Hashable, list]:
+        """One deal: seat -> list of cards."""
+        if not self.total:
+            raise ValueError("no deal satisfies the hand sizes and voids")
+        if self._free:
+            pool = [c for cards in self._cards for c in cards]
+            rng.shuffle(pool)
+            hands, start = {}, 0
+            for seat, n in zip(self.seats, self.capacities):
+                hands[seat] = pool[start:start + n]
+                start += n
+            return hands
+        hands = {seat: [] for seat in self.seats}
+        left = _pack(self.capacities)
+        last = len(self._cards) - 1
+        for i, cards in enumerate(self._cards):
+            if i == last:
+                split = self._last[left][1]  # Whatever is left takes the last suit
+            else:
+                cumulative, options = self._table[(i, left)]
+                top = cumulative[-1]
+                r = rng.randrange(top) if isinstance(top, int) else rng.random() * top
+                split, left = options[bisect_right(cumulative, r)]
+            pool = list(cards)
+            rng.shuffle(pool)
+            start = 0
+            for seat, n in zip(self.seats, split):
+                if n:
+                    hands[seat].extend(pool[start:start + n])
+                    start += n
+        return hands
+
+    def sample_batch(self, k: int, rng=random) -> List[Dict[Hashable, list]]:
+        """``k`` independent deals (the counting work is shared)."""
+        return [self.sample(rng) for _ in range(k)]
+
+    def _count(self, i, left):
+        """Weighted number of deals of suits i.. into the capacities ``left``."""
+        if i >= len(self._cards) - 1:
+            if not self._cards:
+                return int(not left)
+            return self._last.get(left, (0,))[0]
+        entry = self._table.get((i, left))
+        if entry is None:
+            cumulative, options, running = [], [], 0
+            guard = self._guard
+            top = left | guard
+            for packed, w, split in self._splits[i]:
+                rest = top - packed
+                if rest & guard != guard:
+                    continue  # Some seat has no room for its share
+                rest ^= guard
+                w *= self._count(i + 1, rest)
+                if w:
+                    running += w
+                    cumulative.append(running)
+                    options.append((split, rest))
+            entry = self._table[(i, left)] = (cumulative, options)
+        return entry[0][-1] if entry[0] else 0
+
+
+def _pack(values):
+    return sum(v << (_FIELD * j) for j, v in enumerate(values))
+
+
+def _splits(n, capacities, factors):
+    """[(split, deal count)] for n cards of one suit: a_j <= capacity_j, nothing to a void (factor 0) seat."""
+    out = []
+
+    def rec(j, n, split, count):
+        if j == len(capacities) - 1:
+            if n <= capacities[j] and (n == 0 or factors[j]):
+                out.append((split + (n,), count * factors[j] ** n if n else count))
+            return
+        top = min(n, capacities[j]) if factors[j] else 0
+        for a in range(top + 1):
+            rec(j + 1, n - a, split + (a,), count * comb(n, a) * factors[j] ** a if a else count)
+
+    if capacities:
+        rec(0, n, (), 1)
+    elif n == 0:
+        out.append(((), 1))
+    return out
+
+
+def weights_from_memory(memory, seats: Iterable[str]) -> Optional[Dict[str, Dict[str, float]]]:
+    """Per-card suit weights from CardMemory.suit_probability (None when it is not populated)."""
+    probs = getattr(memory, 'suit_probability', None)
+    if not probs:
+        return None
+    return {seat: {suit: max(WEIGHT_FLOOR, p) for suit, p in probs.get(seat, {}).items()}
+            for seat in seats}
@@ -1,224 +1,243 @@
-
-import copy
 from typing import List, Dict, Tuple
 from game_engine.models.card import Card
-from game_engine.models.constants import ORDER_SUN, ORDER_HOKUM, POINT_VALUES_SUN, POINT_VALUES_HOKUM
-from game_engine.logic.validation import is_move_legal
+from ai_worker.mcts.bitboard import (
+    BIT, SUIT_MASKS, ABOVE8, LOWEST8, HIGHEST_POINTS8, LOWEST_POINTS8, LEAD8, ORD_HOKUM,
+    card_id, id_to_card, get_tables, legal_mask,
+)
 
 class FastGame:
     """
     A lightweight, pure-logic game state for MCTS simulations.
     Optimized for speed: No logs, no metadata, no events.
+
+    Hands are tracked twice: ``hands`` keeps the caller's Card objects in
+    their original order (move indices point into these lists), while
+    ``hand_masks`` holds one 32-bit int per seat (see ``bitboard``) that the
+    legality check, trick resolution and greedy rollout work on.
     """
-    def __init__(self, 
-                 players_hands: List[List[Card]], 
-                 trump: str, 
-                 mode: str, 
-                 current_turn: int, 
+    def __init__(self,
+                 players_hands: List[List[Card]],
+                 trump: str,
+                 mode: str,
+                 current_turn: int,
                  dealer_index: int,
                  us_score: int = 0,
                  them_score: int = 0,
                  tricks_history: List = None,
                  table_cards: List = None):
-        
+
         # State
-        self.hands = players_hands # List of Lists of Cards
         self.trump = trump
         self.mode = mode
         self.current_turn = current_turn
         self.dealer_index = dealer_index
-        
+        self._tables = get_tables(mode, trump)
+
         self.scores = {'us': us_score, 'them': them_score}
         self.tricks_collected = {'us': 0, 'them': 0} # Number of tricks
-        self.teams = {0: 'us', 1: 'them', 2: 'us', 3: 'them'}  # Standard Baloot team assignment
-        
-        self.table = table_cards if table_cards else [] # List of {'card': Card, 'playedBy': 'Bottom/Right...'} (Wait, simulation uses int indices usually)
+
+        # id -> Card object, so bit positions map back to the caller's cards
+        self._cards = [None] * 32
+
+        self._hands = []        # List of Lists of Cards (index-addressed)
+        self._hand_ids = []     # Parallel lists of card ids
+        self.hand_masks = []    # One 32-bit int per seat
+        self._lists_stale = False
+        for raw_hand in players_hands:
+            hand, ids, mask = self._ingest_hand(raw_hand)
+            self._hands.append(hand)
+            self._hand_ids.append(ids)
+            self.hand_masks.append(mask)
+
+        self.table = table_cards if table_cards else []
         # Using int indices 0-3 for performance instead of strings
-        self.played_cards_in_trick = [] # List of (player_idx, Card)
-        
+        self._trick = [] # List of (player_idx, card_id)
+
         if table_cards:
-             # Convert existing table to internal format (player_idx, Card)
+             # Convert existing table to internal format (player_idx, card_id)
              # Map 'playedBy' (Bottom/Right/Top/Left) to index (0/1/2/3)
              pos_to_idx = {'Bottom': 0, 'Right': 1, 'Top': 2, 'Left': 3}
-             
+
              for tc in table_cards:
-                 # Check if 'card' is already a Card object or dict
                  c_obj = tc['card']
                  if isinstance(c_obj, dict):
                      c_obj = Card(c_obj['suit'], c_obj['rank'])
-                     
+                 cid = card_id(c_obj)
+                 if cid < 0:
+                     continue
+                 self._cards[cid] = c_obj
+
                  # Check playedBy format
                  p_by = tc.get('playedBy', '')
                  p_idx = pos_to_idx.get(p_by, 0) # Default to 0 if unknown (risk, but mostly valid)
-                 
-                 self.played_cards_in_trick.append((p_idx, c_obj))
-                 
+
+                 self._trick.append((p_idx, cid))
+
              # Correctly set turn if cards are on table
              # If table has K cards, the next turn is (leader + K) % 4
-             if self.played_cards_in_trick:
-                 leader_idx = self.played_cards_in_trick[0][0]
-                 cards_played_count = len(self.played_cards_in_trick)
-                 self.current_turn = (leader_idx + cards_played_count) % 4 
+             if self._trick:
+                 leader_idx = self._trick[0][0]
+                 cards_played_count = len(self._trick)
+                 self.current_turn = (leader_idx + cards_played_count) % 4
 
         self.tricks_history = tricks_history if tricks_history else []
         self.is_finished = False
-        
+
         # Cache for teams (0=Bottom=Us, 1=Right=Them, 2=Top=Us, 3=Left=Them)
         self.teams = [
              'us', 'them', 'us', 'them'
         ]
 
+    def _ingest_hand(self, raw_hand) -> Tuple[List[Card], List[int], int]:
+        """Sanitises one hand: dicts become Cards, unknown cards are dropped."""
+        hand, ids, mask = [], [], 0
+        for c in raw_hand:
+            if isinstance(c, dict):
+                try:
+                    c = Card(c['suit'], c['rank'])
+                except (KeyError, TypeError):
+                    continue  # Discard broken card dicts
+            cid = card_id(c)
+            if cid < 0:
+                continue  # Discard None, strings, ints, unknown suits
+            self._cards[cid] = c
+            hand.append(c)
+            ids.append(cid)
+            mask |= BIT[cid]
+        return hand, ids, mask
+
+    @property
+    def hands(self) -> List[List[Card]]:
+        """Per-seat Card lists; move indices point into these."""
+        if self._lists_stale:
+            self._sync_lists()
+        return self._hands
+
+    @hands.setter
+    def hands(self, players_hands):
+        self._hands, self._hand_ids, self.hand_masks = [], [], []
+        self._lists_stale = False
+        for raw_hand in players_hands:
+            hand, ids, mask = self._ingest_hand(raw_hand)
+            self._hands.append(hand)
+            self._hand_ids.append(ids)
+            self.hand_masks.append(mask)
+
+    @property
+    def played_cards_in_trick(self) -> List[Tuple[int, Card]]:
+        """Current trick as (player_idx, Card) pairs."""
+        return [(p, self._card(cid)) for p, cid in self._trick]
+
+    @played_cards_in_trick.setter
+    def played_cards_in_trick(self, plays):
+        trick = []
+        for p, c in plays:
+            cid = card_id(c)
+            if cid >= 0:
+                self._cards[cid] = c
+                trick.append((p, cid))
+        self._trick = trick
+
+    def _card(self, cid: int) -> Card:
+        c = self._cards[cid]
+        if c is None:
+            c = self._cards[cid] = id_to_card(cid)
+        return c
+
     def clone(self):
-        """Deep copy for MCTS branching."""
-        # Manual copy is faster than deepcopy usually for specific structures
-        new_hands = [h[:] for h in self.hands] # Slice copy lists
-        new_game = FastGame(
-            players_hands=new_hands,
-            trump=self.trump,
-            mode=self.mode,
-            current_turn=self.current_turn,
-            dealer_index=self.dealer_index,
-            us_score=self.scores['us'],
-            them_score=self.scores['them']
-        )
-        new_game.played_cards_in_trick = self.played_cards_in_trick[:]
+        """Copy for MCTS branching (masks are ints, so only the lists are copied)."""
+        new_game = FastGame.__new__(FastGame)
+        new_game.trump = self.trump
+        new_game.mode = self.mode
+        new_game.current_turn = self.current_turn
+        new_game.dealer_index = self.dealer_index
+        new_game._tables = self._tables
+        new_game.scores = dict(self.scores)
+        new_game.tricks_collected = dict(self.tricks_collected)
+        new_game._cards = self._cards  # Shared: cards are never mutated
+        if self._lists_stale:
+            self._sync_lists()
+        new_game._hands = [h[:] for h in self._hands]
+        new_game._hand_ids = [h[:] for h in self._hand_ids]
+        new_game._lists_stale = False
+        new_game.hand_masks = self.hand_masks[:]
+        new_game.table = self.table
+        new_game._trick = self._trick[:]
+        new_game.tricks_history = self.tricks_history
+        new_game.is_finished = self.is_finished
+        new_game.teams = self.teams
         return new_game
 
+    def __getstate__(self):
+        # Trick tables are a shared per-process cache: ship the key, not the tables
+        if self._lists_stale:
+            self._sync_lists()
+        state = self.__dict__.copy()
+        del state['_tables']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tables = get_tables(self.mode, self.trump)
+
+    def _resync_hand(self, p: int):
+        """Rebuilds ids/mask if a caller replaced ``hands[p]`` directly."""
+        hand, ids, mask = self._ingest_hand(self._hands[p])
+        self._hands[p] = hand
+        self._hand_ids[p] = ids
+        self.hand_masks[p] = mask
+
+    def legal_mask(self) -> int:
+        """Bitmask of the cards the current player may legally play (see ``bitboard.legal_mask``)."""
+        return legal_mask(self._tables, self.hand_masks[self.current_turn], self._trick)
+
     def get_legal_moves(self) -> List[int]:
         """Returns list of INDICES of cards in current player's hand."""
-        raw_hand = self.hands[self.current_turn]
-        if not raw_hand: return []
-        
-        # Paranoid Rebuild: Create a guaranteed clean list of Card Objects
-        safe_hand = []
-        for c in raw_hand:
-             if isinstance(c, dict):
-                  try:
-                       safe_hand.append(Card(c['suit'], c['rank']))
-                  except (KeyError, TypeError):
-                      pass  # Discard broken card dicts
-             elif hasattr(c, 'suit') and hasattr(c, 'rank'):
-                  safe_hand.append(c)
-             else:
-                  # Discard None, strings, ints, etc.
-                  pass
-                  
-        # Update self.hands check? No, just use safe_hand for this validation step.
-        # But if we don't update self.hands, then apply_move might crash later?
-        # Yes, we should update strict.
-        self.hands[self.current_turn] = safe_hand
-        hand = safe_hand
-        
-        if not hand: return []
-        
-        # Reuse validation logic
-        # We need to construct 'table_cards' format expected by validator
-        # Validator expects: [{'card': CardObj, 'playedBy': 'Bottom'}]
-        # We have (player_idx, Card). We need map idx->pos.
-        
-        pos_map = {0: 'Bottom', 1: 'Right', 2: 'Top', 3: 'Left'}
-        
-        validator_table = []
-        for p_idx, c in self.played_cards_in_trick:
-             validator_table.append({'card': c, 'playedBy': pos_map[p_idx]})
-             
-        # My Team
-        my_team = self.teams[self.current_turn]
-        
-        # Players Map (for validator)
-        players_team_map = {'Bottom': 'us', 'Right': 'them', 'Top': 'us', 'Left': 'them'}
-        
-        legal_indices = []
-        for i, card in enumerate(hand):
-             try:
-                 # Double check card object integrity
-                 _ = card.suit 
-                 
-                 if is_move_legal(
-                     card=card,
-                     hand=hand,
-                     table_cards=validator_table,
-                     game_mode=self.mode,
-                     trump_suit=self.trump,
-                     my_team=my_team,
-                     players_team_map=players_team_map
-                 ):
-                     legal_indices.append(i)
-             except Exception as e:
-                 # Silent fail for single card? Or print?
-                 # If we rebuild hand safely, this shouldn't happen.
-                 # Taking valid cards only.
-                 pass
-                 
-        return legal_indices
+        p = self.current_turn
+        hands = self.hands
+        if len(hands[p]) != len(self._hand_ids[p]):
+            self._resync_hand(p)
+        if not self._hand_ids[p]:
+            return []
+        legal = self.legal_mask()
+        return [i for i, cid in enumerate(self._hand_ids[p]) if legal >> cid & 1]
 
     def apply_move(self, card_idx: int):
         """Executes move, updates state, resolves trick if full."""
         player_idx = self.current_turn
-        card = self.hands[player_idx].pop(card_idx)
-        
-        self.played_cards_in_trick.append((player_idx, card))
-        
-        if len(self.played_cards_in_trick) == 4:
+        self.hands[player_idx].pop(card_idx)
+        cid = self._hand_ids[player_idx].pop(card_idx)
+        self.hand_masks[player_idx] &= ~BIT[cid]
+
+        self._trick.append((player_idx, cid))
+
+        if len(self._trick) == 4:
              self._resolve_trick()
         else:
              self.current_turn = (self.current_turn + 1) % 4
-             
+
     def _resolve_trick(self):
-        # Determine winner
-        lead_play = self.played_cards_in_trick[0]
-        lead_card = lead_play[1]
-        lead_suit = lead_card.suit
-        
-        best_play = lead_play
-        best_strength = -1
-        
-        # Strength Calc
-        for play in self.played_cards_in_trick:
-             p_idx, card = play
-             strength = -1
-             
-             if self.mode == 'SUN':
-                  if card.suit == lead_suit:
-                       strength = ORDER_SUN.index(card.rank)
-             else: # HOKUM
-                  if card.suit == self.trump:
-                       strength = 100 + ORDER_HOKUM.index(card.rank)
-                  elif card.suit == lead_suit:
-                       strength = ORDER_SUN.index(card.rank)
-                       
-             if strength > best_strength:
-                  best_strength = strength
-                  best_play = play
-                  
-        winner_idx = best_play[0]
+        tb = self._tables
+        strength = tb.strength[self._trick[0][1] >> 3]
+        points_table = tb.points
+
+        best_s, winner_idx, points = -2, self._trick[0][0], 0
+        for p_idx, cid in self._trick:
+             s = strength[cid]
+             points += points_table[cid]
+             if s > best_s:
+                  best_s, winner_idx = s, p_idx
+
         winner_team = self.teams[winner_idx]
-        
-        # Calculate Points
-        points = 0
-        card_debugs = []
-        for _, card in self.played_cards_in_trick:
-             if self.mode == 'SUN':
-                  points += POINT_VALUES_SUN.get(card.rank, 0)
-             else:
-                  val = POINT_VALUES_HOKUM.get(card.rank, 0)
-                  if card.suit == self.trump:
-                       if card.rank == 'J': val = 20
-                       elif card.rank == '9': val = 14
-                  points += val
-             card_debugs.append(f"{card}({points})")
-                  
-        # print(f"Trick Resolved: Mode {self.mode}. Cards: {card_debugs}. Winner: P{winner_idx} ({winner_team}). Points: {points}")
-        
         self.scores[winner_team] += points
         self.tricks_collected[winner_team] += 1
-        
+
         # Clear trick
-        self.played_cards_in_trick = []
+        self._trick = []
         self.current_turn = winner_idx
-        
+
         # Consumed all cards?
-        if len(self.hands[0]) == 0 and len(self.hands[1]) == 0:
+        if not self.hand_masks[0] and not self.hand_masks[1]:
              self.is_finished = True
              # Last trick bonus (10 points)
              self.scores[winner_team] += 10
@@ -230,173 +249,155 @@ class FastGame:
         """
         Simulates the game to completion using a smart heuristic policy.
         Used for PIMC rollouts to estimate hand strength without MCTS overhead.
+
+        Lead: masters first, long suits, avoid naked honours.
+        Follow: feed a winning partner, otherwise win as cheaply as possible,
+        trump (over-trumping when forced) when void, else discard cheapest.
+
+        Runs entirely on bitmasks; the Card lists are filtered lazily, the
+        next time ``hands`` is read.
         """
-        while not self.is_finished:
-            legal = self.get_legal_moves()
-            if not legal: break
-            
-            current_hand = self.hands[self.current_turn]
-            my_team = self.teams[self.current_turn]
-            partner_idx = (self.current_turn + 2) % 4
-            is_leading = (len(self.played_cards_in_trick) == 0)
-            
-            best_choice = legal[0]  # Default fallback
-            
-            if is_leading:
-                best_choice = self._greedy_lead(legal, current_hand)
-            else:
-                best_choice = self._greedy_follow(legal, current_hand, my_team, partner_idx)
-
-            self.apply_move(best_choice)
-
-    def _greedy_lead(self, legal, hand):
-        """Smart lead: play masters first, then high cards, avoid naked honors."""
-        best_idx = legal[0]
-        best_score = -100
-        
-        for idx in legal:
-            card = hand[idx]
-            score = 0
-            
-            is_trump = (self.mode == 'HOKUM' and card.suit == self.trump)
-            
-            # Master card detection (simplified for speed)
-            if is_trump:
-                if card.rank == 'J': score += 50
-                elif card.rank == '9': score += 45
-                elif card.rank == 'A': score += 40
+        if self.is_finished:
+            return
+        tb = self._tables
+        strength_by_lead = tb.strength
+        points = tb.points
+        follow_ord = tb.follow_ord
+        hokum = tb.hokum
+        trump = tb.trump
+        trump_shift = 8 * trump
+        lead_plain, lead_trump = LEAD8
+        highest_pts = HIGHEST_POINTS8[hokum]
+        lowest_pts = LOWEST_POINTS8[hokum]
+        lowest_by_ord = LOWEST8
+        above_by_ord = ABOVE8
+        above_trump = ABOVE8[ORD_HOKUM]
+        lowest_trump = LOWEST8[ORD_HOKUM]
+        bit = BIT
+        masks = self.hand_masks
+        teams = self.teams
+        scores = self.scores
+        tricks = self.tricks_collected
+
+        # Rebuild in-progress trick state
+        p = self.current_turn
+        n = len(self._trick)
+        lead = best_s = best_p = best_c = -1
+        pts = 0
+        strength = None
+        if n:
+            lead = self._trick[0][1] >> 3
+            strength = strength_by_lead[lead]
+            best_s = -2
+            for tp, tc in self._trick:
+                s = strength[tc]
+                pts += points[tc]
+                if s > best_s:
+                    best_s, best_p, best_c = s, tp, tc
+        trick_cards = [tc for _, tc in self._trick]
+
+        while True:
+            hand = masks[p]
+            if not hand:
+                break
+
+            if n == 0:
+                # --- Lead ---
+                best_score = -1000
+                cid = -1
+                for s in range(4):
+                    bits = (hand >> (s << 3)) & 255
+                    if bits:
+                        score, r = (lead_trump if (hokum and s == trump) else lead_plain)[bits]
+                        if score > best_score:
+                            best_score, cid = score, (s << 3) + r
+                lead = cid >> 3
+                strength = strength_by_lead[lead]
+                best_s, best_p, best_c = strength[cid], p, cid
+                pts = points[cid]
             else:
-                if card.rank == 'A': score += 40
-                elif card.rank == '10': score += 30
-                elif card.rank == 'K': score += 20
-            
-            # Prefer suits where we have length (safer leads)
-            suit_count = sum(1 for c in hand if c.suit == card.suit)
-            score += suit_count * 2
-            
-            # Penalize naked honors (K without A, Q without K/A)
-            if card.rank == 'K' and not any(c.rank == 'A' and c.suit == card.suit for c in hand):
-                score -= 15
-            if card.rank == 'Q' and not any(c.rank in ['A', 'K'] and c.suit == card.suit for c in hand):
-                score -= 10
-            
-            if score > best_score:
-                best_score = score
-                best_idx = idx
-        
-        return best_idx
-
-    def _greedy_follow(self, legal, hand, my_team, partner_idx):
-        """Smart follow: finesse, feed partner, trump wisely, duck cheap."""
-        lead_suit = self.played_cards_in_trick[0][1].suit
-        
-        # Find who is currently winning the trick
-        best_strength = -1
-        winner_player_idx = self.played_cards_in_trick[0][0]
-        for p_idx, card in self.played_cards_in_trick:
-            strength = self._card_strength(card, lead_suit)
-            if strength > best_strength:
-                best_strength = strength
-                winner_player_idx = p_idx
-        
-        is_partner_winning = (winner_player_idx == partner_idx)
-        
-        # Classify moves
-        follows = [i for i in legal if hand[i].suit == lead_suit]
-        trumps = [i for i in legal if self.mode == 'HOKUM' and hand[i].suit == self.trump and hand[i].suit != lead_suit]
-        
-        if follows:
-            # Can follow suit
-            winners = [i for i in follows if self._card_strength(hand[i], lead_suit) > best_strength]
-            
-            if is_partner_winning:
-                # Partner winning → feed points (highest point card that doesn't overtake)
-                safe_feeds = [i for i in follows if self._card_strength(hand[i], lead_suit) <= best_strength]
-                if safe_feeds:
-                    return self._highest_points(safe_feeds, hand)
-                # All cards overtake partner — play lowest winner
-                return self._lowest_strength(follows, hand, lead_suit)
+                # --- Follow ---
+                lsh = lead << 3
+                follow_bits = (hand >> lsh) & 255
+                partner_winning = best_p == (p ^ 2)
+                if follow_bits:
+                    ford = follow_ord[lead]
+                    above = above_by_ord[ford][best_c & 7] if (best_c >> 3) == lead else 0
+                    if partner_winning:
+                        safe = follow_bits & ~above
+                        r = highest_pts[safe][1] if safe else lowest_by_ord[ford][follow_bits]
+                    else:
+                        r = lowest_by_ord[ford][(follow_bits & above) or follow_bits]
+                    cid = lsh + r
+                else:
+                    trump_bits = (hand >> trump_shift) & 255 if (hokum and trump >= 0) else 0
+                    if trump_bits and not partner_winning:
+                        if (best_c >> 3) == trump:
+                            trump_bits = (trump_bits & above_trump[best_c & 7]) or trump_bits
+                        cid = trump_shift + lowest_trump[trump_bits]
+                    else:
+                        # Discard the cheapest card, protecting trumps
+                        best_pts = 999
+                        cid = -1
+                        for s in range(4):
+                            bits = (hand >> (s << 3)) & 255
+                            if bits:
+                                pt, r = lowest_pts[bits]
+                                if hokum and s == trump:
+                                    pt += 50
+                                if pt < best_pts:
+                                    best_pts, cid = pt, (s << 3) + r
+                s = strength[cid]
+                pts += points[cid]
+                if s > best_s:
+                    best_s, best_p, best_c = s, p, cid
+
+            masks[p] = hand ^ bit[cid]
+            trick_cards.append(cid)
+            n += 1
+            if n == 4:
+                team = teams[best_p]
+                scores[team] += pts
+                tricks[team] += 1
+                trick_cards = []
+                n = 0
+                p = best_p
+                if not masks[0] and not masks[1]:
+                    self.is_finished = True
+                    scores[team] += 10  # Last trick bonus
+                    break
             else:
-                # Enemy winning → try to win with lowest winning card (finesse)
-                if winners:
-                    return self._lowest_strength(winners, hand, lead_suit)
-                # Can't win → play lowest (duck)
-                return self._lowest_strength(follows, hand, lead_suit)
+                p = (p + 1) & 3
+
+        # Write back trick state and drop played cards from the index lists
+        self.current_turn = p
+        if n:
+            start = (p - n) & 3
+            self._trick = [((start + i) & 3, c) for i, c in enumerate(trick_cards)]
         else:
-            # Void in lead suit
-            if is_partner_winning:
-                # Partner winning → discard lowest value card
-                return self._lowest_points(legal, hand)
-            elif trumps:
-                # Can trump → use lowest trump
-                return self._lowest_strength(trumps, hand, lead_suit)
-            else:
-                # No trumps, not following → discard lowest
-                return self._lowest_points(legal, hand)
-
-    def _card_strength(self, card, lead_suit):
-        """Returns comparable strength value for a card in trick context."""
-        try:
-            if self.mode == 'HOKUM':
-                if card.suit == self.trump:
-                    return 100 + ORDER_HOKUM.index(card.rank)
-                elif card.suit == lead_suit:
-                    return ORDER_SUN.index(card.rank)
-            else:  # SUN
-                if card.suit == lead_suit:
-                    return ORDER_SUN.index(card.rank)
-        except (ValueError, AttributeError):
-            pass
-        return -1
+            self._trick = []
+        self._lists_stale = True
+
+    def _sync_lists(self):
+        """Filters the Card/id lists down to what the masks still hold."""
+        self._lists_stale = False
+        for p in range(len(self.hand_masks)):
+            mask = self.hand_masks[p]
+            ids = self._hand_ids[p]
+            if len(ids) == bin(mask).count('1'):
+                continue
+            keep = [i for i, cid in enumerate(ids) if mask >> cid & 1]
+            self._hand_ids[p] = [ids[i] for i in keep]
+            self._hands[p] = [self._hands[p][i] for i in keep]
 
     def _get_trick_winner_idx(self):
         """Returns the player index currently winning the trick."""
-        if not self.played_cards_in_trick:
+        if not self._trick:
             return self.current_turn
-        lead_suit = self.played_cards_in_trick[0][1].suit
-        best_idx = 0
-        best_strength = -1
-        for i, (p_idx, card) in enumerate(self.played_cards_in_trick):
-            s = self._card_strength(card, lead_suit)
-            if s > best_strength:
-                best_strength = s
-                best_idx = i
-        return self.played_cards_in_trick[best_idx][0]
-
-    def _highest_points(self, indices, hand):
-        """Select card with highest point value (for feeding partner)."""
-        point_map = POINT_VALUES_HOKUM if self.mode == 'HOKUM' else POINT_VALUES_SUN
-        best = indices[0]
-        best_pts = -1
-        for i in indices:
-            pts = point_map.get(hand[i].rank, 0)
-            if pts > best_pts:
-                best_pts = pts
-                best = i
-        return best
-
-    def _lowest_points(self, indices, hand):
-        """Select card with lowest point value (for discarding)."""
-        point_map = POINT_VALUES_HOKUM if self.mode == 'HOKUM' else POINT_VALUES_SUN
-        best = indices[0]
-        best_pts = 999
-        for i in indices:
-            pts = point_map.get(hand[i].rank, 0)
-            # Protect trumps when discarding
-            if self.mode == 'HOKUM' and hand[i].suit == self.trump:
-                pts += 50
-            if pts < best_pts:
-                best_pts = pts
-                best = i
-        return best
-
-    def _lowest_strength(self, indices, hand, lead_suit):
-        """Select card with lowest strength (finessing / economy)."""
-        best = indices[0]
-        best_s = 999
-        for i in indices:
-            s = self._card_strength(hand[i], lead_suit)
-            if s < best_s:
-                best_s = s
-                best = i
-        return best
+        strength = self._tables.strength[self._trick[0][1] >> 3]
+        best_s, winner = -2, self._trick[0][0]
+        for p_idx, cid in self._trick:
+            s = strength[cid]
+            if s > best_s:
+                best_s, winner = s, p_idx
+        return winner
@@ -1,9 +1,20 @@
 
 import math
+import os
 import random
 import time
 from typing import Dict, List, Optional
 from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.bitboard import popcount
+from ai_worker.mcts.transposition import zobrist_key
+
+# Leaves with at most this many cards per seat are scored by the exact
+# double-dummy solver instead of a greedy rollout (0 = always roll out)
+EXACT_LEAF_CARDS = int(os.environ.get('BALOOT_MCTS_EXACT_CARDS', '2'))
+
+def _score_diff(state) -> float:
+    return state.scores['us'] - state.scores['them']
+
 
 class MCTSNode:
     def __init__(self, move_idx: int, parent=None, prior: float = 0.0):
@@ -16,9 +27,16 @@ class MCTSNode:
         self.untried_moves = None # populate on first expansions
 
 class MCTSSolver:
-    def __init__(self, exploration_constant=1.414, neural_strategy=None):
+    def __init__(self, exploration_constant=1.414, neural_strategy=None, transposition_table=None,
+                 batch_size=1, exact_leaf_cards=EXACT_LEAF_CARDS):
         self.exploration_constant = exploration_constant # acts as C_puct in Hybrid Mode
         self.neural_strategy = neural_strategy
+        # Leaves sent to the policy net per forward pass (1 = one call per expansion)
+        self.batch_size = batch_size
+        # Optional TranspositionTable: shares nodes between move orders and
+        # resumes the stored subtree when a root position is searched again
+        self.transposition_table = transposition_table
+        self.exact_leaf_cards = exact_leaf_cards
 
     def search(self, root_state: FastGame, timeout_ms: int = 100, max_iterations: int = None) -> int:
         """
@@ -42,20 +60,34 @@ class MCTSSolver:
         Runs MCTS and returns (best_move_idx, detailed_stats).
         stats: dict[move_idx] -> { 'visits': int, 'wins': float, 'win_rate': float }
         """
+        tt = self.transposition_table
         if root_node_override:
              root_node = root_node_override
         else:
-             root_node = MCTSNode(move_idx=-1)
-             root_node.untried_moves = root_state.get_legal_moves()
+             root_node = tt.get(zobrist_key(root_state)) if tt is not None else None
+             if root_node is None or root_node.untried_moves is None:
+                  root_node = MCTSNode(move_idx=-1)
+                  root_node.untried_moves = root_state.get_legal_moves()
+                  if tt is not None:
+                       tt.put(zobrist_key(root_state), root_node)
         
         start_time = time.time()
-        iterations = 0
+        base_diff = _score_diff(root_state)
+        # A reused root already carries visits: max_iterations is the visit
+        # count to reach, so earlier decisions' work is not searched again
+        iterations = root_node.visits if max_iterations else 0
+
+        if self.neural_strategy and self.batch_size > 1 and hasattr(self.neural_strategy, 'predict_policy_batch'):
+            # Batched leaf evaluation spends the whole budget; the loop below then exits at once
+            iterations = self._search_batched(root_node, root_state, start_time, timeout_ms,
+                                              max_iterations, iterations, base_diff)
         
         while (time.time() - start_time) * 1000 < timeout_ms:
             if max_iterations and iterations >= max_iterations:
                 break
             iterations += 1
             node = root_node
+            path = [node]
             state = root_state.clone()
             
             # 1. Selection
@@ -64,8 +96,13 @@ class MCTSSolver:
             # Here keeping legacy structure: if untried_moves is not empty, we are at a frontier to expand.
             while not node.untried_moves and node.children:
                 is_us_turn = (state.teams[state.current_turn] == 'us')
-                node = self._select_child(node, is_us_turn)
-                state.apply_move(node.move_idx)
+                move_idx, node = self._select_child(node, is_us_turn)
+                state.apply_move(move_idx)
+                path.append(node)
+
+            # Policy expansion creates children without their moves: fill in lazily
+            if node.untried_moves is None:
+                node.untried_moves = state.get_legal_moves()
                 
             # 2. Expansion
             if node.untried_moves:
@@ -80,25 +117,11 @@ class MCTSSolver:
                      move = random.choice(node.untried_moves)
                      state.apply_move(move)
                      node = self._expand(node, move, state)
+                if node is not None:
+                     path.append(node)
                 
-            # 3. Simulation (Rollout) — using smart heuristic policy
-            # play_greedy() understands partner relationships, finessing, and point management
-            try:
-                state.play_greedy()
-            except Exception:
-                pass  # If greedy rollout fails, we still backprop partial state
-                
-            # 4. Backpropagation
-            # Calculate reward from 'us' perspective
-            us_score = state.scores['us']
-            them_score = state.scores['them']
-            
-            score_diff = us_score - them_score
-            reward = 0.5 + (score_diff / 100.0) 
-            if reward > 1.0: reward = 1.0
-            if reward < 0.0: reward = 0.0
-            
-            self._backpropagate(node, reward)
+            # 3. Simulation (Rollout) + 4. Backpropagation
+            self._backpropagate(path, self._simulate(state, base_diff))
             
         if not root_node.children:
             # Fallback if no simulations ran (shouldn't happen with 100ms)
@@ -122,6 +145,113 @@ class MCTSSolver:
             
         return best_move, details
 
+    def _simulate(self, state, base_diff: float = 0) -> float:
+        """
+        Rollout with the smart heuristic policy, reward from 'us' perspective.
+        The reward scores the points won after the search root (``base_diff``
+        is the root's us - them), so worlds that start from different running
+        scores (carried-over worlds replay the tricks since) are comparable.
+        """
+        score_diff = self._exact_score_diff(state)
+        if score_diff is None:
+            # play_greedy() understands partner relationships, finessing, and point management
+            try:
+                state.play_greedy()
+            except Exception:
+                pass  # If greedy rollout fails, we still backprop partial state
+            score_diff = _score_diff(state)
+
+        reward = 0.5 + ((score_diff - base_diff) / 100.0)
+        if reward > 1.0: reward = 1.0
+        if reward < 0.0: reward = 0.0
+        return reward
+
+    def _exact_score_diff(self, state) -> Optional[float]:
+        """Final us - them score of a short endgame under perfect play, or None to roll out."""
+        if state.is_finished or not self.exact_leaf_cards:
+            return None
+        masks = state.hand_masks
+        if popcount(masks[0] | masks[1] | masks[2] | masks[3]) > 4 * self.exact_leaf_cards:
+            return None
+        from ai_worker.strategies.components.endgame_solver import get_solver
+        trick = state._trick
+        leader = trick[0][0] if trick else state.current_turn
+        solver = get_solver(state.mode, state.trump)
+        try:
+            us = solver.value(masks, leader, trick)
+        except ValueError:
+            return None  # Uneven hands (hand-built state): the rollout copes
+        them = solver.total_points(masks, trick) - us
+        return (state.scores['us'] + us) - (state.scores['them'] + them)
+
+    def _search_batched(self, root_node, root_state, start_time, timeout_ms, max_iterations, iterations,
+                        base_diff=0):
+        """
+        PUCT with batched policy evaluation.
+
+        Each wave selects up to batch_size leaves. Every node on a selected
+        path takes a virtual loss (a visit scored as lost for the player who
+        chose it), steering the next selections of the wave elsewhere. The
+        pending leaves are encoded together, priced by one forward pass
+        (NeuralStrategy.predict_policy_batch), then expanded, rolled out and
+        backed up, after the virtual losses are removed.
+        Returns the updated iteration count.
+        """
+        while (time.time() - start_time) * 1000 < timeout_ms:
+            if max_iterations and iterations >= max_iterations:
+                break
+            wave = self.batch_size
+            if max_iterations:
+                wave = min(wave, max_iterations - iterations)
+
+            pending = []  # (path, losses, state) waiting for priors
+            pending_ids = set()
+            for _ in range(wave):
+                node = root_node
+                path, losses = [node], []
+                state = root_state.clone()
+                while not node.untried_moves and node.children:
+                    is_us_turn = (state.teams[state.current_turn] == 'us')
+                    move_idx, node = self._select_child(node, is_us_turn)
+                    state.apply_move(move_idx)
+                    loss = 0.0 if is_us_turn else 1.0
+                    node.visits += 1
+                    node.wins += loss
+                    path.append(node)
+                    losses.append(loss)
+
+                if node.untried_moves is None:
+                    node.untried_moves = state.get_legal_moves()
+                if node.untried_moves:
+                    if id(node) in pending_ids:
+                        # Already queued this wave: drop the duplicate
+                        self._revert_virtual_loss(path, losses)
+                        continue
+                    pending_ids.add(id(node))
+                    pending.append((path, losses, state))
+                else:
+                    # Terminal: nothing to expand, score it now
+                    self._revert_virtual_loss(path, losses)
+                    self._backpropagate(path, self._simulate(state, base_diff))
+                    iterations += 1
+
+            if pending:
+                policies = self.neural_strategy.predict_policy_batch([state for _, _, state in pending])
+                for (path, losses, state), policy in zip(pending, policies):
+                    self._revert_virtual_loss(path, losses)
+                    leaf = self._apply_policy(path[-1], state, policy)
+                    if leaf is not None:
+                        path.append(leaf)
+                    self._backpropagate(path, self._simulate(state, base_diff))
+                    iterations += 1
+        return iterations
+
+    @staticmethod
+    def _revert_virtual_loss(path, losses):
+        for node, loss in zip(path[1:], losses):
+            node.visits -= 1
+            node.wins -= loss
+
     def _select_child(self, node, is_us_turn: bool):
         # AlphaZero PUCT
         # PUCT = Q(s,a) + C * P(s,a) * sqrt(N_parent) / (1 + N_child)
@@ -130,11 +260,15 @@ class MCTSSolver:
         
         best_score = float('-inf')
         best_child = None
+        best_move = -1
         
-        # Pre-calc sqrt(N_parent)
+        # Pre-calc sqrt(N_parent) and the UCT log term (constant across children)
         sqrt_parent_visits = math.sqrt(node.visits)
+        uct_log = 2 * math.log(node.visits) if node.visits > 0 else 0.0
         
-        for child in node.children.values():
+        # Iterate (move, child): a transposed child's own move_idx may come
+        # from a different parent
+        for move_idx, child in node.children.items():
             if child.visits == 0:
                  q_value = 0.5 # Neutral prior for unvisited
                  if self.neural_strategy:
@@ -162,27 +296,40 @@ class MCTSSolver:
                       score = float('inf') # Ensure unvisited are visited
                  else:
                       exploit = q_value
-                      explore = self.exploration_constant * math.sqrt(2 * math.log(node.visits) / child.visits)
+                      explore = self.exploration_constant * math.sqrt(uct_log / child.visits)
                       score = exploit + explore
             
             if score > best_score:
                 best_score = score
                 best_child = child
+                best_move = move_idx
                 
-        return best_child
+        return best_move, best_child
 
     def _expand(self, node, move_idx, state):
         # Legacy Expansion (One at a time)
+        tt = self.transposition_table
+        node.untried_moves.remove(move_idx)
+        if tt is not None:
+            key = zobrist_key(state)
+            child = tt.get(key)
+            if child is not None and child.untried_moves is not None:
+                # Transposition: same position via another move order
+                node.children[move_idx] = child
+                return child
         child = MCTSNode(move_idx=move_idx, parent=node)
         child.untried_moves = state.get_legal_moves()
-        node.untried_moves.remove(move_idx)
         node.children[move_idx] = child
+        if tt is not None:
+            tt.put(key, child)
         return child
         
     def _expand_with_policy(self, node, state):
          # Expand ALL children using Neural Policy
          policy = self.neural_strategy.predict_policy(state)
-         
+         return self._apply_policy(node, state, policy)
+
+    def _apply_policy(self, node, state, policy):
          if not policy:
               # Fallback to random single expansion
               if not node.untried_moves: return None # Should not happen
@@ -261,8 +408,9 @@ class MCTSSolver:
               # They will be populated when visited.
               pass
 
-    def _backpropagate(self, node, reward):
-        while node:
+    def _backpropagate(self, path, reward):
+        # Walk the path actually taken: with a transposition table a node can
+        # have several parents, so node.parent is not enough
+        for node in path:
             node.visits += 1
             node.wins += reward
-            node = node.parent
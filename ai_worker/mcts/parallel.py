@@ -0,0 +1,192 @@
+import atexit
+import logging
+import math
+import os
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+from ai_worker.mcts.pimc import PIMCSolver, merge_root_details
+
+logger = logging.getLogger(__name__)
+
+# Extra wait on top of the search timeout for pickling + IPC
+RESULT_GRACE_MS = 150
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_failed = False
+
+# Worker-process solver cache (one per exploration constant)
+_worker_solvers: Dict[float, MCTSSolver] = {}
+
+
+def _warm_worker():
+    """Pool initializer: pay import and table-building cost once per worker."""
+    from ai_worker.mcts.bitboard import get_tables
+    for mode, trumps in (('SUN', (None,)), ('HOKUM', ('♠', '♥', '♦', '♣'))):
+        for trump in trumps:
+            get_tables(mode, trump)
+
+
+def _search_job(worlds: List[FastGame], timeout_ms: float, max_iterations: Optional[int],
+                exploration_constant: float, seed: int, expires: Optional[float] = None) -> Dict:
+    """
+    Runs in a pool worker: searches its share of the decision, returns root
+    details. The search ends by ``expires`` (wall clock), when the caller
+    stops waiting: a job that waited in the queue gets what is left of its
+    budget, or nothing.
+    """
+    if expires is not None:
+        timeout_ms = min(timeout_ms, (expires - time.time()) * 1000)
+        if timeout_ms <= 0:
+            return {}
+    random.seed(seed)
+    solver = _worker_solvers.get(exploration_constant)
+    if solver is None:
+        solver = _worker_solvers[exploration_constant] = MCTSSolver(exploration_constant=exploration_constant)
+    if len(worlds) == 1:
+        _, details = solver.search_with_details(worlds[0], timeout_ms=timeout_ms, max_iterations=max_iterations)
+    else:
+        _, details = PIMCSolver(solver).search_with_details(worlds, timeout_ms=timeout_ms, max_iterations=max_iterations)
+    return details
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def get_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Returns the process-wide warm pool, (re)creating it for a new size.
+    Returns None if worker processes cannot be started here; callers then
+    search serially.
+    """
+    global _pool, _pool_workers, _pool_failed
+    if _pool_failed:
+        return None
+    if _pool is not None and _pool_workers == workers:
+        return _pool
+    shutdown_pool()
+    try:
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        _pool_workers = workers
+    except (OSError, ValueError, NotImplementedError, ImportError) as e:
+        logger.warning(f"MCTS process pool unavailable, searching serially: {e}")
+        _pool = None
+        _pool_failed = True
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+class ParallelSolver:
+    """
+    Root-parallel MCTS: the decision is split into one job per worker and
+    the root statistics of the independent trees are summed.
+
+    - One world (single-world mode): every worker searches its own tree of the
+      same deal with a different RNG seed and 1/N of the iteration budget.
+    - Several worlds (PIMC mode): worlds are dealt round-robin to the workers.
+
+    Returns the same (best_move_idx, details) as MCTSSolver.search_with_details.
+    Falls back to the in-process search when the pool is unavailable or broken,
+    or when the solver carries a neural strategy (not shipped to workers).
+    """
+    def __init__(self, solver: MCTSSolver = None, workers: int = None):
+        self.solver = solver if solver else MCTSSolver()
+        self.workers = workers if workers else default_workers()
+        self.serial = PIMCSolver(self.solver)
+
+    def search_with_details(self, worlds: List[FastGame], timeout_ms: int = 100,
+                            max_iterations: int = None) -> Tuple[int, Dict]:
+        if not worlds:
+            return -1, {}
+
+        pool = None
+        if self.workers > 1 and not self.solver.neural_strategy:
+            pool = get_pool(self.workers)
+        if pool is None:
+            return self._search_serial(worlds, timeout_ms, max_iterations)
+
+        start = time.time()
+        jobs = self._plan_jobs(worlds, max_iterations)
+        futures = []
+        try:
+            for job_worlds, job_iterations in jobs:
+                futures.append(pool.submit(
+                    _search_job, job_worlds, timeout_ms, job_iterations,
+                    self.solver.exploration_constant, random.getrandbits(32),
+                    start + timeout_ms / 1000.0
+                ))
+        except (BrokenProcessPool, RuntimeError, pickle.PicklingError) as e:
+            logger.warning(f"MCTS pool submit failed, searching serially: {e}")
+            self._discard(futures, broken=isinstance(e, BrokenProcessPool))
+            return self._search_serial(worlds, timeout_ms, max_iterations)
+
+        deadline = start + (timeout_ms + RESULT_GRACE_MS) / 1000.0
+        results = []
+        broken = False
+        for future in futures:
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.time())))
+            except FuturesTimeout:
+                continue  # Late worker: merge whatever finished in time
+            except BrokenProcessPool as e:
+                logger.warning(f"MCTS pool broke mid-search: {e}")
+                broken = True
+                break
+            except Exception as e:
+                logger.warning(f"MCTS worker job failed: {e}")
+
+        # Late jobs still queued are dropped; started ones stop at their expiry
+        self._discard(futures, broken=broken)
+
+        best_move, details = merge_root_details(results)
+        if best_move == -1:
+            remaining_ms = max(1, timeout_ms - (time.time() - start) * 1000)
+            return self._search_serial(worlds, remaining_ms, max_iterations)
+        return best_move, details
+
+    def _plan_jobs(self, worlds: List[FastGame], max_iterations: Optional[int]):
+        """[(worlds_for_job, iteration_budget), ...] — one entry per busy worker."""
+        if len(worlds) == 1:
+            n_jobs = self.workers
+            iterations = math.ceil(max_iterations / n_jobs) if max_iterations else None
+            return [([worlds[0]], iterations) for _ in range(n_jobs)]
+
+        n_jobs = min(self.workers, len(worlds))
+        groups = [worlds[i::n_jobs] for i in range(n_jobs)]
+        jobs = []
+        for group in groups:
+            iterations = None
+            if max_iterations:
+                iterations = math.ceil(max_iterations * len(group) / len(worlds))
+            jobs.append((group, iterations))
+        return jobs
+
+    def _search_serial(self, worlds, timeout_ms, max_iterations):
+        if len(worlds) == 1:
+            return self.solver.search_with_details(worlds[0], timeout_ms=timeout_ms, max_iterations=max_iterations)
+        return self.serial.search_with_details(worlds, timeout_ms=timeout_ms, max_iterations=max_iterations)
+
+    @staticmethod
+    def _discard(futures, broken: bool):
+        for f in futures:
+            f.cancel()
+        if broken:
+            # Next call builds a fresh pool
+            shutdown_pool()
@@ -0,0 +1,82 @@
+import math
+import time
+from typing import Dict, List, Tuple
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+
+class PIMCSolver:
+    """
+    Perfect-Information Monte Carlo with root aggregation.
+
+    Instead of spending the whole budget on one guessed deal, the budget is
+    split across several determinized worlds (each a FastGame whose hidden
+    hands were sampled to respect known voids). Every world gets its own
+    MCTS tree; the root children are keyed by the acting player's hand index,
+    which is identical in every world, so visits and wins are summed per move.
+
+    The return value follows MCTSSolver.search_with_details exactly:
+    (best_move_idx, {move_idx: {'visits', 'wins', 'win_rate', 'prior'}}).
+    """
+    def __init__(self, solver: MCTSSolver = None):
+        self.solver = solver if solver else MCTSSolver()
+
+    def search_with_details(self, worlds: List[FastGame], timeout_ms: int = 100,
+                            max_iterations: int = None) -> Tuple[int, Dict]:
+        if not worlds:
+            return -1, {}
+
+        n_worlds = len(worlds)
+        per_world_iterations = math.ceil(max_iterations / n_worlds) if max_iterations else None
+        deadline = time.time() + timeout_ms / 1000.0
+
+        results = []
+        for i, world in enumerate(worlds):
+            remaining_ms = (deadline - time.time()) * 1000
+            if remaining_ms <= 0:
+                break
+            # Spread whatever time is left evenly over the worlds still to search
+            share_ms = remaining_ms / (n_worlds - i)
+            _, details = self.solver.search_with_details(
+                world, timeout_ms=share_ms, max_iterations=per_world_iterations
+            )
+            results.append(details)
+
+        best_move, details = merge_root_details(results)
+        if best_move == -1:
+            legal = worlds[0].get_legal_moves()
+            if not legal: return -1, {}
+            return legal[0], {}
+        return best_move, details
+
+
+def merge_root_details(results: List[Dict]) -> Tuple[int, Dict]:
+    """
+    Sums per-move root statistics from several searches of the same decision
+    (different worlds, or independent trees of the same world).
+    Returns (best_move_idx, details) with best = most visits, or (-1, {}).
+    """
+    totals: Dict[int, Dict] = {}
+    for details in results:
+        if not details:
+            continue
+        for move_idx, stats in details.items():
+            agg = totals.setdefault(move_idx, {'visits': 0, 'wins': 0.0, 'prior': 0.0, 'trees': 0})
+            agg['visits'] += stats['visits']
+            agg['wins'] += stats['wins']
+            agg['prior'] += stats.get('prior', 0.0)
+            agg['trees'] += 1
+
+    if not totals:
+        return -1, {}
+
+    details = {}
+    for move_idx, agg in totals.items():
+        details[move_idx] = {
+            'visits': agg['visits'],
+            'wins': agg['wins'],
+            'win_rate': agg['wins'] / agg['visits'] if agg['visits'] > 0 else 0,
+            'prior': agg['prior'] / agg['trees'],
+        }
+
+    best_move = max(details.items(), key=lambda item: item[1]['visits'])[0]
+    return best_move, details
@@ -0,0 +1,97 @@
+import os
+import random
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Bounded node count for a TranspositionTable (~250 bytes per MCTSNode)
+DEFAULT_TT_ENTRIES = int(os.environ.get('BALOOT_MCTS_TT_ENTRIES', '200000'))
+
+_rng = random.Random(0x5A0B)  # Fixed seed: keys are stable across processes
+
+# Hands are hashed per list position, not per card set: move indices point
+# into the hand lists, so two states only share a node when the lists match
+# element for element (true for transpositions inside one sampled world).
+Z_HAND = [[[_rng.getrandbits(64) for _ in range(32)] for _ in range(32)] for _ in range(4)]
+Z_TRICK = [[_rng.getrandbits(64) for _ in range(32)] for _ in range(4)]
+Z_TURN = [_rng.getrandbits(64) for _ in range(4)]
+Z_SCORE_US = [_rng.getrandbits(64) for _ in range(256)]
+Z_SCORE_THEM = [_rng.getrandbits(64) for _ in range(256)]
+Z_HOKUM = _rng.getrandbits(64)
+Z_TRUMP = [_rng.getrandbits(64) for _ in range(4)]
+
+
+def zobrist_key(game) -> int:
+    """
+    64-bit key of a FastGame position: remaining hands, trick in progress,
+    player to move (the leader follows from the trick), both scores, mode.
+    """
+    if game._lists_stale:
+        game._sync_lists()
+    key = Z_TURN[game.current_turn]
+    for p, ids in enumerate(game._hand_ids):
+        z = Z_HAND[p]
+        for i, cid in enumerate(ids):
+            key ^= z[i][cid]
+    for p, cid in game._trick:
+        key ^= Z_TRICK[p][cid]
+    key ^= Z_SCORE_US[min(game.scores['us'], 255)]
+    key ^= Z_SCORE_THEM[min(game.scores['them'], 255)]
+    tables = game._tables
+    if tables.hokum:
+        key ^= Z_HOKUM ^ Z_TRUMP[tables.trump]
+    return key
+
+
+class TranspositionTable:
+    """
+    Zobrist-keyed map of MCTS nodes, bounded by LRU eviction.
+
+    Lets a search share statistics between move orders that reach the same
+    position, and lets the next decision of the same bot pick up the subtree
+    it already grew (the root of a carried-over world is looked up by key).
+    Evicting an entry only drops the index; nodes still linked from a live
+    tree stay reachable through it.
+    """
+    def __init__(self, max_entries: int = DEFAULT_TT_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[int, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: int):
+        node = self._entries.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return node
+
+    def put(self, key: int, node):
+        entries = self._entries
+        entries[key] = node
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
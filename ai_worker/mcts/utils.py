@@ -3,13 +3,21 @@ from typing import List, Set
 from game_engine.models.card import Card
 from ai_worker.bot_context import BotContext
 from game_engine.models.constants import SUITS
+from ai_worker.mcts.deal_sampler import DealSampler, weights_from_memory
 
-def generate_random_distribution(ctx: BotContext) -> List[List[Card]]:
+def generate_random_distribution(ctx: BotContext, rng=random) -> List[List[Card]]:
     """
     Generates a random distribution of remaining cards to other players,
     respecting known voids and played cards.
     Returns list of 4 Hands (indices 0..3).
     """
+    return generate_distributions(ctx, 1, rng)[0]
+
+def generate_distributions(ctx: BotContext, k: int, rng=random) -> List[List[List[Card]]]:
+    """
+    K independent distributions (as generate_random_distribution) from one
+    count of the legal deals, so a batch costs little more than one deal.
+    """
     # 1. Identify Remaining Cards
     # We need a full deck set
     all_cards = []
@@ -55,16 +63,6 @@ def generate_random_distribution(ctx: BotContext) -> List[List[Card]]:
     # Simplified: Assume all start with 8. Subtract plays.
     
     # 3. Allocator
-    # Shuffle remaining
-    random.shuffle(remaining)
-    
-    # Distribute (Blindly for now - ignoring voids logic for MVP)
-    # Map to positions
-    hands = [[], [], [], []] # Bottom, Right, Top, Left
-    
-    # Fill Bottom (Self)
-    hands[0] = [c for c in sanitized_hand] # Copy
-    
     # Fill Others — use precise card counts from Memory (Bayesian tracking)
     positions = ['Bottom', 'Right', 'Top', 'Left']
     target_counts = {}
@@ -84,109 +82,34 @@ def generate_random_distribution(ctx: BotContext) -> List[List[Card]]:
             target_counts[i] = cards_left
         
     # --- CONSTRAINT-BASED DISTRIBUTION ---
-    # We have 'remaining' cards and 'target_counts' per player.
-    # We have 'ctx.memory.voids' (Map: pos_string -> Set[suits]).
-    
-    player_positions = ['Bottom', 'Right', 'Top', 'Left']
-    
-    # Filter valid slots for each card
-    # Simplest approach: Shuffle cards, try to assign to valid player with space. If stuck, restart.
-    
-    max_attempts = 10
-    success = False
-    
-    for attempt in range(max_attempts):
-         random.shuffle(remaining)
-         
-         # Reset Hands (Keep Bottom fixed)
-         temp_hands = [[], [], [], []]
-         temp_hands[0] = [c for c in ctx.hand]
-         
-         current_counts = {i: 0 for i in range(4)}
-         
-         # Identify who needs cards
-         needs_cards = [] # List of player_idx
-         for i in range(1, 4): # Right, Top, Left
-              count_needed = target_counts[i]
-              for _ in range(count_needed):
-                   needs_cards.append(i)
-         
-         # Optimize: needs_cards list is what we iterate? 
-         # No, iterate CARDS and find home.
-         
-         fail_attempt = False
-         
-         # Count check
-         if len(needs_cards) != len(remaining):
-              # Mismatch in tracking (e.g. played cards not synced)
-              # Just force fill to avoid crash
-              pass
-              
-         # To simplify: We cycle through players and give cards, checking constraints.
-         # But specific players might be constrained on specific suits.
-         # Hard constraints first?
-         
-         # Let's map Card -> [Valid Players]
-         card_options = []
-         for card in remaining:
-              options = []
-              for p_idx in range(1, 4): # 1, 2, 3
-                   pos_str = player_positions[p_idx]
-                   if target_counts[p_idx] > len(temp_hands[p_idx]):
-                        # Has room
-                        # Check Void
-                        is_void = ctx.memory.is_void(pos_str, card.suit)
-                        if not is_void:
-                             options.append(p_idx)
-                             
-              if not options:
-                   fail_attempt = True
-                   break
-              card_options.append((card, options))
-              
-         if fail_attempt: continue
-         
-         # Distribution (Greedy with some randomness)
-         # Sort by "Most Constrained" (Fewest Options) first to avoid getting stuck?
-         card_options.sort(key=lambda x: len(x[1]))
-         
-         for card, options in card_options:
-               # Filter options to those who STILL have room
-               valid_opts = [idx for idx in options if len(temp_hands[idx]) < target_counts[idx]]
-               
-               if not valid_opts:
-                    fail_attempt = True
-                    break
-               
-               # BAYESIAN WEIGHTING: Prefer assigning cards to players
-               # who are more likely to hold that suit
-               if len(valid_opts) > 1 and hasattr(ctx.memory, 'suit_probability') and ctx.memory.suit_probability:
-                    weights = []
-                    for idx in valid_opts:
-                        pos = player_positions[idx]
-                        prob = ctx.memory.get_suit_probability(pos, card.suit)
-                        weights.append(max(0.1, prob))  # Floor at 0.1 to avoid zero-weight
-                    total_w = sum(weights)
-                    if total_w > 0:
-                        weights = [w / total_w for w in weights]
-                        chosen_idx = random.choices(valid_opts, weights=weights, k=1)[0]
-                    else:
-                        chosen_idx = random.choice(valid_opts)
-               else:
-                    chosen_idx = random.choice(valid_opts)
-               temp_hands[chosen_idx].append(card)
-              
-         if not fail_attempt:
-              hands = temp_hands
-              success = True
-              break
-              
-    if not success:
+    # Exact sampling over the deals that respect hand sizes and known voids
+    # (see deal_sampler), weighted by the Bayesian suit probabilities.
+    sampler = _build_sampler(ctx, remaining, target_counts)
+    if not sampler.feasible:
          # Fallback to naive distribution (Constraint Violation is better than Crash)
-         # Re-run strict naive
-         return _naive_distribution(remaining, target_counts, ctx.hand)
-         
-    return hands
+         deals = []
+         for _ in range(k):
+              rng.shuffle(remaining)
+              deals.append(_naive_distribution(remaining, target_counts, ctx.hand))
+         return deals
+
+    deals = []
+    for deal in sampler.sample_batch(k, rng):
+         hands = [[c for c in sanitized_hand], [], [], []]
+         for p_idx in range(1, 4):
+              hands[p_idx] = deal[p_idx]
+         deals.append(hands)
+    return deals
+
+def _build_sampler(ctx: BotContext, remaining, target_counts) -> DealSampler:
+    player_positions = ['Bottom', 'Right', 'Top', 'Left']
+    capacities = {p_idx: target_counts[p_idx] for p_idx in range(1, 4)}
+    voids = {p_idx: [s for s in SUITS if ctx.memory.is_void(player_positions[p_idx], s)]
+             for p_idx in range(1, 4)}
+    weights = weights_from_memory(ctx.memory, player_positions)
+    if weights:
+         weights = {p_idx: weights[player_positions[p_idx]] for p_idx in range(1, 4)}
+    return DealSampler(remaining, capacities, voids=voids, weights=weights)
 
 def _naive_distribution(remaining, target_counts, my_hand):
     hands = [[], [], [], []]
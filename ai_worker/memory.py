@@ -41,103 +41,127 @@ class CardMemory:
         # Track cards played per suit per player for probability updates
         self.suit_play_count = {}  # {player_pos: {suit: int}}
 
+        # Incremental round state (see begin_round / observe_play / observe_trick_end)
+        self.trump = None
+        self.mode = None
+        self.tricks_done = 0
+        self.plays_seen = 0
+        self.pending_plays = []  # [(player_pos, rank, suit)] of the trick on the table
+        self._unplayed_per_suit = {s: len(RANKS) for s in SUITS}
+
     def mark_played(self, card_str):
-        self.played_cards.add(card_str)
+        if card_str not in self.played_cards:
+            self.played_cards.add(card_str)
+            suit = card_str[-1]
+            if suit in self._unplayed_per_suit:
+                self._unplayed_per_suit[suit] -= 1
+
+    # ========= INCREMENTAL UPDATES =========
+
+    def begin_round(self, trump=None, mode=None):
+        """Forget everything and start tracking a fresh round."""
+        self.reset()
+        self.trump = trump
+        self.mode = mode
+        self._refresh_probabilities()
+
+    def observe_play(self, player_pos, rank, suit):
+        """
+        A card hit the table. O(1): marks it played and updates counts;
+        void inference waits for observe_trick_end (the trick must be complete).
+        """
+        self.mark_played(f"{rank}{suit}")
+        self.pending_plays.append((player_pos, rank, suit))
+        self.plays_seen += 1
+        self._refresh_probabilities()
+
+    def observe_trick_end(self):
+        """The trick on the table was collected: infer voids, discards and proofs from it."""
+        trick_idx = self.tricks_done
+        led_suit = self.pending_plays[0][2] if self.pending_plays else None
+        for player_pos, rank, suit in self.pending_plays:
+            if not player_pos or not rank or not suit:
+                continue
+            self._ingest_trick_play(player_pos, rank, suit, led_suit, trick_idx)
+        self.pending_plays = []
+        self.tricks_done += 1
+        self._refresh_probabilities()
+
+    def _ingest_trick_play(self, player_pos, rank, suit, led_suit, trick_idx):
+        # PROOF-BASED QAYD: Check if this play proves a suspected crime
+        # If player is playing a suit they previously claimed void in -> PROOF!
+        proven_crime = self.check_for_proof(player_pos, suit, trick_idx)
+        if proven_crime:
+             # Store the proof card
+             proven_crime['proof_card'] = {'rank': rank, 'suit': suit}
+
+        # Infer Voids
+        if led_suit and suit != led_suit:
+             # Player failed to follow suit -> VOID in led_suit
+             self.mark_void(player_pos, led_suit)
+             logger.debug(f"[MEMORY] Inferring VOID: Player {player_pos} has no {led_suit} (Played {suit} on {led_suit})")
+
+             # Track Discard for Signaling History
+             if player_pos not in self.discards: self.discards[player_pos] = []
+             self.discards[player_pos].append({
+                 'rank': rank,
+                 'suit': suit,
+                 'trick_idx': trick_idx
+             })
+
+             # PROOF-BASED QAYD: Record suspected crime
+             # The crime card is what they played (wrong suit)
+             # The void_suit is the suit they claimed not to have
+             self.record_suspected_crime(
+                 player_pos=player_pos,
+                 trick_idx=trick_idx,
+                 crime_card={'rank': rank, 'suit': suit},
+                 void_suit=led_suit
+             )
+
+             if self.mode == 'HOKUM' and led_suit != self.trump and suit != self.trump:
+                  self.mark_void(player_pos, self.trump)
+                  logger.debug(f"[MEMORY] Inferring VOID: Player {player_pos} has no {self.trump} (Failed to cut {led_suit})")
+
+    @staticmethod
+    def trick_plays(trick):
+        """
+        Normalizes a history trick into [(player_pos, rank, suit)].
+        Cards may be wrappers {card: {suit, rank}, playedBy} or flat {suit, rank, playedBy};
+        playedBy may instead be a parallel list on the trick.
+        """
+        plays = []
+        involved_players = trick.get('playedBy', []) or []
+        for i, c_data in enumerate(trick.get('cards', [])):
+             c_inner = c_data if 'rank' in c_data else c_data.get('card', {})
+             player_pos = c_data.get('playedBy')
+             if not player_pos and i < len(involved_players):
+                  player_pos = involved_players[i]
+             plays.append((player_pos, c_inner.get('rank'), c_inner.get('suit')))
+        return plays
 
     def populate_from_state(self, game_state):
         """
         Rebuilds memory from the full game history provided in the state.
         Critically, this infers VOIDS based on player actions.
-        
-        TODO: Upgrade to "Mind's Eye" Probabilistic Memory.
-        Current implementation uses binary voids (Has Suit / Void).
-        Future: self.hand_distributions = {player: {suit: prob}}
+
+        Replays the round through the same begin_round / observe_* steps that
+        live game events use, so both paths always agree. Baloot memory is
+        per-round (cards are reshuffled), so pastRoundResults are ignored.
         """
-        self.reset()
-        
-        # 1. Mark Table Cards as Played
-        for tc in game_state.get('tableCards', []):
-             c = tc['card']
-             self.mark_played(f"{c['rank']}{c['suit']}")
-             
-        # 2. Process Round History (Tricks)
-        # Assuming round_history / currentRoundTricks structure:
-        # [{'winner': 'Bottom', 'cards': [{'suit': 'S', 'rank': 'A', 'playedBy': 'Bottom'}, ...]}, ...]
-        
-        history = game_state.get('currentRoundTricks', [])
-        # Also check 'pastRoundResults' for previous rounds if we wanted long-term memory?
-        # No, Baloot memory is per-round (cards are reshuffled).
-        
-        trump = game_state.get('trumpSuit')
-        mode = game_state.get('gameMode')
-        
-        for trick in history:
-            led_suit = None
-            if trick.get('cards'):
-                 # Need to handle if cards are objects or dicts
-                 first_card = trick['cards'][0]
-                 # first_card might be wrapper dict {card: {suit, rank}, playedBy: ...} or just {suit, rank}
-                 # Standardize access
-                 c_dict = first_card if 'rank' in first_card else first_card.get('card', {})
-                 led_suit = c_dict.get('suit')
-                 
-            involved_players = trick.get('playedBy', []) # Parallel list
-                 
-            for i, c_data in enumerate(trick.get('cards', [])):
-                 # Normalize card data
-                 c_inner = c_data if 'rank' in c_data else c_data.get('card', {})
-                 rank = c_inner.get('rank')
-                 suit = c_inner.get('suit')
-                 
-                 # Robust Player Position Extraction
-                 player_pos = c_data.get('playedBy')
-                 if not player_pos and i < len(involved_players):
-                      player_pos = involved_players[i]
-                 
+        self.begin_round(game_state.get('trumpSuit'), game_state.get('gameMode'))
+
+        for trick in game_state.get('currentRoundTricks', []):
+            for player_pos, rank, suit in self.trick_plays(trick):
                  if not player_pos or not rank or not suit:
                       continue
+                 self.observe_play(player_pos, rank, suit)
+            self.observe_trick_end()
 
-                 # Mark Played
-                 self.mark_played(f"{rank}{suit}")
-                 
-                 # PROOF-BASED QAYD: Check if this play proves a suspected crime
-                 # If player is playing a suit they previously claimed void in -> PROOF!
-                 trick_idx = history.index(trick)
-                 proven_crime = self.check_for_proof(player_pos, suit, trick_idx)
-                 if proven_crime:
-                      # Store the proof card
-                      proven_crime['proof_card'] = {'rank': rank, 'suit': suit}
-                 
-                 # Infer Voids
-                 if led_suit and suit != led_suit:
-                      # Player failed to follow suit -> VOID in led_suit
-                      self.mark_void(player_pos, led_suit)
-                      logger.info(f"[MEMORY] Inferring VOID: Player {player_pos} has no {led_suit} (Played {suit} on {led_suit})")
-                      
-                      # Track Discard for Signaling History
-                      if player_pos not in self.discards: self.discards[player_pos] = []
-                      self.discards[player_pos].append({
-                          'rank': rank,
-                          'suit': suit,
-                          'trick_idx': history.index(trick)
-                      })
-                      
-                      # PROOF-BASED QAYD: Record suspected crime
-                      # The crime card is what they played (wrong suit)
-                      # The void_suit is the suit they claimed not to have
-                      self.record_suspected_crime(
-                          player_pos=player_pos,
-                          trick_idx=history.index(trick),
-                          crime_card={'rank': rank, 'suit': suit},
-                          void_suit=led_suit
-                      )
-                      
-                      if mode == 'HOKUM' and led_suit != trump and suit != trump:
-                           self.mark_void(player_pos, trump)
-                           logger.info(f"[MEMORY] Inferring VOID: Player {player_pos} has no {trump} (Failed to cut {led_suit})")
-
-        # BAYESIAN UPDATE: Build probabilistic suit distributions
-        self._update_bayesian_probabilities(game_state)
+        # Current trick: cards are played, voids are inferred once it completes
+        for tc in game_state.get('tableCards', []):
+             c = tc['card']
+             self.observe_play(tc.get('playedBy'), c['rank'], c['suit'])
 
     def mark_void(self, player_ref, suit):
         # player_ref can be int index or string position
@@ -205,32 +229,29 @@ class CardMemory:
 
     # ========= BAYESIAN VOID TRACKING =========
 
-    def _update_bayesian_probabilities(self, game_state):
+    def _refresh_probabilities(self):
         """
         Build probabilistic suit distributions for each player.
         Uses remaining cards + known voids to estimate likely holdings.
+        Constant work (4 players x 4 suits), so it runs after every event.
         """
         positions = ['Bottom', 'Right', 'Top', 'Left']
-        tricks_history = game_state.get('currentRoundTricks', [])
-        table_cards = game_state.get('tableCards', [])
-        total_tricks = len(tricks_history)
 
         # Count remaining cards per player
         for pos in positions:
-            cards_left = 8 - total_tricks
+            cards_left = 8 - self.tricks_done
             # Subtract cards played in current trick
-            for tc in table_cards:
-                if tc.get('playedBy') == pos:
+            for player_pos, _, _ in self.pending_plays:
+                if player_pos == pos:
                     cards_left -= 1
             self.cards_remaining[pos] = max(0, cards_left)
 
         # Count remaining unplayed cards per suit
-        remaining_per_suit = {}
-        for s in SUITS:
-            remaining_per_suit[s] = len(self.get_remaining_in_suit(s))
+        remaining_per_suit = self._unplayed_per_suit
 
         total_remaining = sum(remaining_per_suit.values())
         if total_remaining == 0:
+            self.suit_probability = {}
             return
 
         # Calculate probabilities for each player
@@ -1,39 +1,34 @@
-
-import torch
 import logging
+import numpy as np
 from pathlib import Path
-from ai_worker.learning.mind_reader import MindReaderNet
+from ai_worker.learning.inference import load_session
 from ai_worker.learning.mind_utils import MindVocab
-import os
 
 logger = logging.getLogger(__name__)
 
+
+def _build_mind_reader():
+    # Torch backend only: keeps torch out of the import path under ONNX Runtime
+    from ai_worker.learning.mind_reader import MindReaderNet
+    return MindReaderNet()
+
+
 class MindClient:
     _instance = None
     
-    def __init__(self, model_path=None):
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        
-        # Load Model
-        self.model = MindReaderNet().to(self.device)
-        
+    def __init__(self, model_path=None, backend=None):
         if model_path is None:
             # Default location
             base = Path(__file__).parent
             model_path = base / "models" / "mind_reader_v1.pth"
-            
-        try:
-            if os.path.exists(model_path):
-                self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-                self.model.eval()
-                self.active = True
-                logger.info(f"MindReader loaded from {model_path} on {self.device}")
-            else:
-                logger.warning(f"MindReader model not found at {model_path}. Inference disabled.")
-                self.active = False
-        except Exception as e:
-            logger.error(f"Failed to load MindReader: {e}")
-            self.active = False
+
+        # Shared per-process inference session (ONNX Runtime or torch), see learning.inference
+        self.session = load_session(str(model_path), _build_mind_reader, backend=backend)
+        self.active = self.session is not None
+        if self.active:
+            logger.info(f"MindReader loaded from {model_path} ({self.session.backend})")
+        else:
+            logger.warning(f"MindReader model not found at {model_path}. Inference disabled.")
             
     def _vectorize_history(self, game_state, perspective_idx=0):
         """
@@ -91,7 +86,7 @@ class MindClient:
              t = MindVocab.get_card_token(c_str)
              if t: tokens.append(t)
                 
-        return torch.tensor(tokens, dtype=torch.long).unsqueeze(0).to(self.device)
+        return np.array([tokens], dtype=np.int64)
 
     def _card_to_str(self, c_dict):
         # Helper to convert {'suit': 'H', 'rank': 'A'} to 'HA'
@@ -114,27 +109,23 @@ class MindClient:
             # Prepare Input
             x = self._vectorize_history(game_history, 0) # Perspective 0 for now
             
-            with torch.no_grad():
-                # pred_l (Left), pred_p (Partner), pred_r (Right) relative to Perspective 0
-                # Our Model outputs: [Batch, 32] logits
-                # output is (out_left, out_partner, out_right) - Tuple of tensors
-                # Wait, training collate masked it?
-                # Actually model returns: out_left, out_partner, out_right
-                
-                out_l, out_p, out_r = self.model(x)
-                
-                # Sigmoid for probabilities
-                prob_l = torch.sigmoid(out_l).squeeze(0).cpu().numpy()
-                prob_p = torch.sigmoid(out_p).squeeze(0).cpu().numpy()
-                prob_r = torch.sigmoid(out_r).squeeze(0).cpu().numpy()
-                
-                # Map to Absolute Players (assuming P0 is viewpoint)
-                # Right = 1, Partner = 2, Left = 3
-                return {
-                    1: prob_r,
-                    2: prob_p,
-                    3: prob_l
-                }
+            # pred_l (Left), pred_p (Partner), pred_r (Right) relative to Perspective 0
+            # Our Model outputs: [Batch, 32] logits
+            # Actually model returns: out_left, out_partner, out_right
+            out_l, out_p, out_r = self.session.run(x)
+
+            # Sigmoid for probabilities
+            prob_l = 1.0 / (1.0 + np.exp(-out_l[0]))
+            prob_p = 1.0 / (1.0 + np.exp(-out_p[0]))
+            prob_r = 1.0 / (1.0 + np.exp(-out_r[0]))
+
+            # Map to Absolute Players (assuming P0 is viewpoint)
+            # Right = 1, Partner = 2, Left = 3
+            return {
+                1: prob_r,
+                2: prob_p,
+                3: prob_l
+            }
                 
         except Exception as e:
             logger.error(f"MindReader Inference Error: {e}")
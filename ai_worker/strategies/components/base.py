@@ -175,7 +175,8 @@ class StrategyComponent(ABC):
     def _try_endgame(self, ctx: BotContext) -> dict | None:
         """Attempt minimax solve using ML or heuristic hand reconstruction.
 
-        Shared by both HokumStrategy and SunStrategy for endgame positions (<=3 cards).
+        Shared by HokumStrategy, SunStrategy and PlayingStrategy.get_endgame_decision
+        for endgame positions (<= ENDGAME_MAX_CARDS cards).
         """
         try:
             from ai_worker.strategies.components.endgame_solver import solve_endgame
@@ -190,6 +191,7 @@ class StrategyComponent(ABC):
                 leader_position=leader,
                 mode=ctx.mode or 'SUN',
                 trump_suit=ctx.trump,
+                table_cards=ctx.table_cards,
             )
             if result and result.get('reasoning', '').startswith('Minimax'):
                 return {"action": "PLAY", "cardIndex": result['cardIndex'],
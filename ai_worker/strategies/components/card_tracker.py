@@ -59,13 +59,19 @@ class CardTracker:
             return
         led_suit = trick[0]["card"]["suit"]
         for entry in trick:
-            card = SimpleCard(entry["card"]["rank"], entry["card"]["suit"])
-            self._played.add(card)
-            if (
-                entry["playedBy"] != self._my_position
-                and card.suit != led_suit
-            ):
-                self._void[led_suit].add(entry["playedBy"])
+            self.observe_play(
+                entry["playedBy"], entry["card"]["rank"], entry["card"]["suit"], led_suit
+            )
+
+    def observe_play(self, played_by: str, rank: str, suit: str, led_suit: str) -> None:
+        """Record one card landing on a trick led in *led_suit* (O(1))."""
+        self._played.add(SimpleCard(rank, suit))
+        if played_by != self._my_position and suit != led_suit:
+            self._void[led_suit].add(played_by)
+
+    def set_hand(self, my_hand: list) -> None:
+        """Replace the cards I hold (a persistent tracker outlives one turn's hand)."""
+        self._hand = {SimpleCard(c.rank, c.suit) for c in my_hand}
 
     @property
     def _unseen(self) -> set[SimpleCard]:
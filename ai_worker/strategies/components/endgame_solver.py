@@ -1,122 +1,353 @@
-"""Endgame solver for Baloot AI (≤3 cards per player).
+"""Double-dummy endgame solver for Baloot AI (≤5 cards per player).
 
-With so few cards remaining the game tree is tiny (≤12 plies), making
-exhaustive minimax with alpha-beta pruning both feasible and provably
-optimal.  Called when each player holds 1–3 cards.
+Exact minimax over the last tricks with every hand known (the caller
+supplies a reconstruction of the hidden ones). Works on 32-bit card masks
+(``ai_worker.mcts.bitboard``), with the game's real rules: following suit,
+HOKUM trump / over-trump obligations, trump point values and the 10-point
+last-trick bonus.
+
+- Positions at the start of a trick are memoised exactly:
+  (hands, leader) -> points the Bottom/Top team takes from there on.
+- Inside a trick, alpha-beta with killer-move and master-first ordering.
+- Partition search: cards of one hand that are adjacent among the cards
+  still in play and score the same are interchangeable, so only one of
+  them is searched.
 """
 from __future__ import annotations
 
-POSITIONS = ["Bottom", "Right", "Top", "Left"]
-TEAMS = {"Bottom": 0, "Top": 0, "Right": 1, "Left": 1}
-from ai_worker.strategies.constants import (
-    ORDER_SUN, ORDER_HOKUM, PTS_SUN_FULL as PTS_SUN, PTS_HOKUM_FULL as PTS_HOKUM,
+import os
+
+from ai_worker.mcts.bitboard import (
+    BIT, SUN_POS, HOKUM_POS, ABOVE8, ORD_SUN, ORD_HOKUM,
+    card_id, get_tables, legal_mask, popcount,
 )
-_nxt = lambda p: POSITIONS[(POSITIONS.index(p) + 1) % 4]
-_pts = lambda r, m: (PTS_HOKUM if m == "HOKUM" else PTS_SUN)[r]
 
+POSITIONS = ["Bottom", "Right", "Top", "Left"]
+TEAMS = {"Bottom": 0, "Top": 0, "Right": 1, "Left": 1}
+SEAT = {p: i for i, p in enumerate(POSITIONS)}
 
-def _strength(rank: str, suit: str, led: str, mode: str, trump: str | None) -> int:
-    """Sortable trick-strength of a card."""
-    if mode == "HOKUM" and trump and suit == trump:
-        return 100 + ORDER_HOKUM.index(rank)
-    if suit != led:
-        return -1
-    return (ORDER_HOKUM if mode == "HOKUM" else ORDER_SUN).index(rank)
+ENDGAME_MAX_CARDS = int(os.environ.get('BALOOT_ENDGAME_MAX_CARDS', '5'))
+MEMO_LIMIT = int(os.environ.get('BALOOT_ENDGAME_MEMO', '200000'))  # Entries per solver
+LAST_TRICK_BONUS = 10
+_INF = 1 << 20
+_UNBOUNDED = (-_INF, _INF)
 
 
 def resolve_trick(
     cards_played: list[tuple[str, object]], mode: str, trump_suit: str | None,
 ) -> str:
     """Determine which position wins a completed 4-card trick."""
-    led = cards_played[0][1].suit
-    return max(cards_played,
-               key=lambda t: _strength(t[1].rank, t[1].suit, led, mode, trump_suit))[0]
-
-
-def _legal(hand: list, led_suit: str | None) -> list[int]:
-    """Indices of legally playable cards (must follow suit if able)."""
-    if led_suit:
-        follow = [i for i, c in enumerate(hand) if c.suit == led_suit]
-        if follow:
-            return follow
-    return list(range(len(hand)))
-
-
-def _finish(hands, trick, scores, mode, trump, my_team, a, b, forced):
-    """Score a completed trick, then recurse or return terminal value."""
-    winner = resolve_trick(trick, mode, trump)
-    ns = list(scores)
-    ns[TEAMS[winner]] += sum(_pts(c.rank, mode) for _, c in trick)
-    if all(len(h) == 0 for h in hands.values()):
-        return ns[my_team] - ns[1 - my_team]
-    return _mm(hands, winner, [], ns, mode, trump, my_team, a, b, forced=None)
-
-
-def _mm(hands, cur, trick, scores, mode, trump, my_team, a, b, forced) -> int:
-    """Minimax with alpha-beta.  *forced*: optional (pos, idx) constraint
-    that locks one player's move for the current trick only."""
-    led = trick[0][1].suit if trick else None
-    hand = hands[cur]
-    if not hand and not trick:
-        return scores[my_team] - scores[1 - my_team]
-    if not hand:
-        return (_finish(hands, trick, scores, mode, trump, my_team, a, b, forced)
-                if len(trick) == 4
-                else _mm(hands, _nxt(cur), trick, scores, mode, trump, my_team, a, b, forced))
-
-    # Determine legal indices; override if this position is forced
-    if forced and forced[0] == cur:
-        indices = [forced[1]]
-    else:
-        indices = _legal(hand, led)
-
-    maximizing = TEAMS[cur] == my_team
-    best = -9999 if maximizing else 9999
-    for i in indices:
-        card = hand[i]
-        nh = {p: ([c for j, c in enumerate(h) if j != i] if p == cur else list(h))
-              for p, h in hands.items()}
-        nt = trick + [(cur, card)]
-        val = (_finish(nh, nt, scores, mode, trump, my_team, a, b, forced)
-               if len(nt) == 4
-               else _mm(nh, _nxt(cur), nt, scores, mode, trump, my_team, a, b, forced))
-        if maximizing:
-            best = max(best, val); a = max(a, val)
+    tables = get_tables(mode, trump_suit)
+    strength = tables.strength[card_id(cards_played[0][1]) >> 3]
+    return max(cards_played, key=lambda t: strength[card_id(t[1])])[0]
+
+
+class DoubleDummySolver:
+    """Exact endgame values for one (mode, trump); the memo is reused across calls."""
+
+    def __init__(self, mode: str, trump_suit: str | None = None, memo_limit: int = MEMO_LIMIT):
+        self.tables = tb = get_tables(mode, trump_suit)
+        self.memo_limit = memo_limit
+        self.memo = {}     # (h0, h1, h2, h3, leader) -> (lower, upper) team-0 points from this trick on
+        self.killers = {}  # cards left -> card that last caused a cutoff
+        self.nodes = 0
+        # Per suit: ranks weakest -> strongest, and the ordering for "above" masks
+        self._order = tuple(
+            tuple(sorted(range(8), key=(HOKUM_POS if tb.hokum and s == tb.trump else SUN_POS).__getitem__))
+            for s in range(4))
+        self._ord = tuple(ORD_HOKUM if tb.hokum and s == tb.trump else ORD_SUN for s in range(4))
+        self._reps = {}    # (suit, legal bits, live bits) -> representative ranks
+        self._cands = {}   # (legal, live) -> ordered candidate cards
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def value(self, hands, leader: int, trick=()) -> int:
+        """
+        Points the Bottom/Top team (seats 0 and 2) takes from here to the end
+        of the round, trick cards and last-trick bonus included, with perfect
+        play by everyone. ``hands`` are 4 card masks, ``trick`` the current
+        trick as (seat, card id) pairs led by ``leader``.
+        """
+        hands, trick = self._check(hands, leader, trick)
+        if not trick:
+            return self._solve(hands, leader)
+        live, depth = self._live(hands, trick)
+        return self._search(hands, trick, leader, live, depth, -_INF, _INF, None)
+
+    def move_values(self, hands, leader: int, trick=()) -> dict[int, int]:
+        """Exact team-0 value of every legal card of the seat to move (card id -> value)."""
+        hands, trick = self._check(hands, leader, trick)
+        seat = (leader + len(trick)) & 3
+        legal = legal_mask(self.tables, hands[seat], trick)
+        live, depth = self._live(hands, trick)
+        out = {}
+        for cid in self._candidates(legal, live):
+            v = self._play(hands, trick, leader, live, depth, seat, cid, -_INF, _INF, None)
+            for twin in self._equivalents(cid, legal, live):
+                out[twin] = v
+        return out
+
+    def forced_value(self, hands, leader: int, seat: int, cid: int) -> int:
+        """Team-0 value when ``seat`` plays ``cid`` in the coming trick, whatever is led."""
+        hands, trick = self._check(hands, leader, ())
+        live, depth = self._live(hands, trick)
+        return self._search(hands, trick, leader, live, depth, -_INF, _INF, (seat, cid))
+
+    def total_points(self, hands, trick=()) -> int:
+        """All points still to be won: cards in hand and on the table plus the last-trick bonus."""
+        pts = self.tables.points
+        total = sum(pts[c] for _, c in trick) + LAST_TRICK_BONUS
+        for h in hands:
+            while h:
+                low = h & -h
+                total += pts[low.bit_length() - 1]
+                h ^= low
+        return total
+
+    # ── Search ───────────────────────────────────────────────────────
+
+    def _check(self, hands, leader, trick):
+        hands, trick = tuple(hands), tuple(trick)
+        if len(hands) != 4 or len(trick) > 3:
+            raise ValueError("need 4 hands and at most 3 cards on the table")
+        played = {(leader + i) & 3 for i in range(len(trick))}
+        sizes = {popcount(h) + (1 if s in played else 0) for s, h in enumerate(hands)}
+        if len(sizes) != 1 or 0 in sizes:
+            raise ValueError(f"inconsistent hand sizes for a trick of {len(trick)}")
+        if len(self.memo) > self.memo_limit:
+            self.reset()
+        return hands, trick
+
+    def reset(self):
+        """Drops the position memo (move-generation caches are position-independent)."""
+        self.memo.clear()
+        self.killers.clear()
+        if len(self._cands) > self.memo_limit:
+            self._cands.clear()
+
+    def _solve(self, hands, leader, alpha=-_INF, beta=_INF):
+        """Trick-start value, memoised as bounds: exact unless a window cut the search short."""
+        key = hands + (leader,)
+        lo, hi = self.memo.get(key, _UNBOUNDED)
+        if lo == hi or lo >= beta:
+            return lo
+        if hi <= alpha:
+            return hi
+        a, b = max(alpha, lo), min(beta, hi)
+        live = hands[0] | hands[1] | hands[2] | hands[3]
+        v = self._search(hands, (), leader, live, popcount(live), a, b, None)
+        if v <= a:
+            hi = v
+        elif v >= b:
+            lo = v
         else:
-            best = min(best, val); b = min(b, val)
-        if b <= a:
-            break
-    return best
+            lo = hi = v
+        self.memo[key] = (lo, hi)
+        return v
+
+    def _search(self, hands, trick, leader, live, depth, alpha, beta, forced):
+        """Fail-soft alpha-beta inside a trick; ``live`` = cards in hands or on the table, ``depth`` = cards in hands."""
+        self.nodes += 1
+        seat = (leader + len(trick)) & 3
+        if forced is not None and forced[0] == seat:
+            moves = (forced[1],)
+        else:
+            moves = self._candidates(legal_mask(self.tables, hands[seat], trick), live)
+            killer = self.killers.get(depth)
+            if killer in moves and moves[0] != killer:
+                moves = (killer,) + tuple(m for m in moves if m != killer)
+
+        maximizing = seat & 1 == 0
+        best = -_INF if maximizing else _INF
+        for cid in moves:
+            v = self._play(hands, trick, leader, live, depth, seat, cid, alpha, beta, forced)
+            if maximizing:
+                if v > best:
+                    best = v
+                    if v > alpha:
+                        alpha = v
+            elif v < best:
+                best = v
+                if v < beta:
+                    beta = v
+            if beta <= alpha:
+                self.killers[depth] = cid
+                break
+        return best
+
+    def _play(self, hands, trick, leader, live, depth, seat, cid, alpha, beta, forced):
+        nh = list(hands)
+        nh[seat] &= ~BIT[cid]
+        nh = tuple(nh)
+        nt = trick + ((seat, cid),)
+        if len(nt) < 4:
+            return self._search(nh, nt, leader, live, depth - 1, alpha, beta, forced)
+
+        tb = self.tables
+        strength = tb.strength[nt[0][1] >> 3]
+        points = tb.points
+        best_s, winner, pts = -2, leader, 0
+        for s, c in nt:
+            pts += points[c]
+            if strength[c] > best_s:
+                best_s, winner = strength[c], s
+        if not (nh[0] | nh[1] | nh[2] | nh[3]):
+            pts += LAST_TRICK_BONUS
+            return pts if winner & 1 == 0 else 0
+        if winner & 1:
+            return self._solve(nh, winner, alpha, beta)
+        return self._solve(nh, winner, alpha - pts, beta - pts) + pts
+
+    # ── Move generation ──────────────────────────────────────────────
+
+    @staticmethod
+    def _live(hands, trick):
+        """(cards in hands or on the table, cards in hands)."""
+        held = hands[0] | hands[1] | hands[2] | hands[3]
+        live = held
+        for _, c in trick:
+            live |= BIT[c]
+        return live, popcount(held)
+
+    def _candidates(self, legal, live):
+        """One card per equivalence class, masters then high points first."""
+        key = (legal, live)
+        cands = self._cands.get(key)
+        if cands is None:
+            cands = self._cands[key] = self._order_candidates(legal, live)
+        return cands
+
+    def _order_candidates(self, legal, live):
+        points = self.tables.points
+        scored = []
+        for s in range(4):
+            bits = (legal >> (8 * s)) & 0xFF
+            if not bits:
+                continue
+            live_s = (live >> (8 * s)) & 0xFF
+            above = ABOVE8[self._ord[s]]
+            for r in self._representatives(s, bits, live_s):
+                cid = 8 * s + r
+                master = 0 if above[r] & live_s else 1
+                scored.append((master, points[cid], cid))
+        scored.sort(reverse=True)
+        return tuple(c for _, _, c in scored)
+
+    def _representatives(self, s, bits, live_s):
+        key = (s, bits, live_s)
+        reps = self._reps.get(key)
+        if reps is None:
+            points = self.tables.points
+            reps, prev = [], None  # prev: points of the last kept card if it is adjacent
+            for r in self._order[s]:
+                if not live_s >> r & 1:
+                    continue
+                if bits >> r & 1:
+                    p = points[8 * s + r]
+                    if prev != p:
+                        reps.append(r)
+                    prev = p
+                else:
+                    prev = None
+            reps = self._reps[key] = tuple(reps)
+        return reps
+
+    def _equivalents(self, cid, legal, live):
+        """``cid`` and the legal cards partition search folded into it."""
+        s = cid >> 3
+        live_s = (live >> (8 * s)) & 0xFF
+        bits = (legal >> (8 * s)) & 0xFF
+        points = self.tables.points
+        run, prev = [], None  # Same walk as _representatives
+        for r in self._order[s]:
+            if not live_s >> r & 1:
+                continue
+            if not bits >> r & 1:
+                if cid in run:
+                    break
+                run, prev = [], None
+                continue
+            p = points[8 * s + r]
+            if prev != p:
+                if cid in run:
+                    break
+                run = []
+            run.append(8 * s + r)
+            prev = p
+        return run if cid in run else [cid]
+
+
+_solvers: dict[tuple, DoubleDummySolver] = {}
+
+
+def get_solver(mode: str, trump_suit: str | None = None) -> DoubleDummySolver:
+    """Shared solver (and memo) per (mode, trump)."""
+    key = (mode == 'SUN', None if mode == 'SUN' else trump_suit)
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = _solvers[key] = DoubleDummySolver(mode, trump_suit)
+    return solver
 
 
 def solve_endgame(
     my_hand: list, known_hands: dict[str, list], my_position: str,
     leader_position: str, mode: str, trump_suit: str | None = None,
+    table_cards: list | None = None,
 ) -> dict:
-    """Find the optimal play via exhaustive minimax search.
+    """Find the optimal play via exhaustive double-dummy search.
+
+    ``table_cards`` ({'card', 'playedBy'} dicts) is the trick in progress;
+    without it and with someone else on lead, each of our cards is scored
+    as if forced in the coming trick.
 
-    Returns ``{'cardIndex': int, 'expected_points': int, 'reasoning': str}``.
+    Returns ``{'cardIndex': int, 'expected_points': int, 'reasoning': str}``;
+    expected_points is our team's point lead over the rest of the round.
     Falls back to lowest-value heuristic when opponent hands are unknown.
     """
-    my_team = TEAMS[my_position]
-    hands: dict[str, list] = {my_position: list(my_hand)}
+    tables = get_tables(mode, trump_suit)
+    my_seat = SEAT[my_position]
+    hands = [0, 0, 0, 0]
+    hands[my_seat] = sum(BIT[c] for c in map(card_id, my_hand) if c >= 0)
     for p in POSITIONS:
         if p != my_position:
-            hands[p] = list(known_hands.get(p, []))
-    # Graceful fallback for incomplete information
-    if any(len(hands[p]) == 0 for p in POSITIONS if p != my_position):
-        idx = min(range(len(my_hand)), key=lambda i: _pts(my_hand[i].rank, mode))
+            hands[SEAT[p]] = sum(BIT[c] for c in map(card_id, known_hands.get(p, [])) if c >= 0)
+    trick = []
+    for tc in table_cards or []:
+        cid = card_id(tc.get('card') if isinstance(tc, dict) else tc)
+        if cid >= 0 and tc.get('playedBy') in SEAT:
+            trick.append((SEAT[tc['playedBy']], cid))
+    leader = trick[0][0] if trick else SEAT[leader_position]
+
+    def _fallback(why):
+        idx = min(range(len(my_hand)), key=lambda i: tables.points[card_id(my_hand[i])])
         return {"cardIndex": idx, "expected_points": 0,
-                "reasoning": "Incomplete info — heuristic lowest-value discard"}
-    # Evaluate each legal card by forcing our choice inside full minimax
-    best_idx, best_val = 0, -9999
-    led = None  # we may or may not be leading; _legal handles both
-    for i in _legal(my_hand, led):
-        forced = (my_position, i)
-        val = _mm(hands, leader_position, [], [0, 0], mode, trump_suit,
-                  my_team, -9999, 9999, forced)
-        if val > best_val:
-            best_val, best_idx = val, i
-    n = len(my_hand)
+                "reasoning": f"{why} — heuristic lowest-value discard"}
+
+    # Graceful fallback for incomplete information
+    if any(hands[SEAT[p]] == 0 for p in POSITIONS if p != my_position):
+        return _fallback("Incomplete info")
+
+    solver = get_solver(mode, trump_suit)
+    try:
+        if trick or leader == my_seat:
+            if (leader + len(trick)) & 3 != my_seat:
+                return _fallback("Not our turn")
+            values = solver.move_values(hands, leader, trick)
+        else:
+            values = {card_id(c): solver.forced_value(hands, leader, my_seat, card_id(c)) for c in my_hand}
+    except ValueError:
+        return _fallback("Inconsistent hands")
+
+    total = solver.total_points(hands, trick)
+    sign = 1 if my_seat & 1 == 0 else -1
+    best_idx, best_val = 0, -_INF
+    for i, c in enumerate(my_hand):
+        v0 = values.get(card_id(c))
+        if v0 is None:
+            continue
+        diff = sign * (2 * v0 - total)
+        if diff > best_val:
+            best_val, best_idx = diff, i
+    plies = sum(popcount(h) for h in hands)
     return {"cardIndex": best_idx, "expected_points": best_val,
-            "reasoning": f"Minimax depth-{n * 4}: diff={best_val:+d}"}
+            "reasoning": f"Minimax depth-{plies}: diff={best_val:+d}"}
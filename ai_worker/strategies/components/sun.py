@@ -4,6 +4,7 @@ Lead logic stays here; follow logic in sun_follow.py,
 defensive lead + signals in sun_defense.py.
 """
 from ai_worker.strategies.components.base import StrategyComponent
+from ai_worker.strategies.components.endgame_solver import ENDGAME_MAX_CARDS
 from ai_worker.bot_context import BotContext
 from ai_worker.strategies.components.signaling import (
     get_role, should_attempt_kaboot, should_break_kaboot,
@@ -29,8 +30,8 @@ class SunStrategy(StrategyComponent):
     def get_decision(self, ctx: BotContext) -> dict | None:
         partner_pos = self.get_partner_pos(ctx.player_index)
 
-        # ENDGAME SOLVER: Perfect play when ≤3 cards remain
-        if len(ctx.hand) <= 3:
+        # ENDGAME SOLVER: Perfect play when ≤ENDGAME_MAX_CARDS cards remain
+        if len(ctx.hand) <= ENDGAME_MAX_CARDS:
             endgame = self._try_endgame(ctx)
             if endgame:
                 return endgame
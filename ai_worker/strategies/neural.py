@@ -1,35 +1,39 @@
-
 import logging
+import math
 import random
-import torch
 import os
+import numpy as np
 from ai_worker.bot_context import BotContext
-from ai_worker.learning.model import StrategyNet
 from ai_worker.learning.feature_extractor import FeatureExtractor
+from ai_worker.learning.inference import load_session
 
 logger = logging.getLogger(__name__)
 
+
+def _build_strategy_net():
+    # Torch backend only: keeps torch out of the import path under ONNX Runtime
+    from ai_worker.learning.model import StrategyNet
+    return StrategyNet()
+
+
 class NeuralStrategy:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, backend=None, session=None):
         self.extractor = FeatureExtractor()
-        self.model = StrategyNet()
-        self.device = torch.device("cpu") # Inference on CPU is fine/safer for now
-        self.model.to(self.device)
-        self.model.eval()
-        self.enabled = False
-        
-        # Load Model if exists
-        if model_path and os.path.exists(model_path):
-            try:
-                self.model.load(model_path)
-                self.enabled = True
-                logger.info(f"Neural Strategy Loaded: {model_path}")
-            except Exception as e:
-                logger.error(f"Failed to load Neural Model: {e}")
-                self.enabled = False
+        # Shared per-process inference session (ONNX Runtime or torch), see learning.inference
+        self.session = session
+        if self.session is None and model_path:
+            self.session = load_session(model_path, _build_strategy_net, backend=backend)
+        self.enabled = self.session is not None
+
+        if self.enabled:
+            logger.info(f"Neural Strategy Loaded: {model_path} ({self.session.backend})")
         else:
              logger.warning(f"Neural Model not found at {model_path}. Strategy Disabled.")
 
+    def _logits(self, vectors) -> np.ndarray:
+        """[K, 138] features -> [K, 32] logits through the shared session."""
+        return self.session.run(np.asarray(vectors, dtype=np.float32))[0]
+
     def get_decision(self, ctx: BotContext) -> dict:
         if not self.enabled:
              return None
@@ -38,12 +42,10 @@ class NeuralStrategy:
             # 1. Encode State
             # Pass legal moves mask? The net output is 32 cards.
             # We can mask output instead of input for now.
-            vec = self.extractor.encode(ctx)
-            tensor_in = torch.tensor(vec, dtype=torch.float32).unsqueeze(0).to(self.device)
+            vecs = self.extractor.encode_batch([ctx])
             
             # 2. Inference
-            with torch.no_grad():
-                logits = self.model(tensor_in).squeeze(0) # [32]
+            logits = self._logits(vecs)[0] # [32]
                 
             # 3. Mask Illegal Moves
             legal_indices = ctx.get_legal_moves()
@@ -58,7 +60,7 @@ class NeuralStrategy:
             legal_map = {} # deck_idx -> hand_idx
             
             # Start with -Inf for all
-            masked_logits = torch.full_like(logits, -1e9)
+            masked_logits = np.full_like(logits, -1e9)
             
             for hand_idx in legal_indices:
                  card = ctx.hand[hand_idx]
@@ -68,13 +70,13 @@ class NeuralStrategy:
                       legal_map[deck_idx] = hand_idx
             
             # 4. Select Best
-            best_deck_idx = torch.argmax(masked_logits).item()
+            best_deck_idx = int(np.argmax(masked_logits))
             
             if best_deck_idx in legal_map:
                  best_hand_idx = legal_map[best_deck_idx]
                  
                  # Debug Score
-                 score = logits[best_deck_idx].item()
+                 score = float(logits[best_deck_idx])
                  
                  return {
                      "action": "PLAY",
@@ -111,14 +113,11 @@ class NeuralStrategy:
             if not legal_indices: return {}
 
             if is_fast:
-                 vec = self.extractor.encode_fast(ctx_or_game, legal_indices)
+                 vecs = self.extractor.encode_fast_batch([ctx_or_game])
             else:
-                 vec = self.extractor.encode(ctx_or_game, legal_indices)
+                 vecs = self.extractor.encode_batch([ctx_or_game], [legal_indices])
                  
-            tensor_in = torch.tensor(vec, dtype=torch.float32).unsqueeze(0).to(self.device)
-            
-            with torch.no_grad():
-                logits = self.model(tensor_in).squeeze(0) # [32]
+            logits = self._logits(vecs)[0] # [32]
 
             # 2. Mask Illegal Moves (Indices)
             # Map Hand Indices to Deck Indices for Logit Lookup
@@ -141,18 +140,19 @@ class NeuralStrategy:
                  if deck_idx != -1:
                       masked_logits.append(logits[deck_idx])
                  else:
-                      masked_logits.append(torch.tensor(-10.0))
+                      masked_logits.append(-10.0)
 
             if not masked_logits: return {}
 
             # 3. Softmax
-            masked_logits_tensor = torch.stack(masked_logits)
-            probs = torch.nn.functional.softmax(masked_logits_tensor, dim=0)
+            masked = np.array(masked_logits, dtype=np.float64)
+            exps = np.exp(masked - masked.max())
+            probs = exps / exps.sum()
             
             # 4. Build Result
             policy = {}
             for i, hand_idx in enumerate(legal_indices):
-                 policy[hand_idx] = probs[i].item()
+                 policy[hand_idx] = float(probs[i])
                  
             return policy
 
@@ -162,3 +162,36 @@ class NeuralStrategy:
             legal = ctx_or_game.get_legal_moves()
             if not legal: return {}
             return {idx: 1.0/len(legal) for idx in legal}
+
+    def predict_policy_batch(self, games) -> list:
+        """
+        predict_policy for K FastGames with one forward pass.
+        Returns one {hand_index: probability} dict per game, in order.
+        """
+        legal_lists = [g.get_legal_moves() for g in games]
+        if not self.enabled:
+            return [{idx: 1.0 / len(legal) for idx in legal} if legal else {} for legal in legal_lists]
+
+        try:
+            logits = self._logits(self.extractor.encode_fast_batch(games))  # [K, 32]
+
+            policies = []
+            for row, (game, legal) in enumerate(zip(games, legal_lists)):
+                if not legal:
+                    policies.append({})
+                    continue
+                hand = game.hands[game.current_turn]
+                legal_logits = []
+                for hand_idx in legal:
+                    deck_idx = self.extractor._get_card_index(hand[hand_idx])
+                    legal_logits.append(logits[row, deck_idx] if deck_idx != -1 else -10.0)
+                # Softmax over the legal moves only
+                top = max(legal_logits)
+                exps = [math.exp(x - top) for x in legal_logits]
+                total = sum(exps)
+                policies.append({hand_idx: e / total for hand_idx, e in zip(legal, exps)})
+            return policies
+
+        except Exception as e:
+            logger.error(f"Neural Batch Policy Prediction Failed: {e}")
+            return [{idx: 1.0 / len(legal) for idx in legal} if legal else {} for legal in legal_lists]
@@ -3,6 +3,11 @@ from ai_worker.cognitive import CognitiveOptimizer
 from ai_worker.strategies.components.sun import SunStrategy
 from ai_worker.strategies.components.hokum import HokumStrategy
 from ai_worker.strategies.components.projects import ProjectStrategy
+from ai_worker.strategies.components.endgame_solver import ENDGAME_MAX_CARDS
+from server.metrics import metrics
+
+MCTS_STAGE = metrics.histogram('baloot_bot_stage_seconds', stage='mcts')
+HEURISTICS_STAGE = metrics.histogram('baloot_bot_stage_seconds', stage='heuristics')
 
 
 class PlayingStrategy:
@@ -32,11 +37,17 @@ class PlayingStrategy:
 
         # --- COGNITIVE ENGINE (Oracle) ---
         if getattr(ctx, 'use_mcts', True):
-            oracle_decision = self.cognitive.get_decision(ctx)
+            with metrics.timing(MCTS_STAGE):
+                oracle_decision = self.cognitive.get_decision(ctx)
             if oracle_decision:
                 return oracle_decision
 
         # --- STANDARD HEURISTICS ---
+        with metrics.timing(HEURISTICS_STAGE):
+            return self._heuristic_decision(ctx)
+
+    def _heuristic_decision(self, ctx: BotContext) -> dict:
+        """Endgame solver, then the SUN/HOKUM rules, with projects and the legality guardrail."""
         # 0. Endgame Solver
         endgame_move = self.get_endgame_decision(ctx)
         if endgame_move:
@@ -85,11 +96,20 @@ class PlayingStrategy:
         if hand_size == 1:
             return {"action": "PLAY", "cardIndex": 0, "reasoning": "Endgame: Last Card"}
         
-        # Only activate for endgame (≤3 cards)
+        if hand_size > ENDGAME_MAX_CARDS:
+            return None
+
+        # 2. EXACT SOLVE: Double-dummy over reconstructed hands
+        logic = self.hokum_logic if ctx.mode == 'HOKUM' else self.sun_logic
+        solved = logic._try_endgame(ctx)
+        if solved:
+            return solved
+
+        # Heuristics below only for the last 3 tricks
         if hand_size > 3:
             return None
         
-        # 2. ALL MASTERS: If every card is a master, lead highest-value first
+        # 3. ALL MASTERS: If every card is a master, lead highest-value first
         all_masters = all(ctx.is_master_card(c) for c in ctx.hand)
         if all_masters and not ctx.table_cards:
             # Leading — play highest point value master first to extract max points
@@ -105,7 +125,7 @@ class PlayingStrategy:
                     best_idx = i
             return {"action": "PLAY", "cardIndex": best_idx, "reasoning": "Endgame: Cashing Masters (Highest Value)"}
         
-        # 3. HOKUM ENDGAME: If we hold all remaining trumps + side masters,
+        # 4. HOKUM ENDGAME: If we hold all remaining trumps + side masters,
         #    lead trumps first to clear, then cash side masters
         if ctx.mode == 'HOKUM' and not ctx.table_cards:
             trump = ctx.trump
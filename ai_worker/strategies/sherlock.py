@@ -4,8 +4,10 @@ from typing import Dict, Any, Optional, Set, Tuple
 
 # Use the centralized ForensicScanner logic
 from ai_worker.strategies.components.forensics import ForensicScanner
+from server.logging_utils import get_category_logger
 
 logger = logging.getLogger(__name__)
+sherlock_log = get_category_logger('sherlock')
 
 class ForensicAdapter:
     """
@@ -52,10 +54,8 @@ class SherlockStrategy:
         """
         Main entry point.
         """
-        import datetime
         def _slog(msg):
-            with open('logs/sherlock_debug.log', 'a', encoding='utf-8') as f:
-                f.write(f"{datetime.datetime.now().isoformat()} [SCAN] {msg}\n")
+            sherlock_log.info(f"[SCAN] {msg}")
         
         # 0. Round Change Detection — Clear stale crime cache
         current_round = len(game_state.get('roundHistory', []))
@@ -2,6 +2,7 @@ import { io, Socket } from "socket.io-client";
 import { GameState } from "../types";
 import { devLogger } from "../utils/devLogger";
 import { API_BASE_URL } from "../config";
+import { applyPatch, PatchOp } from "../utils/jsonPatch";
 
 const SERVER_URL = API_BASE_URL;
 
@@ -11,6 +12,15 @@ interface ApiResponse {
     [key: string]: unknown;
 }
 
+// game_patch / sync_game_state payload: a full state or a patch from baseVersion
+interface StateSyncPayload {
+    epoch: string;
+    version: number;
+    baseVersion?: number;
+    patch?: PatchOp[];
+    gameState?: GameState;
+}
+
 class SocketService {
     public socket: Socket | null = null;
     private connectionStatusCallbacks: ((status: 'connected' | 'disconnected' | 'reconnecting', attempt?: number) => void)[] = [];
@@ -22,6 +32,10 @@ class SocketService {
     private activePlayerName: string | null = null;
     public activeBotDifficulty: string | null = null;
 
+    // Versioned state for delta updates (server/broadcast.py)
+    private synced: { roomId: string, epoch: string, version: number, state: GameState } | null = null;
+    private gameStateListeners = new Set<(gameState: GameState) => void>();
+
     connect() {
         if (!this.socket) {
             this.socket = io(SERVER_URL, {
@@ -66,6 +80,7 @@ class SocketService {
                     });
                 }
             });
+            this.socket.on('game_patch', (data: StateSyncPayload) => this.applyStateSync(data));
             this.socket.io.on('reconnect_failed', () => {
                 devLogger.error('SOCKET', `Reconnection failed after ${this.maxReconnectAttempts} attempts`);
                 this.emitConnectionStatus('disconnected');
@@ -95,7 +110,44 @@ class SocketService {
         if (botDifficulty) this.activeBotDifficulty = botDifficulty;
         const payload: Record<string, unknown> = { roomId, playerName };
         if (this.activeBotDifficulty) payload.botDifficulty = this.activeBotDifficulty;
-        this.socket.emit('join_room', payload, callback);
+        this.socket.emit('join_room', payload, (res: ApiResponse) => {
+            callback(res);
+            if (res.success) this.syncGameState(roomId);
+        });
+    }
+
+    /** Switches this client to game_patch deltas, catching up from the version it holds. */
+    syncGameState(roomId: string) {
+        if (!this.socket) return;
+        const known = this.synced?.roomId === roomId ? this.synced : null;
+        this.socket.emit('sync_game_state', { roomId, epoch: known?.epoch, version: known?.version },
+            (res: ApiResponse & Partial<StateSyncPayload>) => {
+                if (!res.success) {
+                    devLogger.error('SOCKET', 'State sync failed', { error: res.error });
+                    return;
+                }
+                this.applyStateSync(res as StateSyncPayload, roomId);
+            });
+    }
+
+    private applyStateSync(data: StateSyncPayload, roomId = this.synced?.roomId ?? this.activeRoomId) {
+        if (!roomId) return;
+        let state: GameState;
+        if (data.gameState) {
+            state = data.gameState;
+        } else if (this.synced && this.synced.roomId === roomId && this.synced.epoch === data.epoch
+            && this.synced.version === data.baseVersion) {
+            if (!data.patch?.length) return;
+            state = applyPatch(this.synced.state, data.patch);
+        } else {
+            // Missed a version (or the server restarted): catch up
+            devLogger.log('SOCKET', 'State version gap, resyncing', { have: this.synced?.version, base: data.baseVersion });
+            this.synced = null;
+            this.syncGameState(roomId);
+            return;
+        }
+        this.synced = { roomId, epoch: data.epoch, version: data.version, state };
+        this.gameStateListeners.forEach(listener => listener(state));
     }
 
     sendAction(roomId: string, action: string, payload: Record<string, unknown>, callback?: (res: ApiResponse) => void) {
@@ -127,14 +179,21 @@ class SocketService {
     onGameUpdate(callback: (gameState: GameState) => void) {
         if (!this.socket) return () => { };
 
+        // Full states: clients not (yet) on deltas, and the server's fallback path
         const handler = (data: { gameState: GameState }) => {
             devLogger.log('SOCKET', 'Game Update Received', { phase: data.gameState.phase, turn: data.gameState.currentTurnIndex });
             callback(data.gameState)
         };
+        const patchListener = (gameState: GameState) => {
+            devLogger.log('SOCKET', 'Game Update Received', { phase: gameState.phase, turn: gameState.currentTurnIndex, version: this.synced?.version });
+            callback(gameState);
+        };
 
         this.socket.on('game_update', handler);
+        this.gameStateListeners.add(patchListener);
         return () => {
             this.socket?.off('game_update', handler);
+            this.gameStateListeners.delete(patchListener);
         };
     }
 
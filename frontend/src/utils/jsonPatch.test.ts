@@ -0,0 +1,30 @@
+import { describe, it, expect } from 'vitest';
+import { applyPatch } from './jsonPatch';
+
+describe('applyPatch', () => {
+    const base = {
+        phase: 'PLAYING',
+        tableCards: [{ card: { suit: '♠', rank: 'A' }, playedBy: 'Bottom' }],
+        players: [{ name: 'A', hand: [1, 2, 3] }, { name: 'B', hand: [4] }],
+        bid: { type: 'SUN', 'a/b': 1 },
+    };
+
+    it('appends, replaces and removes without touching the input', () => {
+        const next = applyPatch(base, [
+            { op: 'add', path: '/tableCards/-', value: { card: { suit: '♠', rank: '7' }, playedBy: 'Right' } },
+            { op: 'replace', path: '/players/0/hand', value: [1, 3] },
+            { op: 'remove', path: '/bid/a~1b' },
+        ]);
+        expect(next.tableCards).toHaveLength(2);
+        expect(next.players[0].hand).toEqual([1, 3]);
+        expect(next.bid).toEqual({ type: 'SUN' });
+        expect(base.tableCards).toHaveLength(1);
+        expect(base.players[0].hand).toEqual([1, 2, 3]);
+    });
+
+    it('keeps unchanged branches by reference', () => {
+        const next = applyPatch(base, [{ op: 'replace', path: '/phase', value: 'FINISHED' }]);
+        expect(next.phase).toBe('FINISHED');
+        expect(next.players).toBe(base.players);
+    });
+});
@@ -0,0 +1,55 @@
+/**
+ * jsonPatch.ts — Applies the JSON-patch (RFC 6902 subset) diffs the server
+ * sends in `game_patch` (see server/state_patch.py).
+ *
+ * Supports 'add' (including the '/-' append), 'remove' and 'replace'.
+ * Returns a new document; containers on the changed paths are copied so
+ * React sees new references exactly where the state changed.
+ */
+export interface PatchOp {
+    op: 'add' | 'remove' | 'replace';
+    path: string;
+    value?: unknown;
+}
+
+type Container = Record<string, unknown> | unknown[];
+
+const unescapeToken = (token: string): string => token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+const shallowCopy = (node: unknown): Container =>
+    Array.isArray(node) ? [...node] : { ...(node as Record<string, unknown>) };
+
+export const applyPatch = <T>(doc: T, patch: PatchOp[]): T => {
+    let root: unknown = doc;
+    for (const op of patch) {
+        if (op.path === '') {
+            root = op.value;
+            continue;
+        }
+        const tokens = op.path.split('/').slice(1).map(unescapeToken);
+        root = shallowCopy(root);
+        let parent = root as Container;
+        for (const token of tokens.slice(0, -1)) {
+            const key = Array.isArray(parent) ? Number(token) : token;
+            const child = shallowCopy((parent as Record<string | number, unknown>)[key]);
+            (parent as Record<string | number, unknown>)[key] = child;
+            parent = child;
+        }
+        const last = tokens[tokens.length - 1];
+        if (Array.isArray(parent)) {
+            if (op.op === 'add') {
+                if (last === '-') parent.push(op.value);
+                else parent.splice(Number(last), 0, op.value);
+            } else if (op.op === 'remove') {
+                parent.splice(Number(last), 1);
+            } else {
+                parent[Number(last)] = op.value;
+            }
+        } else if (op.op === 'remove') {
+            delete parent[last];
+        } else {
+            parent[last] = op.value;
+        }
+    }
+    return root as T;
+};
@@ -1,84 +1,164 @@
 import time
 import json
 import logging
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from game_engine.logic.game import Game
 from game_engine.models.player import Player
 from ai_worker.strategies.playing import PlayingStrategy
 from ai_worker.strategies.bidding import BiddingStrategy
 from ai_worker.bot_context import BotContext
+from ai_worker.knowledge import KnowledgeRegistry
 from game_engine.logic.utils import scan_hand_for_projects
 
 # Configure logging for Arena (suppress debug noise)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Arena")
 
+# Bridge-style IMP table compressed to Baloot round points (a plain round is
+# worth 16 in HOKUM, 26 in SUN): a board swing of at least IMP_SCALE[k]
+# points scores k + 1 IMPs.
+IMP_SCALE = (2, 4, 6, 8, 10, 13, 16, 20, 25, 30, 36, 44, 52, 62)
+
+Z_95 = 1.96
+
+
+def default_bots():
+    """(playing, bidding) strategies for one team."""
+    return PlayingStrategy(), BiddingStrategy()
+
+
+def configured_bots(timeout_ms=None):
+    """default_bots with a per-decision search time (functools.partial-friendly for pools)."""
+    playing, bidding = default_bots()
+    if timeout_ms is not None:
+        playing.cognitive.timeout_ms = timeout_ms
+    return playing, bidding
+
+
+class DealStream:
+    """
+    Seeded deal source for Game.deal_rng. Deal n of a stream is the same in
+    every match played with the seed, however the bidding went, so duplicate
+    tables see the same boards.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.dealt = 0
+        self._rng = random.Random(f"{seed}:dealer")
+
+    def shuffle(self, cards):
+        random.Random(f"{self.seed}:{self.dealt}").shuffle(cards)
+        self.dealt += 1
+
+    def randint(self, a, b):
+        return self._rng.randint(a, b)
+
+
 class Arena:
-    def __init__(self):
-        self.playing_strategy = PlayingStrategy()
-        self.bidding_strategy = BiddingStrategy()
+    def __init__(self, bots=None):
+        """
+        bots: (team A factory, team B factory), each returning (playing,
+        bidding) strategies. Team A sits at Bottom/Top unless a match is
+        played swapped. Default: the production bots on both sides.
+        """
+        factory_a, factory_b = bots or (default_bots, default_bots)
+        team_a = factory_a()
+        team_b = team_a if factory_b is factory_a else factory_b()
+        self.teams = (team_a, team_b)
+        self.playing_strategy, self.bidding_strategy = team_a
+        # Card memory follows the game's events instead of a replay per decision
+        self.knowledge = KnowledgeRegistry(max_rooms=8)
 
-    def run_match(self, match_id="sim_1"):
+    def run_match(self, match_id="sim_1", seed=None, swapped=False, keep_history=True):
         """
         Runs a full headless match between self-playing bots.
         Returns the full match history and result.
+
+        With a ``seed`` the deals come from a DealStream and the bots' own
+        randomness is seeded too, so the match can be replayed (bots whose
+        search stops on a wall-clock timeout rather than an iteration budget
+        can still diverge). ``swapped`` seats team A at Right/Left: the same
+        seed then replays the same deals with the hands exchanged.
         """
         game = Game(room_id=match_id)
-        
+        stream = None
+        if seed is not None:
+            stream = game.deal_rng = DealStream(seed)
+            random.seed(f"{seed}:{int(swapped)}:bots")
+        self.knowledge.attach(game)
+        a_team = 'them' if swapped else 'us'
+
         # Add Players
         names = ["Bot_Bottom", "Bot_Right", "Bot_Top", "Bot_Left"]
         for i, name in enumerate(names):
             p = game.add_player(f"sid_{i}", name)
             p.is_bot = True
-            
+
         # Start Game (Deals cards, sets phase to BIDDING)
         success = game.start_game()
         if not success:
             return {"error": "Failed to start game (not enough players?)"}
-        
+
+        start = time.time()
         steps = 0
         MAX_STEPS = 50000 # Safety limit (approx 2000 steps per game)
-        
+        rounds = []  # Per scored round: board (deal number), points won by us / them
+        scores_before = dict(game.match_scores)
+
+        def _record_round():
+            if len(game.past_round_results) > len(rounds):
+                rounds.append({
+                    "board": stream.dealt - 1 if stream else None,
+                    "us": game.match_scores["us"] - scores_before["us"],
+                    "them": game.match_scores["them"] - scores_before["them"],
+                })
+                scores_before.update(game.match_scores)
+
         while max(game.match_scores.values()) < 152 and steps < MAX_STEPS:
             steps += 1
             # 1. Get State
             if hasattr(game, 'bidding_engine') and game.bidding_engine:
                  game.bidding_engine.GABLAK_DURATION = -1 # Force Expiry
-            
+
             if steps % 10000 == 0:
                  logger.info(f"Match {match_id} Step {steps}. Scores: {game.match_scores}")
 
             current_player_idx = game.current_turn
-            
+            playing_strategy, bidding_strategy = self.teams[(current_player_idx % 2) ^ int(swapped)]
+
             # 1. Get State
-            sid = game.players[current_player_idx].id
             state = game.get_game_state()
-            ctx = BotContext(state, current_player_idx)
-            
+            memory, tracker = self.knowledge.lookup(state, current_player_idx)
+            ctx = BotContext(state, current_player_idx, memory=memory, tracker=tracker)
+
             decision = None
-            
+
             # 2. Decision Logic
             # Note: We group all bidding-related phases
             if game.phase in ["BIDDING", "DOUBLING", "VARIANT_SELECTION", "GABLAK_WINDOW"]:
                 try:
-                    decision = self.bidding_strategy.get_decision(ctx)
+                    decision = bidding_strategy.get_decision(ctx)
                     action = decision.get('action')
                     suit = decision.get('suit')
-                    
+
                     # Apply
                     res = game.handle_bid(current_player_idx, action, suit)
                     if res.get('error'):
                         logger.warning(f"Bid Error ({action}): {res}")
                         # Fallback to PASS to unblock
                         game.handle_bid(current_player_idx, "PASS")
-                        
+
                 except Exception as e:
                     logger.error(f"Bidding Crash: {e}")
                     game.handle_bid(current_player_idx, "PASS")
             elif game.phase == "PLAYING":
                 try:
-                    decision = self.playing_strategy.get_decision(ctx)
+                    decision = playing_strategy.get_decision(ctx)
                     card_idx = decision.get('cardIndex', 0)
-                    
+
                     # Calculate Projects if Trick 1
                     metadata = {}
                     if len(game.round_history) == 0:
@@ -92,7 +172,7 @@ class Arena:
 
                     # Apply
                     res = game.play_card(current_player_idx, card_idx, metadata)
-                    
+
                     if res.get('error'):
                          logger.warning(f"Play Error ({card_idx}): {res}")
                          # Fallback: Try playing card 0, then 1...
@@ -104,26 +184,203 @@ class Arena:
                      logger.error(f"Playing Crash: {e}")
                      # Try to recover?
                      pass
-            
+
             elif game.phase == "FINISHED":
                  # Round Finished. Start Next Round.
                  # Note: start_game() in current engine preserves match scores but re-rolls dealer (known quirk)
+                 _record_round()
                  game.start_game()
                  logger.info(f"Round Finished. Scores: {game.match_scores}. Starting next round.")
-                 
+
             else:
                 # Should not happen in headless unless phase drift
                 logger.warning(f"Unknown Phase in Arena: {game.phase}")
                 break
 
-        return {
+        _record_round()
+        self.knowledge.forget(match_id)
+        result = {
             "match_id": match_id,
+            "seed": seed,
+            "swapped": swapped,
+            "a_team": a_team,
             "winner": "us" if game.match_scores["us"] >= 152 else ("them" if game.match_scores["them"] >= 152 else None),
             "steps": steps,
-            "final_scores": game.match_scores,
+            "duration": time.time() - start,
+            "final_scores": dict(game.match_scores),
+            "rounds": rounds,
             "history_length": len(game.full_match_history),
-            "match_history": game.full_match_history
         }
+        if keep_history:
+            result["match_history"] = game.full_match_history
+        return result
+
+
+# ── Batch runs ───────────────────────────────────────────────────────
+
+_worker_arena = None
+
+
+def _init_worker(bots):
+    """Pool initializer: one Arena (bots, models, tables) per worker process."""
+    global _worker_arena
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_arena = Arena(bots)
+
+
+def _worker_job(job):
+    return _run_job(_worker_arena, job)
+
+
+def _run_job(arena, job):
+    match_id, seed, swapped = job
+    try:
+        return arena.run_match(match_id, seed=seed, swapped=swapped, keep_history=False)
+    except Exception as e:
+        logger.error(f"Match {match_id} failed: {e}")
+        return {"match_id": match_id, "seed": seed, "swapped": swapped,
+                "a_team": 'them' if swapped else 'us', "error": str(e)}
+
+
+def match_seeds(matches, seed=0):
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(matches)]
+
+
+def run_matches(matches, seed=0, duplicate=True, workers=1, bots=None):
+    """
+    Plays ``matches`` seeded matches (each twice, seats swapped, when
+    ``duplicate``) and yields compact results as they finish. ``workers`` > 1
+    spreads the matches over a process pool; ``bots`` must then be picklable
+    (module-level factories or functools.partial of them).
+    """
+    jobs = []
+    for i, match_seed in enumerate(match_seeds(matches, seed)):
+        jobs.append((f"arena_{seed}_{i}", match_seed, False))
+        if duplicate:
+            jobs.append((f"arena_{seed}_{i}_swapped", match_seed, True))
+
+    if workers <= 1:
+        arena = Arena(bots)
+        for job in jobs:
+            yield _run_job(arena, job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(bots,)) as pool:
+        futures = [pool.submit(_worker_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def imps(swing):
+    """IMPs for a board swing in Baloot round points (signed)."""
+    n = sum(1 for t in IMP_SCALE if abs(swing) >= t)
+    return n if swing >= 0 else -n
+
+
+def _mean_ci(values):
+    """(mean, 95% half-width) under a normal approximation."""
+    n = len(values)
+    if not n:
+        return 0.0, 0.0
+    mean = sum(values) / n
+    if n < 2:
+        return mean, float('inf')
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, Z_95 * math.sqrt(var / n)
+
+
+def _wilson(wins, n):
+    """95% Wilson score interval for a win rate."""
+    if not n:
+        return 0.0, 1.0
+    p = wins / n
+    denom = 1 + Z_95 ** 2 / n
+    centre = (p + Z_95 ** 2 / (2 * n)) / denom
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class ArenaReport:
+    """
+    Streaming aggregate of arena results from team A's side: match win rate,
+    point margin, and for duplicate pairs the per-board swing (A's net round
+    points at both tables of the same deal) in points and IMPs.
+    """
+
+    def __init__(self):
+        self.matches = 0
+        self.errors = 0
+        self.incomplete = 0
+        self.a_wins = 0
+        self.margins = []      # A's final match-point margin per match
+        self.board_swings = [] # Per duplicate board
+        self._unpaired = {}    # seed -> result waiting for the other table
+
+    def add(self, result):
+        if result.get("error"):
+            self.errors += 1
+            return
+        self.matches += 1
+        a, b = (result["a_team"], "them" if result["a_team"] == "us" else "us")
+        if result.get("winner") is None:
+            self.incomplete += 1
+        elif result["winner"] == a:
+            self.a_wins += 1
+        scores = result["final_scores"]
+        self.margins.append(scores[a] - scores[b])
+
+        seed = result.get("seed")
+        if seed is None:
+            return
+        other = self._unpaired.pop(seed, None)
+        if other is None or other["swapped"] == result["swapped"]:
+            self._unpaired[seed] = result
+            return
+        nets = [{}, {}]
+        for i, res in enumerate((result, other)):
+            ra = res["a_team"]
+            rb = "them" if ra == "us" else "us"
+            for rnd in res.get("rounds", []):
+                nets[i][rnd["board"]] = nets[i].get(rnd["board"], 0) + rnd[ra] - rnd[rb]
+        for board in sorted(set(nets[0]) & set(nets[1])):
+            self.board_swings.append(nets[0][board] + nets[1][board])
+
+    def summary(self):
+        decided = self.matches - self.incomplete
+        margin, margin_ci = _mean_ci(self.margins)
+        swing, swing_ci = _mean_ci(self.board_swings)
+        imp, imp_ci = _mean_ci([imps(s) for s in self.board_swings])
+        return {
+            "matches": self.matches,
+            "errors": self.errors,
+            "incomplete": self.incomplete,
+            "a_wins": self.a_wins,
+            "a_win_rate": self.a_wins / decided if decided else 0.0,
+            "a_win_rate_ci": _wilson(self.a_wins, decided),
+            "a_margin": margin,
+            "a_margin_ci": margin_ci,
+            "boards": len(self.board_swings),
+            "board_swing": swing,
+            "board_swing_ci": swing_ci,
+            "imps_per_board": imp,
+            "imps_per_board_ci": imp_ci,
+        }
+
+    def format(self):
+        s = self.summary()
+        lo, hi = s["a_win_rate_ci"]
+        lines = [
+            f"Matches: {s['matches']} (errors {s['errors']}, incomplete {s['incomplete']})",
+            f"Team A win rate: {s['a_win_rate']:.1%}  [95% CI {lo:.1%} - {hi:.1%}]",
+            f"Team A margin: {s['a_margin']:+.1f} +/- {s['a_margin_ci']:.1f} match points",
+        ]
+        if s["boards"]:
+            lines.append(f"Duplicate boards: {s['boards']}, swing {s['board_swing']:+.2f} +/- "
+                         f"{s['board_swing_ci']:.2f} points, {s['imps_per_board']:+.2f} +/- "
+                         f"{s['imps_per_board_ci']:.2f} IMPs/board")
+        return "\n".join(lines)
+
 
 if __name__ == "__main__":
     arena = Arena()
@@ -46,6 +46,7 @@ from .phases.playing_phase import PlayingPhase as PlayingLogic
 from .autopilot import AutoPilot
 
 from server.logging_utils import log_event, logger
+from server.metrics import metrics
 
 
 def requires_unlocked(func):
@@ -65,13 +66,18 @@ class Game(StateBridgeMixin):
         self._floor_card_obj = None
 
         # Transient (not serialized into state)
+        self.deal_rng = None  # Deck shuffles + first dealer; None = global random (seeded arenas)
         self.deck = Deck()
         self.players: List[Player] = []
         self.table_cards: List[Dict] = []
         self.timer = TimerManager(5)
+        self.timer.on_change = self._timer_changed
         self.timer_paused = False
         self.turn_duration = 30
         self.bidding_engine = None
+        # Event listeners (e.g. bot knowledge, timer deadlines):
+        # on_card_played / on_trick_resolved / on_round_reset / on_timer_changed
+        self.observers: List[Any] = []
 
         # Managers
         self.lifecycle = GameLifecycle(self)
@@ -116,6 +122,7 @@ class Game(StateBridgeMixin):
 
     def reset_round_state(self):
         self.lifecycle.reset_round_state()
+        self._notify('on_round_reset')
 
     def deal_initial_cards(self):
         self.lifecycle.deal_initial_cards()
@@ -134,6 +141,7 @@ class Game(StateBridgeMixin):
         return self.phases[GamePhase.BIDDING.value].handle_bid(player_index, action, suit, reasoning)
 
     @requires_unlocked
+    @metrics.timed('baloot_game_seconds', op='play_card')
     def play_card(self, player_index, card_idx, metadata=None):
         if self.phase != GamePhase.PLAYING.value:
             return {'success': False, 'error': f"Not in PLAYING. Current: {self.phase}"}
@@ -176,6 +184,7 @@ class Game(StateBridgeMixin):
         result = self.trick_manager.resolve_trick()
         if self.round_history:
             self.graveyard.commit_trick(self.round_history[-1].get('cards', []))
+            self._notify('on_trick_resolved', self.round_history[-1])
         # Clear Akka after trick resolves — it’s a one-trick announcement
         self.state.akkaState = AkkaState()
         return result
@@ -233,6 +242,7 @@ class Game(StateBridgeMixin):
     # ═══════════════════════════════════════════════════════════════════
 
     # @requires_unlocked  <-- Removed to clear deadlock
+    @metrics.timed('baloot_game_seconds', op='check_timeout')
     def check_timeout(self):
         is_chal = self.phase == GamePhase.CHALLENGE.value or self.qayd_state.get('active')
         if (not self.timer.active or self.timer_paused) and not is_chal: return None
@@ -260,6 +270,20 @@ class Game(StateBridgeMixin):
         if self.timer.is_expired(): self.reset_timer()
         return res
 
+    def next_deadline(self):
+        """Epoch seconds at which check_timeout() may act; None when nothing can time out."""
+        if self.phase in (GamePhase.FINISHED.value, GamePhase.GAMEOVER.value):
+            return None
+        deadlines = []
+        if self.qayd_state.get('active'):
+            deadlines.append(self.qayd_state.get('timer_start', 0) + self.qayd_state.get('timer_duration', 0))
+        if not self.timer_paused and self.timer.deadline() is not None:
+            deadlines.append(self.timer.deadline())
+        return min(deadlines) if deadlines else None
+
+    def _timer_changed(self):
+        self._notify('on_timer_changed')
+
     def auto_play_card(self, player_index):
         """Legacy entry point -> AutoPilot."""
         r = AutoPilot.execute(self, player_index)
@@ -287,7 +311,8 @@ class Game(StateBridgeMixin):
                 pos: [{**p, 'cards': [c.to_dict() if hasattr(c,'to_dict') else c for c in p.get('cards',[])]} for p in projs]
                 for pos, projs in self.declarations.items()},
             "timer": {"remaining": self.timer.get_time_remaining(), "duration": self.timer.duration,
-                      "elapsed": self.timer.get_time_elapsed(), "active": self.timer.active},
+                      "elapsed": self.timer.get_time_elapsed(), "active": self.timer.active,
+                      "paused": self.timer.paused},
             "isProjectRevealing": self.is_project_revealing,
             "trickCount": len(self.round_history),
             "doublingLevel": self.doubling_level, "isLocked": self.is_locked,
@@ -313,6 +338,17 @@ class Game(StateBridgeMixin):
     #  INTERNAL HELPERS
     # ═══════════════════════════════════════════════════════════════════
 
+    def _notify(self, event: str, *args):
+        """Calls observer.<event>(game, *args). Observers never break the game."""
+        for observer in list(getattr(self, 'observers', ())):
+            handler = getattr(observer, event, None)
+            if handler is None:
+                continue
+            try:
+                handler(self, *args)
+            except Exception as e:
+                logger.error(f"Observer {type(observer).__name__}.{event} failed: {e}")
+
     def _sync_bid_state(self):
         if not self.bidding_engine: return
         c = self.bidding_engine.contract
@@ -340,7 +376,7 @@ class Game(StateBridgeMixin):
         self.blunders[pos] = self.blunders.get(pos, 0) + 1
 
     def reset_timer(self, duration=None):
-        self.timer.reset(duration); self.timer_paused = False
+        self.timer_paused = False; self.timer.reset(duration)
 
     def pause_timer(self):  self.timer_paused = True;  self.timer.pause()
     def resume_timer(self): self.timer_paused = False; self.timer.resume()
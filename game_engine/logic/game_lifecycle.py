@@ -38,7 +38,7 @@ class GameLifecycle:
         # Only randomize dealer on the very first round; subsequent rounds
         # use the rotated dealer_index set by end_round().
         if not self.game.past_round_results:
-            self.game.dealer_index = random.randint(0, 3)
+            self.game.dealer_index = (getattr(self.game, 'deal_rng', None) or random).randint(0, 3)
         self.deal_initial_cards()
         self.game.phase = GamePhase.BIDDING.value
 
@@ -58,7 +58,7 @@ class GameLifecycle:
 
     def reset_round_state(self):
         """Clear all round-specific data for a fresh start."""
-        self.game.deck = Deck()
+        self.game.deck = Deck(rng=getattr(self.game, 'deal_rng', None))
         for p in self.game.players:
             p.hand = []
             p.captured_cards = []
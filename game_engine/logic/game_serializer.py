@@ -3,13 +3,22 @@ game_engine/logic/game_serializer.py — Game JSON Serialization
 ===============================================================
 
 Extracted from game.py to reduce its size. Handles the full
-to_json() → from_json() cycle used for Redis persistence.
+to_json() → from_json() cycle used for Redis persistence, and the compact
+binary snapshot (serialize_sections / deserialize_sections) RoomManager
+stores as Redis hash fields: msgpack per section, cards packed one byte each.
 """
 
 from __future__ import annotations
+import json
 from typing import TYPE_CHECKING, Dict, Any
 
-from game_engine.models.constants import GamePhase
+# msgpack (compact binary snapshots; JSON bytes without it)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from game_engine.models.constants import GamePhase, SUITS, RANKS
 from game_engine.models.deck import Deck
 from game_engine.models.player import Player
 from game_engine.models.card import Card as CardModel
@@ -88,6 +97,7 @@ def deserialize_game(data: dict) -> Game:
     game.state = GameState(**state_data)
     game._floor_card_obj = None
     game.deck = Deck()
+    game.observers = []
 
     # Restore table cards
     game.table_cards = []
@@ -102,6 +112,7 @@ def deserialize_game(data: dict) -> Game:
 
     # Restore timer
     game.timer = TimerManager(5)
+    game.timer.on_change = game._timer_changed
     timer_state = data.get('timer_state')
     if timer_state:
         game.timer.active = timer_state.get('active', False)
@@ -195,3 +206,113 @@ def deserialize_game(data: dict) -> Game:
         game.recorder = None
 
     return game
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  BINARY SECTIONS (Redis hash fields)
+# ═══════════════════════════════════════════════════════════════════════
+
+FORMAT_MSGPACK = b'm1'
+FORMAT_JSON = b'j1'
+
+# Grow all match long but change at most once per trick: kept apart from the
+# per-move state so an ordinary card play does not rewrite them.
+HISTORY_FIELDS = ('roundHistory', 'trickHistory', 'pastRoundResults',
+                  'fullMatchHistory', 'winProbabilityHistory')
+
+SECTION_FIELDS = ('state', 'history', 'players', 'table', 'meta')
+
+
+def pack_cards(cards) -> bytes:
+    """Cards (Card objects or {suit, rank} dicts) as one byte each: suit * 8 + rank."""
+    out = bytearray()
+    for c in cards:
+        suit, rank = (c.get('suit'), c.get('rank')) if isinstance(c, dict) else (c.suit, c.rank)
+        if suit in SUITS and rank in RANKS:
+            out.append(SUITS.index(suit) * 8 + RANKS.index(rank))
+    return bytes(out)
+
+
+def unpack_cards(data: bytes) -> list:
+    return [{'suit': SUITS[b >> 3], 'rank': RANKS[b & 7]} for b in data]
+
+
+def _encode_fallback(obj):
+    """Safety net for objects that slip through serialize_game()."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'value'):  # Enum
+        return obj.value
+    raise TypeError(f"Unable to serialize: {type(obj)}")
+
+
+def _pack(obj) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True, default=_encode_fallback)
+    return json.dumps(obj, default=_encode_fallback).encode('utf-8')
+
+
+def _unpack(data: bytes, fmt: bytes):
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+def serialize_sections(game: Game) -> Dict[str, bytes]:
+    """
+    The game as independently encoded sections. Equal bytes mean an unchanged
+    section, which is what lets RoomManager write only the dirty ones.
+    """
+    data = serialize_game(game)
+    state = data.pop('state')
+    history = {k: state.pop(k) for k in HISTORY_FIELDS if k in state}
+
+    players = data.pop('players')
+    for p in players:
+        p['hand'] = pack_cards(p['hand'])
+        p['captured_cards'] = pack_cards(c for c in p['captured_cards'] if isinstance(c, dict))
+
+    table = data.pop('table_cards')
+    for tc in table:
+        tc['card'] = pack_cards([tc['card']])
+
+    if msgpack is None:  # bytes are not JSON: fall back to card dicts
+        for p in players:
+            p['hand'] = unpack_cards(p['hand'])
+            p['captured_cards'] = unpack_cards(p['captured_cards'])
+        for tc in table:
+            tc['card'] = unpack_cards(tc['card'])[0]
+
+    return {
+        'fmt': FORMAT_MSGPACK if msgpack is not None else FORMAT_JSON,
+        'state': _pack(state),
+        'history': _pack(history),
+        'players': _pack(players),
+        'table': _pack(table),
+        'meta': _pack(data),
+    }
+
+
+def deserialize_sections(sections: Dict[Any, bytes]) -> Game:
+    """Inverse of serialize_sections (keys may be str or bytes, as Redis returns them)."""
+    sections = {k.decode() if isinstance(k, bytes) else k: v for k, v in sections.items()}
+    fmt = sections.get('fmt', FORMAT_JSON)
+    if isinstance(fmt, str):
+        fmt = fmt.encode()
+
+    data = _unpack(sections['meta'], fmt)
+    state = _unpack(sections['state'], fmt)
+    state.update(_unpack(sections['history'], fmt))
+    data['state'] = state
+
+    players = _unpack(sections['players'], fmt)
+    table = _unpack(sections['table'], fmt)
+    if fmt == FORMAT_MSGPACK:
+        for p in players:
+            p['hand'] = unpack_cards(p['hand'])
+            p['captured_cards'] = unpack_cards(p['captured_cards'])
+        for tc in table:
+            tc['card'] = unpack_cards(tc['card'])[0]
+    data['players'] = players
+    data['table_cards'] = table
+    return deserialize_game(data)
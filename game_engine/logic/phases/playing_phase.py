@@ -90,6 +90,7 @@ class PlayingPhase:
             'playedBy': player.position,
             'metadata': metadata
         })
+        self.game._notify('on_card_played', self.game.table_cards[-1])
 
         # 5b. Baloot tracking: check if K or Q of trump was played
         try:
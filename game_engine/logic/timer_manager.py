@@ -13,6 +13,14 @@ class TimerManager:
         self.duration = default_duration
         self.active = False
         self.last_reset_time = 0
+        self.paused = False
+        self.paused_at = 0
+        # Called after every reset/stop/pause/resume (Game forwards it to its observers)
+        self.on_change = None
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
 
     def reset(self, duration=None):
         """Reset the timer with an optional new duration."""
@@ -25,10 +33,12 @@ class TimerManager:
         self.paused = False
         self.paused_at = 0
         # logger.info(f"Timer RESET. Duration: {self.duration}s")
+        self._changed()
 
     def stop(self):
         """Stop the timer."""
         self.active = False
+        self._changed()
 
     def pause(self):
         """Pause the timer, freezing the elapsed time."""
@@ -37,6 +47,7 @@ class TimerManager:
         self.paused_at = time.time()
         self.paused = True
         logger.info("Timer PAUSED")
+        self._changed()
 
     def resume(self):
         """Resume the timer, adjusting start_time for the paused duration."""
@@ -47,6 +58,13 @@ class TimerManager:
         self.start_time += pause_duration # Shift start time forward
         self.paused = False
         logger.info(f"Timer RESUMED (Paused for {pause_duration:.2f}s)")
+        self._changed()
+
+    def deadline(self):
+        """Epoch seconds after which is_expired() turns True; None while stopped or paused."""
+        if not self.active or self.paused:
+            return None
+        return self.start_time + self.duration
 
     def get_time_elapsed(self):
         """Return seconds elapsed since start."""
@@ -3,12 +3,14 @@ from game_engine.models.card import Card
 from game_engine.models.constants import SUITS, RANKS
 
 class Deck:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # rng: anything with shuffle() (random.Random, arena deal streams); None = global random
+        self.rng = rng or random
         self.cards = [Card(s, r) for s in SUITS for r in RANKS]
         self.shuffle()
     
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
     def deal(self, num):
         if num > len(self.cards):
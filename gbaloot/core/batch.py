@@ -0,0 +1,191 @@
+"""
+Batch Engine — Parallel, cached per-file processing for the gbaloot tools.
+
+Every tool that walks a directory of captures or archives runs one pure
+function per file and then aggregates.  A ``Stage`` names that function and
+its version; ``run_stage`` serves files it has seen before from an on-disk
+cache and fans the rest out over a process pool:
+
+    <cache_dir>/<stage name>/<version key>/<file digest>.pkl
+
+The version key covers the stage and every stage it is built on (``after``),
+and the digest is the SHA-1 of the file's path and contents (results embed
+the path, so a moved file is a new entry).  Bumping one stage's version
+recomputes that stage and its dependants only: upstream results, such as
+parsed archives, still come from the cache.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "batch_cache"
+
+
+# ── Dataclasses ──────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Stage:
+    """One per-file processing step.
+
+    @param name: Cache namespace, e.g. 'archive_scoring'.
+    @param version: Bump whenever ``fn`` would return a different result.
+    @param fn: Module-level (picklable) function of the file path, or of the
+        ``after`` stage's result for that file.
+    @param after: Upstream stage whose result ``fn`` consumes.
+    """
+    name: str
+    version: int
+    fn: Callable[[Any], Any]
+    after: Optional["Stage"] = None
+
+    @property
+    def key(self) -> str:
+        """Version chain, e.g. 'archive_scoring.1+archive.1'."""
+        own = f"{self.name}.{self.version}"
+        return own if self.after is None else f"{own}+{self.after.key}"
+
+
+@dataclass
+class BatchItem:
+    """Result of one stage for one file.
+
+    @param path: Input file.
+    @param value: Stage result, None if the stage (or one upstream) raised.
+    @param error: Exception text when it raised.
+    @param cached: True when served from the cache.
+    """
+    path: Path
+    value: Any = None
+    error: str = ""
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+# ── Running Stages ───────────────────────────────────────────────────
+
+def file_digest(path: Path) -> str:
+    """SHA-1 of a file's absolute path and contents."""
+    h = hashlib.sha1(os.path.abspath(path).encode("utf-8"))
+    h.update(b"\0")
+    h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def run_stage(
+    stage: Stage,
+    paths: Iterable[Path],
+    workers: Optional[int] = 1,
+    cache_dir: Optional[Path] = None,
+) -> list[BatchItem]:
+    """Run a stage over files, returning one BatchItem per path in input order.
+
+    Failures are logged and returned as items with ``error`` set; they are
+    cached like results, so a broken file is not retried until it changes.
+
+    @param stage: Stage to run (its ``after`` chain is run for cache misses).
+    @param paths: Input files.
+    @param workers: Processes for cache misses; 1 runs in this process,
+        None uses every core.
+    @param cache_dir: Cache root (e.g. ``CACHE_DIR``); None disables caching.
+    @returns List of BatchItem.
+    """
+    paths = [Path(p) for p in paths]
+    digests = [file_digest(p) for p in paths] if cache_dir is not None else [None] * len(paths)
+    items = _run(stage, paths, digests, workers, cache_dir)
+    for item in items:
+        if not item.ok:
+            logger.warning("%s failed on %s: %s", stage.name, item.path.name, item.error)
+    return items
+
+
+def _run(
+    stage: Stage,
+    paths: list[Path],
+    digests: list[Optional[str]],
+    workers: Optional[int],
+    cache_dir: Optional[Path],
+) -> list[BatchItem]:
+    folder = None
+    if cache_dir is not None:
+        key = hashlib.sha1(stage.key.encode("utf-8")).hexdigest()[:12]
+        folder = Path(cache_dir) / stage.name / key
+
+    items: list[Optional[BatchItem]] = [None] * len(paths)
+    missing = []
+    for i, (path, digest) in enumerate(zip(paths, digests)):
+        hit = _load(folder / f"{digest}.pkl") if folder is not None else None
+        if hit is None:
+            missing.append(i)
+        else:
+            items[i] = BatchItem(path, hit[0], hit[1], cached=True)
+    if not missing:
+        return items
+
+    # Inputs for the misses: the paths, or the upstream stage's results
+    if stage.after is None:
+        inputs = [(paths[i], "") for i in missing]
+    else:
+        upstream = _run(stage.after, [paths[i] for i in missing],
+                        [digests[i] for i in missing], workers, cache_dir)
+        inputs = [(u.value, u.error) for u in upstream]
+    todo = [k for k, (_, error) in enumerate(inputs) if not error]
+    outputs = dict(zip(todo, _map(stage.fn, [inputs[k][0] for k in todo], workers)))
+
+    for k, i in enumerate(missing):
+        value, error = outputs.get(k, (None, inputs[k][1]))
+        items[i] = BatchItem(paths[i], value, error)
+        if folder is not None:
+            _store(folder / f"{digests[i]}.pkl", (value, error))
+    return items
+
+
+def _map(fn: Callable, args: list, workers: Optional[int]) -> list[tuple[Any, str]]:
+    """Apply fn to every arg, in a process pool when it pays off."""
+    call = functools.partial(_call, fn)
+    workers = min(workers or os.cpu_count() or 1, len(args))
+    if workers <= 1:
+        return [call(a) for a in args]
+    chunksize = max(1, len(args) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(call, args, chunksize=chunksize))
+
+
+def _call(fn: Callable, arg: Any) -> tuple[Any, str]:
+    try:
+        return fn(arg), ""
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# ── Cache Files ──────────────────────────────────────────────────────
+
+def _load(path: Path) -> Optional[tuple[Any, str]]:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+        return None
+
+
+def _store(path: Path, entry: tuple[Any, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
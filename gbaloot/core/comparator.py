@@ -20,6 +20,7 @@ from game_engine.models.constants import (
     POINT_VALUES_SUN,
     POINT_VALUES_HOKUM,
 )
+from gbaloot.core.batch import Stage, run_stage
 from gbaloot.core.card_mapping import (
     index_to_card,
     suit_idx_to_symbol,
@@ -244,23 +245,43 @@ class GameComparator:
         session = ProcessedSession.load(session_file)
         return self.compare_session(session.events, str(session_file))
 
-    def compare_all_sessions(self, sessions_dir: Path) -> list[ComparisonReport]:
+    def compare_all_sessions(
+        self,
+        sessions_dir: Path,
+        workers: Optional[int] = 1,
+        cache_dir: Optional[Path] = None,
+    ) -> list[ComparisonReport]:
         """Compare all processed session files in a directory.
 
+        Sessions are compared in ``workers`` processes (None = all cores);
+        with a ``cache_dir`` only new or changed files are compared again.
+
         @param sessions_dir: Directory containing *_processed.json files.
+        @param workers: Comparison processes.
+        @param cache_dir: Batch cache root, None to compare every file.
         @returns List of ComparisonReport, one per session.
         """
-        reports: list[ComparisonReport] = []
         files = sorted(sessions_dir.glob("*_processed.json"))
+        reports = [
+            item.value
+            for item in run_stage(SESSION_COMPARE_STAGE, files, workers, cache_dir)
+            if item.ok
+        ]
+        for report in reports:
+            self.record_divergences(report)
+        return reports
 
-        for f in files:
-            try:
-                report = self.compare_session_file(f)
-                reports.append(report)
-            except Exception as e:
-                logger.warning("Failed to compare session %s: %s", f.name, e)
+    def record_divergences(self, report: ComparisonReport) -> None:
+        """Record the divergences of a report produced by another comparator.
 
-        return reports
+        Used when sessions are compared in worker processes (or come from
+        the batch cache), so ids stay sequential in report order.
+
+        @param report: ComparisonReport whose disagreeing tricks to record.
+        """
+        for tc in report.trick_comparisons:
+            if not tc.winner_agrees:
+                self._record_divergence(tc, report.session_path)
 
     def get_divergences(self) -> list[Divergence]:
         """Return all divergences accumulated across all comparisons."""
@@ -337,13 +358,12 @@ class GameComparator:
         )
 
         if not winner_agrees:
-            self._record_divergence(trick, tc, session_path)
+            self._record_divergence(tc, session_path)
 
         return tc
 
     def _record_divergence(
         self,
-        trick: ExtractedTrick,
         comparison: TrickComparison,
         session_path: str,
     ) -> None:
@@ -458,58 +478,79 @@ def generate_scorecard(reports: list[ComparisonReport]) -> dict:
     @param reports: List of ComparisonReport from compare_all_sessions().
     @returns Dict with per-category results and metadata.
     """
-    total_tricks = 0
-    total_agree = 0
-    sun_tricks = 0
-    sun_agree = 0
-    hokum_tricks = 0
-    hokum_agree = 0
+    return merge_scorecard([scorecard_counts(r) for r in reports])
+
+
+def scorecard_counts(report: ComparisonReport) -> dict:
+    """Per-session tallies behind the scorecard.
+
+    Counts add up across sessions, so a batch run keeps one of these per
+    file and ``merge_scorecard`` combines them without revisiting any trick.
+
+    @param report: ComparisonReport for one session.
+    @returns Dict of integer counts.
+    """
+    counts = dict.fromkeys(_COUNT_KEYS, 0)
+    counts["sessions"] = 1
 
     # Point consistency: per-round, check if engine points sum
     # to expected total for the mode
-    round_groups: dict[tuple, list[TrickComparison]] = {}
+    round_groups: dict[int, list[TrickComparison]] = {}
 
-    for report in reports:
-        for tc in report.trick_comparisons:
-            total_tricks += 1
+    for tc in report.trick_comparisons:
+        counts["tricks"] += 1
+        if tc.winner_agrees:
+            counts["agree"] += 1
+
+        if tc.game_mode == "SUN":
+            counts["sun_tricks"] += 1
             if tc.winner_agrees:
-                total_agree += 1
-
-            if tc.game_mode == "SUN":
-                sun_tricks += 1
-                if tc.winner_agrees:
-                    sun_agree += 1
-            elif tc.game_mode == "HOKUM":
-                hokum_tricks += 1
-                if tc.winner_agrees:
-                    hokum_agree += 1
-
-            key = (report.session_path, tc.round_index)
-            round_groups.setdefault(key, []).append(tc)
-
-    # G3: Use real point analysis from reports when available
-    rounds_checked = 0
-    rounds_points_ok = 0
-
-    has_point_analyses = any(report.point_analyses for report in reports)
-    if has_point_analyses:
-        for report in reports:
-            for pa in report.point_analyses:
-                if pa.is_complete_round:
-                    rounds_checked += 1
-                    if pa.card_points_consistent:
-                        rounds_points_ok += 1
+                counts["sun_agree"] += 1
+        elif tc.game_mode == "HOKUM":
+            counts["hokum_tricks"] += 1
+            if tc.winner_agrees:
+                counts["hokum_agree"] += 1
+
+        round_groups.setdefault(tc.round_index, []).append(tc)
+
+    # G3: Real point analysis when available
+    if report.point_analyses:
+        counts["with_point_analyses"] = 1
+    for pa in report.point_analyses:
+        if pa.is_complete_round:
+            counts["pa_rounds"] += 1
+            if pa.card_points_consistent:
+                counts["pa_rounds_ok"] += 1
+
+    # Legacy self-check (sum per-trick engine_points)
+    for tricks in round_groups.values():
+        if len(tricks) != 8:
+            continue
+        counts["legacy_rounds"] += 1
+        total_pts = sum(tc.engine_points for tc in tricks)
+        expected = 120 if tricks[0].game_mode == "SUN" else 152
+        if total_pts == expected:
+            counts["legacy_rounds_ok"] += 1
+
+    return counts
+
+
+def merge_scorecard(counts: list[dict]) -> dict:
+    """Build the scorecard from per-session ``scorecard_counts``.
+
+    @param counts: One dict per session.
+    @returns Same structure as generate_scorecard().
+    """
+    total = dict.fromkeys(_COUNT_KEYS, 0)
+    for c in counts:
+        for key in _COUNT_KEYS:
+            total[key] += c[key]
+
+    # G3: Use real point analysis when any session has it, else the legacy check
+    if total["with_point_analyses"]:
+        rounds_checked, rounds_points_ok = total["pa_rounds"], total["pa_rounds_ok"]
     else:
-        # Fallback: legacy self-check (sum per-trick engine_points)
-        for _key, tricks in round_groups.items():
-            if len(tricks) != 8:
-                continue
-            rounds_checked += 1
-            total_pts = sum(tc.engine_points for tc in tricks)
-            mode = tricks[0].game_mode
-            expected = 120 if mode == "SUN" else 152
-            if total_pts == expected:
-                rounds_points_ok += 1
+        rounds_checked, rounds_points_ok = total["legacy_rounds"], total["legacy_rounds_ok"]
 
     def _make_category(correct: int, total: int) -> dict:
         pct = (correct / total * 100.0) if total > 0 else 0.0
@@ -522,12 +563,30 @@ def generate_scorecard(reports: list[ComparisonReport]) -> dict:
         }
 
     return {
-        "trick_resolution": _make_category(total_agree, total_tricks),
+        "trick_resolution": _make_category(total["agree"], total["tricks"]),
         "point_calculation": _make_category(rounds_points_ok, rounds_checked),
-        "sun_mode": _make_category(sun_agree, sun_tricks),
-        "hokum_mode": _make_category(hokum_agree, hokum_tricks),
-        "overall": _make_category(total_agree, total_tricks),
-        "sessions_analyzed": len(reports),
-        "total_tricks": total_tricks,
+        "sun_mode": _make_category(total["sun_agree"], total["sun_tricks"]),
+        "hokum_mode": _make_category(total["hokum_agree"], total["hokum_tricks"]),
+        "overall": _make_category(total["agree"], total["tricks"]),
+        "sessions_analyzed": total["sessions"],
+        "total_tricks": total["tricks"],
         "generated_at": datetime.now().isoformat(),
     }
+
+
+_COUNT_KEYS = (
+    "sessions", "tricks", "agree", "sun_tricks", "sun_agree",
+    "hokum_tricks", "hokum_agree", "with_point_analyses",
+    "pa_rounds", "pa_rounds_ok", "legacy_rounds", "legacy_rounds_ok",
+)
+
+
+# ── Batch Stage ──────────────────────────────────────────────────────
+
+def _compare_session_file(session_file: Path) -> ComparisonReport:
+    return GameComparator().compare_session_file(session_file)
+
+
+# Bump when comparison or extraction rules change
+COMPARATOR_VERSION = 1
+SESSION_COMPARE_STAGE = Stage("session_compare", COMPARATOR_VERSION, _compare_session_file)
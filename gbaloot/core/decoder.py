@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from gbaloot.core.batch import Stage
+from gbaloot.core.models import ProcessedSession
 
 # ── SFS2X Type Codes ────────────────────────────────────────────
 TYPE_NULL             = 0x00
@@ -91,8 +93,12 @@ class DecodeError(Exception):
     pass
 
 
-class SFS2XDecoder:
-    """Recursive decoder for the SmartFoxServer 2X binary WebSocket protocol."""
+class ReferenceSFS2XDecoder:
+    """Recursive decoder for the SmartFoxServer 2X binary WebSocket protocol.
+
+    The original element-at-a-time implementation, kept as the reference
+    that SFS2XDecoder is checked against. Not used on the hot path.
+    """
 
     def __init__(self, data: bytes):
         self.data = data
@@ -307,6 +313,226 @@ class SFS2XDecoder:
         }
 
 
+# ── Table-Driven Decoder ─────────────────────────────────────────
+
+_U16 = struct.Struct(">H")
+_I16 = struct.Struct(">h")
+_I32 = struct.Struct(">i")
+_I64 = struct.Struct(">q")
+_F32 = struct.Struct(">f")
+_F64 = struct.Struct(">d")
+
+
+class SFS2XDecoder:
+    """Table-driven decoder for the SmartFoxServer 2X binary WebSocket protocol.
+
+    Reads in place from a memoryview with precompiled structs, dispatches on
+    the type code through a lookup table and unpacks primitive arrays with a
+    single struct call. Output, errors and byte positions are identical to
+    ReferenceSFS2XDecoder, including on truncated or corrupt input.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.data = data
+        self.view = memoryview(data).cast("B")
+        self.end = len(self.view)
+        self.pos = 0
+        self.errors: list[str] = []
+
+    @property
+    def remaining(self) -> int:
+        return self.end - self.pos
+
+    def _take(self, n: int) -> int:
+        """Claim the next n bytes and return their start offset."""
+        pos = self.pos
+        if pos + n > self.end:
+            raise DecodeError(
+                f"Unexpected EOF: need {n} bytes at pos {pos}, "
+                f"only {self.end - pos} left"
+            )
+        self.pos = pos + n
+        return pos
+
+    def _read_uint8(self) -> int:
+        return self.view[self._take(1)]
+
+    def _read_uint16_be(self) -> int:
+        return _U16.unpack_from(self.view, self._take(2))[0]
+
+    def _read_utf_string(self) -> str:
+        """Read a UTF-8 string: 2-byte BE length prefix + data."""
+        length = _U16.unpack_from(self.view, self._take(2))[0]
+        if length == 0:
+            return ""
+        start = self._take(length)
+        raw = self.view[start:self.pos]
+        try:
+            return str(raw, "utf-8")
+        except UnicodeDecodeError:
+            return str(raw, "latin-1")
+
+    def _read_packed(self, code: str, size: int) -> list:
+        """Read a uint16-counted array of fixed-size numbers in one unpack."""
+        count = self._read_uint16_be()
+        if self.pos + count * size > self.end:
+            # Fail where an element-by-element read would: after the last whole item
+            self.pos += (self.end - self.pos) // size * size
+            self._take(size)
+        start = self._take(count * size)
+        return list(struct.unpack_from(f">{count}{code}", self.view, start))
+
+    # ── Value readers, indexed by type code ──
+
+    def _read_null(self) -> None:
+        return None
+
+    def _read_bool(self) -> bool:
+        return self.view[self._take(1)] != 0
+
+    def _read_short(self) -> int:
+        return _I16.unpack_from(self.view, self._take(2))[0]
+
+    def _read_int(self) -> int:
+        return _I32.unpack_from(self.view, self._take(4))[0]
+
+    def _read_long(self) -> int:
+        return _I64.unpack_from(self.view, self._take(8))[0]
+
+    def _read_float(self) -> float:
+        return _F32.unpack_from(self.view, self._take(4))[0]
+
+    def _read_double(self) -> float:
+        return _F64.unpack_from(self.view, self._take(8))[0]
+
+    def _read_bool_array(self) -> list:
+        count = self._read_uint16_be()
+        start = self._take(count)
+        return list(map(bool, self.view[start:self.pos]))
+
+    def _read_byte_array(self) -> list:
+        length = self._read_int()
+        if length < 0 or length > 1_000_000:
+            self.errors.append(f"Byte array length {length} invalid")
+            return []
+        start = self._take(length)
+        return self.view[start:self.pos].tolist()
+
+    def _read_short_array(self) -> list:
+        return self._read_packed("h", 2)
+
+    def _read_int_array(self) -> list:
+        return self._read_packed("i", 4)
+
+    def _read_long_array(self) -> list:
+        return self._read_packed("q", 8)
+
+    def _read_float_array(self) -> list:
+        return self._read_packed("f", 4)
+
+    def _read_double_array(self) -> list:
+        return self._read_packed("d", 8)
+
+    def _read_string_array(self) -> list:
+        count = self._read_uint16_be()
+        return [self._read_utf_string() for _ in range(count)]
+
+    def _read_sfs_array(self) -> list:
+        count = self._read_uint16_be()
+        if count > 50_000:
+            self.errors.append(f"SFSArray count {count} too large")
+            return []
+        items = []
+        readers, view = self._READERS, self.view
+        for _ in range(count):
+            if self.pos >= self.end:
+                self.errors.append("Truncated SFSArray element")
+                break
+            try:
+                elem_type = view[self._take(1)]
+                items.append(readers[elem_type](self))
+            except DecodeError as e:
+                self.errors.append(str(e))
+                break
+        return items
+
+    def _read_sfs_object(self) -> dict:
+        count = self._read_uint16_be()
+        if count > 10_000:
+            self.errors.append(f"SFSObject field count {count} too large")
+            return {}
+        result = {}
+        readers, view = self._READERS, self.view
+        for _ in range(count):
+            if self.end - self.pos < 3:
+                self.errors.append("Truncated SFSObject field")
+                break
+            try:
+                name = self._read_utf_string()
+                type_code = view[self._take(1)]
+                result[name] = readers[type_code](self)
+            except DecodeError as e:
+                self.errors.append(str(e))
+                break
+        return result
+
+    def _read_unknown(self) -> str:
+        # Always entered straight after the type byte was consumed
+        type_code = self.view[self.pos - 1]
+        self.errors.append(f"Unknown type 0x{type_code:02x} at pos {self.pos}")
+        return f"<unknown_type_0x{type_code:02x}>"
+
+    _READERS = (
+        _read_null, _read_bool, _read_uint8, _read_short, _read_int,
+        _read_long, _read_float, _read_double, _read_utf_string,
+        _read_bool_array, _read_byte_array, _read_short_array,
+        _read_int_array, _read_long_array, _read_float_array,
+        _read_double_array, _read_string_array, _read_sfs_array,
+        _read_sfs_object,
+    ) + (_read_unknown,) * (256 - 19)
+
+    def decode(self, raw_body: bool = False) -> dict:
+        """Decode a full SFS2X binary message."""
+        result = {}
+        if not raw_body:
+            if self.remaining < 1:
+                raise DecodeError(f"Message too short: {self.remaining} bytes")
+            header = self._read_uint8()
+            if header == 0x3F:
+                # Keepalive/ping frame — no payload to parse
+                return {
+                    "fields": {"_keepalive": True},
+                    "errors": [],
+                    "bytes_consumed": self.pos,
+                    "bytes_total": self.end,
+                }
+            if header != 0x80:
+                raise DecodeError(f"Expected 0x80 header, got 0x{header:02x}")
+            if self.remaining < 2:
+                raise DecodeError(f"Message too short after header: {self.remaining} bytes")
+            _body_size = self._read_uint16_be()
+
+        try:
+            root_type = self._read_uint8()
+            if root_type == TYPE_SFS_OBJECT:
+                result = self._read_sfs_object()
+            else:
+                self.errors.append(
+                    f"Expected root SFSObject (0x12), got 0x{root_type:02x}"
+                )
+                value = self._READERS[root_type](self)
+                result = {"_root": value}
+        except DecodeError as e:
+            self.errors.append(str(e))
+
+        return {
+            "fields": result,
+            "errors": self.errors,
+            "bytes_consumed": self.pos,
+            "bytes_total": self.end,
+        }
+
+
 # ── Utility Functions ────────────────────────────────────────────
 
 def hex_to_bytes(hex_string: str) -> tuple[bytes, bool]:
@@ -318,8 +544,8 @@ def hex_to_bytes(hex_string: str) -> tuple[bytes, bool]:
     if hex_string.endswith("..."):
         hex_string = hex_string[:-3].rstrip()
         truncated = True
-    clean = hex_string.replace(" ", "")
-    return bytes.fromhex(clean), truncated
+    # fromhex skips the separating spaces itself
+    return bytes.fromhex(hex_string), truncated
 
 
 def decode_card(code: str) -> str:
@@ -554,6 +780,27 @@ class GameDecoder:
             timeline.append(entry)
         return timeline
 
+    def to_session(self) -> ProcessedSession:
+        """Package the decoded events as a ProcessedSession (decode_all first)."""
+        return ProcessedSession(
+            capture_path=str(self.path),
+            captured_at=self.capture.get("captured_at", ""),
+            label=self.capture.get("label", ""),
+            stats=self.stats,
+            events=[
+                {
+                    "timestamp": ev.timestamp,
+                    "direction": ev.direction,
+                    "action": ev.action,
+                    "fields": ev.fields,
+                    "raw_size": ev.raw_size,
+                    "decode_errors": ev.decode_errors,
+                }
+                for ev in self.events
+            ],
+            timeline=self.get_game_timeline(),
+        )
+
     def summary(self) -> str:
         lines = [
             "=" * 60,
@@ -581,3 +828,18 @@ class GameDecoder:
             lines.append(f"  Duration: {dur:.0f}s ({dur / 60:.1f} min)")
         lines.append("=" * 60)
         return "\n".join(lines)
+
+
+# ── Batch Decoding ───────────────────────────────────────────────────
+
+def decode_capture(capture_path: Path) -> ProcessedSession:
+    """Load and decode one capture file into a ProcessedSession."""
+    decoder = GameDecoder(capture_path)
+    decoder.load()
+    decoder.decode_all()
+    return decoder.to_session()
+
+
+# Bump when decoding or classification output changes
+DECODER_VERSION = 1
+CAPTURE_DECODE_STAGE = Stage("capture_decode", DECODER_VERSION, decode_capture)
@@ -14,6 +14,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from gbaloot.core.batch import CACHE_DIR
 from gbaloot.core.comparator import GameComparator, generate_scorecard
 
 logging.basicConfig(
@@ -44,7 +45,7 @@ def main():
     start = time.time()
 
     print("Running comparisons...")
-    reports = comparator.compare_all_sessions(SESSIONS_DIR)
+    reports = comparator.compare_all_sessions(SESSIONS_DIR, workers=None, cache_dir=CACHE_DIR)
     elapsed = time.time() - start
 
     print(f"Completed in {elapsed:.2f}s")
@@ -8,7 +8,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
-from ..core.decoder import GameDecoder, decode_card
+from ..core.batch import run_stage
+from ..core.decoder import CAPTURE_DECODE_STAGE, GameDecoder, decode_card
 from ..core.models import ProcessedSession
 
 
@@ -123,38 +124,17 @@ def _batch_decode(capture_files: list[Path]):
     sessions_dir = Path(__file__).resolve().parents[1] / "data" / "sessions"
     sessions_dir.mkdir(parents=True, exist_ok=True)
 
+    todo = [
+        f for f in capture_files
+        if not (sessions_dir / f"{f.stem}_processed.json").exists()
+    ]
     processed = 0
-    for f in capture_files:
-        out_file = sessions_dir / f"{f.stem}_processed.json"
-        if out_file.exists():
-            continue
-        try:
-            decoder = GameDecoder(str(f))
-            decoder.load()
-            decoder.decode_all()
-
-            session = ProcessedSession(
-                capture_path=str(f),
-                captured_at=decoder.capture.get("captured_at", ""),
-                label=decoder.capture.get("label", ""),
-                stats=decoder.stats,
-                events=[
-                    {
-                        "timestamp": ev.timestamp,
-                        "direction": ev.direction,
-                        "action": ev.action,
-                        "fields": ev.fields,
-                        "raw_size": ev.raw_size,
-                        "decode_errors": ev.decode_errors,
-                    }
-                    for ev in decoder.events
-                ],
-                timeline=decoder.get_game_timeline(),
-            )
-            session.save(sessions_dir)
+    for item in run_stage(CAPTURE_DECODE_STAGE, todo, workers=None):
+        if item.ok:
+            item.value.save(sessions_dir)
             processed += 1
-        except Exception as e:
-            st.warning(f"Failed to decode {f.name}: {e}")
+        else:
+            st.warning(f"Failed to decode {item.path.name}: {item.error}")
 
     skipped = len(capture_files) - processed
     st.success(f"Batch complete: {processed} new, {skipped} already processed")
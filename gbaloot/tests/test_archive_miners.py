@@ -0,0 +1,203 @@
+"""Golden-archive test for the data-mining scripts ported to the archive store.
+
+``fixtures/golden_archive/savedGames`` is a small synthetic mobile archive
+(one game: SUN, HOKUM, Ashkal and a doubled HOKUM round).  ``expected`` holds
+what the pre-port miners (JSON walk of every file) wrote for it.  Every
+output must still match, except for the intended card-play changes:
+
+- legal moves follow the engine rules, so HOKUM adds the trump and
+  over-trump obligations to follow-suit;
+- trick points give Hokum values (J=20, 9=14) to trump cards only.
+"""
+from __future__ import annotations
+
+import functools
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from game_engine.models.constants import POINT_VALUES_HOKUM, POINT_VALUES_SUN
+from gbaloot.core.card_mapping import SOURCE_RANKS, SOURCE_SUITS
+from gbaloot.tools import archive_store
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+MINERS_DIR = ROOT / "scripts" / "data_mining"
+GOLDEN_DIR = Path(__file__).resolve().parent / "fixtures" / "golden_archive"
+
+MINERS = [
+    "mine_bidding_data", "mine_card_play_data", "mine_doubling_data",
+    "mine_round_outcomes", "mine_signals",
+]
+CHANGED = {"pro_card_play_database.json", "endgame_positions.json", "play_patterns_report.md"}
+UNCHANGED = sorted(p.name for p in (GOLDEN_DIR / "expected").iterdir() if p.name not in CHANGED)
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────
+
+def _load(path: Path):
+    if path.suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    return path.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def mined(tmp_path_factory) -> Path:
+    """Run every ported miner on the golden archive; returns its output dir."""
+    out = tmp_path_factory.mktemp("training")
+    for name in MINERS:
+        spec = importlib.util.spec_from_file_location(name, MINERS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.ARCHIVE_DIR = GOLDEN_DIR / "savedGames"
+        module.TRAINING_DIR = out
+        module.open_store = functools.partial(archive_store.open_store, store_dir=out / "store")
+        module.main()
+    return out
+
+
+@pytest.fixture(scope="module")
+def card_play(mined) -> tuple[list[dict], list[dict]]:
+    """(expected, mined) records of the card-play database, row for row."""
+    old = _load(GOLDEN_DIR / "expected" / "pro_card_play_database.json")
+    new = _load(mined / "pro_card_play_database.json")
+    assert old["summary"] == new["summary"]
+    assert len(old["records"]) == len(new["records"])
+    return old["records"], new["records"]
+
+
+def _team(seat: int) -> int:
+    return 1 if seat in (1, 3) else 2
+
+
+def _hokum_surplus(records: list[dict]) -> dict[tuple, dict[int, int]]:
+    """Points each team's won tricks gained from Hokum values on non-trump cards.
+
+    Keyed by (game, round, trick): the surplus before that trick, rebuilt from
+    the records alone (trick cards from ``cards_played_so_far``, winners from
+    the ``tricks_won`` counts).
+    """
+    rounds: dict[tuple, dict[int, dict]] = {}
+    for r in records:
+        tricks = rounds.setdefault((r["game_id"], r["round_idx"]), {})
+        trick = tricks.setdefault(r["trick_number"], {"won": {}, "played": []})
+        team = _team(r["player_seat"])
+        trick["won"][team] = r["tricks_won_my_team"]
+        trick["won"][3 - team] = r["tricks_won_opponent"]
+        if len(r["cards_played_so_far"]) > len(trick["played"]):
+            trick["played"] = r["cards_played_so_far"]
+        trick["mode"], trick["trump"] = r["game_mode"], r["trump_suit"]
+
+    surplus = {}
+    for (game, rnd), tricks in rounds.items():
+        total = {1: 0, 2: 0}
+        for number in sorted(tricks):
+            trick = tricks[number]
+            surplus[(game, rnd, number)] = dict(total)
+            later = tricks.get(number + 1)
+            if later is None or trick["mode"] != "HOKUM":
+                continue
+            winner = next(t for t in (1, 2) if later["won"][t] > trick["won"][t])
+            for card in later["played"][4 * (number - 1):4 * number]:
+                rank = SOURCE_RANKS[card % 13]
+                if SOURCE_SUITS[card // 13] != trick["trump"]:
+                    total[winner] += POINT_VALUES_HOKUM[rank] - POINT_VALUES_SUN[rank]
+    return surplus
+
+
+# ── Tests: Unchanged Outputs ──────────────────────────────────────────
+
+class TestUnchangedOutputs:
+    """Bidding, doubling, outcome and signal outputs match the old miners."""
+
+    def test_miners_write_every_golden_file(self, mined):
+        expected = {p.name for p in (GOLDEN_DIR / "expected").iterdir()}
+        assert expected <= {p.name for p in mined.iterdir()}
+
+    @pytest.mark.parametrize("name", UNCHANGED)
+    def test_output_matches_golden(self, mined, name):
+        assert _load(mined / name) == _load(GOLDEN_DIR / "expected" / name)
+
+    @pytest.mark.parametrize("name", sorted(CHANGED))
+    def test_changed_output_is_not_golden(self, mined, name):
+        # The golden archive exercises both intended changes
+        assert _load(mined / name) != _load(GOLDEN_DIR / "expected" / name)
+
+
+# ── Tests: Intended Differences ───────────────────────────────────────
+
+class TestCardPlayDifferences:
+    """pro_card_play_database.json: only HOKUM legal moves and trick points."""
+
+    def test_only_hokum_legal_moves_and_points_differ(self, card_play):
+        allowed = {"legal_moves", "num_options", "points_my_team", "points_opponent"}
+        for old, new in zip(*card_play):
+            changed = {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+            assert changed <= allowed, (old["game_id"], old["round_idx"], changed)
+            if changed:
+                assert old["game_mode"] == "HOKUM"
+
+    def test_legal_moves_add_the_trump_obligations(self, card_play):
+        narrowed = 0
+        for old, new in zip(*card_play):
+            assert new["num_options"] == len(new["legal_moves"])
+            if old["legal_moves"] == new["legal_moves"]:
+                continue
+            narrowed += 1
+            # Old: follow suit, else anything.  New: must (over-)trump
+            assert set(new["legal_moves"]) < set(old["legal_moves"])
+            assert new["card_played"] in new["legal_moves"]
+            assert {SOURCE_SUITS[c // 13] for c in new["legal_moves"]} == {old["trump_suit"]}
+        assert narrowed > 0
+
+    def test_points_use_hokum_values_for_trump_only(self, card_play):
+        old_records, new_records = card_play
+        surplus = _hokum_surplus(old_records)
+        changed = 0
+        for old, new in zip(old_records, new_records):
+            extra = surplus[(old["game_id"], old["round_idx"], old["trick_number"])]
+            team = _team(old["player_seat"])
+            assert old["points_my_team"] - new["points_my_team"] == extra[team]
+            assert old["points_opponent"] - new["points_opponent"] == extra[3 - team]
+            changed += old["points_my_team"] != new["points_my_team"]
+        assert changed > 0
+
+
+class TestEndgameDifferences:
+    """endgame_positions.json: only the HOKUM trick points."""
+
+    def test_only_hokum_points_differ(self, mined, card_play):
+        old = _load(GOLDEN_DIR / "expected" / "endgame_positions.json")
+        new = _load(mined / "endgame_positions.json")
+        assert old["summary"] == new["summary"]
+
+        points = {}
+        for r in card_play[1]:
+            team = _team(r["player_seat"])
+            points[(r["game_id"], r["round_idx"], r["trick_number"])] = {
+                team: r["points_my_team"], 3 - team: r["points_opponent"]}
+        changed = 0
+        for before, after in zip(old["positions"], new["positions"]):
+            diff = {k for k in before if before[k] != after[k]}
+            assert diff <= {"points_t1", "points_t2"}
+            if diff:
+                assert before["game_mode"] == "HOKUM"
+                changed += 1
+            key = (after["game_id"], after["round_idx"], after["trick_number"])
+            assert (after["points_t1"], after["points_t2"]) == (points[key][1], points[key][2])
+        assert changed > 0
+
+
+class TestReportDifferences:
+    """play_patterns_report.md: only the option counts of the follow plays."""
+
+    def test_only_option_lines_differ(self, mined):
+        old = _load(GOLDEN_DIR / "expected" / "play_patterns_report.md").splitlines()
+        new = _load(mined / "play_patterns_report.md").splitlines()
+        assert len(old) == len(new)
+        changed = [(a, b) for a, b in zip(old, new) if a != b]
+        assert changed == [
+            ("- Average options: 1.8", "- Average options: 1.7"),
+            ("- Forced plays (1 option): 23 (47.9%)", "- Forced plays (1 option): 24 (50.0%)"),
+        ]
@@ -0,0 +1,195 @@
+"""Tests for the columnar archive store."""
+from __future__ import annotations
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from ai_worker.mcts.bitboard import get_tables, legal_mask, mask_to_ids
+from gbaloot.tools.archive_store import (
+    ArchiveStore,
+    SOURCE_OF_ID,
+    TABLES,
+    ingest,
+    mask_to_source,
+    open_store,
+    popcount,
+    source_mask,
+    suit_lengths,
+    suit_symbol,
+)
+
+_CONTRACTS = [  # (bid, gm, trump engine suit or None)
+    ("sun", 1, None), ("ashkal", 3, None), ("hokom", 2, "floor"),
+    ("hearts", 2, 1), ("clubs", 2, 3),
+]
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────
+
+def _random_round(rng: random.Random) -> list[dict]:
+    """A full round in the mobile archive format, played with legal random cards."""
+    deck = list(range(32))
+    rng.shuffle(deck)
+    hands = [sum(1 << c for c in deck[8 * s:8 * s + 8]) for s in range(4)]
+    dealer = rng.randint(1, 4)
+    floor = deck[rng.randrange(32)]
+    events = [
+        {"e": 15, "bhr": [sum(1 << int(SOURCE_OF_ID[c]) for c in mask_to_ids(h)) for h in hands]},
+        {"e": 1, "p": dealer, "fc": int(SOURCE_OF_ID[floor]),
+         "t1s": rng.randrange(0, 150), "t2s": rng.randrange(0, 150)},
+    ]
+    bid, gm, trump = rng.choice(_CONTRACTS)
+    trump = floor >> 3 if trump == "floor" else trump
+    bidder = rng.randint(1, 4)
+    events.append({"e": 2, "p": bidder % 4 + 1, "b": "pass", "rb": -1})
+    events.append({"e": 2, "p": bidder, "b": bid, "gm": gm, "ts": 2, "rb": bidder})
+    if gm == 2 and rng.random() < 0.5:
+        events.append({"e": 2, "p": bidder % 4 + 1, "b": "double", "gm": gm, "rb": bidder, "gem": 1})
+        events.append({"e": 2, "p": bidder, "b": "pass", "gm": gm, "rb": bidder, "gem": 1})
+
+    tables = get_tables("HOKUM" if gm == 2 else "SUN", suit_symbol(-1 if trump is None else trump))
+    leader, points = dealer % 4 + 1, [0, 0]
+    for _ in range(8):
+        trick = []
+        for k in range(4):
+            seat = (leader + k - 1) % 4 + 1
+            card = rng.choice(mask_to_ids(legal_mask(tables, hands[seat - 1], trick)))
+            hands[seat - 1] &= ~(1 << card)
+            trick.append((seat, card))
+            events.append({"e": 4, "p": seat, "c": int(SOURCE_OF_ID[card])})
+            if rng.random() < 0.05:
+                events.append({"e": 16, "p": seat})
+        strength = tables.strength[trick[0][1] >> 3]
+        leader = max(trick, key=lambda t: strength[t[1]])[0]
+        points[(leader - 1) % 2] += sum(tables.points[c] for _, c in trick)
+        events.append({"e": 6, "p": leader})
+    events.append({"e": 12, "rs": {
+        "w": 1 if points[0] > points[1] else 2, "p1": points[0], "p2": points[1],
+        "s1": points[0] // 10, "s2": points[1] // 10, "b": (bidder - 1) % 2 + 1,
+        "r1": [{"n": "sira", "val": 20}], "r2": [],
+    }})
+    return events
+
+
+def _random_archive(rng: random.Random, n_rounds: int = 3, **overrides) -> dict:
+    data = {"v": 1, "n": f"Session {rng.randrange(10**6)}", "Id": rng.randrange(10**6),
+            "s1": 152, "s2": 90, "rs": [{"r": _random_round(rng)} for _ in range(n_rounds)]}
+    data.update(overrides)
+    return data
+
+
+def _write(directory, name: str, data) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+# ── Tests: Card Helpers ───────────────────────────────────────────────
+
+class TestCardHelpers:
+    """Test source <-> engine card mask conversion."""
+
+    def test_source_mask_round_trip(self):
+        source = [0 * 13 + 12, 1 * 13 + 5, 2 * 13 + 9, 3 * 13 + 8]  # A♠ 7♥ J♣ 10♦
+        mask = source_mask(sum(1 << i for i in source) | 1 << 3)  # plus a '5♠'
+        assert bin(mask).count("1") == 4
+        assert mask_to_source(mask) == sorted(source)
+
+    def test_popcount_and_suit_lengths(self):
+        masks = np.array([0, 0xFFFFFFFF, 0b1011 | 0xF0 << 24], dtype=np.uint32)
+        assert popcount(masks).tolist() == [0, 32, 7]
+        assert suit_lengths(masks).tolist() == [[0, 0, 0, 0], [8, 8, 8, 8], [3, 0, 0, 4]]
+
+
+# ── Tests: Ingest ─────────────────────────────────────────────────────
+
+class TestIngest:
+    """Test normalising archives into the store."""
+
+    def test_tables_follow_the_round(self, tmp_path):
+        rng = random.Random(1)
+        archive = _random_archive(rng, n_rounds=4)
+        _write(tmp_path / "games", "a.json", archive)
+
+        stats = ingest(tmp_path / "games", tmp_path / "store")
+        store = ArchiveStore(tmp_path / "store")
+
+        assert stats["added"] == 1 and stats["games"] == 1
+        assert store.games["name"][0] == archive["n"]
+        assert len(store.rounds) == 4
+        assert len(store.plays) == 128 and len(store.tricks) == 32
+        for ri, rnd in enumerate(store.rounds):
+            bhr = archive["rs"][ri]["r"][0]["bhr"]
+            assert [source_mask(b) for b in bhr] == rnd["hands"].tolist()
+            assert rnd["result"] and rnd["winner"] in (1, 2)
+            # Recomputed winners agree with the archive, points add up to the deck
+            tricks = store.tricks[store.round_of(store.tricks) == ri]
+            assert (tricks["winner"] == tricks["won_by"]).all()
+            deck = sum(get_tables(str(rnd["mode"]), suit_symbol(rnd["trump"])).points)
+            assert tricks["points"].sum() == deck
+
+        # Every card leaves the hand it was played from, and was legal
+        plays = store.plays
+        hands = store.rounds["hands"][store.round_of(plays), plays["seat"] - 1]
+        played_before = plays["played"]
+        assert ((plays["hand"] | played_before) & hands == hands).all()
+        bit = np.uint32(1) << plays["card"].astype(np.uint32)
+        assert (plays["hand"] & bit).all() and (plays["legal"] & bit).all()
+        assert ((plays["pos"] == 0) == (plays["lead"] == -1)).all()
+
+    def test_bids_and_declarations(self, tmp_path):
+        _write(tmp_path / "games", "a.json", _random_archive(random.Random(2), n_rounds=2))
+        store = open_store(tmp_path / "games", tmp_path / "store")
+
+        assert set(store.bids["bid"]) >= {"pass"}
+        assert (store.bids["rb"][store.bids["bid"] != "pass"] > 0).all()
+        assert store.decls["name"].tolist() == ["sira", "sira"]
+        assert store.decls["val"].tolist() == [20, 20]
+        starts, stops = store.round_spans("bids")
+        assert stops.sum() - starts.sum() == len(store.bids)
+
+    def test_incremental_matches_rebuild(self, tmp_path):
+        rng = random.Random(3)
+        games = tmp_path / "games"
+        for name in ("b.json", "c.json", "d.json"):
+            _write(games, name, _random_archive(rng))
+        ingest(games, tmp_path / "store")
+
+        _write(games, "a.json", _random_archive(rng))  # new, sorts first
+        _write(games, "c.json", _random_archive(rng, n_rounds=1))  # changed
+        (games / "d.json").unlink()
+        stats = ingest(games, tmp_path / "store")
+        assert (stats["added"], stats["updated"], stats["removed"], stats["unchanged"]) == (1, 1, 1, 1)
+
+        ingest(games, tmp_path / "rebuilt")
+        store, rebuilt = ArchiveStore(tmp_path / "store"), ArchiveStore(tmp_path / "rebuilt")
+        for table in TABLES:
+            assert np.array_equal(store.table(table), rebuilt.table(table)), table
+        assert store.games["file"].tolist() == ["a.json", "b.json", "c.json"]
+
+    def test_unchanged_archive_is_not_rewritten(self, tmp_path):
+        _write(tmp_path / "games", "a.json", _random_archive(random.Random(4)))
+        ingest(tmp_path / "games", tmp_path / "store")
+        before = (tmp_path / "store" / "plays.npy").stat().st_mtime_ns
+
+        stats = ingest(tmp_path / "games", tmp_path / "store")
+        assert stats["unchanged"] == 1 and stats["added"] == 0
+        assert (tmp_path / "store" / "plays.npy").stat().st_mtime_ns == before
+
+    def test_bad_files_are_skipped_until_they_change(self, tmp_path):
+        games = tmp_path / "games"
+        _write(games, "good.json", _random_archive(random.Random(5)))
+        (games / "bad.json").write_text("not valid json", encoding="utf-8")
+        _write(games, "empty.json", {"v": 1})
+
+        assert ingest(games, tmp_path / "store")["failed"] == 2
+        assert ingest(games, tmp_path / "store")["failed"] == 2
+        store = ArchiveStore(tmp_path / "store")
+        assert store.games["file"].tolist() == ["good.json"]
+        assert store.manifest["failed"].keys() == {"bad.json", "empty.json"}
+
+    def test_missing_store_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            ArchiveStore(tmp_path / "nowhere")
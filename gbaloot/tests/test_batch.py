@@ -0,0 +1,126 @@
+"""Tests for the parallel, cached batch engine (gbaloot.core.batch)."""
+from __future__ import annotations
+
+import dataclasses
+import random
+
+from gbaloot.core.batch import Stage, run_stage
+from gbaloot.core.comparator import merge_scorecard
+from gbaloot.tests.test_archive_store import _random_archive, _write
+from gbaloot.tools.archive_bidding_validator import BIDDING_STAGE, validate_all_bidding
+from gbaloot.tools.archive_scoring_validator import SCORING_STAGE, validate_all
+from gbaloot.tools.run_archive_benchmark import ARCHIVE_COMPARE_STAGE
+
+CALLS: list[str] = []
+
+
+def _read(path):
+    CALLS.append("read")
+    text = path.read_text(encoding="utf-8")
+    if text == "boom":
+        raise ValueError("bad file")
+    return text
+
+
+def _shout(text):
+    CALLS.append("shout")
+    return text.upper()
+
+
+READ = Stage("read", 1, _read)
+SHOUT = Stage("shout", 1, _shout, after=READ)
+
+
+def _files(tmp_path, *texts):
+    paths = []
+    for i, text in enumerate(texts):
+        path = tmp_path / f"f{i}.txt"
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+# ── Tests: Stages ─────────────────────────────────────────────────────
+
+class TestRunStage:
+    """Test caching, versioning and error handling of run_stage."""
+
+    def test_unchanged_files_come_from_the_cache(self, tmp_path):
+        paths = _files(tmp_path, "a", "b", "c")
+        CALLS.clear()
+        first = run_stage(SHOUT, paths, cache_dir=tmp_path / "cache")
+        assert [i.value for i in first] == ["A", "B", "C"]
+        assert CALLS.count("read") == 3 and CALLS.count("shout") == 3
+
+        paths[1].write_text("changed", encoding="utf-8")
+        CALLS.clear()
+        second = run_stage(SHOUT, paths, cache_dir=tmp_path / "cache")
+        assert [i.value for i in second] == ["A", "CHANGED", "C"]
+        assert [i.cached for i in second] == [True, False, True]
+        assert CALLS == ["read", "shout"]
+
+    def test_version_bump_reuses_upstream_results(self, tmp_path):
+        paths = _files(tmp_path, "a", "b")
+        run_stage(SHOUT, paths, cache_dir=tmp_path / "cache")
+
+        CALLS.clear()
+        bumped = dataclasses.replace(SHOUT, version=2)
+        assert [i.value for i in run_stage(bumped, paths, cache_dir=tmp_path / "cache")] == ["A", "B"]
+        assert CALLS == ["shout", "shout"]
+
+    def test_failures_are_reported_and_cached(self, tmp_path):
+        paths = _files(tmp_path, "ok", "boom")
+        CALLS.clear()
+        items = run_stage(SHOUT, paths, cache_dir=tmp_path / "cache")
+        assert items[0].ok and items[0].value == "OK"
+        assert not items[1].ok and "bad file" in items[1].error
+        assert CALLS == ["read", "read", "shout"]  # shout never sees the failure
+
+        CALLS.clear()
+        again = run_stage(SHOUT, paths, cache_dir=tmp_path / "cache")
+        assert CALLS == [] and again[1].error == items[1].error
+
+    def test_pool_matches_serial_in_order(self, tmp_path):
+        paths = _files(tmp_path, *"abcdefgh")
+        serial = run_stage(SHOUT, paths)
+        pooled = run_stage(SHOUT, paths, workers=2)
+        assert [i.value for i in pooled] == [i.value for i in serial] == list("ABCDEFGH")
+        assert [i.path for i in pooled] == paths
+
+
+# ── Tests: Archive Tools ──────────────────────────────────────────────
+
+class TestArchiveTools:
+    """The batch-backed validators agree with a plain serial run."""
+
+    def test_validators_cached_and_pooled(self, tmp_path):
+        rng = random.Random(7)
+        games = tmp_path / "games"
+        for i in range(4):
+            _write(games, f"g{i}.json", _random_archive(rng))
+        (games / "bad.json").write_text("not json", encoding="utf-8")
+
+        plain = validate_all(games)
+        pooled = validate_all(games, workers=2, cache_dir=tmp_path / "cache")
+        cached = validate_all(games, cache_dir=tmp_path / "cache")
+        assert plain.total_games == 4
+        assert plain == pooled == cached
+
+        plain_bids = validate_all_bidding(games)
+        cached_bids = validate_all_bidding(games, cache_dir=tmp_path / "cache")
+        assert plain_bids == cached_bids and plain_bids.total_rounds == 12
+
+        # Both validators parsed each archive once between them
+        parsed = list((tmp_path / "cache" / "archive").rglob("*.pkl"))
+        assert len(parsed) == 5
+        assert SCORING_STAGE.after is BIDDING_STAGE.after
+
+    def test_archive_compare_stage(self, tmp_path):
+        _write(tmp_path / "games", "g.json", _random_archive(random.Random(8), n_rounds=2))
+        [item] = run_stage(ARCHIVE_COMPARE_STAGE, [tmp_path / "games" / "g.json"])
+        counts, report = item.value
+        assert report.total_tricks == 16 and report.total_divergences == 0
+        assert report.trick_comparisons == []  # Only divergent tricks are kept
+        scorecard = merge_scorecard([counts])
+        assert scorecard["trick_resolution"]["agreement_pct"] == 100.0
+        assert scorecard["point_calculation"]["total"] == 2
@@ -23,6 +23,8 @@ from gbaloot.core.comparator import (
     _get_card_points,
     _classify_severity,
     generate_scorecard,
+    merge_scorecard,
+    scorecard_counts,
 )
 
 
@@ -290,6 +292,13 @@ class TestCompareSession:
         assert report.winner_agreement_pct == 0.0
         assert len(comp.get_divergences()) == 1
 
+        # A report from another (worker) comparator records the same divergence
+        other = GameComparator()
+        other.record_divergences(report)
+        assert [d.to_dict() for d in other.get_divergences()] == [
+            d.to_dict() for d in comp.get_divergences()
+        ]
+
     def test_report_has_all_fields(self):
         events = self._make_session_events([{
             "cards": {0: 5, 1: 18, 2: 31, 3: 44},
@@ -401,3 +410,14 @@ class TestGenerateScorecard:
         scorecard = generate_scorecard([r1, r2])
         assert scorecard["sessions_analyzed"] == 2
         assert scorecard["total_tricks"] == 8
+
+    def test_counts_merge_incrementally(self):
+        full_round = [self._make_tc("SUN", True, round_idx=0, trick_num=i + 1) for i in range(8)]
+        r1 = self._make_report(full_round, "s1")
+        r2 = self._make_report([self._make_tc("HOKUM", False)] * 3, "s2")
+        merged = merge_scorecard([scorecard_counts(r1), scorecard_counts(r2)])
+        whole = generate_scorecard([r1, r2])
+        merged.pop("generated_at"), whole.pop("generated_at")
+        assert merged == whole
+        assert merged["point_calculation"]["total"] == 1
+        assert merged["hokum_mode"]["correct"] == 0
@@ -5,6 +5,7 @@ Covers: type parsing (null/bool/int/string/arrays/objects), compressed messages,
 action classification, hex conversion, truncated payloads, and edge cases.
 """
 import json
+import random
 import struct
 import tempfile
 import zlib
@@ -13,6 +14,7 @@ from pathlib import Path
 import pytest
 
 from gbaloot.core.decoder import (
+    ReferenceSFS2XDecoder,
     SFS2XDecoder,
     DecodeError,
     GameDecoder,
@@ -65,6 +67,45 @@ def _utf_str(s: str) -> bytes:
     return struct.pack(">H", len(raw)) + raw
 
 
+_NAMES = ["c", "p", "u", "cd", "hand", "score", "ملك", "\u2665A", ""]
+_PACKED = {0x0B: "h", 0x0C: "i", 0x0D: "q", 0x0E: "f", 0x0F: "d"}
+
+
+def _random_value(rng: random.Random, depth: int = 0) -> bytes:
+    """A random SFS2X value (type byte + payload) covering every type code."""
+    tc = rng.randrange(0x13 if depth < 3 else 0x11)
+    n = rng.randrange(12)
+    if tc == TYPE_NULL:
+        body = b""
+    elif tc in (TYPE_BOOL, TYPE_BYTE):
+        body = bytes([rng.randrange(256)])
+    elif tc in (TYPE_SHORT, TYPE_INT, TYPE_LONG, TYPE_FLOAT, TYPE_DOUBLE):
+        body = rng.randbytes([2, 4, 8, 4, 8][tc - TYPE_SHORT])
+    elif tc == TYPE_UTF_STRING:
+        body = _utf_str(rng.choice(_NAMES))
+    elif tc == 0x09:
+        body = struct.pack(">H", n) + bytes(rng.randrange(3) for _ in range(n))
+    elif tc == 0x0A:
+        body = struct.pack(">i", n) + rng.randbytes(n)
+    elif tc in _PACKED:
+        body = struct.pack(">H", n) + rng.randbytes(n * struct.calcsize(_PACKED[tc]))
+    elif tc == TYPE_UTF_STRING_ARRAY:
+        body = struct.pack(">H", n) + b"".join(_utf_str(rng.choice(_NAMES)) for _ in range(n))
+    elif tc == TYPE_SFS_ARRAY:
+        body = struct.pack(">H", n) + b"".join(_random_value(rng, depth + 1) for _ in range(n))
+    else:
+        body = struct.pack(">H", n) + b"".join(
+            _utf_str(rng.choice(_NAMES)) + _random_value(rng, depth + 1) for _ in range(n))
+    return bytes([tc]) + body
+
+
+def _random_message(rng: random.Random) -> bytes:
+    """A well-formed frame whose root object holds a few random fields."""
+    fields = [_utf_str(rng.choice(_NAMES)) + _random_value(rng, 1) for _ in range(rng.randrange(1, 6))]
+    body = bytes([TYPE_SFS_OBJECT]) + struct.pack(">H", len(fields)) + b"".join(fields)
+    return _build_sfs_message(body)
+
+
 # ── SFS2XDecoder Type Parsing ────────────────────────────────────────
 
 class TestSFS2XDecoderTypes:
@@ -235,6 +276,60 @@ class TestSFS2XDecoderEdgeCases:
         assert "<unknown_type_0xff>" in str(result["fields"]["x"])
 
 
+# ── Reference Equivalence ────────────────────────────────────────────
+
+def _outcome(decoder_cls, data: bytes, raw_body: bool = False) -> str:
+    """repr of the decode result or raised error (repr keeps NaN and -0.0 comparable)."""
+    try:
+        return repr(decoder_cls(data).decode(raw_body=raw_body))
+    except DecodeError as e:
+        return f"DecodeError: {e}"
+
+
+class TestReferenceEquivalence:
+    """The table-driven decoder must match the original on any input."""
+
+    def test_well_formed_messages(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            msg = _random_message(rng)
+            result = SFS2XDecoder(msg).decode()
+            assert result["bytes_consumed"] == len(msg)
+            assert _outcome(SFS2XDecoder, msg) == _outcome(ReferenceSFS2XDecoder, msg)
+
+    def test_truncated_and_corrupted_messages(self):
+        rng = random.Random(2)
+        for _ in range(1500):
+            msg = bytearray(_random_message(rng))
+            if rng.random() < 0.5:
+                del msg[rng.randrange(1, len(msg)):]
+            for _ in range(rng.randrange(3)):
+                msg[rng.randrange(len(msg))] = rng.randrange(256)
+            raw_body = rng.random() < 0.2
+            data = bytes(msg[3:] if raw_body else msg)
+            assert _outcome(SFS2XDecoder, data, raw_body) == _outcome(ReferenceSFS2XDecoder, data, raw_body)
+
+    def test_random_bytes(self):
+        rng = random.Random(3)
+        for _ in range(1500):
+            data = bytes([0x80, 0, 0, rng.choice([0x12, 0x11, rng.randrange(256)])]) + rng.randbytes(rng.randrange(40))
+            assert _outcome(SFS2XDecoder, data) == _outcome(ReferenceSFS2XDecoder, data)
+
+    def test_packed_arrays_fail_at_the_same_element(self):
+        body = struct.pack("B", TYPE_SFS_OBJECT) + struct.pack(">H", 1)
+        body += _utf_str("xs") + struct.pack("B", TYPE_INT_ARRAY)
+        body += struct.pack(">H", 4) + struct.pack(">3i", 1, 2, 3) + b"\x00\x01"
+        msg = _build_sfs_message(body)
+        result = SFS2XDecoder(msg).decode()
+        assert result["errors"] == ["Unexpected EOF: need 4 bytes at pos 25, only 2 left"]
+        assert result["bytes_consumed"] == 25
+        assert _outcome(SFS2XDecoder, msg) == _outcome(ReferenceSFS2XDecoder, msg)
+
+    def test_accepts_memoryview_input(self):
+        msg = _random_message(random.Random(4))
+        assert _outcome(SFS2XDecoder, memoryview(msg)) == _outcome(ReferenceSFS2XDecoder, msg)
+
+
 # ── Hex Conversion ───────────────────────────────────────────────────
 
 class TestHexConversion:
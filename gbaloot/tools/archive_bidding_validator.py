@@ -16,9 +16,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from gbaloot.core.batch import CACHE_DIR, Stage, run_stage
 from gbaloot.tools.archive_parser import (
+    PARSE_STAGE,
     parse_archive,
-    load_all_archives,
     ArchiveGame,
     ArchiveRound,
     EVT_ROUND_START,
@@ -486,7 +487,16 @@ def analyze_game_bidding(game: ArchiveGame) -> GameBiddingResult:
 
 # ── Full Pipeline ───────────────────────────────────────────────────
 
-def validate_all_bidding(archive_dir: Path) -> BiddingStatisticsReport:
+# Bump when analyze_game_bidding output changes; parsed archives are reused
+BIDDING_VERSION = 1
+BIDDING_STAGE = Stage("archive_bidding", BIDDING_VERSION, analyze_game_bidding, after=PARSE_STAGE)
+
+
+def validate_all_bidding(
+    archive_dir: Path,
+    workers: Optional[int] = 1,
+    cache_dir: Optional[Path] = None,
+) -> BiddingStatisticsReport:
     """Run bidding analysis across all archive files.
 
     Computes aggregate statistics, validates bidding rules, and
@@ -494,15 +504,17 @@ def validate_all_bidding(archive_dir: Path) -> BiddingStatisticsReport:
 
     Args:
         archive_dir: Path to savedGames directory.
+        workers: Analysis processes (None = all cores).
+        cache_dir: Batch cache root; None re-analyzes every file.
 
     Returns:
         BiddingStatisticsReport with all stats and per-game details.
     """
-    games = load_all_archives(archive_dir)
-    report = BiddingStatisticsReport(total_archives=len(games))
+    items = run_stage(BIDDING_STAGE, sorted(archive_dir.glob("*.json")), workers, cache_dir)
+    results = [item.value for item in items if item.ok]
+    report = BiddingStatisticsReport(total_archives=len(results))
 
-    for game in games:
-        gr = analyze_game_bidding(game)
+    for gr in results:
         report.games.append(gr)
         report.total_issues += len(gr.issues)
 
@@ -572,5 +584,5 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         archive_dir = Path(sys.argv[1])
 
-    report = validate_all_bidding(archive_dir)
+    report = validate_all_bidding(archive_dir, workers=None, cache_dir=CACHE_DIR)
     print(report.summary())
@@ -16,6 +16,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from gbaloot.core.batch import Stage, run_stage
+
 logger = logging.getLogger(__name__)
 
 # ── Constants ────────────────────────────────────────────────────────
@@ -163,23 +165,25 @@ def parse_archive(archive_path: Path) -> ArchiveGame:
     return game
 
 
-def load_all_archives(directory: Path) -> list[ArchiveGame]:
+def load_all_archives(
+    directory: Path,
+    workers: Optional[int] = 1,
+    cache_dir: Optional[Path] = None,
+) -> list[ArchiveGame]:
     """Load all archive JSON files from a directory.
 
     @param directory: Path to the savedGames directory.
+    @param workers: Parser processes (None = all cores).
+    @param cache_dir: Batch cache root; None parses every file.
     @returns List of parsed ArchiveGame objects.
     """
-    games: list[ArchiveGame] = []
-    files = sorted(directory.glob("*.json"))
+    items = run_stage(PARSE_STAGE, sorted(directory.glob("*.json")), workers, cache_dir)
+    return [item.value for item in items if item.ok]
 
-    for f in files:
-        try:
-            game = parse_archive(f)
-            games.append(game)
-        except Exception as e:
-            logger.warning("Failed to parse %s: %s", f.name, e)
 
-    return games
+# Bump when parse_archive output changes; every archive stage builds on it
+PARSER_VERSION = 1
+PARSE_STAGE = Stage("archive", PARSER_VERSION, parse_archive)
 
 
 # ── Internal Helpers ─────────────────────────────────────────────────
@@ -36,9 +36,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from gbaloot.core.batch import CACHE_DIR, Stage, run_stage
 from gbaloot.tools.archive_parser import (
+    PARSE_STAGE,
     parse_archive,
-    load_all_archives,
     ArchiveGame,
     ArchiveRound,
 )
@@ -690,16 +691,28 @@ def validate_game(game: ArchiveGame) -> GameValidation:
     return gv
 
 
-def validate_all(archive_dir: Path) -> ValidationReport:
+# Bump when validate_game output changes (a rule fix); parsed archives are reused
+VALIDATOR_VERSION = 1
+SCORING_STAGE = Stage("archive_scoring", VALIDATOR_VERSION, validate_game, after=PARSE_STAGE)
+
+
+def validate_all(
+    archive_dir: Path,
+    workers: Optional[int] = 1,
+    cache_dir: Optional[Path] = None,
+) -> ValidationReport:
     """Run validation across all archive files.
 
+    Games are validated in ``workers`` processes (None = all cores); with a
+    ``cache_dir`` only new or changed files are parsed and validated again.
+
     Returns a comprehensive ValidationReport.
     """
-    games = load_all_archives(archive_dir)
-    report = ValidationReport(total_games=len(games))
+    items = run_stage(SCORING_STAGE, sorted(archive_dir.glob("*.json")), workers, cache_dir)
+    validations = [item.value for item in items if item.ok]
+    report = ValidationReport(total_games=len(validations))
 
-    for game in games:
-        gv = validate_game(game)
+    for gv in validations:
         report.games.append(gv)
 
         report.total_rounds += gv.total_rounds
@@ -819,5 +832,5 @@ if __name__ == "__main__":
         archive_dir = Path(sys.argv[1])
 
     print(f"Validating archives in: {archive_dir}")
-    report = validate_all(archive_dir)
+    report = validate_all(archive_dir, workers=None, cache_dir=CACHE_DIR)
     print(format_report(report))
@@ -0,0 +1,513 @@
+"""
+Archive Store -- Columnar, memory-mapped copy of the mobile archives.
+
+Every data-mining pass used to ``json.load`` each savedGames file and walk
+its raw event list again.  ``ingest`` does that walk once per file and
+writes the results as NumPy structured arrays (one ``.npy`` per table) that
+``ArchiveStore`` opens with ``mmap_mode="r"``:
+
+    games   one row per archive file
+    rounds  contract, floor card, dealt hands and result of each round
+    bids    every e=2 bid event
+    plays   every e=4 card play, with the hand it was played from, the
+            legal moves and the trick it was played into
+    tricks  every e=6 trick boundary, with its winner and points
+    decls   every declaration listed in a round result (r1/r2)
+
+Cards are 32-bit masks in the engine layout of ``ai_worker.mcts.bitboard``
+(suits ♠♥♦♣ x ranks 7..A), so trick winners, points and legal moves come
+from the same tables the bots use.  Seats keep the archive's 1-4 numbering
+(teams: 1 = seats 1,3 and 2 = seats 2,4), and every row carries ``game``
+and ``round`` so tables join on those keys (see ``ArchiveStore.round_of``).
+
+Ingest is incremental: the manifest records each file's SHA-1, so only new
+or changed files are parsed and deleted files are dropped.  Rows are kept
+in file-name order, so an incremental store is identical to a rebuild.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ai_worker.mcts.bitboard import SUIT_INDEX, get_tables, legal_mask, mask_to_ids
+from game_engine.models.constants import SUITS, RANKS, POINT_VALUES_SUN, POINT_VALUES_HOKUM
+from gbaloot.core.card_mapping import SOURCE_SUITS, VALID_RANK_RANGE
+from gbaloot.tools.archive_parser import (
+    EVT_HAND_DEALT,
+    EVT_ROUND_START,
+    EVT_BID,
+    EVT_CARD_PLAYED,
+    EVT_TRICK_WON,
+    EVT_ROUND_RESULT,
+)
+
+logger = logging.getLogger(__name__)
+
+# ── Constants ────────────────────────────────────────────────────────
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ARCHIVE_DIR = DATA_DIR / "archive_captures" / "mobile_export" / "savedGames"
+STORE_DIR = DATA_DIR / "archive_store"
+
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Source card index (suit * 13 + rank, suits ♠♥♣♦, Baloot ranks at 5..12)
+# <-> engine card id (suit * 8 + rank, suits ♠♥♦♣, ranks 7..A)
+_ENGINE_SUIT = tuple(SUIT_INDEX[SOURCE_SUITS[s]] for s in range(4))
+ID_OF_SOURCE = np.full(52, -1, dtype=np.int8)
+SOURCE_OF_ID = np.zeros(32, dtype=np.int8)
+for _s in range(4):
+    for _r in VALID_RANK_RANGE:
+        ID_OF_SOURCE[_s * 13 + _r] = _ENGINE_SUIT[_s] * 8 + _r - VALID_RANK_RANGE.start
+        SOURCE_OF_ID[_ENGINE_SUIT[_s] * 8 + _r - VALID_RANK_RANGE.start] = _s * 13 + _r
+
+SUIT_MASKS = np.array([0xFF << (8 * s) for s in range(4)], dtype=np.uint32)
+RANK_MASKS: dict[str, int] = {
+    rank: sum(1 << (8 * s + r) for s in range(4)) for r, rank in enumerate(RANKS)
+}
+
+# Suit-named bids pick the trump directly; these bids mean no trump
+_SUIT_BIDS = {"spades": "♠", "hearts": "♥", "diamonds": "♦", "clubs": "♣"}
+_NO_TRUMP_BIDS = {"sun", "ashkal", "turntosun"}
+
+GAME_DTYPE = np.dtype([
+    ("game", "<i4"), ("file", "U128"), ("name", "U128"), ("session_id", "<i8"),
+    ("s1", "<i4"), ("s2", "<i4"), ("rounds", "<i2"),
+])
+ROUND_DTYPE = np.dtype([
+    ("game", "<i4"), ("round", "<i2"),
+    ("dealt", "?"), ("hands", "<u4", (4,)),      # e=15 hands of seats 1-4
+    ("dealer", "i1"), ("floor", "i1"),           # e=1 seat; floor card id or -1
+    ("t1s", "<i2"), ("t2s", "<i2"),              # e=1 team scores before the round
+    ("mode", "U5"), ("trump", "i1"),             # 'SUN'/'HOKUM'; engine suit or -1
+    ("ts", "i1"), ("bidder", "i1"),              # last raw bid ts; contract seat or -1
+    ("result", "?"), ("winner", "i1"), ("bid_team", "i1"),  # e=12 rs: w, b
+    ("p1", "<i2"), ("p2", "<i2"), ("s1", "<i2"), ("s2", "<i2"), ("kaboot", "i1"),
+])
+BID_DTYPE = np.dtype([
+    ("game", "<i4"), ("round", "<i2"), ("event", "<i4"), ("seat", "i1"),
+    ("bid", "U16"), ("gm", "i1"), ("ts", "i1"), ("rb", "i1"), ("gem", "i1"),
+])
+PLAY_DTYPE = np.dtype([
+    ("game", "<i4"), ("round", "<i2"), ("event", "<i4"),
+    ("trick", "i1"), ("pos", "i1"), ("seat", "i1"), ("card", "i1"),
+    ("hand", "<u4"), ("legal", "<u4"),           # before the play
+    ("table", "<u4"), ("played", "<u4"),         # trick so far; round so far
+    ("lead", "i1"), ("winning", "i1"),           # lead suit or -1; winning seat or 0
+])
+TRICK_DTYPE = np.dtype([
+    ("game", "<i4"), ("round", "<i2"), ("event", "<i4"), ("trick", "i1"),
+    ("cards", "<u4"), ("count", "i1"), ("leader", "i1"),
+    ("winner", "i1"), ("won_by", "i1"),          # computed; the e=6 event's p
+    ("points", "<i2"),
+])
+DECL_DTYPE = np.dtype([
+    ("game", "<i4"), ("round", "<i2"), ("team", "i1"), ("name", "U16"), ("val", "<i4"),
+])
+
+TABLES: dict[str, np.dtype] = {
+    "games": GAME_DTYPE,
+    "rounds": ROUND_DTYPE,
+    "bids": BID_DTYPE,
+    "plays": PLAY_DTYPE,
+    "tricks": TRICK_DTYPE,
+    "decls": DECL_DTYPE,
+}
+
+
+# ── Card Helpers ─────────────────────────────────────────────────────
+
+def source_mask(bitmask: int) -> int:
+    """Convert a 52-bit source hand bitmask to a 32-bit engine card mask.
+
+    @param bitmask: Source bitmask (bit ``suit * 13 + rank``).
+    @returns Engine mask; non-Baloot ranks are dropped.
+    """
+    mask = 0
+    for s in range(4):
+        mask |= ((bitmask >> (s * 13 + VALID_RANK_RANGE.start)) & 0xFF) << (8 * _ENGINE_SUIT[s])
+    return mask
+
+
+def mask_to_source(mask: int) -> list[int]:
+    """Sorted source card indices of an engine card mask."""
+    return sorted(int(SOURCE_OF_ID[c]) for c in mask_to_ids(int(mask)))
+
+
+def suit_symbol(suit: int) -> Optional[str]:
+    """Engine suit index -> symbol, or None for -1 (no trump / no lead)."""
+    return SUITS[suit] if suit >= 0 else None
+
+
+def popcount(masks) -> np.ndarray:
+    """Vectorised number of set bits of a uint32 mask array."""
+    m = np.asarray(masks, dtype=np.uint32)
+    m = m - ((m >> 1) & 0x55555555)
+    m = (m & 0x33333333) + ((m >> 2) & 0x33333333)
+    m = (m + (m >> 4)) & 0x0F0F0F0F
+    return ((m * np.uint32(0x01010101)) >> 24).astype(np.int64)
+
+
+def suit_lengths(masks) -> np.ndarray:
+    """(n, 4) cards held per engine suit for a uint32 mask array."""
+    m = np.asarray(masks, dtype=np.uint32)
+    return np.stack([popcount(m & SUIT_MASKS[s]) for s in range(4)], axis=-1)
+
+
+def hand_metrics(masks, trump) -> dict[str, np.ndarray]:
+    """Vectorised hand-strength counts of uint32 hand masks.
+
+    Point values use the flat rank scales (every J is 20 in ``point_value_hokum``),
+    as the bidding tables were built.
+
+    @param masks: Hand masks (any shape).
+    @param trump: Engine trump suit per hand, -1 for none (broadcast to ``masks``).
+    @returns Arrays shaped like ``masks``: trump_count, aces, kings, queens,
+        jacks, high_cards, point_value_sun, point_value_hokum, voids,
+        singletons, longest_suit; plus suit_lengths with a trailing axis of 4.
+    """
+    m = np.asarray(masks, dtype=np.uint32)
+    lengths = suit_lengths(m)
+    by_rank = {rank: popcount(m & np.uint32(RANK_MASKS[rank])) for rank in RANKS}
+    trump = np.broadcast_to(np.asarray(trump, dtype=np.int64), m.shape)
+    trump_len = np.take_along_axis(lengths, np.maximum(trump, 0)[..., None], axis=-1)[..., 0]
+    high = by_rank["A"] + by_rank["K"] + by_rank["Q"] + by_rank["J"]
+    return {
+        "trump_count": np.where(trump >= 0, trump_len, 0),
+        "aces": by_rank["A"], "kings": by_rank["K"], "queens": by_rank["Q"], "jacks": by_rank["J"],
+        "high_cards": high,
+        "point_value_sun": sum(by_rank[r] * POINT_VALUES_SUN[r] for r in RANKS),
+        "point_value_hokum": sum(by_rank[r] * POINT_VALUES_HOKUM[r] for r in RANKS),
+        "voids": (lengths == 0).sum(axis=-1),
+        "singletons": (lengths == 1).sum(axis=-1),
+        "longest_suit": lengths.max(axis=-1),
+        "suit_lengths": lengths,
+    }
+
+
+# ── Ingest ───────────────────────────────────────────────────────────
+
+def ingest(
+    archive_dir: Path = ARCHIVE_DIR,
+    store_dir: Path = STORE_DIR,
+    force: bool = False,
+) -> dict:
+    """Bring the store in line with the archive files on disk.
+
+    Files whose SHA-1 matches the manifest keep their rows; new and changed
+    files are parsed; rows of deleted files are dropped.  Files that fail
+    to parse are logged and remembered by hash, so they are not retried
+    until they change.
+
+    @param archive_dir: Directory of ``*.json`` archive files.
+    @param store_dir: Store directory (created if missing).
+    @param force: Re-parse every file.
+    @returns Counts: added, updated, removed, unchanged, failed, games.
+    """
+    archive_dir, store_dir = Path(archive_dir), Path(store_dir)
+    manifest = {} if force else _read_manifest(store_dir)
+    known = manifest.get("files", {})
+    failed_before = manifest.get("failed", {})
+
+    files, failed = {}, {}
+    parsed: dict[str, dict[str, np.ndarray]] = {}
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "failed": 0}
+    for path in sorted(archive_dir.glob("*.json")):
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        entry = known.get(path.name)
+        if entry and entry["sha1"] == digest:
+            files[path.name] = dict(entry)
+            stats["unchanged"] += 1
+            continue
+        if failed_before.get(path.name) == digest:
+            failed[path.name] = digest
+            stats["failed"] += 1
+            continue
+        try:
+            parsed[path.name] = _parse_file(raw, path.name)
+        except Exception as e:
+            logger.warning("Failed to ingest %s: %s", path.name, e)
+            failed[path.name] = digest
+            stats["failed"] += 1
+            continue
+        files[path.name] = {"sha1": digest, "game": -1}
+        stats["updated" if entry else "added"] += 1
+    stats["removed"] = len(set(known) - set(files) - set(failed))
+
+    changed = parsed or stats["removed"] or failed != failed_before
+    if changed or not (store_dir / MANIFEST_NAME).exists():
+        tables = _merge(files, known, parsed, store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        for name, rows in tables.items():
+            tmp = store_dir / f"{name}.npy.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, rows)
+            os.replace(tmp, store_dir / f"{name}.npy")
+        manifest = {
+            "version": STORE_VERSION,
+            "files": files,
+            "failed": failed,
+            "rows": {name: len(rows) for name, rows in tables.items()},
+        }
+        tmp = store_dir / f"{MANIFEST_NAME}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, store_dir / MANIFEST_NAME)
+    stats["games"] = len(files)
+    return stats
+
+
+def open_store(
+    archive_dir: Path = ARCHIVE_DIR,
+    store_dir: Path = STORE_DIR,
+    refresh: bool = True,
+) -> "ArchiveStore":
+    """Ingest any new or changed archives (unless ``refresh`` is False) and open the store."""
+    if refresh:
+        stats = ingest(archive_dir, store_dir)
+        logger.info("Archive store: %s", stats)
+    return ArchiveStore(store_dir)
+
+
+def _read_manifest(store_dir: Path) -> dict:
+    path = store_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != STORE_VERSION:
+        logger.info("Archive store version changed, rebuilding")
+        return {}
+    return manifest
+
+
+def _merge(files: dict, known: dict, parsed: dict, store_dir: Path) -> dict:
+    """Assign game ids in file-name order and assemble every table."""
+    old = ArchiveStore(store_dir) if known else None
+    order = sorted(files)
+    new_id = {name: i for i, name in enumerate(order)}
+    # Old game id -> new game id for files whose rows are kept
+    remap = np.full(max((e["game"] for e in known.values()), default=-1) + 1, -1, dtype=np.int64)
+    for name in order:
+        if name not in parsed:
+            remap[known[name]["game"]] = new_id[name]
+    for name in order:
+        files[name]["game"] = new_id[name]
+
+    tables = {}
+    for table, dtype in TABLES.items():
+        parts = []
+        if old is not None and len(remap):
+            rows = old.table(table)
+            ids = remap[rows["game"]]
+            keep = ids >= 0
+            if keep.any():
+                rows = np.array(rows[keep])
+                rows["game"] = ids[keep]
+                parts.append(rows)
+        for name, rows_by_table in parsed.items():
+            rows = rows_by_table[table]
+            rows["game"] = new_id[name]
+            parts.append(rows)
+        rows = np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+        tables[table] = rows[np.argsort(rows["game"], kind="stable")]
+    return tables
+
+
+def _parse_file(raw: bytes, file_name: str) -> dict[str, np.ndarray]:
+    """Walk one archive's events into rows of every table (``game`` left at 0)."""
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected JSON object, got {type(data).__name__}")
+    raw_rounds = data.get("rs")
+    if not isinstance(raw_rounds, list):
+        raise ValueError("Missing 'rs' (rounds) array in archive")
+
+    rows: dict[str, list] = {table: [] for table in TABLES}
+    rows["games"].append((
+        0, file_name, str(data.get("n", file_name)), int(data.get("Id") or 0),
+        int(data.get("s1") or 0), int(data.get("s2") or 0), len(raw_rounds),
+    ))
+    for ri, raw_round in enumerate(raw_rounds):
+        events = raw_round.get("r") if isinstance(raw_round, dict) else None
+        if isinstance(events, list):
+            _parse_round(ri, [(i, ev) for i, ev in enumerate(events) if isinstance(ev, dict)], rows)
+
+    return {table: np.array(rows[table], dtype=dtype) for table, dtype in TABLES.items()}
+
+
+def _parse_round(ri: int, events: list[tuple[int, dict]], rows: dict[str, list]) -> None:
+    """Append one round's rows; ``events`` are (index in the round, event) pairs."""
+    # First pass: deal, round start, bids and result
+    hands, dealt = [0, 0, 0, 0], False
+    fc, dealer, t1s, t2s = None, 1, 0, 0
+    mode, ts, bidder = "SUN", -1, -1
+    bids: list[str] = []
+    result, seen = None, set()
+    for ev_idx, ev in events:
+        e = ev.get("e")
+        if e == EVT_HAND_DEALT and e not in seen:
+            bhr = ev.get("bhr") or []
+            for si in range(min(4, len(bhr))):
+                hands[si] = source_mask(int(bhr[si]))
+            dealt = len(bhr) >= 4
+        elif e == EVT_ROUND_START and e not in seen:
+            fc = ev.get("fc")
+            dealer = int(ev.get("p") or 1)
+            t1s, t2s = int(ev.get("t1s") or 0), int(ev.get("t2s") or 0)
+        elif e == EVT_ROUND_RESULT and e not in seen:
+            rs = ev.get("rs", {})
+            result = rs if isinstance(rs, dict) else None
+        elif e == EVT_BID:
+            gm, bid = ev.get("gm"), str(ev.get("b", ""))
+            if gm == 2:
+                mode = "HOKUM"
+            elif gm in (1, 3):
+                mode = "SUN"
+            if ev.get("ts") is not None:
+                ts = int(ev["ts"])
+            rb = ev.get("rb", -1)
+            if rb is not None and rb > 0:
+                bidder = int(rb)
+            bids.append(bid)
+            rows["bids"].append((
+                0, ri, ev_idx, int(ev.get("p") or 0), bid, _opt(gm), _opt(ev.get("ts")),
+                _opt(ev.get("rb")), _opt(ev.get("gem")),
+            ))
+        seen.add(e)
+
+    trump = _contract_trump(bids, fc)
+    floor = int(ID_OF_SOURCE[fc]) if isinstance(fc, int) and 0 <= fc < 52 else -1
+    res = result or {}
+    rows["rounds"].append((
+        0, ri, dealt, hands, dealer, floor, t1s, t2s, mode, trump, ts, bidder,
+        result is not None, int(res.get("w") or 0), int(res.get("b") or 0),
+        int(res.get("p1") or 0), int(res.get("p2") or 0),
+        int(res.get("s1") or 0), int(res.get("s2") or 0), int(bool(res.get("kbt"))),
+    ))
+    for team, key in ((1, "r1"), (2, "r2")):
+        for d in res.get(key) or []:
+            if isinstance(d, dict):
+                name = d.get("n")
+                rows["decls"].append((0, ri, team, "" if name is None else str(name),
+                                      int(d.get("val") or 0)))
+
+    # Second pass: follow every hand through the tricks
+    tables = get_tables(mode, suit_symbol(trump))
+    current, played = list(hands), 0
+    trick_no, trick = 0, []
+    for ev_idx, ev in events:
+        e = ev.get("e")
+        if e == EVT_TRICK_WON:
+            winner = _winner(tables, trick) if trick else 0
+            cards = sum(1 << c for _, c in trick)
+            rows["tricks"].append((
+                0, ri, ev_idx, trick_no, cards, len(trick), trick[0][0] if trick else 0,
+                winner, int(ev.get("p") or 0), sum(tables.points[c] for _, c in trick),
+            ))
+            trick_no += 1
+            trick = []
+        elif e == EVT_CARD_PLAYED:
+            seat, src = ev.get("p", 0), ev.get("c", -1)
+            if not (1 <= seat <= 4) or not isinstance(src, int) or not 0 <= src < 52:
+                continue
+            card = int(ID_OF_SOURCE[src])
+            if card < 0:
+                continue
+            hand = current[seat - 1]
+            rows["plays"].append((
+                0, ri, ev_idx, trick_no, len(trick), seat, card, hand,
+                legal_mask(tables, hand, trick), sum(1 << c for _, c in trick), played,
+                trick[0][1] >> 3 if trick else -1, _winner(tables, trick) if trick else 0,
+            ))
+            current[seat - 1] &= ~(1 << card)
+            played |= 1 << card
+            trick.append((seat, card))
+
+
+def _contract_trump(bids: list[str], fc) -> int:
+    """Trump suit from the bid names: a suit bid, else the floor card's suit for 'hokom'."""
+    for bid in bids:
+        if bid in _SUIT_BIDS:
+            return SUIT_INDEX[_SUIT_BIDS[bid]]
+        if bid in _NO_TRUMP_BIDS:
+            return -1
+    if "hokom" in bids and isinstance(fc, int) and fc // 13 in SOURCE_SUITS:
+        return _ENGINE_SUIT[fc // 13]
+    return -1
+
+
+def _winner(tables, trick: list[tuple[int, int]]) -> int:
+    """Seat holding the trick so far (the first of equal strengths wins)."""
+    strength = tables.strength[trick[0][1] >> 3]
+    best_seat, best = trick[0][0], -2
+    for seat, card in trick:
+        if strength[card] > best:
+            best_seat, best = seat, strength[card]
+    return best_seat
+
+
+def _round_key(rows: np.ndarray) -> np.ndarray:
+    return (rows["game"].astype(np.int64) << 16) | rows["round"]
+
+
+def _opt(value) -> int:
+    """Optional small int field -> int, -1 when missing."""
+    return -1 if value is None else int(value)
+
+
+# ── Reading ──────────────────────────────────────────────────────────
+
+class ArchiveStore:
+    """Read-only view of an ingested store; tables are memory-mapped on first use.
+
+    @param path: Store directory written by ``ingest``.
+    @raises FileNotFoundError: If the store has not been ingested yet.
+    @raises ValueError: If it was written by another store version.
+    """
+
+    def __init__(self, path: Path = STORE_DIR):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Archive store version {self.manifest.get('version')}, "
+                             f"expected {STORE_VERSION}: re-run ingest")
+        self._tables: dict[str, np.ndarray] = {}
+        self._round_keys: Optional[np.ndarray] = None
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in TABLES:
+            return self.table(name)
+        raise AttributeError(name)
+
+    def table(self, name: str) -> np.ndarray:
+        """One table as a structured array (memory-mapped when non-empty)."""
+        rows = self._tables.get(name)
+        if rows is None:
+            path = self.path / f"{name}.npy"
+            rows = np.load(path, mmap_mode="r") if self.manifest["rows"].get(name) else np.load(path)
+            self._tables[name] = rows
+        return rows
+
+    def round_of(self, rows: np.ndarray) -> np.ndarray:
+        """Index into ``rounds`` of each row of another table (a vectorised join)."""
+        if self._round_keys is None:
+            self._round_keys = _round_key(self.rounds)
+        return np.searchsorted(self._round_keys, _round_key(rows))
+
+    def round_spans(self, table: str) -> tuple[np.ndarray, np.ndarray]:
+        """(start, stop) row range of ``table`` for each row of ``rounds``."""
+        keys = _round_key(self.table(table))
+        if self._round_keys is None:
+            self._round_keys = _round_key(self.rounds)
+        return (np.searchsorted(keys, self._round_keys, side="left"),
+                np.searchsorted(keys, self._round_keys, side="right"))
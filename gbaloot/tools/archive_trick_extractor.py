@@ -25,6 +25,8 @@ from typing import Optional
 
 from game_engine.models.constants import ORDER_SUN, ORDER_HOKUM
 
+from gbaloot.core.batch import Stage
+
 from gbaloot.core.card_mapping import (
     index_to_card,
     SUIT_SYMBOL_TO_IDX,
@@ -36,6 +38,7 @@ from gbaloot.core.trick_extractor import (
     ExtractionResult,
 )
 from gbaloot.tools.archive_parser import (
+    PARSE_STAGE,
     parse_archive,
     ArchiveGame,
     ArchiveRound,
@@ -105,6 +108,11 @@ def extract_tricks_from_game(game: ArchiveGame) -> ExtractionResult:
     )
 
 
+# Bump when extraction output changes; parsed archives are reused
+EXTRACTOR_VERSION = 1
+TRICKS_STAGE = Stage("archive_tricks", EXTRACTOR_VERSION, extract_tricks_from_game, after=PARSE_STAGE)
+
+
 # ── Round Extraction ────────────────────────────────────────────────
 
 def _extract_round(
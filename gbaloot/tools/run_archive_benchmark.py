@@ -2,11 +2,18 @@
 GBaloot Archive Benchmark Runner -- Compare 109 source platform mobile archive
 sessions against our game engine's trick resolution logic.
 
+Archives are extracted and compared in a process pool, and each file's
+report is cached by content hash (see gbaloot.core.batch), so a re-run
+over an unchanged corpus only loads the cached reports and merges their
+scorecard counts.
+
 Usage:
-    python -m gbaloot.tools.run_archive_benchmark
+    python -m gbaloot.tools.run_archive_benchmark [--workers N] [--no-cache]
 """
 from __future__ import annotations
 
+import argparse
+import dataclasses
 import json
 import logging
 import sys
@@ -17,16 +24,17 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from gbaloot.core.batch import CACHE_DIR, Stage, run_stage
 from gbaloot.core.card_mapping import map_game_mode, suit_idx_to_symbol
 from gbaloot.core.comparator import (
     GameComparator,
     ComparisonReport,
     TrickComparison,
-    generate_scorecard,
+    merge_scorecard,
+    scorecard_counts,
 )
 from gbaloot.core.trick_extractor import ExtractionResult
-from gbaloot.tools.archive_parser import parse_archive, ArchiveGame
-from gbaloot.tools.archive_trick_extractor import extract_tricks_from_archive
+from gbaloot.tools.archive_trick_extractor import TRICKS_STAGE
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -121,10 +129,33 @@ def compare_extraction(
     )
 
 
+def _compare_archive(extraction: ExtractionResult) -> tuple[dict, ComparisonReport]:
+    """Batch stage body: scorecard counts and divergences of one archive.
+
+    The report keeps only its divergent tricks; the counts carry the rest
+    of the scorecard, so cached results stay small and quick to load.
+    """
+    report = compare_extraction(extraction, GameComparator())
+    counts = scorecard_counts(report)
+    divergent = [tc for tc in report.trick_comparisons if not tc.winner_agrees]
+    return counts, dataclasses.replace(report, trick_comparisons=divergent)
+
+
+# Bump when compare_extraction output changes
+ARCHIVE_COMPARE_VERSION = 1
+ARCHIVE_COMPARE_STAGE = Stage(
+    "archive_compare", ARCHIVE_COMPARE_VERSION, _compare_archive, after=TRICKS_STAGE
+)
+
+
 # ── Main ─────────────────────────────────────────────────────────────
 
-def main():
-    """Run the archive benchmark."""
+def main(workers: int | None = None, use_cache: bool = True):
+    """Run the archive benchmark.
+
+    @param workers: Processes for uncached archives (None = all cores).
+    @param use_cache: Reuse per-archive results from the batch cache.
+    """
     print("=" * 65)
     print("  GBaloot Archive Benchmark -- 109 source platform Mobile Sessions")
     print("=" * 65)
@@ -144,28 +175,29 @@ def main():
     start = time.time()
 
     print("Running comparisons...")
-    for i, archive_file in enumerate(archive_files):
-        try:
-            extraction = extract_tricks_from_archive(archive_file)
-            if extraction.total_tricks == 0:
-                parse_errors.append(f"{archive_file.name}: 0 tricks extracted")
-                continue
-            report = compare_extraction(extraction, comparator)
-            reports.append(report)
-
-            # Progress indicator
-            if (i + 1) % 20 == 0:
-                print(f"  Processed {i + 1}/{len(archive_files)}...")
-
-        except Exception as e:
-            parse_errors.append(f"{archive_file.name}: {e}")
+    items = run_stage(
+        ARCHIVE_COMPARE_STAGE, archive_files, workers,
+        CACHE_DIR if use_cache else None,
+    )
+    counts: list[dict] = []
+    for item in items:
+        if not item.ok:
+            parse_errors.append(f"{item.path.name}: {item.error}")
+        elif item.value[1].total_tricks == 0:
+            parse_errors.append(f"{item.path.name}: 0 tricks extracted")
+        else:
+            counts.append(item.value[0])
+            reports.append(item.value[1])
+            comparator.record_divergences(item.value[1])
+    cached = sum(item.cached for item in items)
+    print(f"  {len(items) - cached} compared, {cached} from cache")
 
     elapsed = time.time() - start
     print(f"Completed in {elapsed:.2f}s")
     print()
 
     # Generate scorecard
-    scorecard = generate_scorecard(reports)
+    scorecard = merge_scorecard(counts)
 
     # ── Print Summary ────────────────────────────────────────────────
     print("=" * 65)
@@ -299,4 +331,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Archive trick-resolution benchmark")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="recompare every archive")
+    args = parser.parse_args()
+    main(workers=args.workers, use_cache=not args.no_cache)
@@ -0,0 +1,26 @@
+"""
+scripts/benchmarks — Micro-benchmarks of the engine primitives, with a baseline.
+
+Each case in cases.py times one primitive (move legality, trick winner,
+round scoring, serializer round trip, BotContext, FastGame rollouts, MCTS,
+SFS2X decoding) on fixtures built from fixed seeds, so every run measures
+the same work. The runner writes the results to JSON and compares them
+with baseline.json; a case slower than its baseline by more than the
+tolerance fails the run.
+
+Timings are divided by a fixed pure-Python calibration loop measured in
+the same run, so a baseline recorded on one machine stays meaningful on
+another of a different speed. A case over its limit is timed again
+(``--confirm`` times) and only fails if it stays slow, so one busy moment
+on the host does not fail the run; the exit status is 1 on a regression.
+
+    PYTHONPATH=. python -m scripts.benchmarks                   # run + compare
+    PYTHONPATH=. python -m scripts.benchmarks --update-baseline
+    PYTHONPATH=. python -m scripts.benchmarks --only mcts --tolerance 0.5
+"""
+from scripts.benchmarks.cases import CASES
+from scripts.benchmarks.runner import (
+    compare, keep_fastest, load_results, run_suite, save_results,
+)
+
+__all__ = ['CASES', 'compare', 'keep_fastest', 'load_results', 'run_suite', 'save_results']
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+
+from scripts.benchmarks.cases import CASES, quiet_engine_logs
+from scripts.benchmarks.runner import (
+    BASELINE_FILE, DEFAULT_REPEATS, DEFAULT_TOLERANCE,
+    compare, keep_fastest, load_results, run_suite, save_results,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scripts.benchmarks',
+                                     description="Engine micro-benchmarks with a regression gate")
+    parser.add_argument('--only', action='append', default=[],
+                        help="Run cases whose name contains this (repeatable)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown vs the baseline (0.25 = 25%%)")
+    parser.add_argument('--confirm', type=int, default=2,
+                        help="Times a slow case is re-measured before it counts as a regression")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--output', help="Write this run's results to a JSON file")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store this run as the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.only or any(o.lower() in c.name.lower() for o in args.only)]
+    if not cases:
+        parser.error(f"no case matches {args.only}")
+
+    quiet_engine_logs()
+    print("--- BENCHMARKING ENGINE PRIMITIVES ---")
+    results = run_suite(cases, repeats=args.repeats)
+
+    if args.update_baseline:
+        if args.output:
+            save_results(results, args.output)
+        if os.path.exists(args.baseline) and args.only:
+            # Partial run: keep the other cases' baselines
+            merged = load_results(args.baseline)
+            merged['results'].update(results['results'])
+            results = dict(results, results=merged['results'])
+        save_results(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 1
+    baseline = load_results(args.baseline)
+    for _ in range(args.confirm):
+        suspects = {name for name, _, _, status in compare(results, baseline, cases, args.tolerance)
+                    if status == 'REGRESSION'}
+        if not suspects:
+            break
+        print(f"Re-measuring {', '.join(sorted(suspects))}")
+        keep_fastest(results, run_suite([c for c in cases if c.name in suspects], repeats=args.repeats))
+    if args.output:
+        save_results(results, args.output)
+
+    print()
+    print(f"vs baseline of {baseline['created']} (calibration {baseline['calibration_ns'] / 1e6:.1f} ms "
+          f"then, {results['calibration_ns'] / 1e6:.1f} ms now)")
+    regressions = 0
+    for name, ratio, limit, status in compare(results, baseline, cases, args.tolerance):
+        if ratio is None:
+            print(f"{name:40s}      (new)")
+            continue
+        regressions += status == 'REGRESSION'
+        print(f"{name:40s} {ratio:6.2f}x  (limit {1 + limit:.2f}x)  {status}")
+
+    if regressions:
+        print(f"RESULT: ❌ REGRESSION ({regressions} case(s) slower than the baseline allows)")
+        return 1
+    print("RESULT: ✅ VIABLE (Every primitive within tolerance of its baseline)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Benchmark cases: seeded fixtures and the timed work for each primitive.
+
+A case is ``Case(name, setup, tolerance)``; ``setup(seed)`` builds its
+fixtures and returns ``(run, ops)``: ``run()`` does ``ops`` operations and
+is what gets timed.
+"""
+import logging
+import random
+from collections import namedtuple
+
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+
+Case = namedtuple('Case', 'name setup tolerance')
+
+POSITIONS = ['Bottom', 'Right', 'Top', 'Left']
+TEAM_MAP = {'Bottom': 'us', 'Right': 'them', 'Top': 'us', 'Left': 'them'}
+
+
+# ── Fixtures ──────────────────────────────────────────────────────
+
+def _deals(n, seed):
+    """n seeded (hands, mode, trump) deals, alternating SUN and HOKUM."""
+    rng = random.Random(seed)
+    deals = []
+    for i in range(n):
+        deck = [Card(s, r) for s in SUITS for r in RANKS]
+        rng.shuffle(deck)
+        mode = 'HOKUM' if i % 2 else 'SUN'
+        deals.append(([deck[k * 8:(k + 1) * 8] for k in range(4)], mode, SUITS[i % 4] if mode == 'HOKUM' else None))
+    return deals
+
+
+def _games(n, seed, plays):
+    """
+    n Games with seeded deals, a SUN contract, and ``plays`` cards played
+    (each seat plays its first legal card).
+    """
+    from game_engine.logic.game import Game
+    from game_engine.logic.validation import is_move_legal
+
+    games = []
+    for i in range(n):
+        game = Game(f"bench_{seed}_{i}")
+        game.deal_rng = random.Random(seed * 1000 + i)
+        for p in range(4):
+            game.add_player(f"p{p}", f"Player {p}")
+        game.start_game()
+        game.handle_bid(game.current_turn, 'SUN')
+        for _ in range(plays):
+            seat = game.current_turn
+            hand = game.players[seat].hand
+            idx = next(k for k, c in enumerate(hand) if is_move_legal(
+                c, hand, game.table_cards, game.game_mode, game.trump_suit, TEAM_MAP[POSITIONS[seat]], TEAM_MAP))
+            game.play_card(seat, idx)
+        games.append(game)
+    return games
+
+
+def _first_legal_tricks(hands, mode, trump):
+    """Plays a deal out (first legal card each turn): [(table, winner position)]."""
+    from game_engine.logic.trick_resolver import TrickResolver
+    from game_engine.logic.validation import is_move_legal
+
+    hands = [h[:] for h in hands]
+    leader, tricks = 0, []
+    for _ in range(8):
+        table = []
+        for k in range(4):
+            seat = (leader + k) % 4
+            hand = hands[seat]
+            card = next(c for c in hand if is_move_legal(
+                c, hand, table, mode, trump, TEAM_MAP[POSITIONS[seat]], TEAM_MAP))
+            hand.remove(card)
+            table.append({'card': card, 'playedBy': POSITIONS[seat]})
+        leader = POSITIONS.index(table[TrickResolver.get_trick_winner(table, mode, trump)]['playedBy'])
+        tricks.append((table, POSITIONS[leader]))
+    return tricks
+
+
+# ── Cases ─────────────────────────────────────────────────────────
+
+def move_legality(seed):
+    from game_engine.logic.validation import is_move_legal
+
+    rng = random.Random(seed)
+    calls = []
+    for hands, mode, trump in _deals(64, seed):
+        leader = rng.randrange(4)
+        table = [{'card': hands[(leader + k) % 4][rng.randrange(8)], 'playedBy': POSITIONS[(leader + k) % 4]}
+                 for k in range(rng.randrange(4))]
+        seat = (leader + len(table)) % 4
+        team = TEAM_MAP[POSITIONS[seat]]
+        calls.extend((card, hands[seat], table, mode, trump, team) for card in hands[seat])
+
+    def run():
+        for card, hand, table, mode, trump, team in calls:
+            is_move_legal(card, hand, table, mode, trump, team, TEAM_MAP)
+    return run, len(calls)
+
+
+def trick_winner(seed):
+    from game_engine.logic.trick_resolver import TrickResolver
+
+    tricks = [(table, mode, trump) for hands, mode, trump in _deals(32, seed)
+              for table, _ in _first_legal_tricks(hands, mode, trump)]
+
+    def run():
+        for table, mode, trump in tricks:
+            TrickResolver.get_trick_winner(table, mode, trump)
+    return run, len(tricks)
+
+
+def round_scoring(seed):
+    from game_engine.logic.game import Game
+    from game_engine.logic.trick_resolver import TrickResolver
+
+    engines = []
+    for i, (hands, mode, trump) in enumerate(_deals(32, seed)):
+        game = Game(f"bench_score_{i}")
+        for p in range(4):
+            game.add_player(f"p{p}", f"Player {p}")
+        game.game_mode = mode
+        game.trump_suit = trump
+        game.bid = {'type': mode, 'bidder': POSITIONS[i % 4], 'suit': trump}
+        game.round_history = [
+            {'winner': winner, 'points': sum(TrickResolver.get_card_points(t['card'], mode, trump) for t in table),
+             'cards': [t['card'].to_dict() for t in table], 'playedBy': [t['playedBy'] for t in table]}
+            for table, winner in _first_legal_tricks(hands, mode, trump)]
+        engines.append(game.scoring_engine)
+
+    def run():
+        for engine in engines:
+            engine.calculate_final_scores()
+    return run, len(engines)
+
+
+def serializer_round_trip(seed):
+    from game_engine.logic.game_serializer import deserialize_sections, serialize_sections
+
+    games = _games(16, seed, plays=13)
+
+    def run():
+        for game in games:
+            deserialize_sections(serialize_sections(game))
+    return run, len(games)
+
+
+def bot_context(seed):
+    from ai_worker.bot_context import BotContext
+
+    states = [(game.get_game_state(), game.current_turn) for game in _games(16, seed, plays=13)]
+
+    def run():
+        for state, seat in states:
+            BotContext(state, seat)
+    return run, len(states)
+
+
+def fastgame_rollouts(seed):
+    from ai_worker.mcts.fast_game import FastGame
+
+    games = [FastGame(hands, trump=trump, mode=mode, current_turn=i % 4, dealer_index=0)
+             for i, (hands, mode, trump) in enumerate(_deals(64, seed))]
+
+    def run():
+        for game in games:
+            game.clone().play_greedy()
+    return run, len(games)
+
+
+MCTS_ITERATIONS = 1000
+
+
+def mcts_iterations(seed):
+    from ai_worker.mcts.fast_game import FastGame
+    from ai_worker.mcts.mcts import MCTSSolver
+
+    hands, _, _ = _deals(1, seed)[0]
+    game = FastGame(hands, trump=SUITS[0], mode='HOKUM', current_turn=0, dealer_index=0)
+
+    def run():
+        random.seed(seed)  # Same tree every run
+        MCTSSolver().search_with_details(game, timeout_ms=60_000, max_iterations=MCTS_ITERATIONS)
+    return run, MCTS_ITERATIONS
+
+
+def sfs2x_decode(seed):
+    from gbaloot.core.decoder import SFS2XDecoder
+    from gbaloot.tests.test_decoder import _random_message
+
+    rng = random.Random(seed)
+    frames = [_random_message(rng) for _ in range(500)]
+
+    def run():
+        for frame in frames:
+            SFS2XDecoder(frame).decode()
+    return run, len(frames)
+
+
+CASES = [
+    Case('validation.is_move_legal', move_legality, None),
+    Case('TrickResolver.get_trick_winner', trick_winner, None),
+    Case('ScoringEngine.calculate_final_scores', round_scoring, None),
+    Case('game_serializer.sections_round_trip', serializer_round_trip, None),
+    Case('BotContext.__init__', bot_context, None),
+    Case('FastGame.rollout', fastgame_rollouts, None),
+    Case('MCTSSolver.iteration', mcts_iterations, 0.35),  # Allocation-heavy: more GC noise
+    Case('SFS2XDecoder.decode', sfs2x_decode, None),
+]
+
+
+def quiet_engine_logs():
+    """Game events and Redis-less errors would dominate the timings."""
+    logging.disable(logging.CRITICAL)
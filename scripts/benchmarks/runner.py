@@ -0,0 +1,135 @@
+"""
+Timing, result files and the baseline comparison.
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_TOLERANCE = float(os.environ.get('BALOOT_BENCH_TOLERANCE', '0.25'))
+DEFAULT_REPEATS = 7
+MIN_SAMPLE_NS = 20_000_000  # Shorter samples are mostly scheduler noise
+SEED = 2024
+
+
+def _calibration_work():
+    """A fixed mix of the interpreter work the cases do (calls, dicts, lists, ints)."""
+    table, acc = {}, []
+    for i in range(20000):
+        table[i & 255] = table.get(i & 255, 0) + (i * 7) % 13
+        acc.append(i ^ (i >> 3))
+    return sum(acc) + len(table)
+
+
+def calibrate(repeats=DEFAULT_REPEATS):
+    """Best ns for the calibration loop."""
+    return _best_ns(_calibration_work, repeats)[0]
+
+
+def _loops_for(fn):
+    """How many calls of fn make a sample of at least MIN_SAMPLE_NS (also the warm-up)."""
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter_ns() - start >= MIN_SAMPLE_NS:
+            return loops
+        loops *= 2
+
+
+def _best_ns(fn, repeats):
+    """(min, median) ns per call of fn over ``repeats`` samples."""
+    loops = _loops_for(fn)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter_ns() - start) / loops)
+    return min(timings), statistics.median(timings)
+
+
+def run_suite(cases, repeats=DEFAULT_REPEATS, seed=SEED, report=print):
+    """
+    Times every case; returns the results document (see save_results).
+    The calibration loop runs again before each case and the fastest of all
+    its runs is the machine speed: a busy moment slows one sample, never
+    all of them.
+    """
+    calibration = calibrate(repeats)
+    timings = {}
+    for case in cases:
+        run, ops = case.setup(seed)
+        calibration = min(calibration, calibrate(repeats))
+        best, median = _best_ns(run, repeats)
+        timings[case.name] = (best, median, ops)
+        report(f"{case.name:40s} {best / ops / 1000:10.2f} us/op {ops * 1e9 / best:12,.0f} ops/s")
+    results = {
+        name: {
+            'ns_per_op': best / ops,
+            'median_ns_per_op': median / ops,
+            'ops_per_sec': ops * 1e9 / best,
+            'normalized': best / calibration,
+        }
+        for name, (best, median, ops) in timings.items()
+    }
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'calibration_ns': calibration,
+        'results': results,
+    }
+
+
+def compare(current, baseline, cases, tolerance=DEFAULT_TOLERANCE):
+    """
+    Per-case verdicts against ``baseline``: [(name, ratio, limit, status)].
+    ratio is current / baseline normalized time (> 1 = slower); status is
+    'ok', 'REGRESSION', 'faster' (beyond the tolerance: worth a new
+    baseline) or 'new' (no baseline entry).
+    """
+    verdicts = []
+    for case in cases:
+        now = current['results'].get(case.name)
+        before = baseline.get('results', {}).get(case.name)
+        if now is None:
+            continue
+        if before is None:
+            verdicts.append((case.name, None, None, 'new'))
+            continue
+        limit = case.tolerance if case.tolerance is not None else tolerance
+        ratio = now['normalized'] / before['normalized']
+        if ratio > 1 + limit:
+            status = 'REGRESSION'
+        elif ratio < 1 / (1 + limit):
+            status = 'faster'
+        else:
+            status = 'ok'
+        verdicts.append((case.name, ratio, limit, status))
+    return verdicts
+
+
+def keep_fastest(results, rerun):
+    """Merges a re-run into ``results`` keeping each case's fastest measurement."""
+    for name, now in rerun['results'].items():
+        before = results['results'].get(name)
+        if before is None or now['normalized'] < before['normalized']:
+            results['results'][name] = now
+    return results
+
+
+def load_results(path=BASELINE_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
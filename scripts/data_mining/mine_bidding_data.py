@@ -8,28 +8,32 @@ Produces:
   - bidding_thresholds.json: (trump_count x high_cards) matrix + Sun profile
   - bidding_analysis_report.md: Human-readable analysis with actionable thresholds
 
-Uses move_labels.json to exclude BOT bids.
+Uses move_labels.json to exclude BOT bids. Reads the columnar archive store
+(gbaloot/tools/archive_store.py), ingesting new or changed archives first.
 """
 from __future__ import annotations
 
 import json
 import math
-import os
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from game_engine.models.constants import SUITS  # noqa: E402
+from gbaloot.tools.archive_store import (  # noqa: E402
+    ArchiveStore, SOURCE_OF_ID, hand_metrics, mask_to_source, open_store, suit_symbol,
+)
+
 ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
 TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
 
-# Card mapping (from card_mapping.py)
-SOURCE_SUITS = {0: "♠", 1: "♥", 2: "♣", 3: "♦"}
-SOURCE_RANKS = {5: "7", 6: "8", 7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-VALID_RANK_RANGE = range(5, 13)
-
-# Point values
-PTS_SUN = {"7": 0, "8": 0, "9": 0, "J": 2, "Q": 3, "K": 4, "10": 10, "A": 11}
-PTS_HOKUM = {"7": 0, "8": 0, "Q": 3, "K": 4, "10": 10, "A": 11, "9": 14, "J": 20}
+# Suits in source card order, for suit_distribution
+SOURCE_SUIT_ORDER = ("♠", "♥", "♣", "♦")
 
 # Bids that represent an actual contract bid (not pass/transition)
 CONTRACT_BIDS = {"hokom", "sun", "ashkal", "hokom2", "turntosun",
@@ -37,183 +41,34 @@ CONTRACT_BIDS = {"hokom", "sun", "ashkal", "hokom2", "turntosun",
 PASS_BIDS = {"pass", "wala", "thany", "waraq"}
 DOUBLING_BIDS = {"double", "redouble", "hokomclose", "hokomopen",
                  "beforeyou", "triple", "qahwa"}
+SUIT_BIDS = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
 
 # Archive ts → suit symbol mapping
 TS_TO_SUIT = {1: "♥", 2: "♣", 3: "♦", None: "♠", 0: "♠"}
 
 
-def decode_bitmask(bitmask: int) -> list[int]:
-    """Decode a 64-bit card bitmask into card indices."""
-    cards = []
-    for idx in range(52):
-        if idx % 13 not in VALID_RANK_RANGE:
-            continue
-        if bitmask & (1 << idx):
-            cards.append(idx)
-    return sorted(cards)
-
-
-def card_idx_to_info(idx: int) -> dict:
-    """Convert card index to rank/suit info."""
-    suit_idx = idx // 13
-    rank_idx = idx % 13
-    return {
-        "suit": SOURCE_SUITS.get(suit_idx, "?"),
-        "rank": SOURCE_RANKS.get(rank_idx, "?"),
-        "suit_idx": suit_idx,
-    }
+def compute_hand_metrics(hands: np.ndarray, trumps: np.ndarray) -> list[dict]:
+    """Compute hand strength metrics for many hands at once.
 
-
-def compute_hand_metrics(hand_cards: list[int], trump_suit: str | None,
-                         mode: str) -> dict:
-    """Compute hand strength metrics."""
-    suits = defaultdict(list)
-    aces = 0
-    kings = 0
-    queens = 0
-    jacks = 0
-    point_value_sun = 0
-    point_value_hokum = 0
-
-    for idx in hand_cards:
-        info = card_idx_to_info(idx)
-        rank = info["rank"]
-        suit = info["suit"]
-        suits[suit].append(rank)
-
-        if rank == "A":
-            aces += 1
-        elif rank == "K":
-            kings += 1
-        elif rank == "Q":
-            queens += 1
-        elif rank == "J":
-            jacks += 1
-
-        point_value_sun += PTS_SUN.get(rank, 0)
-        point_value_hokum += PTS_HOKUM.get(rank, 0)
-
-    suit_lengths = {s: len(ranks) for s, ranks in suits.items()}
-    all_suits = ["♠", "♥", "♣", "♦"]
-    voids = sum(1 for s in all_suits if suit_lengths.get(s, 0) == 0)
-    singletons = sum(1 for s in all_suits if suit_lengths.get(s, 0) == 1)
-    longest_suit = max(suit_lengths.values()) if suit_lengths else 0
-
-    trump_count = 0
-    if trump_suit and trump_suit in suits:
-        trump_count = len(suits[trump_suit])
-
-    high_cards = aces + kings + queens + jacks
-
-    return {
-        "trump_count": trump_count,
-        "aces": aces,
-        "kings": kings,
-        "queens": queens,
-        "jacks": jacks,
-        "high_cards": high_cards,
-        "point_value_sun": point_value_sun,
-        "point_value_hokum": point_value_hokum,
-        "voids": voids,
-        "singletons": singletons,
-        "longest_suit": longest_suit,
-        "suit_distribution": suit_lengths,
-    }
-
-
-def resolve_trump_suit(events: list[dict], fc: int | None) -> str | None:
-    """Resolve the trump suit from bid events and floor card."""
-    suit_bids = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-
-    for ev in events:
-        if ev.get("e") != 2:
-            continue
-        b = ev.get("b", "")
-        # Explicit suit selection
-        if b in suit_bids:
-            return suit_bids[b]
-        # turntosun means no trump
-        if b == "turntosun":
-            return None
-        if b == "sun" or b == "ashkal":
-            return None
-
-    # For R1 hokom, trump = floor card suit
-    for ev in events:
-        if ev.get("e") != 2:
-            continue
-        b = ev.get("b", "")
-        if b == "hokom" and fc is not None:
-            suit_idx = fc // 13
-            return SOURCE_SUITS.get(suit_idx, None)
-
-    return None
-
-
-def resolve_game_mode(events: list[dict]) -> str:
-    """Resolve game mode from bid events."""
-    mode = "SUN"
-    for ev in events:
-        if ev.get("e") != 2:
-            continue
-        gm = ev.get("gm")
-        if gm == 1 or gm == 3:
-            mode = "SUN"
-        elif gm == 2:
-            mode = "HOKUM"
-    return mode
-
-
-def get_floor_card(events: list[dict]) -> int | None:
-    """Get the floor card from e=1 event."""
-    for ev in events:
-        if ev.get("e") == 1:
-            return ev.get("fc")
-    return None
-
-
-def get_round_start_scores(events: list[dict]) -> tuple[int, int]:
-    """Get team scores at round start from e=1."""
-    for ev in events:
-        if ev.get("e") == 1:
-            return ev.get("t1s", 0), ev.get("t2s", 0)
-    return 0, 0
-
-
-def get_dealer_seat(events: list[dict]) -> int:
-    """Get dealer seat from e=1.p field."""
-    for ev in events:
-        if ev.get("e") == 1:
-            return ev.get("p", 1)
-    return 1
-
-
-def get_bidder_seat(events: list[dict]) -> int:
-    """Get the seat of the player who won the bid (rb field)."""
-    rb = -1
-    for ev in events:
-        if ev.get("e") == 2:
-            v = ev.get("rb", -1)
-            if v > 0:
-                rb = v
-    return rb
-
-
-def get_round_result(events: list[dict]) -> dict | None:
-    """Get the e=12 round result."""
-    for ev in events:
-        if ev.get("e") == 12:
-            return ev.get("rs", {})
-    return None
-
-
-def get_hokum_multiplier(events: list[dict]) -> int:
+    @param hands: uint32 hand masks.
+    @param trumps: Engine trump suit per hand (-1 for none).
+    """
+    metrics = hand_metrics(hands, trumps)
+    lengths = metrics.pop("suit_lengths").tolist()
+    cols = {k: v.tolist() for k, v in metrics.items()}
+    out = []
+    for i, suit_lens in enumerate(lengths):
+        row = {k: v[i] for k, v in cols.items()}
+        row["suit_distribution"] = {s: suit_lens[SUITS.index(s)]
+                                    for s in SOURCE_SUIT_ORDER if suit_lens[SUITS.index(s)]}
+        out.append(row)
+    return out
+
+
+def get_hokum_multiplier(bids: list[str]) -> int:
     """Derive HOKUM multiplier from bid events."""
     level = 1
-    for evt in events:
-        if evt.get("e") != 2:
-            continue
-        b = evt.get("b", "")
+    for b in bids:
         if b in ("hokomclose", "beforeyou", "hokomopen"):
             level += 1
         elif b == "triple":
@@ -223,12 +78,9 @@ def get_hokum_multiplier(events: list[dict]) -> int:
     return min(level, 99)
 
 
-def has_sun_radda(events: list[dict]) -> bool:
+def has_sun_radda(bids: list[str]) -> bool:
     """Check if SUN round has a radda."""
-    return any(
-        evt.get("e") == 2 and evt.get("b") in ("double", "redouble")
-        for evt in events
-    )
+    return any(b in ("double", "redouble") for b in bids)
 
 
 def player_team(seat: int) -> int:
@@ -253,157 +105,149 @@ def load_bot_moves() -> set[tuple[str, int, int]]:
     return bot_keys
 
 
-def extract_bidding_records(games: list[dict], bot_moves: set) -> list[dict]:
-    """Extract all bidding records from all games."""
+def _bid_trumps(store: ArchiveStore, rnd: np.ndarray) -> np.ndarray:
+    """Trump each bid is evaluated against: its own suit, none for SUN bids, else the floor suit."""
+    bid = store.bids["bid"]
+    floor = store.rounds["floor"][rnd]
+    trumps = np.where(floor >= 0, floor >> 3, -1).astype(np.int64)
+    trumps[np.isin(bid, ("sun", "ashkal", "turntosun"))] = -1
+    for name, suit in SUIT_BIDS.items():
+        trumps[bid == name] = SUITS.index(suit)
+    return trumps
+
+
+def extract_bidding_records(store: ArchiveStore, bot_moves: set) -> list[dict]:
+    """Extract all bidding records from all games.
+
+    Hand metrics for every bid are computed over the whole bids table.
+    """
     records = []
 
-    for game in games:
-        game_name = game.get("n", game.get("_filename", "unknown"))
-
-        for round_idx, round_obj in enumerate(game.get("rs", [])):
-            events = round_obj.get("r", [])
-
-            # Get deal info
-            hands = {}
-            for ev in events:
-                if ev.get("e") == 15:
-                    bhr = ev.get("bhr", [])
-                    for seat_idx in range(min(4, len(bhr))):
-                        hands[seat_idx + 1] = decode_bitmask(bhr[seat_idx])
-                    break
-
-            fc = get_floor_card(events)
-            t1s, t2s = get_round_start_scores(events)
-            dealer = get_dealer_seat(events)
-
-            # Resolve game mode and trump from this round's bids
-            game_mode = resolve_game_mode(events)
-            trump_suit = resolve_trump_suit(events, fc)
-
-            # Floor card suit
-            fc_suit = None
-            if fc is not None:
-                fc_suit_idx = fc // 13
-                fc_suit = SOURCE_SUITS.get(fc_suit_idx)
-
-            # Get round result
-            result = get_round_result(events)
-            round_won_by = 0
-            gp_t1 = 0
-            gp_t2 = 0
-            khasara = False
-            was_doubled = False
-            multiplier = 1
-            bidding_team = 0
-
-            if result:
-                round_won_by = result.get("w", 0)
-                gp_t1 = result.get("s1", 0)
-                gp_t2 = result.get("s2", 0)
-                bidding_team = result.get("b", 0)
-                kbt = result.get("kbt", 0)
-
-                if game_mode == "HOKUM":
-                    multiplier = get_hokum_multiplier(events)
-                    was_doubled = multiplier > 1
-                elif game_mode == "SUN":
-                    was_doubled = has_sun_radda(events)
-                    multiplier = 2 if was_doubled else 1
-
-                # Khasara: loser gets 0 GP
-                khasara = (gp_t1 == 0 or gp_t2 == 0) and not kbt
-
-            # Track bids to build previous_bids context
-            bid_sequence = []
-            bidding_round = 1
-
-            for ev_idx, ev in enumerate(events):
-                if ev.get("e") != 2:
-                    continue
-
-                b = ev.get("b", "")
-                seat = ev.get("p", 0)
-
-                # Track bidding round transitions
-                if b == "thany":
-                    bidding_round = 2
-                    bid_sequence.append({"seat": seat, "bid": b})
-                    continue
-
-                # Skip non-bid transitions
-                if b in ("waraq",):
-                    bid_sequence.append({"seat": seat, "bid": b})
-                    continue
-
-                # Skip doubling bids — they go to Mission 3
-                if b in DOUBLING_BIDS:
-                    bid_sequence.append({"seat": seat, "bid": b})
-                    continue
-
-                # Check if this is a BOT move
-                is_bot = (game_name, round_idx + 1, ev_idx) in bot_moves
-
-                # Determine seat position relative to dealer
-                seat_pos = ((seat - dealer - 1) % 4) + 1
-
-                # Get hand for this player
-                hand = hands.get(seat, [])
-
-                # For R1 hokom, trump suit = floor card suit
-                # For this specific bid, what's the relevant trump?
-                if b == "hokom" and fc_suit:
-                    bid_trump = fc_suit
-                elif b in ("clubs", "hearts", "spades", "diamonds"):
-                    suit_map = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-                    bid_trump = suit_map[b]
-                elif b in ("sun", "ashkal", "turntosun"):
-                    bid_trump = None
-                else:
-                    bid_trump = fc_suit  # For passes, use floor card suit as context
-
-                metrics = compute_hand_metrics(hand, bid_trump, game_mode)
-
-                # Team info
-                team = player_team(seat) if seat > 0 else 0
-                team_score = t1s if team == 1 else t2s
-                opp_score = t2s if team == 1 else t1s
-
-                # Outcome
-                round_won = (round_won_by == team) if result else None
-                gp_earned = (gp_t1 if team == 1 else gp_t2) if result else 0
-
-                is_contract_bid = b in CONTRACT_BIDS
-                is_pass = b in PASS_BIDS
-
-                record = {
-                    "game_id": game_name,
-                    "round_idx": round_idx + 1,
-                    "player_seat": seat,
-                    "hand_cards": hand,
-                    "floor_card": fc,
-                    "floor_card_suit": fc_suit,
-                    "bid": b,
-                    "is_contract_bid": is_contract_bid,
-                    "is_pass": is_pass,
-                    "bidding_round": bidding_round,
-                    "seat_position": seat_pos,
-                    "previous_bids": [x["bid"] for x in bid_sequence],
-                    "game_mode_chosen": game_mode,
-                    "trump_suit": trump_suit,
-                    "team": team,
-                    "team_score": team_score,
-                    "opponent_score": opp_score,
-                    "score_differential": team_score - opp_score,
-                    **metrics,
-                    "round_won": round_won,
-                    "gp_earned": gp_earned,
-                    "khasara": khasara,
-                    "was_doubled": was_doubled,
-                    "multiplier": multiplier,
-                    "is_human": not is_bot,
-                }
-                records.append(record)
+    rounds, bids = store.rounds, store.bids
+    names = store.games["name"].tolist()
+    rnd_of_bid = store.round_of(bids)
+    seats = bids["seat"].astype(np.int64)
+    seated = (seats >= 1) & (seats <= 4)
+    hands = np.where(seated, rounds["hands"][rnd_of_bid, np.clip(seats - 1, 0, 3)], 0)
+    metrics = compute_hand_metrics(hands, _bid_trumps(store, rnd_of_bid))
+    bid_names, bid_seats, events = bids["bid"].tolist(), seats.tolist(), bids["event"].tolist()
+    hand_cards = [mask_to_source(h) for h in hands.tolist()]
+    starts, stops = store.round_spans("bids")
+
+    for ri in range(len(rounds)):
+        rnd = rounds[ri]
+        game_name = names[rnd["game"]]
+        round_idx = int(rnd["round"])
+        fc = int(SOURCE_OF_ID[rnd["floor"]]) if rnd["floor"] >= 0 else None
+        t1s, t2s = int(rnd["t1s"]), int(rnd["t2s"])
+        dealer = int(rnd["dealer"])
+
+        # Resolve game mode and trump from this round's bids
+        game_mode = str(rnd["mode"])
+        trump_suit = suit_symbol(int(rnd["trump"]))
+
+        # Floor card suit
+        fc_suit = suit_symbol(int(rnd["floor"]) >> 3) if fc is not None else None
+
+        # Get round result
+        result = bool(rnd["result"])
+        round_bids = bid_names[starts[ri]:stops[ri]]
+        round_won_by = 0
+        gp_t1 = 0
+        gp_t2 = 0
+        khasara = False
+        was_doubled = False
+        multiplier = 1
+        bidding_team = 0
+
+        if result:
+            round_won_by = int(rnd["winner"])
+            gp_t1 = int(rnd["s1"])
+            gp_t2 = int(rnd["s2"])
+            bidding_team = int(rnd["bid_team"])
+            kbt = bool(rnd["kaboot"])
+
+            if game_mode == "HOKUM":
+                multiplier = get_hokum_multiplier(round_bids)
+                was_doubled = multiplier > 1
+            elif game_mode == "SUN":
+                was_doubled = has_sun_radda(round_bids)
+                multiplier = 2 if was_doubled else 1
+
+            # Khasara: loser gets 0 GP
+            khasara = (gp_t1 == 0 or gp_t2 == 0) and not kbt
+
+        # Track bids to build previous_bids context
+        bid_sequence = []
+        bidding_round = 1
+
+        for i in range(starts[ri], stops[ri]):
+            b = bid_names[i]
+            seat = bid_seats[i]
+
+            # Track bidding round transitions
+            if b == "thany":
+                bidding_round = 2
+                bid_sequence.append({"seat": seat, "bid": b})
+                continue
+
+            # Skip non-bid transitions
+            if b in ("waraq",):
+                bid_sequence.append({"seat": seat, "bid": b})
+                continue
+
+            # Skip doubling bids — they go to Mission 3
+            if b in DOUBLING_BIDS:
                 bid_sequence.append({"seat": seat, "bid": b})
+                continue
+
+            # Check if this is a BOT move
+            is_bot = (game_name, round_idx + 1, events[i]) in bot_moves
+
+            # Determine seat position relative to dealer
+            seat_pos = ((seat - dealer - 1) % 4) + 1
+
+            # Team info
+            team = player_team(seat) if seat > 0 else 0
+            team_score = t1s if team == 1 else t2s
+            opp_score = t2s if team == 1 else t1s
+
+            # Outcome
+            round_won = (round_won_by == team) if result else None
+            gp_earned = (gp_t1 if team == 1 else gp_t2) if result else 0
+
+            is_contract_bid = b in CONTRACT_BIDS
+            is_pass = b in PASS_BIDS
+
+            record = {
+                "game_id": game_name,
+                "round_idx": round_idx + 1,
+                "player_seat": seat,
+                "hand_cards": hand_cards[i],
+                "floor_card": fc,
+                "floor_card_suit": fc_suit,
+                "bid": b,
+                "is_contract_bid": is_contract_bid,
+                "is_pass": is_pass,
+                "bidding_round": bidding_round,
+                "seat_position": seat_pos,
+                "previous_bids": [x["bid"] for x in bid_sequence],
+                "game_mode_chosen": game_mode,
+                "trump_suit": trump_suit,
+                "team": team,
+                "team_score": team_score,
+                "opponent_score": opp_score,
+                "score_differential": team_score - opp_score,
+                **metrics[i],
+                "round_won": round_won,
+                "gp_earned": gp_earned,
+                "khasara": khasara,
+                "was_doubled": was_doubled,
+                "multiplier": multiplier,
+                "is_human": not is_bot,
+            }
+            records.append(record)
+            bid_sequence.append({"seat": seat, "bid": b})
 
     return records
 
@@ -691,23 +535,13 @@ def main():
     print("  BOT moves to exclude: {}".format(len(bot_moves)))
 
     # Load games
-    print("Loading games from {}...".format(ARCHIVE_DIR))
-    games = []
-    for fname in sorted(os.listdir(ARCHIVE_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        with open(ARCHIVE_DIR / fname, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                data["_filename"] = fname
-                games.append(data)
-            except json.JSONDecodeError:
-                pass
-    print("  Loaded {} games".format(len(games)))
+    print("Loading archive store for {}...".format(ARCHIVE_DIR))
+    store = open_store(ARCHIVE_DIR)
+    print("  Loaded {} games".format(len(store.games)))
 
     # Extract records
     print("\nExtracting bidding records...")
-    records = extract_bidding_records(games, bot_moves)
+    records = extract_bidding_records(store, bot_moves)
     print("  Total bid events: {}".format(len(records)))
 
     human_records = [r for r in records if r["is_human"]]
@@ -740,7 +574,7 @@ def main():
                 "bot_records": len(bot_records),
                 "contract_bids": len(contract),
                 "passes": len(passes),
-                "games": len(games),
+                "games": len(store.games),
             },
             "records": records,
         }, f, indent=2, ensure_ascii=False)
@@ -1,13 +1,14 @@
 """Mission 2: Professional Card Play Database.
 
 Extracts every card play decision with complete game context:
-- Player's hand BEFORE play (reconstructed by tracking)
-- Legal moves (reconstructed from Baloot rules)
+- Player's hand BEFORE play (tracked by the archive store)
+- Legal moves (engine rules, as the bots play)
 - Trick context (cards on table, current winner)
 - Game state (tricks/points won by each team)
 - Outcome (won trick, trick points, round won)
 
-Filters BOT moves using move_labels.json.
+Filters BOT moves using move_labels.json. Reads the columnar archive store
+(gbaloot/tools/archive_store.py), ingesting new or changed archives first.
 
 Produces:
   - pro_card_play_database.json: Raw decision records (HUMAN only)
@@ -18,35 +19,25 @@ Produces:
 from __future__ import annotations
 
 import json
-import os
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from gbaloot.tools.archive_store import (  # noqa: E402
+    ArchiveStore, SOURCE_OF_ID, mask_to_source, open_store, popcount, suit_symbol,
+)
+
 ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
 TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
 
 # Card mapping
 SOURCE_SUITS = {0: "♠", 1: "♥", 2: "♣", 3: "♦"}
 SOURCE_RANKS = {5: "7", 6: "8", 7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-VALID_RANK_RANGE = range(5, 13)
-
-PTS_SUN = {"7": 0, "8": 0, "9": 0, "J": 2, "Q": 3, "K": 4, "10": 10, "A": 11}
-PTS_HOKUM = {"7": 0, "8": 0, "Q": 3, "K": 4, "10": 10, "A": 11, "9": 14, "J": 20}
-
-# Rank orders for trick resolution
-ORDER_SUN = ["7", "8", "9", "J", "Q", "K", "10", "A"]
-ORDER_HOKUM = ["7", "8", "Q", "K", "10", "A", "9", "J"]
-
-
-def decode_bitmask(bitmask: int) -> list[int]:
-    cards = []
-    for idx in range(52):
-        if idx % 13 not in VALID_RANK_RANGE:
-            continue
-        if bitmask & (1 << idx):
-            cards.append(idx)
-    return sorted(cards)
 
 
 def card_suit(idx: int) -> str:
@@ -61,13 +52,6 @@ def card_name(idx: int) -> str:
     return "{}{}".format(card_rank(idx), card_suit(idx))
 
 
-def card_points(idx: int, mode: str) -> int:
-    rank = card_rank(idx)
-    if mode == "HOKUM":
-        return PTS_HOKUM.get(rank, 0)
-    return PTS_SUN.get(rank, 0)
-
-
 def player_team(seat: int) -> int:
     return 1 if seat in (1, 3) else 2
 
@@ -76,95 +60,6 @@ def partner_seat(seat: int) -> int:
     return {1: 3, 2: 4, 3: 1, 4: 2}.get(seat, 0)
 
 
-def compute_legal_moves(hand: list[int], lead_suit: str | None,
-                        trump_suit: str | None) -> list[int]:
-    """Compute legal moves following Baloot rules.
-
-    Rules:
-    - If leading: any card is legal
-    - If following: must follow lead suit if possible
-    - If void in lead suit: can play any card (including trump)
-    """
-    if lead_suit is None:
-        return list(hand)  # Leading: any card
-
-    # Must follow lead suit if possible
-    follow_cards = [c for c in hand if card_suit(c) == lead_suit]
-    if follow_cards:
-        return follow_cards
-
-    # Void in lead suit: can play anything
-    return list(hand)
-
-
-def compute_trick_winner(plays: list[tuple[int, int]], mode: str,
-                         trump_suit: str | None) -> int:
-    """Compute which seat wins the trick.
-
-    Args:
-        plays: list of (seat, card_idx) in play order
-        mode: "SUN" or "HOKUM"
-        trump_suit: trump suit symbol or None for SUN
-
-    Returns: winning seat number
-    """
-    if not plays:
-        return 0
-
-    lead_suit = card_suit(plays[0][1])
-    best_seat = plays[0][0]
-    best_strength = -1
-
-    for seat, cidx in plays:
-        c_suit = card_suit(cidx)
-        c_rank = card_rank(cidx)
-        strength = -1
-
-        if mode == "HOKUM" and trump_suit and c_suit == trump_suit:
-            strength = 100 + ORDER_HOKUM.index(c_rank) if c_rank in ORDER_HOKUM else 100
-        elif c_suit == lead_suit:
-            strength = ORDER_SUN.index(c_rank) if c_rank in ORDER_SUN else 0
-
-        if strength > best_strength:
-            best_strength = strength
-            best_seat = seat
-
-    return best_seat
-
-
-def resolve_game_mode(events: list[dict]) -> str:
-    mode = "SUN"
-    for ev in events:
-        if ev.get("e") == 2:
-            gm = ev.get("gm")
-            if gm == 2: mode = "HOKUM"
-            elif gm in (1, 3): mode = "SUN"
-    return mode
-
-
-def resolve_trump_suit(events: list[dict], fc: int | None) -> str | None:
-    suit_bids = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-    for ev in events:
-        if ev.get("e") != 2: continue
-        b = ev.get("b", "")
-        if b in suit_bids: return suit_bids[b]
-        if b in ("turntosun", "sun", "ashkal"): return None
-    for ev in events:
-        if ev.get("e") != 2: continue
-        if ev.get("b") == "hokom" and fc is not None:
-            return SOURCE_SUITS.get(fc // 13)
-    return None
-
-
-def get_bidder_seat(events: list[dict]) -> int:
-    rb = -1
-    for ev in events:
-        if ev.get("e") == 2:
-            v = ev.get("rb", -1)
-            if v > 0: rb = v
-    return rb
-
-
 def load_bot_moves() -> set[tuple[str, int, int]]:
     labels_path = TRAINING_DIR / "move_labels.json"
     if not labels_path.exists(): return set()
@@ -174,203 +69,150 @@ def load_bot_moves() -> set[tuple[str, int, int]]:
             for m in data.get("labeled_moves", []) if m.get("player_type") == "BOT"}
 
 
-def extract_card_plays(games: list[dict], bot_moves: set) -> tuple[list[dict], list[dict]]:
+def _team_totals(tricks: np.ndarray) -> tuple[dict, tuple[dict, dict]]:
+    """Tricks and points won per team before each trick number, and at the end."""
+    before = {}
+    tricks_won = {1: 0, 2: 0}
+    points_won = {1: 0, 2: 0}
+    for trick, count, winner, points in zip(tricks["trick"].tolist(), tricks["count"].tolist(),
+                                            tricks["winner"].tolist(), tricks["points"].tolist()):
+        before[trick] = (dict(tricks_won), dict(points_won))
+        if count:
+            tricks_won[player_team(winner)] += 1
+            points_won[player_team(winner)] += points
+    return before, (tricks_won, points_won)
+
+
+def extract_card_plays(store: ArchiveStore, bot_moves: set) -> tuple[list[dict], list[dict]]:
     """Extract all card play decisions with full context.
 
+    Hands, legal moves (engine rules) and trick winners come precomputed
+    from the archive store; per-play flags are computed for the whole
+    plays table at once.
+
     Returns: (play_records, endgame_positions)
     """
     play_records = []
     endgame_positions = []
 
-    for game in games:
-        game_name = game.get("n", game.get("_filename", "unknown"))
-
-        for round_idx, round_obj in enumerate(game.get("rs", [])):
-            events = round_obj.get("r", [])
-
-            # Get initial hands
-            initial_hands = {}
-            for ev in events:
-                if ev.get("e") == 15:
-                    bhr = ev.get("bhr", [])
-                    for si in range(min(4, len(bhr))):
-                        initial_hands[si + 1] = set(decode_bitmask(bhr[si]))
-                    break
-
-            if len(initial_hands) < 4:
-                continue
-
-            fc = None
-            for ev in events:
-                if ev.get("e") == 1:
-                    fc = ev.get("fc")
-                    break
-
-            game_mode = resolve_game_mode(events)
-            trump_suit = resolve_trump_suit(events, fc)
-            bidder_seat = get_bidder_seat(events)
-            bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
-
-            # Round result
-            result = None
-            for ev in events:
-                if ev.get("e") == 12:
-                    result = ev.get("rs", {})
-                    break
-
-            round_winner = result.get("w", 0) if result else 0
-
-            # Track state as we walk through events
-            current_hands = {s: set(h) for s, h in initial_hands.items()}
-            trick_number = 0
-            trick_plays = []  # list of (seat, card_idx) for current trick
-            all_played_cards = []  # all cards played so far
-            tricks_won = {1: 0, 2: 0}  # team -> tricks won
-            points_won = {1: 0, 2: 0}  # team -> points won
-            trump_played_count = 0
-
-            for ev_idx, ev in enumerate(events):
-                if ev.get("e") != 4:
-                    # Track trick boundaries
-                    if ev.get("e") == 6:
-                        # Trick completed — compute winner from played cards
-                        if trick_plays:
-                            winner_seat = compute_trick_winner(
-                                trick_plays, game_mode, trump_suit)
-                            winner_team = player_team(winner_seat)
-                            tricks_won[winner_team] += 1
-
-                            # Compute trick points
-                            trick_pts = sum(
-                                card_points(c, game_mode) for _, c in trick_plays)
-                            points_won[winner_team] += trick_pts
-
-                        trick_plays = []
-                        trick_number += 1
-                    continue
-
-                seat = ev.get("p", 0)
-                card_idx = ev.get("c", -1)
-
-                if seat < 1 or seat > 4 or card_idx < 0:
-                    continue
-
-                # Position in trick (1=leader, 2-4=followers)
-                position_in_trick = len(trick_plays) + 1
-
-                # Lead suit (None if this player is leading)
-                lead_suit = None
-                if trick_plays:
-                    lead_suit = card_suit(trick_plays[0][1])
-
-                # Current winner of trick so far
-                current_winner = None
-                if trick_plays:
-                    current_winner = compute_trick_winner(
-                        trick_plays, game_mode, trump_suit)
-
-                # Hand before this play
-                hand_before = sorted(current_hands.get(seat, set()))
-
-                # Legal moves
-                legal = compute_legal_moves(hand_before, lead_suit, trump_suit)
-
-                # Check if BOT
-                is_bot = (game_name, round_idx + 1, ev_idx) in bot_moves
-                is_human = not is_bot
-
-                # Team info
-                team = player_team(seat)
-                my_tricks = tricks_won[team]
-                opp_tricks = tricks_won[3 - team]
-                my_points = points_won[team]
-                opp_points = points_won[3 - team]
-                is_bidding_team = (team == bidding_team)
-
-                # Cards on table
-                cards_on_table = [c for _, c in trick_plays]
-
-                # Is partner currently winning?
-                partner_winning = False
-                if current_winner is not None:
-                    partner_winning = player_team(current_winner) == team
-
-                # Card being played
-                played_suit = card_suit(card_idx)
-                played_rank = card_rank(card_idx)
-                is_trump = (played_suit == trump_suit) if trump_suit else False
-
-                # Is this a discard? (void in lead suit, not playing trump)
-                is_discard = (lead_suit is not None and
-                              played_suit != lead_suit and
-                              not is_trump)
-
-                # The effective trick number (1-indexed)
-                eff_trick = trick_number + 1
-
-                record = {
+    rounds, plays, tricks = store.rounds, store.plays, store.tricks
+    names = store.games["name"].tolist()
+
+    # Whole-table columns
+    trump = rounds["trump"][store.round_of(plays)]
+    suit = plays["card"] >> 3
+    is_trump = ((trump >= 0) & (suit == trump)).tolist()
+    is_discard = ((plays["lead"] >= 0) & (suit != plays["lead"]) & ~np.array(is_trump)).tolist()
+    num_options = popcount(plays["legal"]).tolist()
+    source = SOURCE_OF_ID[plays["card"]].tolist()
+    cols = {name: plays[name].tolist()
+            for name in ("event", "trick", "pos", "seat", "hand", "legal", "played", "winning")}
+    starts, stops = store.round_spans("plays")
+    trick_starts, trick_stops = store.round_spans("tricks")
+
+    for ri in np.flatnonzero(rounds["dealt"]).tolist():
+        rnd = rounds[ri]
+        game_name = names[rnd["game"]]
+        round_idx = int(rnd["round"])
+        game_mode = str(rnd["mode"])
+        trump_suit = suit_symbol(int(rnd["trump"]))
+        bidder_seat = int(rnd["bidder"])
+        bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
+        has_result = bool(rnd["result"])
+        round_winner = int(rnd["winner"])
+        initial_hands = rnd["hands"].tolist()
+
+        before, final = _team_totals(tricks[trick_starts[ri]:trick_stops[ri]])
+        trick_number = -1
+        cards_on_table = []
+        all_played_cards = []  # all cards played so far
+        trump_played_count = 0
+
+        for i in range(starts[ri], stops[ri]):
+            seat, card_idx, pos = cols["seat"][i], source[i], cols["pos"][i]
+            if cols["trick"][i] != trick_number:
+                trick_number = cols["trick"][i]
+                cards_on_table = []
+            tricks_won, points_won = before.get(trick_number, final)
+
+            # Position in trick (1=leader, 2-4=followers)
+            position_in_trick = pos + 1
+            lead_suit = card_suit(cards_on_table[0]) if cards_on_table else None
+            current_winner = cols["winning"][i] or None
+
+            # Check if BOT
+            is_bot = (game_name, round_idx + 1, cols["event"][i]) in bot_moves
+
+            # Team info
+            team = player_team(seat)
+            legal = mask_to_source(cols["legal"][i])
+
+            # The effective trick number (1-indexed)
+            eff_trick = trick_number + 1
+
+            record = {
+                "game_id": game_name,
+                "round_idx": round_idx + 1,
+                "trick_number": eff_trick,
+                "position_in_trick": position_in_trick,
+                "card_played": card_idx,
+                "card_name": card_name(card_idx),
+                "card_suit": card_suit(card_idx),
+                "card_rank": card_rank(card_idx),
+                "hand_before": mask_to_source(cols["hand"][i]),
+                "legal_moves": legal,
+                "num_options": num_options[i],
+                "cards_on_table": list(cards_on_table),
+                "lead_suit": lead_suit,
+                "current_winner": current_winner,
+                "partner_winning": current_winner is not None and player_team(current_winner) == team,
+                "game_mode": game_mode,
+                "trump_suit": trump_suit,
+                "tricks_won_my_team": tricks_won[team],
+                "tricks_won_opponent": tricks_won[3 - team],
+                "points_my_team": points_won[team],
+                "points_opponent": points_won[3 - team],
+                "cards_played_so_far": list(all_played_cards),
+                "cards_remaining": 32 - len(all_played_cards),
+                "trump_played_count": trump_played_count,
+                "partner_seat": partner_seat(seat),
+                "is_bidding_team": team == bidding_team,
+                "is_leader": position_in_trick == 1,
+                "is_trump_play": is_trump[i],
+                "is_discard": is_discard[i],
+                "round_won": (round_winner == team) if has_result else None,
+                "is_human": not is_bot,
+                "player_seat": seat,
+            }
+            play_records.append(record)
+
+            # Track endgame positions (last 3 tricks = cards_remaining <= 12)
+            if eff_trick >= 6 and position_in_trick == 1:
+                # Snapshot all 4 hands for endgame
+                played = cols["played"][i]
+                endgame = {
                     "game_id": game_name,
                     "round_idx": round_idx + 1,
                     "trick_number": eff_trick,
-                    "position_in_trick": position_in_trick,
-                    "card_played": card_idx,
-                    "card_name": card_name(card_idx),
-                    "card_suit": played_suit,
-                    "card_rank": played_rank,
-                    "hand_before": hand_before,
-                    "legal_moves": legal,
-                    "num_options": len(legal),
-                    "cards_on_table": cards_on_table,
-                    "lead_suit": lead_suit,
-                    "current_winner": current_winner,
-                    "partner_winning": partner_winning,
+                    "hands": {str(s + 1): mask_to_source(h & ~played)
+                              for s, h in enumerate(initial_hands)},
                     "game_mode": game_mode,
                     "trump_suit": trump_suit,
-                    "tricks_won_my_team": my_tricks,
-                    "tricks_won_opponent": opp_tricks,
-                    "points_my_team": my_points,
-                    "points_opponent": opp_points,
-                    "cards_played_so_far": list(all_played_cards),
-                    "cards_remaining": 32 - len(all_played_cards),
-                    "trump_played_count": trump_played_count,
-                    "partner_seat": partner_seat(seat),
-                    "is_bidding_team": is_bidding_team,
-                    "is_leader": position_in_trick == 1,
-                    "is_trump_play": is_trump,
-                    "is_discard": is_discard,
-                    "round_won": (round_winner == team) if result else None,
-                    "is_human": is_human,
-                    "player_seat": seat,
+                    "leader": seat,
+                    "tricks_won_t1": tricks_won[1],
+                    "tricks_won_t2": tricks_won[2],
+                    "points_t1": points_won[1],
+                    "points_t2": points_won[2],
+                    "bidding_team": bidding_team,
+                    "round_won_by": round_winner,
                 }
-                play_records.append(record)
-
-                # Track endgame positions (last 3 tricks = cards_remaining <= 12)
-                if eff_trick >= 6 and position_in_trick == 1:
-                    # Snapshot all 4 hands for endgame
-                    endgame = {
-                        "game_id": game_name,
-                        "round_idx": round_idx + 1,
-                        "trick_number": eff_trick,
-                        "hands": {str(s): sorted(h) for s, h in current_hands.items()},
-                        "game_mode": game_mode,
-                        "trump_suit": trump_suit,
-                        "leader": seat,
-                        "tricks_won_t1": tricks_won[1],
-                        "tricks_won_t2": tricks_won[2],
-                        "points_t1": points_won[1],
-                        "points_t2": points_won[2],
-                        "bidding_team": bidding_team,
-                        "round_won_by": round_winner,
-                    }
-                    endgame_positions.append(endgame)
-
-                # Update state
-                current_hands[seat].discard(card_idx)
-                all_played_cards.append(card_idx)
-                if is_trump:
-                    trump_played_count += 1
-
-                trick_plays.append((seat, card_idx))
+                endgame_positions.append(endgame)
+
+            # Update state
+            all_played_cards.append(card_idx)
+            cards_on_table.append(card_idx)
+            if is_trump[i]:
+                trump_played_count += 1
 
     return play_records, endgame_positions
 
@@ -571,22 +413,12 @@ def main():
     bot_moves = load_bot_moves()
     print("\n  BOT moves: {}".format(len(bot_moves)))
 
-    print("Loading games...")
-    games = []
-    for fname in sorted(os.listdir(ARCHIVE_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        with open(ARCHIVE_DIR / fname, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                data["_filename"] = fname
-                games.append(data)
-            except json.JSONDecodeError:
-                pass
-    print("  Loaded {} games".format(len(games)))
+    print("Loading archive store...")
+    store = open_store(ARCHIVE_DIR)
+    print("  Loaded {} games".format(len(store.games)))
 
     print("\nExtracting card play decisions (with hand tracking)...")
-    all_records, endgame_positions = extract_card_plays(games, bot_moves)
+    all_records, endgame_positions = extract_card_plays(store, bot_moves)
     human_records = [r for r in all_records if r["is_human"]]
     print("  Total card plays: {}".format(len(all_records)))
     print("  Human plays: {}".format(len(human_records)))
@@ -609,7 +441,7 @@ def main():
                 "total_plays": len(all_records),
                 "human_plays": len(human_records),
                 "bot_plays_excluded": len(all_records) - len(human_records),
-                "games": len(games),
+                "games": len(store.games),
             },
             "records": human_records,
         }, f, indent=2, ensure_ascii=False)
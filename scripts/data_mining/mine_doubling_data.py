@@ -2,6 +2,7 @@
 
 Extracts every doubling decision (and opportunity NOT taken) from 109
 professional games, with hand strength and score context for Kelly Criterion.
+Reads the columnar archive store (gbaloot/tools/archive_store.py).
 
 Produces:
   - pro_doubling_database.json: Raw decision records
@@ -12,105 +13,41 @@ from __future__ import annotations
 
 import json
 import math
-import os
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
-ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
-TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
+sys.path.insert(0, str(ROOT))
 
-SOURCE_SUITS = {0: "♠", 1: "♥", 2: "♣", 3: "♦"}
-SOURCE_RANKS = {5: "7", 6: "8", 7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-VALID_RANK_RANGE = range(5, 13)
+from gbaloot.tools.archive_store import (  # noqa: E402
+    ArchiveStore, hand_metrics, mask_to_source, open_store, suit_symbol,
+)
 
-PTS_SUN = {"7": 0, "8": 0, "9": 0, "J": 2, "Q": 3, "K": 4, "10": 10, "A": 11}
-PTS_HOKUM = {"7": 0, "8": 0, "Q": 3, "K": 4, "10": 10, "A": 11, "9": 14, "J": 20}
+ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
+TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
 
 DOUBLING_BIDS = {"double", "redouble", "hokomclose", "hokomopen",
                  "beforeyou", "triple", "qahwa"}
 DOUBLING_PASS_CONTEXT = {"pass"}  # Passes during doubling phase
 
+HAND_METRICS = ("trump_count", "aces", "kings", "queens", "jacks", "high_cards",
+                "point_value_sun", "point_value_hokum", "longest_suit")
 
-def decode_bitmask(bitmask: int) -> list[int]:
-    """Decode a 64-bit card bitmask into card indices."""
-    cards = []
-    for idx in range(52):
-        if idx % 13 not in VALID_RANK_RANGE:
-            continue
-        if bitmask & (1 << idx):
-            cards.append(idx)
-    return sorted(cards)
-
-
-def card_idx_to_info(idx: int) -> dict:
-    suit_idx = idx // 13
-    rank_idx = idx % 13
-    return {"suit": SOURCE_SUITS.get(suit_idx, "?"), "rank": SOURCE_RANKS.get(rank_idx, "?")}
-
-
-def compute_hand_metrics(hand_cards: list[int], trump_suit: str | None) -> dict:
-    suits = defaultdict(list)
-    aces = kings = queens = jacks = 0
-    pts_sun = pts_hokum = 0
-    for idx in hand_cards:
-        info = card_idx_to_info(idx)
-        rank, suit = info["rank"], info["suit"]
-        suits[suit].append(rank)
-        if rank == "A": aces += 1
-        elif rank == "K": kings += 1
-        elif rank == "Q": queens += 1
-        elif rank == "J": jacks += 1
-        pts_sun += PTS_SUN.get(rank, 0)
-        pts_hokum += PTS_HOKUM.get(rank, 0)
-
-    trump_count = len(suits.get(trump_suit, [])) if trump_suit else 0
-    return {
-        "trump_count": trump_count,
-        "aces": aces, "kings": kings, "queens": queens, "jacks": jacks,
-        "high_cards": aces + kings + queens + jacks,
-        "point_value_sun": pts_sun, "point_value_hokum": pts_hokum,
-        "longest_suit": max((len(v) for v in suits.values()), default=0),
-    }
+
+def compute_hand_metrics(hands: np.ndarray, trumps: np.ndarray) -> list[dict]:
+    """Hand strength metrics for many hands at once (engine trump suit, -1 for none)."""
+    metrics = hand_metrics(hands, trumps)
+    cols = [metrics[k].tolist() for k in HAND_METRICS]
+    return [dict(zip(HAND_METRICS, row)) for row in zip(*cols)]
 
 
 def player_team(seat: int) -> int:
     return 1 if seat in (1, 3) else 2
 
 
-def resolve_game_mode(events: list[dict]) -> str:
-    mode = "SUN"
-    for ev in events:
-        if ev.get("e") == 2:
-            gm = ev.get("gm")
-            if gm == 2: mode = "HOKUM"
-            elif gm in (1, 3): mode = "SUN"
-    return mode
-
-
-def resolve_trump_suit(events: list[dict], fc: int | None) -> str | None:
-    suit_bids = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-    for ev in events:
-        if ev.get("e") != 2: continue
-        b = ev.get("b", "")
-        if b in suit_bids: return suit_bids[b]
-        if b in ("turntosun", "sun", "ashkal"): return None
-    for ev in events:
-        if ev.get("e") != 2: continue
-        if ev.get("b") == "hokom" and fc is not None:
-            return SOURCE_SUITS.get(fc // 13)
-    return None
-
-
-def get_bidder_seat(events: list[dict]) -> int:
-    rb = -1
-    for ev in events:
-        if ev.get("e") == 2:
-            v = ev.get("rb", -1)
-            if v > 0: rb = v
-    return rb
-
-
 def load_bot_moves() -> set[tuple[str, int, int]]:
     labels_path = TRAINING_DIR / "move_labels.json"
     if not labels_path.exists(): return set()
@@ -120,148 +57,127 @@ def load_bot_moves() -> set[tuple[str, int, int]]:
             for m in data.get("labeled_moves", []) if m.get("player_type") == "BOT"}
 
 
-def extract_doubling_records(games: list[dict], bot_moves: set) -> list[dict]:
+def extract_doubling_records(store: ArchiveStore, bot_moves: set) -> list[dict]:
     """Extract all doubling decisions and missed opportunities."""
     records = []
 
-    for game in games:
-        game_name = game.get("n", game.get("_filename", "unknown"))
-
-        for round_idx, round_obj in enumerate(game.get("rs", [])):
-            events = round_obj.get("r", [])
-
-            # Get hands
-            hands = {}
-            for ev in events:
-                if ev.get("e") == 15:
-                    for si in range(min(4, len(ev.get("bhr", [])))):
-                        hands[si + 1] = decode_bitmask(ev["bhr"][si])
-                    break
-
-            fc = None
-            t1s = t2s = 0
-            for ev in events:
-                if ev.get("e") == 1:
-                    fc = ev.get("fc")
-                    t1s = ev.get("t1s", 0)
-                    t2s = ev.get("t2s", 0)
-                    break
-
-            game_mode = resolve_game_mode(events)
-            trump_suit = resolve_trump_suit(events, fc)
-            bidder_seat = get_bidder_seat(events)
-            bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
-
-            # Round result
-            result = None
-            for ev in events:
-                if ev.get("e") == 12:
-                    result = ev.get("rs", {})
-                    break
-
-            round_won_by = result.get("w", 0) if result else 0
-            gp_t1 = result.get("s1", 0) if result else 0
-            gp_t2 = result.get("s2", 0) if result else 0
-
-            # Track doubling phase
-            in_doubling_phase = False
-            doubling_level = 1
-            contract_set = False
-
-            for ev_idx, ev in enumerate(events):
-                if ev.get("e") != 2:
-                    continue
-                b = ev.get("b", "")
-                seat = ev.get("p", 0)
-
-                # Detect doubling phase entry
-                if b in DOUBLING_BIDS:
-                    in_doubling_phase = True
-
-                if not in_doubling_phase and b not in DOUBLING_BIDS:
-                    # Check if this is a pass during doubling opportunity
-                    # Passes after a contract bid but before play = doubling opportunity
-                    if b == "pass" and bidder_seat > 0 and not contract_set:
-                        # This could be a normal bidding pass, not a doubling opportunity
-                        # We only count it if the contract has been set
-                        pass
-                    continue
-
-                is_bot = (game_name, round_idx + 1, ev_idx) in bot_moves
-                team = player_team(seat) if seat > 0 else 0
-                is_bidding_team = (team == bidding_team)
-
-                hand = hands.get(seat, [])
-                metrics = compute_hand_metrics(hand, trump_suit)
-
-                team_score = t1s if team == 1 else t2s
-                opp_score = t2s if team == 1 else t1s
-
-                if b in DOUBLING_BIDS:
-                    # Actual doubling action
-                    if b in ("hokomclose", "hokomopen", "double", "beforeyou"):
-                        doubling_level += 1
-                    elif b == "triple":
-                        doubling_level = max(doubling_level, 3)
-                    elif b == "qahwa":
-                        doubling_level = 99
-
-                    gem = ev.get("gem", doubling_level - 1)
-                    round_won = (round_won_by == team)
-                    gp_earned = gp_t1 if team == 1 else gp_t2
-                    gp_lost = gp_t2 if team == 1 else gp_t1
-
-                    record = {
-                        "game_id": game_name,
-                        "round_idx": round_idx + 1,
-                        "action": b,
-                        "action_type": "double",
-                        "doubling_level": doubling_level,
-                        "gem_value": gem,
-                        "player_seat": seat,
-                        "is_bidding_team": is_bidding_team,
-                        "hand_cards": hand,
-                        "hand_metrics": metrics,
-                        "game_mode": game_mode,
-                        "trump_suit": trump_suit,
-                        "team_score_before": team_score,
-                        "opponent_score_before": opp_score,
-                        "score_differential": team_score - opp_score,
-                        "points_to_win": 152 - team_score,
-                        "round_won": round_won,
-                        "gp_earned": gp_earned if round_won else 0,
-                        "gp_lost": gp_lost if not round_won else 0,
-                        "khasara": gp_t1 == 0 or gp_t2 == 0,
-                        "is_human": not is_bot,
-                    }
-                    records.append(record)
-
-                elif b == "pass" and in_doubling_phase:
-                    # Doubling opportunity NOT taken
-                    record = {
-                        "game_id": game_name,
-                        "round_idx": round_idx + 1,
-                        "action": "pass_on_double",
-                        "action_type": "pass",
-                        "doubling_level": doubling_level,
-                        "gem_value": ev.get("gem", 0),
-                        "player_seat": seat,
-                        "is_bidding_team": is_bidding_team,
-                        "hand_cards": hand,
-                        "hand_metrics": metrics,
-                        "game_mode": game_mode,
-                        "trump_suit": trump_suit,
-                        "team_score_before": team_score,
-                        "opponent_score_before": opp_score,
-                        "score_differential": team_score - opp_score,
-                        "points_to_win": 152 - team_score,
-                        "round_won": (round_won_by == team) if result else None,
-                        "gp_earned": 0,
-                        "gp_lost": 0,
-                        "khasara": False,
-                        "is_human": not is_bot,
-                    }
-                    records.append(record)
+    rounds, bids = store.rounds, store.bids
+    names = store.games["name"].tolist()
+    rnd_of_bid = store.round_of(bids)
+    seats = bids["seat"].astype(np.int64)
+    seated = (seats >= 1) & (seats <= 4)
+    hands = np.where(seated, rounds["hands"][rnd_of_bid, np.clip(seats - 1, 0, 3)], 0)
+    metrics = compute_hand_metrics(hands, rounds["trump"][rnd_of_bid])
+    bid_names, bid_seats = bids["bid"].tolist(), seats.tolist()
+    events, gems = bids["event"].tolist(), bids["gem"].tolist()
+    starts, stops = store.round_spans("bids")
+
+    for ri in range(len(rounds)):
+        rnd = rounds[ri]
+        game_name = names[rnd["game"]]
+        round_idx = int(rnd["round"])
+        t1s, t2s = int(rnd["t1s"]), int(rnd["t2s"])
+
+        game_mode = str(rnd["mode"])
+        trump_suit = suit_symbol(int(rnd["trump"]))
+        bidder_seat = int(rnd["bidder"])
+        bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
+
+        # Round result
+        result = bool(rnd["result"])
+        round_won_by = int(rnd["winner"])
+        gp_t1 = int(rnd["s1"])
+        gp_t2 = int(rnd["s2"])
+
+        # Track doubling phase
+        in_doubling_phase = False
+        doubling_level = 1
+
+        for i in range(starts[ri], stops[ri]):
+            b = bid_names[i]
+            seat = bid_seats[i]
+
+            # Detect doubling phase entry
+            if b in DOUBLING_BIDS:
+                in_doubling_phase = True
+
+            if not in_doubling_phase:
+                continue
+
+            is_bot = (game_name, round_idx + 1, events[i]) in bot_moves
+            team = player_team(seat) if seat > 0 else 0
+            is_bidding_team = (team == bidding_team)
+
+            hand = mask_to_source(hands[i])
+
+            team_score = t1s if team == 1 else t2s
+            opp_score = t2s if team == 1 else t1s
+
+            if b in DOUBLING_BIDS:
+                # Actual doubling action
+                if b in ("hokomclose", "hokomopen", "double", "beforeyou"):
+                    doubling_level += 1
+                elif b == "triple":
+                    doubling_level = max(doubling_level, 3)
+                elif b == "qahwa":
+                    doubling_level = 99
+
+                gem = gems[i] if gems[i] >= 0 else doubling_level - 1
+                round_won = (round_won_by == team)
+                gp_earned = gp_t1 if team == 1 else gp_t2
+                gp_lost = gp_t2 if team == 1 else gp_t1
+
+                record = {
+                    "game_id": game_name,
+                    "round_idx": round_idx + 1,
+                    "action": b,
+                    "action_type": "double",
+                    "doubling_level": doubling_level,
+                    "gem_value": gem,
+                    "player_seat": seat,
+                    "is_bidding_team": is_bidding_team,
+                    "hand_cards": hand,
+                    "hand_metrics": metrics[i],
+                    "game_mode": game_mode,
+                    "trump_suit": trump_suit,
+                    "team_score_before": team_score,
+                    "opponent_score_before": opp_score,
+                    "score_differential": team_score - opp_score,
+                    "points_to_win": 152 - team_score,
+                    "round_won": round_won,
+                    "gp_earned": gp_earned if round_won else 0,
+                    "gp_lost": gp_lost if not round_won else 0,
+                    "khasara": gp_t1 == 0 or gp_t2 == 0,
+                    "is_human": not is_bot,
+                }
+                records.append(record)
+
+            elif b == "pass":
+                # Doubling opportunity NOT taken
+                record = {
+                    "game_id": game_name,
+                    "round_idx": round_idx + 1,
+                    "action": "pass_on_double",
+                    "action_type": "pass",
+                    "doubling_level": doubling_level,
+                    "gem_value": max(gems[i], 0),
+                    "player_seat": seat,
+                    "is_bidding_team": is_bidding_team,
+                    "hand_cards": hand,
+                    "hand_metrics": metrics[i],
+                    "game_mode": game_mode,
+                    "trump_suit": trump_suit,
+                    "team_score_before": team_score,
+                    "opponent_score_before": opp_score,
+                    "score_differential": team_score - opp_score,
+                    "points_to_win": 152 - team_score,
+                    "round_won": (round_won_by == team) if result else None,
+                    "gp_earned": 0,
+                    "gp_lost": 0,
+                    "khasara": False,
+                    "is_human": not is_bot,
+                }
+                records.append(record)
 
     return records
 
@@ -469,22 +385,12 @@ def main():
     print("=" * 60)
 
     bot_moves = load_bot_moves()
-    print("\nLoading games...")
-    games = []
-    for fname in sorted(os.listdir(ARCHIVE_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        with open(ARCHIVE_DIR / fname, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                data["_filename"] = fname
-                games.append(data)
-            except json.JSONDecodeError:
-                pass
-    print("  Loaded {} games".format(len(games)))
+    print("\nLoading archive store...")
+    store = open_store(ARCHIVE_DIR)
+    print("  Loaded {} games".format(len(store.games)))
 
     print("\nExtracting doubling records...")
-    records = extract_doubling_records(games, bot_moves)
+    records = extract_doubling_records(store, bot_moves)
     print("  Total records: {}".format(len(records)))
     doubles = [r for r in records if r["action_type"] == "double"]
     passes = [r for r in records if r["action_type"] == "pass"]
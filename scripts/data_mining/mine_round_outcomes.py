@@ -1,7 +1,8 @@
 """Mission 5: Round Outcome Predictors.
 
 Builds a comprehensive dataset connecting hand distributions, bidding,
-and strategic choices to round outcomes for win probability estimation.
+and strategic choices to round outcomes for win probability estimation,
+from the columnar archive store (gbaloot/tools/archive_store.py).
 
 Produces:
   - round_outcomes.json: All round summaries with 4 hands + outcome
@@ -11,125 +12,40 @@ Produces:
 from __future__ import annotations
 
 import json
-import os
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from gbaloot.tools.archive_store import (  # noqa: E402
+    ArchiveStore, SOURCE_OF_ID, hand_metrics, mask_to_source, open_store, suit_symbol,
+)
+
 ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
 TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
 
-SOURCE_SUITS = {0: "♠", 1: "♥", 2: "♣", 3: "♦"}
-SOURCE_RANKS = {5: "7", 6: "8", 7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-VALID_RANK_RANGE = range(5, 13)
-
-PTS_SUN = {"7": 0, "8": 0, "9": 0, "J": 2, "Q": 3, "K": 4, "10": 10, "A": 11}
-PTS_HOKUM = {"7": 0, "8": 0, "Q": 3, "K": 4, "10": 10, "A": 11, "9": 14, "J": 20}
-
-
-def decode_bitmask(bitmask: int) -> list[int]:
-    cards = []
-    for idx in range(52):
-        if idx % 13 not in VALID_RANK_RANGE:
-            continue
-        if bitmask & (1 << idx):
-            cards.append(idx)
-    return sorted(cards)
-
-
-def card_idx_to_info(idx: int) -> dict:
-    suit_idx = idx // 13
-    rank_idx = idx % 13
-    return {"suit": SOURCE_SUITS.get(suit_idx, "?"), "rank": SOURCE_RANKS.get(rank_idx, "?")}
-
-
-def hand_metrics(hand: list[int], trump_suit: str | None) -> dict:
-    """Compute comprehensive hand metrics."""
-    suits = defaultdict(list)
-    aces = kings = queens = jacks = 0
-    pts_sun = pts_hokum = 0
-    for idx in hand:
-        info = card_idx_to_info(idx)
-        r, s = info["rank"], info["suit"]
-        suits[s].append(r)
-        if r == "A": aces += 1
-        elif r == "K": kings += 1
-        elif r == "Q": queens += 1
-        elif r == "J": jacks += 1
-        pts_sun += PTS_SUN.get(r, 0)
-        pts_hokum += PTS_HOKUM.get(r, 0)
-
-    trump_count = len(suits.get(trump_suit, [])) if trump_suit else 0
-    all_suits = ["♠", "♥", "♣", "♦"]
-    suit_lens = {s: len(suits.get(s, [])) for s in all_suits}
-    voids = sum(1 for s in all_suits if suit_lens[s] == 0)
-    singletons = sum(1 for s in all_suits if suit_lens[s] == 1)
-    longest = max(suit_lens.values()) if suit_lens else 0
-
-    return {
-        "trump_count": trump_count,
-        "aces": aces, "kings": kings, "queens": queens, "jacks": jacks,
-        "high_cards": aces + kings + queens + jacks,
-        "point_value_sun": pts_sun,
-        "point_value_hokum": pts_hokum,
-        "voids": voids,
-        "singletons": singletons,
-        "longest_suit": longest,
-    }
+CONTRACT_TYPES = ("hokom", "sun", "ashkal", "hokom2", "turntosun")
 
 
 def player_team(seat: int) -> int:
     return 1 if seat in (1, 3) else 2
 
 
-def resolve_game_mode(events: list[dict]) -> str:
-    mode = "SUN"
-    for ev in events:
-        if ev.get("e") == 2:
-            gm = ev.get("gm")
-            if gm == 2: mode = "HOKUM"
-            elif gm in (1, 3): mode = "SUN"
-    return mode
-
-
-def resolve_trump_suit(events: list[dict], fc: int | None) -> str | None:
-    suit_bids = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-    for ev in events:
-        if ev.get("e") != 2: continue
-        b = ev.get("b", "")
-        if b in suit_bids: return suit_bids[b]
-        if b in ("turntosun", "sun", "ashkal"): return None
-    for ev in events:
-        if ev.get("e") != 2: continue
-        if ev.get("b") == "hokom" and fc is not None:
-            return SOURCE_SUITS.get(fc // 13)
-    return None
-
-
-def get_bidder_seat(events: list[dict]) -> int:
-    rb = -1
-    for ev in events:
-        if ev.get("e") == 2:
-            v = ev.get("rb", -1)
-            if v > 0: rb = v
-    return rb
-
-
-def get_bid_type(events: list[dict]) -> str:
+def get_bid_type(bids: list[str]) -> str:
     """Get the winning bid type."""
-    for ev in events:
-        if ev.get("e") == 2:
-            b = ev.get("b", "")
-            if b in ("hokom", "sun", "ashkal", "hokom2", "turntosun"):
-                return b
+    for b in bids:
+        if b in CONTRACT_TYPES:
+            return b
     return "unknown"
 
 
-def get_multiplier(events: list[dict], mode: str) -> int:
+def get_multiplier(bids: list[str], mode: str) -> int:
     level = 1
-    for ev in events:
-        if ev.get("e") != 2: continue
-        b = ev.get("b", "")
+    for b in bids:
         if b in ("hokomclose", "beforeyou", "hokomopen"):
             level += 1
         elif b == "triple":
@@ -141,162 +57,123 @@ def get_multiplier(events: list[dict], mode: str) -> int:
     return min(level, 99)
 
 
-def count_tricks_per_team(events: list[dict]) -> tuple[int, int]:
-    """Count tricks won by each team by tracking card plays and trick boundaries."""
-    t1_tricks = t2_tricks = 0
-    trick_cards = []
-
-    for ev in events:
-        if ev.get("e") == 4:
-            trick_cards.append(ev)
-        elif ev.get("e") == 6:
-            # Trick boundary — the winner is the leader of the next trick
-            # We use the result to count, but approximate here
-            p = ev.get("p")
-            if p is not None and p > 0:
-                team = player_team(p)
-                if team == 1:
-                    t1_tricks += 1
-                else:
-                    t2_tricks += 1
-            trick_cards = []
-
-    return t1_tricks, t2_tricks
+def extract_round_outcomes(store: ArchiveStore) -> list[dict]:
+    """Extract comprehensive round summaries.
 
-
-def extract_round_outcomes(games: list[dict]) -> list[dict]:
-    """Extract comprehensive round summaries."""
+    Hand metrics for all four seats of every round and the e=6 trick
+    counts are computed over the whole store at once.
+    """
     records = []
 
-    for game in games:
-        game_name = game.get("n", game.get("_filename", "unknown"))
-
-        for round_idx, round_obj in enumerate(game.get("rs", [])):
-            events = round_obj.get("r", [])
-
-            # Get hands
-            all_hands = {}
-            for ev in events:
-                if ev.get("e") == 15:
-                    bhr = ev.get("bhr", [])
-                    for si in range(min(4, len(bhr))):
-                        all_hands[si + 1] = decode_bitmask(bhr[si])
-                    break
-
-            if not all_hands or len(all_hands) < 4:
-                continue
-
-            # Get round info
-            fc = None
-            t1s = t2s = 0
-            for ev in events:
-                if ev.get("e") == 1:
-                    fc = ev.get("fc")
-                    t1s = ev.get("t1s", 0)
-                    t2s = ev.get("t2s", 0)
-                    break
-
-            game_mode = resolve_game_mode(events)
-            trump_suit = resolve_trump_suit(events, fc)
-            bidder_seat = get_bidder_seat(events)
-            bid_type = get_bid_type(events)
-            multiplier = get_multiplier(events, game_mode)
-            bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
-
-            # Result
-            result = None
-            for ev in events:
-                if ev.get("e") == 12:
-                    result = ev.get("rs", {})
-                    break
-
-            if result is None:
-                continue  # Skip waraq rounds
-
-            winner_team = result.get("w", 0)
-            p1_raw = result.get("p1", 0)
-            p2_raw = result.get("p2", 0)
-            gp_t1 = result.get("s1", 0)
-            gp_t2 = result.get("s2", 0)
-            kbt = result.get("kbt", 0)
-            khasara = (gp_t1 == 0 or gp_t2 == 0) and not kbt
-            r1_decls = result.get("r1", [])
-            r2_decls = result.get("r2", [])
-
-            # Count tricks
-            t1_tricks, t2_tricks = count_tricks_per_team(events)
-
-            # Compute hand metrics for all 4 players
-            player_metrics = {}
-            for seat in range(1, 5):
-                player_metrics[seat] = hand_metrics(all_hands.get(seat, []), trump_suit)
-
-            # Team 1 = seats 1,3; Team 2 = seats 2,4
-            m1 = player_metrics[1]
-            m3 = player_metrics[3]
-            m2 = player_metrics[2]
-            m4 = player_metrics[4]
-
-            # Bidder and partner metrics
-            if bidding_team == 1:
-                bidder_m = player_metrics.get(bidder_seat, m1)
-                partner_seat = 3 if bidder_seat == 1 else 1
-                partner_m = player_metrics.get(partner_seat, m3)
-                defender_m1 = m2
-                defender_m2 = m4
-            else:
-                bidder_m = player_metrics.get(bidder_seat, m2)
-                partner_seat = 4 if bidder_seat == 2 else 2
-                partner_m = player_metrics.get(partner_seat, m4)
-                defender_m1 = m1
-                defender_m2 = m3
-
-            record = {
-                "game_id": game_name,
-                "round_idx": round_idx + 1,
-                "team1_hands": [all_hands.get(1, []), all_hands.get(3, [])],
-                "team2_hands": [all_hands.get(2, []), all_hands.get(4, [])],
-                "floor_card": fc,
-                "game_mode": game_mode,
-                "trump_suit": trump_suit,
-                "bidding_team": bidding_team,
-                "bidder_seat": bidder_seat,
-                "bid_type": bid_type,
-                "multiplier": multiplier,
-                "team1_score_before": t1s,
-                "team2_score_before": t2s,
-                # Bidder metrics
-                "bidder_trump_count": bidder_m["trump_count"],
-                "bidder_high_cards": bidder_m["high_cards"],
-                "bidder_aces": bidder_m["aces"],
-                "bidder_point_total_sun": bidder_m["point_value_sun"],
-                "bidder_point_total_hokum": bidder_m["point_value_hokum"],
-                "partner_trump_count": partner_m["trump_count"],
-                "partner_high_cards": partner_m["high_cards"],
-                "combined_trump": bidder_m["trump_count"] + partner_m["trump_count"],
-                "combined_aces": bidder_m["aces"] + partner_m["aces"],
-                "combined_high_cards": bidder_m["high_cards"] + partner_m["high_cards"],
-                # Defender metrics
-                "defender_combined_trump": defender_m1["trump_count"] + defender_m2["trump_count"],
-                "defender_combined_aces": defender_m1["aces"] + defender_m2["aces"],
-                "defender_combined_high_cards": defender_m1["high_cards"] + defender_m2["high_cards"],
-                # Outcome
-                "winner_team": winner_team,
-                "bidder_won": winner_team == bidding_team,
-                "team1_tricks": t1_tricks,
-                "team2_tricks": t2_tricks,
-                "team1_raw_points": p1_raw,
-                "team2_raw_points": p2_raw,
-                "team1_gp": gp_t1,
-                "team2_gp": gp_t2,
-                "khasara": khasara,
-                "kaboot": bool(kbt),
-                "declarations": {
-                    "r1": [{"n": d.get("n"), "val": d.get("val")} for d in r1_decls],
-                    "r2": [{"n": d.get("n"), "val": d.get("val")} for d in r2_decls],
-                },
-            }
-            records.append(record)
+    rounds = store.rounds
+    names = store.games["name"].tolist()
+    metrics = hand_metrics(rounds["hands"], rounds["trump"][:, None])
+    metric_cols = {k: v.tolist() for k, v in metrics.items() if k != "suit_lengths"}
+
+    # Tricks per team, from the seat on each e=6 trick boundary
+    tricks = store.tricks
+    won = tricks[tricks["won_by"] > 0]
+    rows = store.round_of(won)
+    team1 = np.isin(won["won_by"], (1, 3))
+    t1_tricks = np.bincount(rows[team1], minlength=len(rounds)).tolist()
+    t2_tricks = np.bincount(rows[~team1], minlength=len(rounds)).tolist()
+
+    bids = store.bids["bid"].tolist()
+    bid_starts, bid_stops = store.round_spans("bids")
+    decls = store.decls
+    decl_starts, decl_stops = store.round_spans("decls")
+
+    # Skip undealt and waraq (no result) rounds
+    for ri in np.flatnonzero(rounds["dealt"] & rounds["result"]).tolist():
+        rnd = rounds[ri]
+        all_hands = {s + 1: mask_to_source(h) for s, h in enumerate(rnd["hands"].tolist())}
+        fc = int(SOURCE_OF_ID[rnd["floor"]]) if rnd["floor"] >= 0 else None
+
+        game_mode = str(rnd["mode"])
+        trump_suit = suit_symbol(int(rnd["trump"]))
+        bidder_seat = int(rnd["bidder"])
+        round_bids = bids[bid_starts[ri]:bid_stops[ri]]
+        bid_type = get_bid_type(round_bids)
+        multiplier = get_multiplier(round_bids, game_mode)
+        bidding_team = player_team(bidder_seat) if bidder_seat > 0 else 0
+
+        winner_team = int(rnd["winner"])
+        gp_t1, gp_t2 = int(rnd["s1"]), int(rnd["s2"])
+        kbt = bool(rnd["kaboot"])
+        khasara = (gp_t1 == 0 or gp_t2 == 0) and not kbt
+        round_decls = decls[decl_starts[ri]:decl_stops[ri]]
+
+        player_metrics = {seat: {k: v[ri][seat - 1] for k, v in metric_cols.items()}
+                          for seat in range(1, 5)}
+
+        # Team 1 = seats 1,3; Team 2 = seats 2,4
+        m1 = player_metrics[1]
+        m3 = player_metrics[3]
+        m2 = player_metrics[2]
+        m4 = player_metrics[4]
+
+        # Bidder and partner metrics
+        if bidding_team == 1:
+            bidder_m = player_metrics.get(bidder_seat, m1)
+            partner_seat = 3 if bidder_seat == 1 else 1
+            partner_m = player_metrics.get(partner_seat, m3)
+            defender_m1 = m2
+            defender_m2 = m4
+        else:
+            bidder_m = player_metrics.get(bidder_seat, m2)
+            partner_seat = 4 if bidder_seat == 2 else 2
+            partner_m = player_metrics.get(partner_seat, m4)
+            defender_m1 = m1
+            defender_m2 = m3
+
+        record = {
+            "game_id": names[rnd["game"]],
+            "round_idx": int(rnd["round"]) + 1,
+            "team1_hands": [all_hands[1], all_hands[3]],
+            "team2_hands": [all_hands[2], all_hands[4]],
+            "floor_card": fc,
+            "game_mode": game_mode,
+            "trump_suit": trump_suit,
+            "bidding_team": bidding_team,
+            "bidder_seat": bidder_seat,
+            "bid_type": bid_type,
+            "multiplier": multiplier,
+            "team1_score_before": int(rnd["t1s"]),
+            "team2_score_before": int(rnd["t2s"]),
+            # Bidder metrics
+            "bidder_trump_count": bidder_m["trump_count"],
+            "bidder_high_cards": bidder_m["high_cards"],
+            "bidder_aces": bidder_m["aces"],
+            "bidder_point_total_sun": bidder_m["point_value_sun"],
+            "bidder_point_total_hokum": bidder_m["point_value_hokum"],
+            "partner_trump_count": partner_m["trump_count"],
+            "partner_high_cards": partner_m["high_cards"],
+            "combined_trump": bidder_m["trump_count"] + partner_m["trump_count"],
+            "combined_aces": bidder_m["aces"] + partner_m["aces"],
+            "combined_high_cards": bidder_m["high_cards"] + partner_m["high_cards"],
+            # Defender metrics
+            "defender_combined_trump": defender_m1["trump_count"] + defender_m2["trump_count"],
+            "defender_combined_aces": defender_m1["aces"] + defender_m2["aces"],
+            "defender_combined_high_cards": defender_m1["high_cards"] + defender_m2["high_cards"],
+            # Outcome
+            "winner_team": winner_team,
+            "bidder_won": winner_team == bidding_team,
+            "team1_tricks": t1_tricks[ri],
+            "team2_tricks": t2_tricks[ri],
+            "team1_raw_points": int(rnd["p1"]),
+            "team2_raw_points": int(rnd["p2"]),
+            "team1_gp": gp_t1,
+            "team2_gp": gp_t2,
+            "khasara": khasara,
+            "kaboot": kbt,
+            "declarations": {
+                key: [{"n": n, "val": v} for t, n, v in zip(round_decls["team"].tolist(),
+                                                            round_decls["name"].tolist(),
+                                                            round_decls["val"].tolist()) if t == team]
+                for key, team in (("r1", 1), ("r2", 2))
+            },
+        }
+        records.append(record)
 
     return records
 
@@ -465,22 +342,12 @@ def main():
     print("Mission 5: Round Outcome Predictors")
     print("=" * 60)
 
-    print("\nLoading games...")
-    games = []
-    for fname in sorted(os.listdir(ARCHIVE_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        with open(ARCHIVE_DIR / fname, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                data["_filename"] = fname
-                games.append(data)
-            except json.JSONDecodeError:
-                pass
-    print("  Loaded {} games".format(len(games)))
+    print("\nLoading archive store...")
+    store = open_store(ARCHIVE_DIR)
+    print("  Loaded {} games".format(len(store.games)))
 
     print("\nExtracting round outcomes...")
-    records = extract_round_outcomes(games)
+    records = extract_round_outcomes(store)
     print("  Total rounds: {}".format(len(records)))
     print("  HOKUM: {}".format(sum(1 for r in records if r["game_mode"] == "HOKUM")))
     print("  SUN: {}".format(sum(1 for r in records if r["game_mode"] == "SUN")))
@@ -1,7 +1,8 @@
 """Mission 4: Partnership Signaling Extraction.
 
 Discovers if professional players use systematic signaling through
-lead cards, discards, and count signals.
+lead cards, discards, and count signals. Reads the columnar archive store
+(gbaloot/tools/archive_store.py).
 
 Produces:
   - lead_signals.json: Lead signal patterns
@@ -11,31 +12,27 @@ Produces:
 from __future__ import annotations
 
 import json
-import os
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from gbaloot.tools.archive_store import (  # noqa: E402
+    ArchiveStore, SOURCE_OF_ID, SUIT_MASKS, mask_to_source, open_store, suit_symbol,
+)
+
 ARCHIVE_DIR = ROOT / "gbaloot" / "data" / "archive_captures" / "mobile_export" / "savedGames"
 TRAINING_DIR = ROOT / "gbaloot" / "data" / "training"
 
 SOURCE_SUITS = {0: "♠", 1: "♥", 2: "♣", 3: "♦"}
 SOURCE_RANKS = {5: "7", 6: "8", 7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-VALID_RANK_RANGE = range(5, 13)
 RANK_ORDER = ["7", "8", "9", "J", "Q", "K", "10", "A"]
 
 ORDER_SUN = ["7", "8", "9", "J", "Q", "K", "10", "A"]
-ORDER_HOKUM = ["7", "8", "Q", "K", "10", "A", "9", "J"]
-
-
-def decode_bitmask(bitmask: int) -> list[int]:
-    cards = []
-    for idx in range(52):
-        if idx % 13 not in VALID_RANK_RANGE:
-            continue
-        if bitmask & (1 << idx):
-            cards.append(idx)
-    return sorted(cards)
 
 
 def card_suit(idx: int) -> str:
@@ -58,59 +55,6 @@ def partner_seat_fn(seat: int) -> int:
     return {1: 3, 2: 4, 3: 1, 4: 2}.get(seat, 0)
 
 
-def compute_trick_winner(plays: list[tuple[int, int]], mode: str,
-                         trump_suit: str | None) -> int:
-    if not plays: return 0
-    lead_suit = card_suit(plays[0][1])
-    best_seat = plays[0][0]
-    best_strength = -1
-    for seat, cidx in plays:
-        c_suit = card_suit(cidx)
-        c_rank = card_rank(cidx)
-        strength = -1
-        if mode == "HOKUM" and trump_suit and c_suit == trump_suit:
-            strength = 100 + (ORDER_HOKUM.index(c_rank) if c_rank in ORDER_HOKUM else 0)
-        elif c_suit == lead_suit:
-            strength = ORDER_SUN.index(c_rank) if c_rank in ORDER_SUN else 0
-        if strength > best_strength:
-            best_strength = strength
-            best_seat = seat
-    return best_seat
-
-
-def resolve_game_mode(events: list[dict]) -> str:
-    mode = "SUN"
-    for ev in events:
-        if ev.get("e") == 2:
-            gm = ev.get("gm")
-            if gm == 2: mode = "HOKUM"
-            elif gm in (1, 3): mode = "SUN"
-    return mode
-
-
-def resolve_trump_suit(events: list[dict], fc: int | None) -> str | None:
-    suit_bids = {"clubs": "♣", "hearts": "♥", "spades": "♠", "diamonds": "♦"}
-    for ev in events:
-        if ev.get("e") != 2: continue
-        b = ev.get("b", "")
-        if b in suit_bids: return suit_bids[b]
-        if b in ("turntosun", "sun", "ashkal"): return None
-    for ev in events:
-        if ev.get("e") != 2: continue
-        if ev.get("b") == "hokom" and fc is not None:
-            return SOURCE_SUITS.get(fc // 13)
-    return None
-
-
-def get_bidder_seat(events: list[dict]) -> int:
-    rb = -1
-    for ev in events:
-        if ev.get("e") == 2:
-            v = ev.get("rb", -1)
-            if v > 0: rb = v
-    return rb
-
-
 def load_bot_moves() -> set[tuple[str, int, int]]:
     labels_path = TRAINING_DIR / "move_labels.json"
     if not labels_path.exists(): return set()
@@ -120,190 +64,148 @@ def load_bot_moves() -> set[tuple[str, int, int]]:
             for m in data.get("labeled_moves", []) if m.get("player_type") == "BOT"}
 
 
-def extract_signals(games: list[dict], bot_moves: set) -> tuple[list[dict], list[dict]]:
-    """Extract lead signals and discard signals."""
+def extract_signals(store: ArchiveStore, bot_moves: set) -> tuple[list[dict], list[dict]]:
+    """Extract lead signals and discard signals from complete (4-card) tricks.
+
+    Discard candidates (followed by a card that is neither the led suit nor
+    trump) are flagged for the whole plays table at once.
+    """
     lead_signals = []
     discard_signals = []
 
-    for game in games:
-        game_name = game.get("n", game.get("_filename", "unknown"))
-
-        for round_idx, round_obj in enumerate(game.get("rs", [])):
-            events = round_obj.get("r", [])
-
-            # Get initial hands
-            initial_hands = {}
-            for ev in events:
-                if ev.get("e") == 15:
-                    bhr = ev.get("bhr", [])
-                    for si in range(min(4, len(bhr))):
-                        initial_hands[si + 1] = set(decode_bitmask(bhr[si]))
-                    break
-
-            if len(initial_hands) < 4:
+    rounds, plays, tricks = store.rounds, store.plays, store.tricks
+    names = store.games["name"].tolist()
+    suit = plays["card"] >> 3
+    trump = rounds["trump"][store.round_of(plays)]
+    is_discard = ((plays["lead"] >= 0) & (suit != plays["lead"])
+                  & ~((trump >= 0) & (suit == trump))).tolist()
+    # Did the player still hold the led suit (partner response)?
+    had_lead = (plays["hand"] & SUIT_MASKS[np.maximum(plays["lead"], 0)]) != 0
+    source = SOURCE_OF_ID[plays["card"]].tolist()
+    cols = {name: plays[name].tolist() for name in ("event", "trick", "seat", "hand")}
+    had_lead = had_lead.tolist()
+    starts, stops = store.round_spans("plays")
+    trick_starts, trick_stops = store.round_spans("tricks")
+
+    for ri in np.flatnonzero(rounds["dealt"]).tolist():
+        rnd = rounds[ri]
+        game_name = names[rnd["game"]]
+        round_idx = int(rnd["round"])
+        game_mode = str(rnd["mode"])
+        trump_suit = suit_symbol(int(rnd["trump"]))
+
+        # Play rows of each trick number
+        by_trick = defaultdict(list)
+        for i in range(starts[ri], stops[ri]):
+            by_trick[cols["trick"][i]].append(i)
+
+        trick_number = 0
+        for trick, count, winner_seat in zip(
+                tricks["trick"][trick_starts[ri]:trick_stops[ri]].tolist(),
+                tricks["count"][trick_starts[ri]:trick_stops[ri]].tolist(),
+                tricks["winner"][trick_starts[ri]:trick_stops[ri]].tolist()):
+            if count != 4:
                 continue
-
-            fc = None
-            for ev in events:
-                if ev.get("e") == 1:
-                    fc = ev.get("fc")
+            trick_number += 1
+            rows = by_trick[trick]
+            winner_team = player_team(winner_seat)
+
+            # Extract lead signal (position 1 = leader)
+            lead = rows[0]
+            leader_seat = cols["seat"][lead]
+            lead_card = source[lead]
+            lead_suit_played = card_suit(lead_card)
+            lead_rank_played = card_rank(lead_card)
+
+            # Leader's hand at the time of leading
+            leader_hand_before = mask_to_source(cols["hand"][lead])
+
+            # Cards of the led suit in leader's hand
+            leader_suit_cards = [c for c in leader_hand_before
+                                 if card_suit(c) == lead_suit_played]
+            leader_suit_length = len(leader_suit_cards)
+            leader_has_ace = any(card_rank(c) == "A"
+                                 for c in leader_suit_cards)
+
+            # Partner's response
+            ps = partner_seat_fn(leader_seat)
+            partner_card = None
+            partner_had_suit = False
+            for i in rows:
+                if cols["seat"][i] == ps:
+                    partner_card = source[i]
+                    partner_had_suit = had_lead[i]
                     break
 
-            game_mode = resolve_game_mode(events)
-            trump_suit = resolve_trump_suit(events, fc)
-            bidder_seat = get_bidder_seat(events)
-
-            # Track state
-            current_hands = {s: set(h) for s, h in initial_hands.items()}
-            trick_plays = []
-            trick_number = 0
-
-            card_events = []
-            for ev_idx, ev in enumerate(events):
-                if ev.get("e") == 4:
-                    card_events.append((ev_idx, ev))
-                elif ev.get("e") == 6:
-                    # Process completed trick
-                    if len(trick_plays) == 4:
-                        trick_number += 1
-                        winner_seat = compute_trick_winner(
-                            trick_plays, game_mode, trump_suit)
-                        winner_team = player_team(winner_seat)
-
-                        # Extract lead signal (position 1 = leader)
-                        leader_seat = trick_plays[0][0]
-                        lead_card = trick_plays[0][1]
-                        lead_suit_played = card_suit(lead_card)
-                        lead_rank_played = card_rank(lead_card)
-
-                        # Leader's hand at the time of leading
-                        # We need the hand BEFORE this trick, which we tracked
-                        leader_hand_before = sorted(
-                            current_hands.get(leader_seat, set()) | {lead_card})
-
-                        # Cards of the led suit in leader's hand
-                        leader_suit_cards = [c for c in leader_hand_before
-                                             if card_suit(c) == lead_suit_played]
-                        leader_suit_length = len(leader_suit_cards)
-                        leader_has_ace = any(card_rank(c) == "A"
-                                             for c in leader_suit_cards)
-
-                        # Partner's response
-                        ps = partner_seat_fn(leader_seat)
-                        partner_card = None
-                        partner_had_suit = False
-                        for s, c in trick_plays:
-                            if s == ps:
-                                partner_card = c
-                                # Check if partner had the led suit
-                                partner_hand = current_hands.get(ps, set()) | {c}
-                                partner_had_suit = any(
-                                    card_suit(pc) == lead_suit_played
-                                    for pc in partner_hand)
-                                break
-
-                        is_bot = any(
-                            (game_name, round_idx + 1, eidx) in bot_moves
-                            for eidx, _ in [(ce[0], ce[1]) for ce in card_events
-                                             if ce[1].get("p") == leader_seat]
-                        )
-
-                        if not is_bot:
-                            lead_signal = {
-                                "game_id": game_name,
-                                "round_idx": round_idx + 1,
-                                "trick_number": trick_number,
-                                "leader_seat": leader_seat,
-                                "lead_card": lead_card,
-                                "lead_card_name": card_name(lead_card),
-                                "lead_card_rank": lead_rank_played,
-                                "lead_card_suit": lead_suit_played,
-                                "leader_hand": leader_hand_before,
-                                "leader_suit_length": leader_suit_length,
-                                "leader_has_ace": leader_has_ace,
-                                "partner_response": partner_card,
-                                "partner_response_name": card_name(partner_card) if partner_card else None,
-                                "partner_had_suit": partner_had_suit,
-                                "trick_won_by_team": winner_team == player_team(leader_seat),
-                                "game_mode": game_mode,
-                                "trump_suit": trump_suit,
-                                "is_trump_lead": lead_suit_played == trump_suit if trump_suit else False,
-                            }
-                            lead_signals.append(lead_signal)
-
-                        # Extract discard signals (followers who couldn't follow suit)
-                        if len(trick_plays) >= 2:
-                            lead_suit = card_suit(trick_plays[0][1])
-                            for pos_idx, (s, c) in enumerate(trick_plays[1:], 2):
-                                c_suit = card_suit(c)
-                                if c_suit == lead_suit:
-                                    continue  # Followed suit, no signal
-
-                                # This is a discard/trump play
-                                is_trump = (c_suit == trump_suit) if trump_suit else False
-                                if is_trump:
-                                    continue  # Trump play, not a discard signal
-
-                                # Discard signal: void in lead suit
-                                player_hand = sorted(
-                                    current_hands.get(s, set()) | {c})
-
-                                suits_in_hand = defaultdict(int)
-                                for h_card in player_hand:
-                                    suits_in_hand[card_suit(h_card)] += 1
-
-                                # Check if discard is from shortest suit
-                                c_suit_length = suits_in_hand.get(c_suit, 0)
-                                min_suit_len = min(suits_in_hand.values()) if suits_in_hand else 0
-                                discarded_from_shortest = c_suit_length == min_suit_len
-
-                                # Check if discarded highest in that suit
-                                same_suit_cards = [
-                                    h for h in player_hand if card_suit(h) == c_suit]
-                                if same_suit_cards:
-                                    rank_indices = [
-                                        ORDER_SUN.index(card_rank(h))
-                                        for h in same_suit_cards
-                                        if card_rank(h) in ORDER_SUN]
-                                    my_rank_idx = ORDER_SUN.index(card_rank(c)) if card_rank(c) in ORDER_SUN else -1
-                                    discarded_highest = my_rank_idx == max(rank_indices) if rank_indices else False
-                                else:
-                                    discarded_highest = True
-
-                                is_bot2 = (game_name, round_idx + 1,
-                                           card_events[pos_idx - 1][0] if pos_idx - 1 < len(card_events) else -1) in bot_moves
-
-                                if not is_bot2:
-                                    discard_signal = {
-                                        "game_id": game_name,
-                                        "round_idx": round_idx + 1,
-                                        "trick_number": trick_number,
-                                        "player_seat": s,
-                                        "discarded_card": c,
-                                        "discarded_card_name": card_name(c),
-                                        "discarded_suit": c_suit,
-                                        "discarded_rank": card_rank(c),
-                                        "player_hand": player_hand,
-                                        "suits_in_hand": dict(suits_in_hand),
-                                        "led_suit": lead_suit,
-                                        "game_mode": game_mode,
-                                        "discarded_from_shortest_suit": discarded_from_shortest,
-                                        "discarded_highest_in_suit": discarded_highest,
-                                    }
-                                    discard_signals.append(discard_signal)
-
-                    # Reset trick
-                    for s, c in trick_plays:
-                        current_hands[s].discard(c)
-                    trick_plays = []
-                    card_events = []
-                    continue
-
-                if ev.get("e") == 4:
-                    seat = ev.get("p", 0)
-                    cidx = ev.get("c", -1)
-                    if seat > 0 and cidx >= 0:
-                        trick_plays.append((seat, cidx))
+            is_bot = any((game_name, round_idx + 1, cols["event"][i]) in bot_moves
+                         for i in rows if cols["seat"][i] == leader_seat)
+
+            if not is_bot:
+                lead_signal = {
+                    "game_id": game_name,
+                    "round_idx": round_idx + 1,
+                    "trick_number": trick_number,
+                    "leader_seat": leader_seat,
+                    "lead_card": lead_card,
+                    "lead_card_name": card_name(lead_card),
+                    "lead_card_rank": lead_rank_played,
+                    "lead_card_suit": lead_suit_played,
+                    "leader_hand": leader_hand_before,
+                    "leader_suit_length": leader_suit_length,
+                    "leader_has_ace": leader_has_ace,
+                    "partner_response": partner_card,
+                    "partner_response_name": card_name(partner_card) if partner_card else None,
+                    "partner_had_suit": partner_had_suit,
+                    "trick_won_by_team": winner_team == player_team(leader_seat),
+                    "game_mode": game_mode,
+                    "trump_suit": trump_suit,
+                    "is_trump_lead": lead_suit_played == trump_suit if trump_suit else False,
+                }
+                lead_signals.append(lead_signal)
+
+            # Extract discard signals (followers who couldn't follow suit)
+            for i in rows[1:]:
+                if not is_discard[i]:
+                    continue  # Followed suit or trumped, no signal
+
+                s, c = cols["seat"][i], source[i]
+                c_suit = card_suit(c)
+
+                # Discard signal: void in lead suit
+                player_hand = mask_to_source(cols["hand"][i])
+
+                suits_in_hand = defaultdict(int)
+                for h_card in player_hand:
+                    suits_in_hand[card_suit(h_card)] += 1
+
+                # Check if discard is from shortest suit
+                c_suit_length = suits_in_hand.get(c_suit, 0)
+                min_suit_len = min(suits_in_hand.values()) if suits_in_hand else 0
+                discarded_from_shortest = c_suit_length == min_suit_len
+
+                # Check if discarded highest in that suit
+                rank_indices = [ORDER_SUN.index(card_rank(h))
+                                for h in player_hand if card_suit(h) == c_suit]
+                discarded_highest = ORDER_SUN.index(card_rank(c)) == max(rank_indices)
+
+                if (game_name, round_idx + 1, cols["event"][i]) not in bot_moves:
+                    discard_signal = {
+                        "game_id": game_name,
+                        "round_idx": round_idx + 1,
+                        "trick_number": trick_number,
+                        "player_seat": s,
+                        "discarded_card": c,
+                        "discarded_card_name": card_name(c),
+                        "discarded_suit": c_suit,
+                        "discarded_rank": card_rank(c),
+                        "player_hand": player_hand,
+                        "suits_in_hand": dict(suits_in_hand),
+                        "led_suit": lead_suit_played,
+                        "game_mode": game_mode,
+                        "discarded_from_shortest_suit": discarded_from_shortest,
+                        "discarded_highest_in_suit": discarded_highest,
+                    }
+                    discard_signals.append(discard_signal)
 
     return lead_signals, discard_signals
 
@@ -547,22 +449,12 @@ def main():
 
     bot_moves = load_bot_moves()
 
-    print("\nLoading games...")
-    games = []
-    for fname in sorted(os.listdir(ARCHIVE_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        with open(ARCHIVE_DIR / fname, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                data["_filename"] = fname
-                games.append(data)
-            except json.JSONDecodeError:
-                pass
-    print("  Loaded {} games".format(len(games)))
+    print("\nLoading archive store...")
+    store = open_store(ARCHIVE_DIR)
+    print("  Loaded {} games".format(len(store.games)))
 
     print("\nExtracting signals...")
-    lead_signals, discard_signals = extract_signals(games, bot_moves)
+    lead_signals, discard_signals = extract_signals(store, bot_moves)
     print("  Lead signals: {}".format(len(lead_signals)))
     print("  Discard signals: {}".format(len(discard_signals)))
 
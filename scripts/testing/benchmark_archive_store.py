@@ -0,0 +1,82 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+
+from gbaloot.tests.test_archive_store import _random_archive
+from gbaloot.tools.archive_parser import load_all_archives
+from gbaloot.tools.archive_store import ArchiveStore, hand_metrics, ingest, popcount
+
+# Cost of getting at the mobile archives from a data-mining script.
+# "json" is what every miner used to do on each run: json.load every
+# savedGames file and walk its events (load_all_archives does the load and
+# the contract resolution). "ingest" builds the columnar store once;
+# "re-ingest" is the next run with nothing changed (hash check only) and
+# "+1 file" the run after one new archive arrives. "query" opens the
+# memory-mapped store and computes hand metrics for every seat of every
+# round plus the legal-move count of every play, vectorised.
+
+
+def run_archive_store_benchmark(games=1000, rounds=8, seed=5):
+    print("--- BENCHMARKING ARCHIVE STORE VS JSON RE-PARSING ---")
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_dir, store_dir = Path(tmp) / "savedGames", Path(tmp) / "store"
+        archive_dir.mkdir()
+        for i in range(games):
+            (archive_dir / f"game_{i:05d}.json").write_text(
+                json.dumps(_random_archive(rng, n_rounds=rounds)), encoding="utf-8")
+        size = sum(f.stat().st_size for f in archive_dir.iterdir()) / 1e6
+        print(f"{games} games x {rounds} rounds, {size:.1f} MB of JSON")
+
+        start = time.perf_counter()
+        load_all_archives(archive_dir)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ingest(archive_dir, store_dir)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ingest(archive_dir, store_dir)
+        noop = time.perf_counter() - start
+
+        (archive_dir / "game_new.json").write_text(
+            json.dumps(_random_archive(rng, n_rounds=rounds)), encoding="utf-8")
+        start = time.perf_counter()
+        stats = ingest(archive_dir, store_dir)
+        incremental = time.perf_counter() - start
+        assert stats["added"] == 1
+
+        start = time.perf_counter()
+        store = ArchiveStore(store_dir)
+        metrics = hand_metrics(store.rounds["hands"], store.rounds["trump"][:, None])
+        options = popcount(store.plays["legal"])
+        query = time.perf_counter() - start
+        forced = float(np.mean(options == 1))
+
+        disk = sum(f.stat().st_size for f in store_dir.iterdir()) / 1e6
+        print(f"json (load_all_archives): {legacy:6.2f} s per mining run")
+        print(f"ingest:                   {full:6.2f} s once -> {disk:.1f} MB store")
+        print(f"re-ingest (no changes):   {noop:6.2f} s")
+        print(f"re-ingest (+1 file):      {incremental:6.2f} s")
+        print(f"query:                    {query:6.3f} s ({len(store.rounds)} rounds, "
+              f"{len(store.plays)} plays, {forced:.0%} forced, "
+              f"mean {metrics['high_cards'].mean():.2f} high cards)")
+
+    per_run = noop + query
+    if per_run * 5 < legacy:
+        print("RESULT: ✅ VIABLE (Mining runs skip JSON parsing entirely)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_archive_store_benchmark()
@@ -0,0 +1,67 @@
+import dataclasses
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from gbaloot.core.batch import run_stage
+from gbaloot.tests.test_archive_store import _random_archive
+from gbaloot.tools.archive_bidding_validator import BIDDING_STAGE
+from gbaloot.tools.archive_scoring_validator import SCORING_STAGE
+from gbaloot.tools.run_archive_benchmark import ARCHIVE_COMPARE_STAGE
+
+# Cost of a full validation pass over the archive corpus: the scoring
+# validator, the bidding validator and the trick-comparison benchmark.
+# "serial" is how the tools used to run (one process, everything recomputed);
+# "cold" fans the files out over every core and fills the cache; "warm" is
+# the next run with nothing changed; "rule fix" bumps the scoring
+# validator's version, so only that stage reruns on the cached parses.
+
+STAGES = (SCORING_STAGE, BIDDING_STAGE, ARCHIVE_COMPARE_STAGE)
+
+
+def _pass(files, stages, workers, cache_dir):
+    start = time.perf_counter()
+    for stage in stages:
+        items = run_stage(stage, files, workers, cache_dir)
+        assert all(item.ok for item in items)
+    return time.perf_counter() - start
+
+
+def run_batch_benchmark(games=300, rounds=8, seed=9):
+    print("--- BENCHMARKING BATCH VALIDATORS (POOL + CACHE VS SERIAL) ---")
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_dir, cache_dir = Path(tmp) / "savedGames", Path(tmp) / "cache"
+        archive_dir.mkdir()
+        for i in range(games):
+            (archive_dir / f"game_{i:05d}.json").write_text(
+                json.dumps(_random_archive(rng, n_rounds=rounds)), encoding="utf-8")
+        files = sorted(archive_dir.glob("*.json"))
+        workers = os.cpu_count() or 1
+        print(f"{games} games x {rounds} rounds, {workers} cores")
+
+        serial = _pass(files, STAGES, 1, None)
+        cold = _pass(files, STAGES, None, cache_dir)
+        warm = _pass(files, STAGES, None, cache_dir)
+        bumped = dataclasses.replace(SCORING_STAGE, version=SCORING_STAGE.version + 1)
+        rule_fix = _pass(files, (bumped, BIDDING_STAGE, ARCHIVE_COMPARE_STAGE), None, cache_dir)
+
+        print(f"serial, no cache:        {serial:6.2f} s")
+        print(f"pool, cold cache:        {cold:6.2f} s ({serial / cold:.1f}x)")
+        print(f"pool, warm (no changes): {warm:6.2f} s ({serial / warm:.1f}x)")
+        print(f"scoring rule fix:        {rule_fix:6.2f} s (scoring only, parses cached)")
+
+    if warm * 5 < serial and rule_fix < serial:
+        print("RESULT: ✅ VIABLE (Unchanged corpus re-validates from cache)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_batch_benchmark()
@@ -0,0 +1,71 @@
+from gevent import monkey; monkey.patch_all()  # As server/main.py does
+
+import os
+import sys
+import time
+
+import gevent
+
+sys.path.append(os.getcwd())
+
+from server.bot_workers import DecisionPool
+from tests.server.test_bot_workers import _fallback, _think
+
+# Event-loop latency while bots think. A ticker greenlet sleeps 10 ms in a
+# loop (standing in for socket I/O, timers and broadcasts); the worst gap
+# between its wake-ups is the longest a human would wait for the server.
+# "inline" is the old bot_loop (get_decision in the greenlet), "pool" sends
+# each decision to a worker process. Each decision burns THINK seconds of CPU
+# like an MCTS search.
+
+THINK = 0.3
+
+
+def _worst_gap(pool, bots):
+    gaps, done = [], []
+
+    def ticker():
+        last = time.perf_counter()
+        while not done:
+            gevent.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = gevent.spawn(ticker)
+    start = time.perf_counter()
+    jobs = [gevent.spawn(pool.decide, {'think': THINK}, 0, f'room-{i}') for i in range(bots)]
+    gevent.joinall(jobs)
+    elapsed = time.perf_counter() - start
+    done.append(True)
+    tick.join()
+    assert all(j.value['action'] == 'PASS' for j in jobs)
+    return max(gaps), elapsed
+
+
+def run_bot_workers_benchmark(bot_counts=(1, 4, 8)):
+    print("--- BENCHMARKING BOT DECISIONS (WORKER POOL VS INLINE) ---")
+    workers = max(1, (os.cpu_count() or 1) - 1)
+    inline = DecisionPool(workers=0, decide_fn=_think)
+    pool = DecisionPool(workers=workers, deadline=60, decide_fn=_think, fallback_fn=_fallback)
+    for i in range(workers * 4):  # Start the workers
+        pool.decide({'think': 0}, 0, f'room-{i}')
+    print(f"{workers} worker processes, {THINK * 1000:.0f} ms of CPU per decision")
+
+    worst = 0.0
+    for bots in bot_counts:
+        inline_gap, inline_time = _worst_gap(inline, bots)
+        pool_gap, pool_time = _worst_gap(pool, bots)
+        worst = max(worst, pool_gap)
+        print(f"{bots} bots thinking: worst loop stall inline {inline_gap * 1000:6.0f} ms -> "
+              f"pool {pool_gap * 1000:4.0f} ms (all decisions in {inline_time:.2f} s / {pool_time:.2f} s)")
+    pool.shutdown()
+
+    if worst < 0.05:
+        print("RESULT: ✅ VIABLE (Loop latency flat however many bots think)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_bot_workers_benchmark()
@@ -0,0 +1,100 @@
+import json
+import os
+import random
+import sys
+import time
+
+import fakeredis
+
+sys.path.append(os.getcwd())
+
+from ai_worker.brain_client import BrainClient
+
+# Brain traffic of the bot decision hot path: a lookup for every
+# BIDDING/PLAYING decision and an analysis enqueue for every miss. Redis is
+# fakeredis with RTT_MS of simulated network latency per round trip. "legacy"
+# is the old client (GET correct, GET override on a miss, one LPUSH per
+# enqueue); "cached" is BrainClient with its snapshot loaded.
+
+RTT_MS = 0.3
+
+
+class _LatencyRedis(fakeredis.FakeRedis):
+    """fakeredis that sleeps RTT_MS per round trip (command or pipeline)."""
+    round_trips = 0
+
+    def execute_command(self, *args, **kwargs):
+        _LatencyRedis.round_trips += 1
+        time.sleep(RTT_MS / 1000)
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed(*args, **kwargs):
+            _LatencyRedis.round_trips += 1
+            time.sleep(RTT_MS / 1000)
+            return execute(*args, **kwargs)
+        pipe.execute = timed
+        return pipe
+
+
+def _legacy_decision(r, context_hash, payload):
+    move = r.get(f"brain:correct:{context_hash}")
+    if not move:
+        move = r.get("brain:move:FORCE_OVERRIDE_TEST")
+    if not move:
+        r.lpush("bot:analyze_queue", json.dumps(payload))
+    return json.loads(move) if move else None
+
+
+def _cached_decision(brain, context_hash, payload):
+    move = brain.lookup_move(context_hash)
+    if not move:
+        brain.queue_analysis(payload)
+    return move
+
+
+def run_brain_cache_benchmark(decisions=3000, known=500, seed=2):
+    print("--- BENCHMARKING BRAIN LOOKUPS (LOCAL CACHE VS PER-CALL REDIS) ---")
+    rng = random.Random(seed)
+    r = _LatencyRedis(decode_responses=True)
+    for i in range(known):
+        r.set(f"brain:correct:k{i}", json.dumps({'rank': 'A', 'suit': '♠', 'reason': str(i)}))
+    # 2% of decisions hit a taught position, the rest are new contexts
+    hashes = [f"k{rng.randrange(known)}" if rng.random() < 0.02 else f"ctx{i}" for i in range(decisions)]
+    payload = {'context_hash': 'x', 'game_context': {'hand': ['A♠'] * 8}}
+
+    _LatencyRedis.round_trips = 0
+    start = time.perf_counter()
+    legacy = [_legacy_decision(r, h, payload) for h in hashes]
+    legacy_time = time.perf_counter() - start
+    legacy_trips = _LatencyRedis.round_trips
+
+    brain = BrainClient(redis_client=r)
+    brain.refresh_snapshot()  # Normally the background thread's job
+    _LatencyRedis.round_trips = 0
+    start = time.perf_counter()
+    cached = [_cached_decision(brain, h, payload) for h in hashes]
+    brain.flush_analysis()
+    cached_time = time.perf_counter() - start
+    cached_trips = _LatencyRedis.round_trips
+    assert cached == legacy
+
+    stats = brain.stats()
+    print(f"{decisions} decisions, {known} taught positions, {RTT_MS} ms RTT")
+    print(f"legacy: {legacy_trips:5d} round trips, {legacy_time * 1e6 / decisions:7.1f} us/decision")
+    print(f"cached: {cached_trips:5d} round trips, {cached_time * 1e6 / decisions:7.1f} us/decision "
+          f"({legacy_time / cached_time:.1f}x)")
+    print(f"answered locally: {stats['local_rate']:.1%}, Redis lookups {stats['redis_lookups']}, "
+          f"mean {stats['redis_mean_ms']:.2f} ms, {stats['queue_flushes']} queue batches")
+
+    if cached_trips * 10 < legacy_trips:
+        print("RESULT: ✅ VIABLE (Misses never leave the process)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_brain_cache_benchmark()
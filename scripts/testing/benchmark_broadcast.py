@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from game_engine.logic.game import Game
+from game_engine.models.constants import GamePhase
+from server.broadcast import StateStream
+from server.schemas.game import GameStateModel
+
+# Per-emit cost of game_update over a played round: the previous full-state
+# broadcast (json.dumps check + schema validation + full payload) vs. the
+# versioned stream (validation once per version + JSON patch payload).
+# Bytes are the JSON the socket.io server puts on the wire per room emit.
+
+
+def _legacy_emit(state):
+    json.dumps(state)
+    payload = {'gameState': GameStateModel(**state).model_dump(mode='json', by_alias=True)}
+    return json.dumps(payload)
+
+
+def _delta_emit(stream, state):
+    base = stream.version
+    patch = stream.update(state)
+    if patch == []:
+        return ''
+    return json.dumps({'epoch': stream.epoch, 'version': stream.version, 'baseVersion': base, 'patch': patch})
+
+
+def _round_states():
+    game = Game('bench_room')
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    game.handle_bid(game.current_turn, 'HOKUM')
+    if game.phase != GamePhase.PLAYING.value:
+        game.phase = GamePhase.PLAYING.value
+    states = [game.get_game_state()]
+    while game.phase == GamePhase.PLAYING.value:
+        idx = game.current_turn
+        hand = game.players[idx].hand
+        card_idx = next(i for i, c in enumerate(hand) if game.is_valid_move(c, hand))
+        game.play_card(idx, card_idx)
+        states.append(game.get_game_state())
+    return states
+
+
+def run_broadcast_benchmark(repeats=20):
+    print("--- BENCHMARKING game_update BROADCAST ---")
+    logging.disable(logging.CRITICAL)
+    states = _round_states()
+
+    results = {}
+    for name in ('full', 'delta'):
+        elapsed, sizes = 0.0, []
+        for _ in range(repeats):
+            stream = StateStream()
+            _delta_emit(stream, states[0])  # Clients start from a synced full state
+            sizes = []
+            for state in states[1:]:
+                start = time.perf_counter()
+                wire = _legacy_emit(state) if name == 'full' else _delta_emit(stream, state)
+                elapsed += time.perf_counter() - start
+                sizes.append(len(wire.encode('utf-8')))
+        emits = repeats * (len(states) - 1)
+        results[name] = (elapsed / emits * 1e6, sum(sizes) / len(sizes))
+        print(f"{name:>5}: {results[name][0]:7.1f} us/emit, {results[name][1]:7.0f} bytes/emit "
+              f"({len(states) - 1} moves)")
+
+    cpu = results['full'][0] / results['delta'][0]
+    egress = results['full'][1] / results['delta'][1]
+    print(f"CPU x{cpu:.1f}, egress x{egress:.1f} smaller")
+    if egress >= 3 and cpu >= 1.5:
+        print("RESULT: ✅ VIABLE (Deltas cut per-move CPU and payload)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+if __name__ == "__main__":
+    run_broadcast_benchmark()
@@ -0,0 +1,122 @@
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+from ai_worker.mcts.deal_sampler import DealSampler
+
+# Cost per determinized deal of the hidden hands, early and late in the round.
+# Scenarios come from a real random deal: N cards left per hidden seat, and
+# each seat is marked void in up to V suits it really does not hold (so a
+# legal deal always exists). "legacy" is the previous shuffle-and-retry
+# allocator (10 attempts, then an unconstrained deal); "exact" builds the
+# DealSampler and draws a batch of K deals from it, "weighted" the same with
+# CardMemory-style suit weights (what the bot uses once memory is populated).
+# Bias: total variation distance from uniform over the legal deals of a small
+# late-round position (0 = uniform; sampling noise alone is about 0.02).
+
+
+def _legacy_deal(rng, remaining, capacities, voids):
+    """Returns (hands, fell_back)."""
+    for _ in range(10):
+        rng.shuffle(remaining)
+        hands = {s: [] for s in capacities}
+        options = []
+        for card in remaining:
+            opts = [s for s in capacities if card.suit not in voids[s]]
+            if not opts:
+                break
+            options.append((card, opts))
+        else:
+            options.sort(key=lambda x: len(x[1]))
+            for card, opts in options:
+                valid = [s for s in opts if len(hands[s]) < capacities[s]]
+                if not valid:
+                    break
+                hands[rng.choice(valid)].append(card)
+            else:
+                return hands, False
+    hands, i = {s: [] for s in capacities}, 0
+    seats = list(capacities)
+    for card in remaining:
+        while len(hands[seats[i]]) >= capacities[seats[i]]:
+            i += 1
+        hands[seats[i]].append(card)
+    return hands, True
+
+
+def _scenario(rng, n, max_voids):
+    deck = [Card(s, r) for s in SUITS for r in RANKS]
+    rng.shuffle(deck)
+    seats = ['Right', 'Top', 'Left']
+    hands = {s: deck[i * n:(i + 1) * n] for i, s in enumerate(seats)}
+    voids = {}
+    for s in seats:
+        missing = [suit for suit in SUITS if all(c.suit != suit for c in hands[s])]
+        rng.shuffle(missing)
+        voids[s] = set(missing[:max_voids])
+    remaining = [c for s in seats for c in hands[s]]
+    return remaining, {s: n for s in seats}, voids
+
+
+def _bias(rng, draws=20000):
+    cards = [Card(s, r) for s, ranks in (('♠', 'AK7'), ('♥', 'Q8'), ('♦', 'J9')) for r in ranks]
+    caps = {'Right': 2, 'Top': 3, 'Left': 2}
+    voids = {'Right': {'♥'}, 'Left': {'♠'}, 'Top': set()}
+    sampler = DealSampler(cards, caps, voids=voids)
+    out = {}
+    for name, draw in (('legacy', lambda: _legacy_deal(rng, list(cards), caps, voids)[0]),
+                       ('exact', lambda: sampler.sample(rng))):
+        freq = {}
+        for _ in range(draws):
+            key = frozenset((s, str(c)) for s, h in draw().items() for c in h)
+            freq[key] = freq.get(key, 0) + 1
+        uniform = 1 / sampler.total
+        out[name] = 0.5 * (sum(abs(n / draws - uniform) for n in freq.values())
+                           + uniform * (sampler.total - len(freq)))
+    return out
+
+
+def run_deal_sampler_benchmark(scenarios=300, batch=16, seed=3):
+    print("--- BENCHMARKING HIDDEN-HAND DEAL SAMPLING ---")
+    rng = random.Random(seed)
+    worst = 0.0
+    for n, max_voids in ((8, 0), (6, 1), (4, 2), (3, 3), (2, 3)):
+        cases = [_scenario(rng, n, max_voids) for _ in range(scenarios)]
+
+        start = time.perf_counter()
+        fallbacks = 0
+        for remaining, caps, voids in cases:
+            for _ in range(batch):
+                fallbacks += _legacy_deal(rng, list(remaining), caps, voids)[1]
+        legacy = (time.perf_counter() - start) / (scenarios * batch) * 1e6
+
+        start = time.perf_counter()
+        for remaining, caps, voids in cases:
+            DealSampler(remaining, caps, voids=voids).sample_batch(batch, rng)
+        exact = (time.perf_counter() - start) / (scenarios * batch) * 1e6
+
+        start = time.perf_counter()
+        for remaining, caps, voids in cases:
+            weights = {s: {suit: 0.5 + rng.random() / 2 for suit in SUITS} for s in caps}
+            DealSampler(remaining, caps, voids=voids, weights=weights).sample_batch(batch, rng)
+        weighted = (time.perf_counter() - start) / (scenarios * batch) * 1e6
+
+        worst = max(worst, exact, weighted)
+        print(f"{n} cards/seat, <={max_voids} voids/seat: legacy {legacy:6.1f} us/deal "
+              f"({fallbacks / (scenarios * batch):5.1%} void-violating fallbacks) | "
+              f"exact {exact:6.1f}, weighted {weighted:6.1f} us/deal (batches of {batch})")
+
+    bias = _bias(rng)
+    print(f"Bias (TVD from uniform): legacy {bias['legacy']:.3f}, exact {bias['exact']:.3f}")
+    if worst < 200 and bias['exact'] < 0.05:
+        print("RESULT: ✅ VIABLE (Exact sampling, flat cost, no fallbacks)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+if __name__ == "__main__":
+    run_deal_sampler_benchmark()
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from ai_worker.learning.feature_extractor import FeatureExtractor
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+
+# Feature encoding cost for N BotContext-like states: encode() per sample
+# plus the list -> float32 array conversion every caller does before
+# inference, against one encode_batch call. Rows must be identical.
+
+
+def _states(n, seed=4):
+    rng = random.Random(seed)
+    states, legal = [], []
+    for _ in range(n):
+        deck = [Card(s, r) for s in SUITS for r in RANKS]
+        rng.shuffle(deck)
+        hand = deck[:rng.randrange(1, 9)]
+        table = [{'card': c.to_dict(), 'playedBy': 'Right'} for c in deck[8:8 + rng.randrange(4)]]
+        states.append(SimpleNamespace(
+            hand=hand, trump=rng.choice([None] + SUITS), mode=rng.choice(['SUN', 'HOKUM']),
+            raw_state={'tableCards': table, 'matchScores': {'us': rng.randrange(152), 'them': rng.randrange(152)}},
+        ))
+        legal.append(sorted(rng.sample(range(len(hand)), rng.randrange(1, len(hand) + 1))))
+    return states, legal
+
+
+def run_encoder_benchmark(n=20000, repeats=5):
+    print("--- BENCHMARKING FEATURE ENCODER (BATCH VS PER-SAMPLE) ---")
+    extractor = FeatureExtractor()
+    states, legal = _states(n)
+
+    single = np.array([extractor.encode(s, m) for s, m in zip(states, legal)], dtype=np.float32)
+    assert np.array_equal(single, extractor.encode_batch(states, legal))
+
+    per_sample = batched = float("inf")
+    for _ in range(repeats):  # Best of N, the machine is shared
+        start = time.perf_counter()
+        np.array([extractor.encode(s, m) for s, m in zip(states, legal)], dtype=np.float32)
+        per_sample = min(per_sample, time.perf_counter() - start)
+        start = time.perf_counter()
+        extractor.encode_batch(states, legal)
+        batched = min(batched, time.perf_counter() - start)
+
+    print(f"{n} states: encode {n / per_sample:10,.0f} states/s -> "
+          f"encode_batch {n / batched:10,.0f} states/s ({per_sample / batched:.1f}x)")
+
+    if per_sample >= 1.5 * batched:
+        print("RESULT: ✅ VIABLE (Identical features, batch encoder faster)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_encoder_benchmark()
@@ -0,0 +1,102 @@
+from gevent import monkey; monkey.patch_all()  # As server/main.py does
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from server.logging_utils import LogBackend
+
+# Cost of a debug line to the greenlet that logs it. "legacy" is the old
+# _sherlock_log / client_log pattern (open, append, close per line);
+# "queued" is a category logger of LogBackend, whose file writes happen on
+# the logging thread.
+# - caller CPU: thread CPU time of the logging greenlet (the logging thread
+#   shares the core on small hosts, so wall time would count its work too).
+# - slow disk: every write stalls SLOW_WRITE seconds (busy or network disk);
+#   wall time of the caller for SLOW_LINES lines.
+# Then a burst far above BALOOT_LOG_BUDGET shows how much reaches the disk.
+
+LINES = 20000
+SLOW_LINES = 200
+SLOW_WRITE = 0.002
+BUDGET = 500
+_native_sleep = monkey.get_original('time', 'sleep')
+
+
+def _legacy_log(path, msg, stall=0.0):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"{datetime.datetime.now().isoformat()} {msg}\n")
+        _native_sleep(stall)
+
+
+def _slow_sink(backend, category):
+    backend.flush()  # Opens the sink
+    sink = backend.listener.routes[category][0]
+    emit = sink.emit
+
+    def slow_emit(record):
+        emit(record)
+        _native_sleep(SLOW_WRITE)
+    sink.emit = slow_emit
+
+
+def run_logging_benchmark():
+    print("--- BENCHMARKING DEBUG LOGGING (QUEUED VS OPEN-PER-LINE) ---")
+    log_dir = tempfile.mkdtemp()
+    try:
+        legacy_path = os.path.join(log_dir, 'legacy.log')
+        start = time.thread_time()
+        for i in range(LINES):
+            _legacy_log(legacy_path, f"Scan invoked. Phase=PLAYING, line {i}")
+        legacy_cpu = time.thread_time() - start
+        start = time.perf_counter()
+        for i in range(SLOW_LINES):
+            _legacy_log(legacy_path, f"Scan invoked. Phase=PLAYING, line {i}", SLOW_WRITE)
+        legacy_slow = time.perf_counter() - start
+
+        backend = LogBackend(log_dir=log_dir, budget=0)
+        log = backend.logger('sherlock', 'bench.sherlock')
+        start = time.thread_time()
+        for i in range(LINES):
+            log.info(f"Scan invoked. Phase=PLAYING, line {i}")
+        queued_cpu = time.thread_time() - start
+        _slow_sink(backend, 'sherlock')
+        start = time.perf_counter()
+        for i in range(SLOW_LINES):
+            log.info(f"Scan invoked. Phase=PLAYING, line {i}")
+        queued_slow = time.perf_counter() - start
+        backend.flush(timeout=60)
+        backend.stop()
+
+        burst = LogBackend(log_dir=log_dir, budget=BUDGET)
+        client = burst.logger('client', 'bench.client')
+        start = time.perf_counter()
+        for i in range(LINES):
+            client.info(f"[INFO] [UI] message {i}")
+        burst_time = time.perf_counter() - start
+        burst.flush(timeout=60)
+        burst.stop()
+        with open(os.path.join(log_dir, 'client_debug.log'), encoding='utf-8') as f:
+            written = sum(1 for _ in f)
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    print(f"caller CPU per line: legacy {legacy_cpu * 1e6 / LINES:5.1f} us, "
+          f"queued {queued_cpu * 1e6 / LINES:5.1f} us ({legacy_cpu / queued_cpu:.1f}x)")
+    print(f"slow disk ({SLOW_WRITE * 1000:.0f} ms/write), {SLOW_LINES} lines: legacy {legacy_slow * 1000:6.1f} ms, "
+          f"queued {queued_slow * 1000:5.1f} ms in the caller")
+    print(f"burst of {LINES} lines in {burst_time:.2f} s with a {BUDGET}/s budget: {written} written")
+
+    if queued_slow * 10 < legacy_slow and queued_cpu < legacy_cpu and written < LINES / 4:
+        print("RESULT: ✅ VIABLE (No disk I/O on game greenlets, volume capped)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_logging_benchmark()
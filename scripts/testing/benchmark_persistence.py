@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from game_engine.logic.game import Game
+from game_engine.logic.game_serializer import serialize_sections, deserialize_sections
+from game_engine.models.constants import GamePhase
+
+# Per-move persistence CPU and Redis write volume over a played round, the
+# work RoomManager does around its Redis calls (network time not included):
+#   json     — json.dumps(to_json) on save, json.loads + from_json on every get
+#   sections — serialize_sections + dirty-section compare on save; a get whose
+#              'v' matches the cached version deserializes nothing
+# "reload" is the get after another worker wrote (full decode either way).
+
+
+def _round_games():
+    game = Game('bench_room')
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    game.handle_bid(game.current_turn, 'HOKUM')
+    if game.phase != GamePhase.PLAYING.value:
+        game.phase = GamePhase.PLAYING.value
+    yield game
+    while game.phase == GamePhase.PLAYING.value:
+        idx = game.current_turn
+        hand = game.players[idx].hand
+        game.play_card(idx, next(i for i, c in enumerate(hand) if game.is_valid_move(c, hand)))
+        yield game
+
+
+def _json_move(game, synced):
+    blob = json.dumps(game.to_json())
+    Game.from_json(json.loads(blob))
+    return len(blob)
+
+
+def _sections_move(game, synced):
+    sections = serialize_sections(game)
+    dirty = {f: b for f, b in sections.items() if synced.get(f) != b}
+    synced.update(dirty)
+    return sum(len(b) for b in dirty.values())
+
+
+def run_persistence_benchmark(repeats=10):
+    print("--- BENCHMARKING GAME PERSISTENCE ---")
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for name, move in (('json', _json_move), ('sections', _sections_move)):
+        elapsed, written, moves = 0.0, 0, 0
+        for _ in range(repeats):
+            synced = {}
+            for game in _round_games():
+                start = time.perf_counter()
+                written += move(game, synced)
+                elapsed += time.perf_counter() - start
+                moves += 1
+        results[name] = (elapsed / moves * 1e6, written / moves)
+        print(f"{name:>8}: {results[name][0]:7.1f} us/move (save + get), "
+              f"{results[name][1]:7.0f} bytes written/move")
+
+    game = list(_round_games())[-1]
+    blob, sections = json.dumps(game.to_json()), serialize_sections(game)
+    start = time.perf_counter()
+    for _ in range(repeats * 10):
+        Game.from_json(json.loads(blob))
+    json_reload = (time.perf_counter() - start) / (repeats * 10) * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats * 10):
+        deserialize_sections(sections)
+    sections_reload = (time.perf_counter() - start) / (repeats * 10) * 1e6
+    print(f"  reload: json {json_reload:7.1f} us ({len(blob)} bytes), "
+          f"sections {sections_reload:7.1f} us ({sum(map(len, sections.values()))} bytes)")
+
+    cpu = results['json'][0] / results['sections'][0]
+    egress = results['json'][1] / results['sections'][1]
+    print(f"CPU x{cpu:.1f}, bytes written x{egress:.1f} smaller")
+    if cpu >= 1.2 and egress >= 2:
+        print("RESULT: ✅ VIABLE (Sectioned snapshots cut per-move persistence cost)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+if __name__ == "__main__":
+    run_persistence_benchmark()
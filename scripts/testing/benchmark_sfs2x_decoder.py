@@ -0,0 +1,77 @@
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from gbaloot.core.decoder import ReferenceSFS2XDecoder, SFS2XDecoder, decode_message
+from gbaloot.tests.test_decoder import _build_sfs_message, _random_message, _utf_str
+
+# Decode throughput of the SFS2X binary protocol. "mixed" is random nested
+# objects covering every type code; "state" is a game-state style frame with
+# hands, scores and history as primitive arrays, which is what the capture
+# traffic mostly carries. "hex" is the full decode_message path from the
+# '[hex:N] AA BB ..' capture strings. Both decoders must agree on every frame.
+
+
+def _state_message(rng):
+    """A game-state frame: small scalars plus int/long/double/short arrays."""
+    fields = [
+        _utf_str("c") + b"\x08" + _utf_str("game.state"),
+        _utf_str("r") + b"\x04" + struct.pack(">i", rng.randrange(20)),
+        _utf_str("ts") + b"\x05" + struct.pack(">q", rng.randrange(2**40)),
+    ]
+    for name, code, fmt in (("h", 0x0C, "i"), ("hist", 0x0C, "i"), ("ids", 0x0D, "q"),
+                            ("odds", 0x0F, "d"), ("sc", 0x0B, "h")):
+        n = rng.randrange(8, 64)
+        values = [rng.randrange(-1000, 1000) for _ in range(n)]
+        fields.append(_utf_str(name) + bytes([code]) + struct.pack(f">H{n}{fmt}", n, *values))
+    body = b"\x12" + struct.pack(">H", len(fields)) + b"".join(fields)
+    return _build_sfs_message(body)
+
+
+def _throughput(decoder_cls, frames, repeats):
+    size = sum(map(len, frames)) * repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for frame in frames:
+            decoder_cls(frame).decode()
+    return size / (time.perf_counter() - start) / 1e6
+
+
+def run_decoder_benchmark(n_frames=2000, repeats=5, seed=3):
+    print("--- BENCHMARKING SFS2X DECODER (TABLE-DRIVEN VS REFERENCE) ---")
+    rng = random.Random(seed)
+    corpora = {
+        "mixed": [_random_message(rng) for _ in range(n_frames)],
+        "state": [_state_message(rng) for _ in range(n_frames)],
+    }
+    speedups = []
+    for name, frames in corpora.items():
+        for frame in frames:
+            assert repr(SFS2XDecoder(frame).decode()) == repr(ReferenceSFS2XDecoder(frame).decode())
+        ref = _throughput(ReferenceSFS2XDecoder, frames, repeats)
+        new = _throughput(SFS2XDecoder, frames, repeats)
+        speedups.append(new / ref)
+        kb = sum(map(len, frames)) / len(frames) / 1e3
+        print(f"{name:6s} ({kb:4.1f} KB/frame): reference {ref:6.2f} MB/s -> "
+              f"table-driven {new:6.2f} MB/s ({new / ref:.1f}x)")
+
+    hexed = ["[hex:%d] " % len(f) + " ".join(f"{b:02x}" for b in f) for f in corpora["state"]]
+    start = time.perf_counter()
+    for h in hexed:
+        decode_message(h)
+    elapsed = time.perf_counter() - start
+    print(f"hex    decode_message:          {sum(map(len, corpora['state'])) / elapsed / 1e6:6.2f} MB/s "
+          f"of frame bytes ({len(hexed) / elapsed:,.0f} frames/s)")
+
+    if min(speedups) >= 1.5:
+        print("RESULT: ✅ VIABLE (Faster on every corpus, identical output)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_decoder_benchmark()
@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from game_engine.logic.game import Game
+from server.deadlines import DeadlineQueue
+
+# Idle cost of one timer tick (every 0.1 s) with N rooms whose timers are all
+# running but none expired:
+#   polling   — the previous loop: check_timeout() on every room, plus (with
+#               Redis) a GET + json.loads + from_json per room
+#   deadlines — one heap peek (in-process) for the whole tick
+
+
+def _rooms(n):
+    games = {}
+    for i in range(n):
+        game = Game(f"bench_{i}")
+        for p in range(4):
+            game.add_player(f"p{p}", f"P{p}")
+        game.start_game()
+        game.reset_timer(30)
+        games[game.room_id] = game
+    return games
+
+
+def _time(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def run_timer_benchmark(sizes=(50, 500, 2000), repeats=20):
+    print("--- BENCHMARKING TIMER TICK (idle rooms) ---")
+    logging.disable(logging.CRITICAL)
+
+    sample = next(iter(_rooms(1).values()))
+    blob = json.dumps(sample.to_json())
+    reload_us = _time(lambda: Game.from_json(json.loads(blob)), 50)
+
+    worst = 0.0
+    for n in sizes:
+        games = _rooms(n)
+        queue = DeadlineQueue()
+        for game in games.values():
+            queue.attach(game)
+
+        def poll():
+            for room_id in list(games.keys()):
+                games[room_id].check_timeout()
+
+        poll_us = _time(poll, repeats)
+        wheel_us = _time(queue.pop_due, repeats * 50)
+        redis_us = poll_us + n * reload_us
+        worst = max(worst, wheel_us)
+        print(f"{n:>5} rooms: polling {poll_us:10.1f} us/tick in-process, ~{redis_us / 1000:8.1f} ms/tick "
+              f"with Redis reloads | deadlines {wheel_us:6.2f} us/tick")
+
+    print(f"per-room reload in the old loop: {reload_us:.0f} us (x10 ticks/s)")
+    if worst < 50:
+        print("RESULT: ✅ VIABLE (Idle tick cost flat in room count)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+if __name__ == "__main__":
+    run_timer_benchmark()
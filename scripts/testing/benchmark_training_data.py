@@ -0,0 +1,111 @@
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader
+
+sys.path.append(os.getcwd())
+
+from ai_worker.learning.dataset_shards import ShardDataset, convert_legacy
+
+# Training-data load time, epoch throughput and memory of the binary shards
+# against the CSV loader they replace. "legacy" parses dataset.csv into one
+# tensor dict per sample and batches them with a per-sample DataLoader (what
+# train_network.BalootDataset did); "shards" memory-maps the converted
+# records and gathers a whole batch per index list.
+
+BATCH_SIZE = 64
+
+
+def _legacy_load(csv_file, extractor_labels):
+    samples = []
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            vector = [float(x) for x in row[2].split(',')]
+            label = extractor_labels.get(row[4], -1)
+            if label != -1 and len(vector) == 138:
+                samples.append({'vector': torch.tensor(vector, dtype=torch.float32),
+                                'label': torch.tensor(label, dtype=torch.long)})
+    return samples
+
+
+def _epoch(loader):
+    n = 0
+    for batch in loader:
+        n += batch['vector'].shape[0]
+        batch['vector'].sum()
+    return n
+
+
+def _rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 1e6
+
+
+def _write_csv(path, n, rng):
+    ranks, suits = ["7", "8", "9", "10", "J", "Q", "K", "A"], "SHDC"
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(["ts", "game_id", "vector", "mcts_move_idx", "target", "win_rate"])
+        for i in range(n):
+            vec = (rng.random(138) < 0.2).astype(float)
+            vec[128:] = rng.random(10).round(4)
+            w.writerow([i, f"g{i // 32}", ",".join(f"{v:.2f}" for v in vec), 0,
+                        f"{ranks[i % 8]}{suits[i % 4]}", 0.97])
+
+
+def run_training_data_benchmark(samples=50000, seed=5):
+    print("--- BENCHMARKING TRAINING DATA (BINARY SHARDS VS CSV) ---")
+    rng = np.random.default_rng(seed)
+    labels = {f"{r}{s}": i for i, (s, r) in enumerate(
+        (s, r) for s in "SHDC" for r in ["7", "8", "9", "10", "J", "Q", "K", "A"])}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, shard_dir = os.path.join(tmp, "dataset.csv"), os.path.join(tmp, "shards")
+        _write_csv(csv_path, samples, rng)
+        convert_legacy([csv_path], shard_dir)
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        shard_mb = sum(os.path.getsize(os.path.join(shard_dir, f)) for f in os.listdir(shard_dir)) / 1e6
+        print(f"{samples} samples: CSV {csv_mb:.1f} MB, shards {shard_mb:.1f} MB")
+
+        rss = _rss_mb()
+        start = time.perf_counter()
+        shards = ShardDataset(shard_dir)
+        shard_load = time.perf_counter() - start
+        start = time.perf_counter()
+        shard_n = _epoch(shards.loader(range(len(shards)), BATCH_SIZE, shuffle=True))
+        shard_epoch = time.perf_counter() - start
+        shard_rss = _rss_mb() - rss
+
+        rss = _rss_mb()
+        start = time.perf_counter()
+        legacy = _legacy_load(csv_path, labels)
+        legacy_load = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy_n = _epoch(DataLoader(legacy, batch_size=BATCH_SIZE, shuffle=True))
+        legacy_epoch = time.perf_counter() - start
+        legacy_rss = _rss_mb() - rss
+        assert legacy_n == shard_n == samples
+
+    print(f"load:  legacy {legacy_load:6.2f} s -> shards {shard_load:6.3f} s ({legacy_load / shard_load:.0f}x)")
+    print(f"epoch: legacy {samples / legacy_epoch:8,.0f} samples/s -> shards "
+          f"{samples / shard_epoch:8,.0f} samples/s ({legacy_epoch / shard_epoch:.1f}x)")
+    print(f"RSS:   legacy +{legacy_rss:6.1f} MB -> shards +{shard_rss:6.1f} MB")
+    legacy_first, shard_first = legacy_load + legacy_epoch, shard_load + shard_epoch
+    print(f"load + first epoch: legacy {legacy_first:6.2f} s -> shards {shard_first:6.2f} s "
+          f"({legacy_first / shard_first:.0f}x)")
+
+    if legacy_first > 10 * shard_first and legacy_epoch >= shard_epoch:
+        print("RESULT: ✅ VIABLE (Shards load instantly and stream batches)")
+    else:
+        print("RESULT: ⚠️ MARGINAL")
+
+
+if __name__ == "__main__":
+    run_training_data_benchmark()
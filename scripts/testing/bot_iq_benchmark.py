@@ -12,6 +12,10 @@ Usage:
   python scripts/bot_iq_benchmark.py          # 10 games (quick)
   python scripts/bot_iq_benchmark.py --games 50  # 50 games (thorough)
   python scripts/bot_iq_benchmark.py --games 100 --verbose  # detailed output
+
+  # PIMC (multi-world) vs single-world MCTS at equal wall-clock per decision.
+  # Each seed is played twice with the teams swapped.
+  python scripts/bot_iq_benchmark.py --compare-search --games 10 --timeout-ms 100
 """
 
 import sys
@@ -30,6 +34,7 @@ from game_engine.models.constants import GamePhase
 from ai_worker.bot_context import BotContext
 from ai_worker.strategies.bidding import BiddingStrategy
 from ai_worker.strategies.playing import PlayingStrategy
+from ai_worker.cognitive import SEARCH_PIMC, SEARCH_SINGLE
 
 import contextlib
 import io
@@ -195,11 +200,14 @@ class BenchmarkStats:
 class HeadlessGameRunner:
     """Runs a single complete Baloot match (multiple rounds until 152+ points)."""
 
-    def __init__(self, stats: BenchmarkStats, verbose=False):
+    def __init__(self, stats: BenchmarkStats, verbose=False, playing_strategies=None, use_mcts=False):
         self.stats = stats
         self.verbose = verbose
         self.bidding_strategy = BiddingStrategy()
         self.playing_strategy = PlayingStrategy()
+        # Optional per-team override: {'us': PlayingStrategy, 'them': PlayingStrategy}
+        self.playing_strategies = playing_strategies or {}
+        self.use_mcts = use_mcts
         self.total_tricks = 0
         self.total_rounds = 0
 
@@ -345,10 +353,11 @@ class HeadlessGameRunner:
         try:
             game_state = game.get_game_state()
             ctx = BotContext(game_state, player_idx)
-            ctx.use_mcts = False  # Use pure heuristics for speed (no MCTS in benchmark)
+            ctx.use_mcts = self.use_mcts  # Pure heuristics for speed unless comparing search modes
 
+            strategy = self.playing_strategies.get(game.players[player_idx].team, self.playing_strategy)
             with contextlib.redirect_stdout(io.StringIO()):
-                decision = self.playing_strategy.get_decision(ctx)
+                decision = strategy.get_decision(ctx)
 
             card_idx = decision.get('cardIndex', 0)
             reasoning = decision.get('reasoning', 'Unknown')
@@ -402,6 +411,76 @@ class HeadlessGameRunner:
             return False
 
 
+# ═══════════════════════════════════════════════════
+#  Search Mode Comparison (PIMC vs single world)
+# ═══════════════════════════════════════════════════
+
+def _search_strategy(search_mode: str, timeout_ms: int, num_worlds: int) -> PlayingStrategy:
+    strategy = PlayingStrategy()
+    cognitive = strategy.cognitive
+    cognitive.search_mode = search_mode
+    cognitive.num_worlds = num_worlds
+    cognitive.timeout_ms = timeout_ms
+    cognitive.adaptive_budget = False  # Time-bounded only: equal wall-clock per decision
+    cognitive.dataset_logger = None    # Don't pollute the training set
+    return strategy
+
+
+def run_search_comparison(num_games: int, timeout_ms: int, num_worlds: int, verbose=False):
+    """
+    Plays each seed twice — PIMC on team US, then PIMC on team THEM — so both
+    sides see the same initial deal. Reports PIMC's match win rate and
+    average match-score differential.
+    """
+    print("═" * 60)
+    print("  🧠 SEARCH MODE COMPARISON: PIMC vs SINGLE WORLD")
+    print(f"  {num_games} seeds x 2 seatings, {timeout_ms}ms/decision, {num_worlds} worlds")
+    print("═" * 60)
+
+    pimc_wins = single_wins = draws = crashed = 0
+    score_diffs = []
+    total_start = time.time()
+
+    for i in range(num_games):
+        for pimc_team in ('us', 'them'):
+            single_team = 'them' if pimc_team == 'us' else 'us'
+            random.seed(1000 + i)
+            strategies = {
+                pimc_team: _search_strategy(SEARCH_PIMC, timeout_ms, num_worlds),
+                single_team: _search_strategy(SEARCH_SINGLE, timeout_ms, num_worlds),
+            }
+            runner = HeadlessGameRunner(BenchmarkStats(), verbose=verbose,
+                                        playing_strategies=strategies, use_mcts=True)
+            game_start = time.time()
+            result = runner.run_game(i)
+            game_dur = time.time() - game_start
+
+            if not result.get('success'):
+                crashed += 1
+                print(f"  ❌ Seed {i:>3} (PIMC={pimc_team}): CRASHED — {result.get('error', 'unknown')[:50]}")
+                continue
+
+            scores = result['scores']
+            score_diffs.append(scores[pimc_team] - scores[single_team])
+            if result['winner'] == pimc_team:
+                pimc_wins += 1
+            elif result['winner'] == single_team:
+                single_wins += 1
+            else:
+                draws += 1
+            print(f"  Seed {i:>3} PIMC={pimc_team:<4}: PIMC {scores[pimc_team]:>3} - {scores[single_team]:<3} single "
+                  f"({game_dur:.1f}s)")
+
+    played = pimc_wins + single_wins + draws
+    print(f"\n⏱️ Total time: {time.time() - total_start:.1f}s")
+    if played:
+        avg_diff = sum(score_diffs) / len(score_diffs)
+        print(f"\n🏆 PIMC wins:   {pimc_wins}/{played} ({100 * pimc_wins / played:.1f}%)")
+        print(f"   Single wins: {single_wins}/{played} ({100 * single_wins / played:.1f}%)")
+        print(f"   Draws:       {draws}   Crashed: {crashed}")
+        print(f"   Avg match-score diff (PIMC - single): {avg_diff:+.1f}")
+
+
 # ═══════════════════════════════════════════════════
 #  Main Entry Point
 # ═══════════════════════════════════════════════════
@@ -410,8 +489,16 @@ def main():
     parser = argparse.ArgumentParser(description='Bot IQ Benchmark')
     parser.add_argument('--games', type=int, default=10, help='Number of games to simulate')
     parser.add_argument('--verbose', action='store_true', help='Show per-move output')
+    parser.add_argument('--compare-search', action='store_true',
+                        help='Pit PIMC (multi-world) MCTS against single-world MCTS')
+    parser.add_argument('--timeout-ms', type=int, default=100, help='Per-decision search time (compare mode)')
+    parser.add_argument('--worlds', type=int, default=8, help='Sampled worlds for PIMC (compare mode)')
     args = parser.parse_args()
 
+    if args.compare_search:
+        run_search_comparison(args.games, args.timeout_ms, args.worlds, verbose=args.verbose)
+        return
+
     num_games = args.games
     verbose = args.verbose
 
@@ -1,90 +1,90 @@
-import sys
-import os
-import time
+import argparse
 import cProfile
-import pstats
 import logging
-from unittest.mock import MagicMock
+import os
+import pstats
+import sys
+import time
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.getcwd())
 
 from game_engine.logic.game import Game
-from game_engine.models.player import Player
-from bot_agent import BotAgent
-from server.bidding_engine import BidType
-
-# Configure Logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("Profiler")
-
-class HeadlessGame(Game):
-    """Subclass of Game that mocks socket interactions."""
-    def __init__(self, room_id):
-        super().__init__(room_id)
-        # Mocking generic socket/timer interactions if any
-        self.timer = MagicMock()
-    
-    # Override emit to do nothing
-    def emit(self, event, data):
-        pass
-
-def run_simulation():
-    game = HeadlessGame("test_room")
-    
-    # Add 4 Bot Players
-    bot_agent = BotAgent()
-    game.add_player("p1", "Saad (Bot)")
-    game.add_player("p2", "Khalid (Bot)")
-    game.add_player("p3", "Noura (Bot)")
-    game.add_player("p4", "Abu Fahad (Bot)")
-    
-    # Start Round (Manually triggering state)
-    game.players[0].hand = [] # Logic populates this
-    # We need to simulate the distribution.
-    # Actually, Game logic has dealing.
-    
-    game.deck.shuffle()
-    # Deal 5 cards
-    for p in game.players:
-        # Deal 5 cards. deal(n) returns a list of n cards.
-        p.hand = game.deck.deal(5)
-    
-    # Force bidding phase
-    game.phase = "BIDDING"
-    game.current_turn = 0
-    game.dealer_index = 3
-    
-    print("Starting Profiling Loop...")
-    
-    start_time = time.time()
+from ai_worker.agent import bot_agent
+from server.metrics import metrics
+
+logging.disable(logging.ERROR)  # Redis-less Brain errors and game events
+
+# Where a bot move spends its time. Plays headless all-bot rounds through
+# BotAgent.get_decision and Game.play_card / handle_bid, then prints the
+# latency histograms of server/metrics.py: the whole decision, each stage
+# (sherlock, brain, mcts, heuristics, bidding) and the engine calls.
+# --cprofile adds the top functions by cumulative time.
+
+
+def _apply(game, seat, decision):
+    if game.phase == "PLAYING":
+        res = game.play_card(seat, decision.get('cardIndex', 0), metadata={'reasoning': decision.get('reasoning')})
+        if not res.get('success'):
+            res = game.play_card(seat, 0)
+        return res
+    res = game.handle_bid(seat, (decision.get('action') or 'PASS').upper(), decision.get('suit'))
+    if not res.get('success'):
+        res = game.handle_bid(seat, "PASS")
+    return res
+
+
+def play_rounds(rounds, strategy, max_steps=400):
     decisions = 0
-    
-    # Simulate 100 decisions
-    profiler = cProfile.Profile()
-    profiler.enable()
-    
-    for _ in range(100):
-        # Fake a turn for player 0
-        state = game.get_game_state()
-        
-        # Measure Bot Decision
-        try:
-            decision = bot_agent.get_decision(state, 0)
+    for r in range(rounds):
+        game = Game(f"profile_{r}")
+        for i in range(4):
+            game.add_player(f"bot{i}", f"Bot {i}")
+            game.players[i].strategy = strategy
+        game.start_game()
+        for _ in range(max_steps):
+            if game.phase not in ("BIDDING", "DOUBLING", "VARIANT_SELECTION", "PLAYING"):
+                break
+            seat = game.current_turn
+            state = game.get_game_state()
+            state['players'][seat]['strategy'] = strategy
+            decision = bot_agent.get_decision(state, seat)
             decisions += 1
-        except Exception as e:
-            print(f"Error in decision: {e}")
-            break
-            
-    profiler.disable()
-    end_time = time.time()
-    
-    print(f"\nCompleted {decisions} decisions in {end_time - start_time:.4f}s")
-    print(f"Average: {(end_time - start_time)/decisions*1000:.2f}ms per decision")
-    
-    # Stats
-    stats = pstats.Stats(profiler).sort_stats('cumtime')
-    stats.print_stats(20)
+            if not _apply(game, seat, decision).get('success'):
+                break
+    return decisions
+
+
+def print_report():
+    print(f"{'metric':52s} {'count':>6s} {'mean ms':>9s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for (name, labels), histogram in sorted(metrics._histograms.items()):
+        if not histogram.count:
+            continue
+        label = name + (f"{{{','.join(f'{k}={v}' for k, v in labels)}}}" if labels else "")
+        print(f"{label:52s} {histogram.count:6d} {histogram.total / histogram.count * 1000:9.2f} "
+              f"{histogram.quantile(0.5) * 1000:8.2f} {histogram.quantile(0.99) * 1000:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency of bot decisions")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--strategy', default='heuristic', choices=['heuristic', 'mcts', 'neural'])
+    parser.add_argument('--cprofile', action='store_true')
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    start = time.perf_counter()
+    decisions = play_rounds(args.rounds, args.strategy)
+    elapsed = time.perf_counter() - start
+    if profiler:
+        profiler.disable()
+
+    print(f"{decisions} decisions in {elapsed:.2f}s ({args.strategy}, {args.rounds} rounds)")
+    print_report()
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumtime').print_stats(20)
+
 
 if __name__ == "__main__":
-    run_simulation()
+    main()
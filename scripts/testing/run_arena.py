@@ -1,64 +1,79 @@
-import time
+import argparse
+import functools
+import importlib
 import json
+import logging
 import os
 import sys
+import time
 
 # Add root to python path to allow imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # Create environment variable to disable Redis in bot_agent
 # os.environ["OFFLINE_MODE"] = "true" # Commented out for Production Mode check
 
 
-from game_engine.arena import Arena
-# from bot_agent import bot_agent # No longer needed to import just to patch
+from game_engine.arena import ArenaReport, configured_bots, run_matches
+
+# Self-play evaluation: team A vs team B over seeded matches, in parallel.
+# Duplicate mode (default) plays every seed twice with the seats swapped, so
+# both teams hold the same cards and luck of the deal cancels out per board.
+#
+#   python scripts/testing/run_arena.py 200 --workers 8
+#   python scripts/testing/run_arena.py 200 --a my_pkg.bots:candidate --timeout-ms 100
+
 
+def _factory(spec, timeout_ms):
+    """'module:function' returning (playing, bidding); default: the production bots."""
+    if not spec:
+        return functools.partial(configured_bots, timeout_ms=timeout_ms)
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
 
 
-def run_batch(num_games=100):
-    arena = Arena()
-    results = []
-    
+def run_batch(num_games=100, workers=None, seed=0, duplicate=True, bots=None,
+              out_path="candidates/arena_results.jsonl"):
+    workers = workers or max(1, (os.cpu_count() or 1))
+    report = ArenaReport()
+    total = num_games * (2 if duplicate else 1)
+
+    print(f"Starting {'duplicate ' if duplicate else ''}arena: {num_games} seeds, "
+          f"{total} matches, {workers} workers, seed {seed}...")
     start_time = time.time()
-    wins = {"us": 0, "them": 0}
-    errors = 0
-    
-    print(f"Starting Batch Simulation of {num_games} games...")
-    
-    for i in range(num_games):
-        match_id = f"sim_{int(time.time())}_{i}"
-        try:
-            res = arena.run_match(match_id)
-            results.append(res)
-            
-            w = res.get('winner')
-            if w: wins[w] += 1
-            
-            # Progress bar
-            if (i+1) % 10 == 0:
-                print(f"Completed {i+1}/{num_games} games. Wins: {wins}")
-                
-        except Exception as e:
-            print(f"Match {i} Failed: {e}")
-            errors += 1
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w") as f:
+        for done, res in enumerate(run_matches(num_games, seed=seed, duplicate=duplicate,
+                                               workers=workers, bots=bots), 1):
+            report.add(res)
+            f.write(json.dumps(res) + "\n")
+            if res.get("error"):
+                print(f"Match {res['match_id']} Failed: {res['error']}")
+            if done % 10 == 0 or done == total:
+                s = report.summary()
+                print(f"Completed {done}/{total} matches. A win rate {s['a_win_rate']:.1%}, "
+                      f"{s['imps_per_board']:+.2f} IMPs/board over {s['boards']} boards")
 
     total_time = time.time() - start_time
-    print(f"\n--- Batch Finished in {total_time:.2f}s ---")
-    print(f"Total Games: {num_games}")
-    print(f"Win Rate (US): {wins['us']/num_games:.1%}")
-    print(f"Win Rate (THEM): {wins['them']/num_games:.1%}")
-    print(f"Draws/Incomplete: {num_games - wins['us'] - wins['them']}")
-    print(f"Errors: {errors}")
-    print(f"Avg Time/Game: {total_time/num_games:.3f}s")
-    
-    # Save Results
-    os.makedirs("candidates", exist_ok=True)
-    with open("candidates/arena_results.json", "w") as f:
-        json.dump(results, f, indent=2)
-    print("Results saved to candidates/arena_results.json")
+    print(f"\n--- Arena Finished in {total_time:.2f}s ({total_time / max(1, total):.2f}s/match wall) ---")
+    print(report.format())
+    print(f"Results saved to {out_path}")
+    return report
+
 
 if __name__ == "__main__":
-    count = 100
-    if len(sys.argv) > 1:
-        count = int(sys.argv[1])
-    run_batch(count)
+    parser = argparse.ArgumentParser(description="Parallel seeded self-play arena")
+    parser.add_argument("games", nargs="?", type=int, default=100, help="seeds (x2 matches in duplicate mode)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-duplicate", action="store_true", help="play each seed once")
+    parser.add_argument("--a", default=None, help="team A factory, module:function")
+    parser.add_argument("--b", default=None, help="team B factory, module:function")
+    parser.add_argument("--timeout-ms", type=int, default=None, help="search time per decision for the default bots")
+    parser.add_argument("--out", default="candidates/arena_results.jsonl")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    run_batch(args.games, workers=args.workers, seed=args.seed, duplicate=not args.no_duplicate,
+              bots=(_factory(args.a, args.timeout_ms), _factory(args.b, args.timeout_ms)),
+              out_path=args.out)
@@ -26,7 +26,7 @@ def run_data_generation(num_games=5):
     
     # Ensure dataset logger is ready
     dataset_logger = DatasetLogger()
-    print(f"Logging dataset to: {dataset_logger.file_path}")
+    print(f"Logging dataset to: {dataset_logger.shard_dir}")
     
     start_time = time.time()
     games_completed = 0
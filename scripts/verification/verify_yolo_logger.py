@@ -8,6 +8,7 @@ import sys
 sys.path.append(os.getcwd())
 
 from ai_worker.learning.dataset_logger import DatasetLogger
+from ai_worker.learning.dataset_shards import open_shards
 from ai_worker.bot_context import BotContext
 
 def verify_yolo():
@@ -75,16 +76,16 @@ def verify_yolo():
         print(f"FAIL: Buffer should be empty after flush, has {len(logger.buffer)}")
         return
         
-    # 6. Verify File
-    file_path = os.path.join(data_dir, "yolo_dataset.jsonl")
-    if not os.path.exists(file_path):
-        print("FAIL: Output file not created")
+    # 6. Verify Shards
+    shards = open_shards(logger.shard_dir)
+    if not shards:
+        print("FAIL: No shard written")
         return
         
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-        print(f"Success! File created with {len(lines)} records.")
-        print("Sample Record:", lines[0].strip())
+    rows = shards[0]
+    print(f"Success! Shard created with {len(rows)} records.")
+    print("Sample Record: label", rows[0]['label'], "confidence", rows[0]['confidence'],
+          "game", rows[0]['game_id'].decode())
         
     print("--- VERIFICATION PASSED ✅ ---")
 
@@ -7,6 +7,7 @@ import socketio
 from py4web.core import bottle
 from server.socket_handler import sio, timer_background_task
 from server.room_manager import room_manager
+from server.room_leases import room_router
 from server.core_patch import apply_py4web_patches
 
 logger = logging.getLogger(__name__)
@@ -64,5 +65,7 @@ def create_app():
     
     # 7. Start Background Tasks
     sio.start_background_task(timer_background_task, room_manager)
+    if room_router.leases.shared:
+        sio.start_background_task(room_router.serve_forever)
     
     return ws_app
@@ -8,6 +8,7 @@ dedicated function rather than a monolithic if-elif chain.
 import time
 import logging
 from ai_worker.agent import bot_agent
+from server.bot_workers import decision_pool
 from server.broadcast import broadcast_game_update
 from server.room_manager import room_manager
 import server.settings as settings
@@ -187,13 +188,18 @@ def bot_loop(sio, game, room_id, recursion_depth=0):
             return
 
         current_idx = game.current_turn
+        current_phase = game.phase
         current_player = game.players[current_idx]
 
         if not current_player.is_bot:
             return
 
-        # ── Get AI Decision ──
-        decision = bot_agent.get_decision(game.get_game_state(), current_idx)
+        # ── Get AI Decision (worker process; this greenlet waits cooperatively) ──
+        bot_agent.knowledge.attach(game)  # Card memory follows the game's events (inline decisions)
+        decision = decision_pool.decide(game.get_game_state(), current_idx, room_id, sleep=sio.sleep)
+        if game.phase != current_phase or game.current_turn != current_idx:
+            rlog.info(f"Bot {current_idx} decision discarded: game moved on while it was thinking")
+            return
         action = decision.get('action')
         res = {'success': False}
 
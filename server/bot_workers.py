@@ -0,0 +1,287 @@
+"""
+server/bot_workers.py — Bot decisions off the event loop.
+
+bot_agent.get_decision is pure CPU (MCTS searches for up to half a second
+without yielding), so calling it from a gevent greenlet froze socket I/O,
+timers and broadcasts for every room on the worker while a bot thought.
+DecisionPool runs it in worker processes instead; the calling greenlet
+polls the result with a cooperative sleep, so the loop keeps serving
+humans however many bots are thinking.
+
+- Each room is pinned to one worker process (crc32 of the room id), so the
+  agent state carried between calls — Sherlock's pending accusation, the
+  card-memory cache — stays with the room.
+- Every request has a deadline. When it passes, or the worker dies, the
+  caller gets rules_decision (the heuristic bidder and fixed play rules,
+  cheap enough to compute on the event loop) and the game moves on. A request that timed out still
+  queued is just dropped; a worker that overran on the request itself is
+  killed and replaced, and the rooms queued behind it on the same slot
+  retry on the fresh worker instead of waiting out their own deadlines.
+- workers=0 (BALOOT_BOT_WORKERS=0) decides inline in the caller: tests and
+  single-process tools.
+- Latency histograms a worker records (bot stages, Brain lookups) travel
+  back with each decision and are merged into this process's metrics.
+"""
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+import zlib
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from server.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.environ.get('BALOOT_BOT_WORKERS', str(max(1, (os.cpu_count() or 1) - 1))))
+# Seconds from submit to result, queueing included (MCTS alone is ~0.5s)
+DECISION_DEADLINE = float(os.environ.get('BALOOT_BOT_DEADLINE', '3.0'))
+POLL_INTERVAL = 0.005
+
+
+# ── Decision Functions ────────────────────────────────────────────
+
+def agent_decision(game_state, player_index):
+    """Full bot decision (runs in a worker process)."""
+    from ai_worker.agent import bot_agent
+    return bot_agent.get_decision(game_state, player_index)
+
+
+# Actions each bidding sub-phase accepts; anything else gets the phase's default
+BID_ACTIONS = {
+    'DOUBLING': ('PASS', 'DOUBLE', 'TRIPLE', 'FOUR', 'GAHWA'),
+    'VARIANT_SELECTION': ('OPEN', 'CLOSED'),
+}
+BID_DEFAULTS = {'VARIANT_SELECTION': 'OPEN'}  # PASS elsewhere
+
+
+def rules_decision(game_state, player_index):
+    """
+    Fixed-rule decision for the same seat, computed in the server process
+    (no search, Sherlock, Brain lookups or endgame solver). Bidding phases
+    use the heuristic BiddingStrategy (see rules_bid); in play, the cheapest
+    card that takes the trick from the opponents, else the cheapest legal
+    card.
+    """
+    from game_engine.logic.trick_resolver import TrickResolver
+    from game_engine.logic.validation import get_trick_winner_index, is_move_legal
+    from game_engine.models.card import Card
+
+    if game_state.get('phase') in ('BIDDING', 'DOUBLING', 'VARIANT_SELECTION'):
+        return rules_bid(game_state, player_index)
+    players = game_state['players']
+    me = players[player_index]
+    hand = [Card(c['suit'], c['rank']) for c in me.get('hand', [])]
+    if game_state.get('phase') != 'PLAYING' or not hand:
+        return {'action': 'PASS', 'reasoning': 'Rules fallback'}
+
+    mode, trump = game_state.get('gameMode'), game_state.get('trumpSuit')
+    teams = {p['position']: p['team'] for p in players}
+    variant = (game_state.get('bid') or {}).get('variant')
+    table = [{'card': Card(tc['card']['suit'], tc['card']['rank']), 'playedBy': tc['playedBy']}
+             for tc in game_state.get('tableCards', [])]
+    legal = [i for i, card in enumerate(hand)
+             if is_move_legal(card, hand, table, mode, trump, me['team'], teams, variant)] or list(range(len(hand)))
+
+    candidates = legal
+    if table and teams.get(table[get_trick_winner_index(table, mode, trump)]['playedBy']) != me['team']:
+        winners = [i for i in legal if get_trick_winner_index(
+            table + [{'card': hand[i], 'playedBy': me['position']}], mode, trump) == len(table)]
+        candidates = winners or legal
+    index = min(candidates, key=lambda i: TrickResolver.get_card_points(hand[i], mode, trump))
+    return {'action': 'PLAY', 'cardIndex': index, 'reasoning': 'Rules fallback'}
+
+
+_running = None  # Worker side: shared value holding the id of the request it is running
+
+
+def rules_bid(game_state, player_index):
+    """
+    The heuristic BiddingStrategy's bid (hand evaluation only), checked
+    against what the bidding sub-phase accepts: OPEN/CLOSED in variant
+    selection, the doubling chain in doubling.
+    """
+    from ai_worker.bot_context import BotContext
+    from ai_worker.strategies.bidding import BiddingStrategy
+
+    phase = game_state.get('phase')
+    if phase in BID_ACTIONS:  # Sub-phase reported as the game phase
+        game_state = {**game_state, 'biddingPhase': phase}
+    bidding_phase = game_state.get('biddingPhase')
+    try:
+        decision = BiddingStrategy().get_decision(BotContext(game_state, player_index))
+    except Exception as e:
+        logger.warning(f"[BOT_POOL] Heuristic bid failed for seat {player_index}: {e}")
+        decision = None
+    action = (decision or {}).get('action')
+    if not action or action not in BID_ACTIONS.get(bidding_phase, (action,)):
+        return {'action': BID_DEFAULTS.get(bidding_phase, 'PASS'), 'reasoning': 'Rules fallback'}
+    return decision
+
+
+def _run_in_worker(decide_fn, game_state, player_index, request_id=0, expires=None):
+    """
+    Worker side of a request: the decision and the metrics it recorded.
+    A request whose caller already gave up (past ``expires``, wall clock)
+    is skipped.
+    """
+    if expires is not None and time.time() >= expires:
+        return None, {}
+    if _running is not None:
+        _running.value = request_id
+    return decide_fn(game_state, player_index), metrics.drain()
+
+
+def _init_worker(warm, running=None):
+    """
+    Pool initializer: drop the metrics inherited from the parent through
+    fork (they would be sent back), and import the agent (strategies,
+    model) once per worker when ``warm``.
+    """
+    global _running
+    _running = running
+    metrics.drain()
+    if warm:
+        import ai_worker.agent  # noqa: F401
+
+
+# ── Pool ──────────────────────────────────────────────────────────
+
+class DecisionPool:
+    """
+    Runs bot decisions in worker processes, one single-process executor per
+    slot. decide() blocks only the calling greenlet.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, deadline=DECISION_DEADLINE,
+                 decide_fn=agent_decision, fallback_fn=rules_decision):
+        self.workers = workers
+        self.deadline = deadline
+        self.decide_fn = decide_fn
+        self.fallback_fn = fallback_fn
+        self._executors = [None] * max(0, workers)
+        # Per slot: the id of the request its worker is running (see _started)
+        self._running = [None] * max(0, workers)
+        self._request_ids = itertools.count(1)
+        self.completed = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def decide(self, game_state, player_index, room_id=None, sleep=time.sleep):
+        """
+        Decision for ``player_index``, from a worker when there is one.
+
+        ``sleep`` is the cooperative sleep to wait with (``sio.sleep``; plain
+        time.sleep is gevent's once the server has monkey-patched).
+        """
+        if self.workers <= 0:
+            return self.decide_fn(game_state, player_index)
+
+        slot = self._slot(room_id if room_id is not None else game_state.get('roomId'))
+        start = time.monotonic()
+        deadline = start + self.deadline
+        expires = time.time() + self.deadline
+        while True:
+            executor = self._executor(slot)
+            request_id = next(self._request_ids)
+            try:
+                future = executor.submit(_run_in_worker, self.decide_fn, game_state, player_index,
+                                         request_id, expires)
+            except (BrokenProcessPool, RuntimeError, OSError, pickle.PicklingError) as e:
+                logger.warning(f"[BOT_POOL] Submit to worker {slot} failed: {e}")
+                self._reset(slot, executor)
+                return self._fall_back(game_state, player_index)
+
+            while not future.done():
+                if time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    if future.cancel() or not self._started(slot, executor, future, request_id):
+                        # Never reached the worker: it is busy with another room's decision
+                        logger.warning(f"[BOT_POOL] Seat {player_index} in room {room_id} missed its "
+                                       f"{self.deadline:.1f}s deadline queued on worker {slot}; rules fallback")
+                        return self.fallback_fn(game_state, player_index)
+                    logger.warning(f"[BOT_POOL] Seat {player_index} in room {room_id} missed its "
+                                   f"{self.deadline:.1f}s deadline; recycling worker {slot}, rules fallback")
+                    self._reset(slot, executor, kill=True)
+                    return self.fallback_fn(game_state, player_index)
+                sleep(POLL_INTERVAL)
+
+            try:
+                decision, worker_metrics = future.result()
+            except (BrokenProcessPool, CancelledError) as e:
+                if self._executors[slot] is not executor and time.monotonic() < deadline:
+                    continue  # Recycled after another room's overrun: retry on the fresh worker
+                logger.warning(f"[BOT_POOL] Worker {slot} died: {e}")
+                self._reset(slot, executor)
+                return self._fall_back(game_state, player_index)
+            except Exception as e:
+                logger.error(f"[BOT_POOL] Decision failed in worker {slot}: {e}")
+                return self._fall_back(game_state, player_index)
+            break
+        self.completed += 1
+        metrics.merge(worker_metrics)
+        metrics.observe('baloot_bot_pool_wait_seconds', time.monotonic() - start)
+        return decision
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'failures': self.failures,
+        }
+
+    def shutdown(self):
+        for slot in range(len(self._executors)):
+            self._reset(slot)
+
+    def _slot(self, room_id):
+        return zlib.crc32(str(room_id).encode('utf-8')) % self.workers
+
+    def _executor(self, slot):
+        executor = self._executors[slot]
+        if executor is None:
+            running = self._running[slot] = multiprocessing.RawValue('q', 0)
+            executor = self._executors[slot] = ProcessPoolExecutor(
+                max_workers=1, initializer=_init_worker,
+                initargs=(self.decide_fn is agent_decision, running))
+        return executor
+
+    def _started(self, slot, executor, future, request_id):
+        """
+        Whether the slot's worker is running this request. The executor
+        marks a future running as soon as it is handed to the worker's call
+        queue, which may still be behind another room's decision.
+        """
+        running = self._running[slot]
+        return (future.running() and self._executors[slot] is executor
+                and running is not None and running.value == request_id)
+
+    def _reset(self, slot, executor=None, kill=False):
+        """
+        Drops a slot's executor (only if it is still ``executor``, when
+        given); the next request starts a fresh worker. ``kill`` terminates a
+        worker still running a decision: shutdown alone would let it finish.
+        """
+        current = self._executors[slot]
+        if current is None or (executor is not None and current is not executor):
+            return
+        self._executors[slot] = None
+        self._running[slot] = None
+        processes = list((current._processes or {}).values()) if kill else []
+        current.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _fall_back(self, game_state, player_index):
+        self.failures += 1
+        return self.fallback_fn(game_state, player_index)
+
+
+# Singleton Instance
+decision_pool = DecisionPool()
+atexit.register(decision_pool.shutdown)
@@ -3,36 +3,174 @@ server/broadcast.py — Canonical broadcast module.
 
 Single source of truth for emitting validated game state to clients.
 All modules should import broadcast_game_update from here.
+
+Every room has a versioned StateStream. A broadcast validates the state once
+and, if anything but the clock moved, records it as the next version:
+- legacy clients get the full state in 'game_update' (unchanged protocol);
+- clients that called sync_game_state (see room_lifecycle) sit in the
+  '<room>:delta' room and get 'game_patch' {epoch, version, baseVersion, patch},
+  a JSON-patch against the previous version. A client whose version is not
+  baseVersion (missed emit, server restart = new epoch) asks sync_game_state
+  again and gets a patch from its version if still in history, else a full state.
+
+Delta subscribers are tracked per room outside the streams: a stream evicted
+(MAX_STREAMS) or dropped with a hibernated room starts a new epoch on its next
+broadcast, and its subscribers get that full state as their resync.
 """
-import json
 import logging
+import os
+import uuid
+from collections import OrderedDict
+
+from server.metrics import metrics
+from server.state_patch import make_patch
 
 logger = logging.getLogger(__name__)
 
+STATE_HISTORY = int(os.environ.get('BALOOT_STATE_HISTORY', '16'))  # Versions kept for catch-up patches
+MAX_STREAMS = int(os.environ.get('BALOOT_STATE_STREAMS', '2048'))
+DELTA_ROOM_SUFFIX = ':delta'
 
-def broadcast_game_update(sio, game, room_id):
-    """Emit validated game state with schema check and fallback."""
-    try:
+# Change on every call without being a new state: never worth a version of their own
+VOLATILE_KEYS = ('serverTime',)
+# Derived from the timer's start time and the clock; any other timer field is state
+DERIVED_TIMER_KEYS = ('remaining', 'elapsed')
+
+
+def delta_room(room_id):
+    return f"{room_id}{DELTA_ROOM_SUFFIX}"
+
+
+class StateStream:
+    """Validated, versioned snapshots of one room's game state."""
+
+    def __init__(self, history=STATE_HISTORY):
+        self.max_history = history
+        self.reset()
+
+    def reset(self):
+        """New epoch: every delta client resyncs from a full state."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.snapshot = None
+        self.history = OrderedDict()  # version -> snapshot
+
+    def update(self, state):
+        """
+        Validates ``state`` (the schema check runs here, once per version) and
+        returns the patch from the previous version, or None if there was none.
+        Returns [] and keeps the version when only volatile keys moved.
+        """
         from server.schemas.game import GameStateModel
+        snapshot = GameStateModel(**state).model_dump(mode='json', by_alias=True)
+        previous = self.snapshot
+        if previous is not None and _same_state(previous, snapshot):
+            return []
+        patch = make_patch(previous, snapshot) if previous is not None else None
+        self.version += 1
+        self.snapshot = snapshot
+        self.history[self.version] = snapshot
+        while len(self.history) > self.max_history:
+            self.history.popitem(last=False)
+        return patch
 
-        # Get game state
-        state = game.get_game_state()
+    def sync_payload(self, epoch=None, version=None):
+        """What a (re)syncing client needs: a catch-up patch if possible, else the full state."""
+        if epoch == self.epoch and version == self.version:
+            return {'epoch': self.epoch, 'version': self.version, 'baseVersion': version, 'patch': []}
+        if epoch == self.epoch and version in self.history:
+            return {'epoch': self.epoch, 'version': self.version, 'baseVersion': version,
+                    'patch': make_patch(self.history[version], self.snapshot)}
+        return {'epoch': self.epoch, 'version': self.version, 'gameState': self.snapshot}
 
-        # Validate JSON serializability BEFORE schema validation
-        try:
-            json.dumps(state)
-        except TypeError as json_err:
-            logger.error(f"[BROADCAST] State not JSON-serializable: {json_err}")
-            logger.error(f"[BROADCAST] Problematic state keys: {list(state.keys())}")
-            raise
 
-        # Validate with schema
-        state_model = GameStateModel(**state)
-        sio.emit('game_update', {'gameState': state_model.model_dump(mode='json', by_alias=True)}, room=room_id)
+def _same_state(a, b):
+    for key in a.keys() | b.keys():
+        if key in VOLATILE_KEYS:
+            continue
+        if key == 'timer':
+            if _timer_fields(a.get(key)) != _timer_fields(b.get(key)):
+                return False
+        elif a.get(key) != b.get(key):
+            return False
+    return True
+
+
+def _timer_fields(timer):
+    return {k: v for k, v in (timer or {}).items() if k not in DERIVED_TIMER_KEYS}
+
+
+_streams = OrderedDict()  # room_id -> StateStream
+_delta_sids = {}  # room_id -> sids on patches; survives the room's stream
+
+
+def get_stream(room_id) -> StateStream:
+    stream = _streams.get(room_id)
+    if stream is None:
+        stream = _streams[room_id] = StateStream()
+        while len(_streams) > MAX_STREAMS:
+            _streams.popitem(last=False)
+    else:
+        _streams.move_to_end(room_id)
+    return stream
+
+
+def drop_stream(room_id):
+    _streams.pop(room_id, None)
+
+
+def subscribe_deltas(sio, sid, room_id, game, epoch=None, version=None):
+    """
+    Moves a client onto patches and returns its sync payload (full state or
+    catch-up patch). The stream is brought up to the game's current state
+    first; delta clients already subscribed get the patch for that step.
+    """
+    stream = get_stream(room_id)
+    base_version = stream.version
+    patch = stream.update(game.get_game_state())
+    if patch and _delta_sids.get(room_id):
+        sio.emit('game_patch', {'epoch': stream.epoch, 'version': stream.version,
+                                'baseVersion': base_version, 'patch': patch}, room=delta_room(room_id))
+    _delta_sids.setdefault(room_id, set()).add(sid)
+    sio.enter_room(sid, delta_room(room_id))
+    return stream.sync_payload(epoch, version)
+
+
+def unsubscribe_deltas(sid):
+    """Disconnect cleanup; socket.io drops the sid from its rooms by itself."""
+    for room_id in [r for r, sids in _delta_sids.items() if sid in sids]:
+        _delta_sids[room_id].discard(sid)
+        if not _delta_sids[room_id]:
+            del _delta_sids[room_id]
+
+
+@metrics.timed('baloot_broadcast_seconds')
+def broadcast_game_update(sio, game, room_id):
+    """Emit validated game state with schema check and fallback."""
+    try:
+        stream = get_stream(room_id)
+        base_version = stream.version
+        patch = stream.update(game.get_game_state())
+        if patch == []:
+            return  # Nothing changed but the clock
+
+        delta_sids = _delta_sids.get(room_id)
+        sio.emit('game_update', {'gameState': stream.snapshot}, room=room_id,
+                 skip_sid=list(delta_sids) if delta_sids else None)
+        if delta_sids:
+            if patch is None:
+                payload = stream.sync_payload()
+            else:
+                payload = {'epoch': stream.epoch, 'version': stream.version,
+                           'baseVersion': base_version, 'patch': patch}
+            sio.emit('game_patch', payload, room=delta_room(room_id))
 
     except Exception as e:
         logger.critical(f"SCHEMA VALIDATION FAILED for Room {room_id}: {e}")
         logger.error(f"[BROADCAST] Error type: {type(e).__name__}")
+        # Delta clients cannot patch from an unvalidated state: start them over
+        if room_id in _streams:
+            _streams[room_id].reset()
 
         # Fallback: try to send raw state (may still fail if not serializable)
         try:
@@ -18,6 +18,7 @@ from server.routes.brain import (
 )
 from server.routes.puzzles import get_puzzles, get_puzzle_detail
 from server.routes.qayd import confirm_qayd, handle_qayd_trigger, update_director_config
+from server.routes.metrics import get_metrics, get_room_memory
 
 
 # --- Explicit Binding for Custom Runner ---
@@ -64,11 +65,13 @@ def bind(app):
     from server.routes.brain import bind_brain
     from server.routes.puzzles import bind_puzzles
     from server.routes.qayd import bind_qayd
+    from server.routes.metrics import bind_metrics
 
     bind_auth(safe_mount)
     bind_brain(safe_mount)
     bind_puzzles(safe_mount)
     bind_qayd(safe_mount)
+    bind_metrics(safe_mount)
     bind_game(safe_mount)  # Must be last (catch-all route)
 
     setattr(app, '_main_controllers_bound', True)
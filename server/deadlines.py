@@ -0,0 +1,179 @@
+"""
+server/deadlines.py — When each room's timer next needs looking at.
+
+The timer task used to load and check every room ten times a second. Rooms
+now register their next deadline (Game.next_deadline) here whenever their
+timer changes or the game is saved, and the timer task only touches rooms
+whose deadline has passed:
+- in-process, a heap of (deadline, room_id) with lazy invalidation;
+- shared, a Redis sorted set (score = deadline). A worker claims a due room
+  by ZREM-ing it, so with several workers each expiry is handled once.
+  Registrations made while Redis was unreachable live only in the heap;
+  the first Redis call after the outage writes them back to the set.
+"""
+import heapq
+import logging
+import os
+import time
+
+from server.common import redis_client
+
+logger = logging.getLogger(__name__)
+
+DEADLINES_KEY = 'timer:deadlines'
+CLAIM_BATCH = int(os.environ.get('BALOOT_TIMER_CLAIM_BATCH', '64'))
+# is_expired() is strict: look a hair after the deadline so the check acts
+EXPIRY_SLACK = 0.001
+REDIS_RETRY_SECONDS = 5.0  # Local-only after a Redis error, then try again
+
+
+class DeadlineQueue:
+    """Next timer deadline per room."""
+
+    def __init__(self, redis=None, key=DEADLINES_KEY):
+        self.redis = redis
+        self.key = key
+        self._deadlines = {}  # room_id -> deadline (the live entry)
+        self._heap = []       # (deadline, room_id), possibly stale
+        self._redis_down_until = 0.0
+        self._resync = False         # Set changed while Redis was down: rewrite on reconnect
+        self._offline_cancels = set()
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    # ── Registration ─────────────────────────────────────────────────
+
+    def attach(self, game):
+        """Follows a Game's timer changes (idempotent) and registers its current deadline."""
+        observers = getattr(game, 'observers', None)
+        if observers is None:
+            game.observers = observers = []
+        if self not in observers:
+            observers.append(self)
+        self.schedule(game)
+
+    def on_timer_changed(self, game):
+        self.schedule(game)
+
+    def schedule(self, game):
+        self.set(game.room_id, game.next_deadline())
+
+    def set(self, room_id, deadline):
+        """Registers ``deadline`` (epoch seconds) for a room; None cancels."""
+        if deadline is None:
+            if room_id in self._deadlines:
+                self.cancel(room_id)
+            return
+        deadline += EXPIRY_SLACK
+        if self._deadlines.get(room_id) == deadline:
+            return
+        self._deadlines[room_id] = deadline
+        heapq.heappush(self._heap, (deadline, room_id))
+        if len(self._heap) > 4 * len(self._deadlines) + 64:
+            self._compact()
+        redis = self._shared()
+        if redis is not None:
+            try:
+                redis.zadd(self.key, {room_id: deadline})
+            except Exception as e:
+                self._redis_failed('ZADD', e)
+
+    def cancel(self, room_id):
+        self._deadlines.pop(room_id, None)
+        redis = self._shared()
+        if redis is None:
+            if self._resync:
+                self._offline_cancels.add(room_id)
+            return
+        try:
+            redis.zrem(self.key, room_id)
+        except Exception as e:
+            self._redis_failed('ZREM', e)
+            self._offline_cancels.add(room_id)
+
+    def _shared(self):
+        if self.redis is None or time.time() < self._redis_down_until:
+            return None
+        if self._resync and not self._write_back():
+            return None
+        return self.redis
+
+    def _write_back(self):
+        """Re-registers every live deadline (and drops offline cancels) after an outage."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if self._offline_cancels:
+                pipe.zrem(self.key, *self._offline_cancels)
+            if self._deadlines:
+                pipe.zadd(self.key, dict(self._deadlines))
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed('resync', e)
+            return False
+        logger.info(f"[DEADLINES] Redis back: re-registered {len(self._deadlines)} deadlines")
+        self._resync = False
+        self._offline_cancels.clear()
+        return True
+
+    def _redis_failed(self, what, e):
+        logger.error(f"[DEADLINES] Redis {what} failed, local deadlines for {REDIS_RETRY_SECONDS:.0f}s: {e}")
+        self._redis_down_until = time.time() + REDIS_RETRY_SECONDS
+        self._resync = True
+
+    def _compact(self):
+        self._heap = [(d, r) for r, d in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    # ── Expiry ───────────────────────────────────────────────────────
+
+    def next_deadline(self):
+        """Earliest in-process deadline, or None."""
+        while self._heap:
+            deadline, room_id = self._heap[0]
+            if self._deadlines.get(room_id) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now=None):
+        """
+        Room ids whose deadline has passed, each removed from the queue (the
+        caller reschedules after checking the game). Reads the shared sorted
+        set when Redis is reachable, else the local heap (which every
+        registration also feeds).
+        """
+        now = time.time() if now is None else now
+        redis = self._shared()
+        if redis is not None:
+            try:
+                return self._claim_shared(redis, now)
+            except Exception as e:
+                self._redis_failed('claim', e)
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, room_id = heapq.heappop(self._heap)
+            if self._deadlines.get(room_id) == deadline:
+                del self._deadlines[room_id]
+                due.append(room_id)
+        return due
+
+    def _claim_shared(self, redis, now):
+        members = redis.zrangebyscore(self.key, '-inf', now, start=0, num=CLAIM_BATCH)
+        if not members:
+            return []
+        pipe = redis.pipeline(transaction=False)
+        for room_id in members:
+            pipe.zrem(self.key, room_id)
+        claimed = []
+        for room_id, removed in zip(members, pipe.execute()):
+            room_id = room_id.decode() if isinstance(room_id, bytes) else room_id
+            if removed:  # Another worker did not get there first
+                claimed.append(room_id)
+            if room_id in self._deadlines and self._deadlines[room_id] <= now:
+                del self._deadlines[room_id]
+        return claimed
+
+
+# Global instance (shared through Redis when available)
+deadlines = DeadlineQueue(redis_client)
@@ -40,6 +40,16 @@ class RedisPersistenceError(BalootError):
         super().__init__(f"Redis {operation} failed for room {room_id}: {cause}")
 
 
+class StaleWriteError(RedisPersistenceError):
+    """Raised when a save would overwrite game state this process has not seen."""
+    def __init__(self, room_id: str, reason: str):
+        self.operation = 'save'
+        self.room_id = room_id
+        self.cause = None
+        self.reason = reason
+        BalootError.__init__(self, f"Save aborted for room {room_id}: {reason}")
+
+
 class BroadcastError(BalootError):
     """Raised when game state broadcast to clients fails."""
     pass
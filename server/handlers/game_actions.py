@@ -5,6 +5,7 @@ import logging
 
 import server.bot_orchestrator as bot_orchestrator
 from server.room_manager import room_manager
+from server.room_leases import room_router
 from server.rate_limiter import limiter
 from server.handlers.game_lifecycle import (
     broadcast_game_update, handle_bot_turn,
@@ -28,6 +29,7 @@ def register(sio):
     """Register the game_action event handler on the given sio instance."""
 
     @sio.event
+    @room_router.routed
     def game_action(sid, data):
         if not isinstance(data, dict):
             return {'success': False, 'error': 'Invalid request format'}
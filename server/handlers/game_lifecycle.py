@@ -10,6 +10,7 @@ from server.room_manager import room_manager
 from ai_worker.personality import BALANCED, AGGRESSIVE, CONSERVATIVE
 from ai_worker.dialogue_system import DialogueSystem
 from ai_worker.memory_hall import memory_hall
+from server.logging_utils import get_category_logger
 
 logger = logging.getLogger(__name__)
 
@@ -99,11 +100,7 @@ def _sawa_timer_task(sio, game, room_id, timer_seconds=3):
 def auto_restart_round(sio, game, room_id):
     """Wait then start next round if match is not over"""
     def _trace(msg):
-        import datetime
-        try:
-            with open('logs/sherlock_debug.log', 'a', encoding='utf-8') as f:
-                f.write(f"{datetime.datetime.now().isoformat()} [AUTO_RESTART] {msg}\n")
-        except OSError: pass
+        get_category_logger('sherlock').info(f"[AUTO_RESTART] {msg}")
     
     try:
         # race condition guard
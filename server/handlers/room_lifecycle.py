@@ -7,6 +7,7 @@ import time
 import logging
 
 from server.room_manager import room_manager
+from server.room_leases import room_router
 from ai_worker.personality import PROFILES, BALANCED, AGGRESSIVE, CONSERVATIVE
 from server.rate_limiter import limiter
 import server.auth_utils as auth_utils
@@ -84,6 +85,8 @@ def register(sio, connected_users):
             del connected_users[sid]
         # Cleanup player-to-room tracking
         room_manager.untrack_player(sid)
+        from server.broadcast import unsubscribe_deltas
+        unsubscribe_deltas(sid)
 
     @sio.event
     def create_room(sid, data):
@@ -99,6 +102,7 @@ def register(sio, connected_users):
         return {'success': True, 'roomId': room_id}
 
     @sio.event
+    @room_router.routed
     def join_room(sid, data):
         if not isinstance(data, dict):
             return {'success': False, 'error': 'Invalid request format'}
@@ -195,6 +199,35 @@ def register(sio, connected_users):
         return response
 
     @sio.event
+    @room_router.routed
+    def sync_game_state(sid, data):
+        """
+        Opts a client in to 'game_patch' deltas. Called after join/reconnect and
+        whenever a patch's baseVersion is not the client's version; returns a
+        catch-up patch from {epoch, version} if the server still has it, else the full state.
+        """
+        if not isinstance(data, dict):
+            return {'success': False, 'error': 'Invalid request format'}
+        room_id = data.get('roomId')
+        if not _validate_room_id(room_id):
+            return {'success': False, 'error': 'Invalid roomId'}
+        # The client may be connected to another worker: its socket.io rooms are not visible here
+        if room_id not in (sio.rooms(sid) or []) and room_manager.get_room_for_sid(sid) != room_id:
+            return {'success': False, 'error': 'Not in room'}
+        game = room_manager.get_game(room_id)
+        if not game:
+            return {'success': False, 'error': 'Room not found'}
+
+        from server.broadcast import subscribe_deltas
+        try:
+            payload = subscribe_deltas(sio, sid, room_id, game, data.get('epoch'), data.get('version'))
+        except Exception as e:
+            logger.error(f"sync_game_state failed for {room_id}: {e}")
+            return {'success': False, 'error': 'State unavailable'}
+        return {'success': True, **payload}
+
+    @sio.event
+    @room_router.routed
     def add_bot(sid, data):
         if not isinstance(data, dict):
             return {'success': False, 'error': 'Invalid request format'}
@@ -208,11 +241,10 @@ def register(sio, connected_users):
         room_id = data.get('roomId')
         if not _validate_room_id(room_id):
             return {'success': False, 'error': 'Invalid roomId'}
-        if room_id not in room_manager.games:
+        game = room_manager.get_game(room_id)
+        if not game:
             return {'success': False, 'error': 'Room not found'}
 
-        game = room_manager.games[room_id]
-
         # Cycle through personas: Balanced -> Aggressive -> Conservative
         personas = [BALANCED, AGGRESSIVE, CONSERVATIVE]
         persona = personas[len(game.players) % 3]
@@ -241,6 +273,7 @@ def register(sio, connected_users):
         return {'success': True}
 
     @sio.event
+    @room_router.routed
     def check_start(sid, data):
         if not isinstance(data, dict):
             return {'success': False, 'error': 'Invalid request format'}
@@ -284,6 +317,7 @@ def register(sio, connected_users):
         }
 
     @sio.event
+    @room_router.routed
     def rejoin_room(sid, data):
         """Rejoin an active game after app restart / reconnection.
 
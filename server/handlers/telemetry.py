@@ -2,10 +2,12 @@
 Client telemetry log handler.
 """
 import os
-import time
 import logging
 
+from server.logging_utils import get_category_logger
+
 logger = logging.getLogger(__name__)
+client_log_file = get_category_logger('client')
 
 # Ensure logs directory exists at import time
 os.makedirs('logs', exist_ok=True)
@@ -30,9 +32,8 @@ def register(sio):
             log_line = f"[{level}] [{category}] {msg}"
             logger.info(f"[CLIENT-LOG] [SID:{sid}] {log_line}")
 
-            # Write to file for Agent to read
-            with open('logs/client_debug.log', 'a', encoding='utf-8') as f:
-                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {log_line}\n")
+            # Queued for client_debug.log (for Agent to read)
+            client_log_file.info(log_line)
 
         except Exception as e:
             logger.error(f"Error logging client message: {e}")
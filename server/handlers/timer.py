@@ -1,15 +1,68 @@
 """
 Background timer task for checking game timeouts.
+
+Only rooms whose registered deadline has passed are loaded and checked
+(server/deadlines.py); idle rooms cost nothing per tick. Any worker may
+claim a due room; the check runs on the room's owner (server/room_leases.py).
 """
 import time
 import logging
 import traceback
 
 from server.room_manager import room_manager
+from server.deadlines import deadlines
+from server.room_leases import room_router
+from server.logging_utils import get_category_logger
 
 logger = logging.getLogger(__name__)
+# Dedicated debug files, written by the logging thread
+singleton_log = get_category_logger('singleton')
+monitor_log = get_category_logger('timer')
+crash_log = get_category_logger('crash')
 
 TIMER_TASK_STARTED = False
+TICK_SECONDS = 0.1  # Timeout resolution; a tick is one heap peek / ZRANGEBYSCORE
+RETRY_SECONDS = 5.0  # A timeout check that failed (or found the room moved) runs again after this
+
+
+def check_room_timeout(sio, room_manager_instance, room_id):
+    """Runs a due room's timeout and registers its next deadline."""
+    game = room_manager_instance.get_game(room_id)
+    if not game:
+        return
+
+    res = game.check_timeout()
+    if res and isinstance(res, dict) and res.get('success'):
+        # Timeout caused an action (Pass or AutoPlay)
+        from server.handlers.game_lifecycle import (
+            broadcast_game_update, handle_bot_turn,
+            save_match_snapshot, auto_restart_round
+        )
+        room_manager.save_game(game)
+        broadcast_game_update(sio, game, room_id)
+
+        # Trigger Bot if next player is bot
+        handle_bot_turn(sio, game, room_id)
+
+        # Check finish
+        if game.phase == "FINISHED":
+            save_match_snapshot(game, room_id)
+            sio.start_background_task(auto_restart_round, sio, game, room_id)
+
+    # Popped when due: re-register whatever the game waits for now (None = nothing)
+    deadlines.attach(game)
+
+
+def retry_room_timeout(room_id):
+    """Registers the room again so a failed check is not the last one."""
+    deadlines.set(room_id, time.time() + RETRY_SECONDS)
+
+
+def register_room_timeout(router, sio, room_manager_instance):
+    """The 'room_timeout' event the timer dispatches to each due room's owner."""
+    router.register('room_timeout',
+                    lambda sid, data: check_room_timeout(sio, room_manager_instance, data['roomId']),
+                    on_failure=lambda sid, data: retry_room_timeout(data['roomId']))
 
 
 def timer_background_task(sio, room_manager_instance):
@@ -25,69 +78,49 @@ def timer_background_task(sio, room_manager_instance):
 
     # Check for duplicate modules
     sock_modules = [k for k in sys.modules.keys() if 'socket_handler' in k]
-    debug_msg += f"Loaded Socket Handlers: {sock_modules}\n"
+    debug_msg += f"Loaded Socket Handlers: {sock_modules}"
 
-    with open("logs/singleton_debug.log", "a") as f:
-        f.write(f"{time.time()} PRE-CHECK: {debug_msg}")
+    singleton_log.info(f"PRE-CHECK: {debug_msg}")
 
     if TIMER_TASK_STARTED:
         logger.warning(f"Timer Background Task ALREADY RUNNING. Skipping. {debug_msg}")
-        with open("logs/singleton_debug.log", "a") as f:
-            f.write(f"{time.time()} SKIPPED: {debug_msg}")
+        singleton_log.warning(f"SKIPPED: {debug_msg}")
         return
 
     TIMER_TASK_STARTED = True
 
-    with open("logs/singleton_debug.log", "a") as f:
-        f.write(f"{time.time()} STARTED: {debug_msg}")
+    singleton_log.info(f"STARTED: {debug_msg}")
+
+    register_room_timeout(room_router, sio, room_manager_instance)
 
     last_heartbeat = time.time()
     logger.info("Timer Background Task Started")
-
-    # Dedicated Debug Logger
-    with open("logs/timer_monitor.log", "w") as f:
-        f.write(f"{time.time()} STARTUP\n")
+    monitor_log.info("STARTUP")
 
     while True:
-        sio.sleep(0.1)  # Check every 0.1 second for smoother timeouts
+        sio.sleep(TICK_SECONDS)
 
         now = time.time()
         if now - last_heartbeat > 10:
-            logger.info(f"Timer Task Heartbeat. Checking {len(room_manager_instance.games)} games.")
-            with open("logs/timer_monitor.log", "a") as f:
-                f.write(f"{now} HEARTBEAT {len(room_manager_instance.games)} games\n")
+            logger.info(f"Timer Task Heartbeat. {len(deadlines)} rooms with deadlines.")
+            monitor_log.info(f"HEARTBEAT {len(deadlines)} deadlines")
             last_heartbeat = now
+            try:
+                hibernated = room_manager_instance.hibernate_idle()
+                if hibernated:
+                    logger.info(f"Hibernated {hibernated} idle rooms.")
+            except Exception as e:
+                logger.exception(f"Room hibernation sweep failed: {e}")
 
         try:
-            # Create list of IDs to iterate safely (in case dict changes size)
-            room_ids = list(room_manager_instance.games.keys())
-
-            for room_id in room_ids:
-                game = room_manager_instance.get_game(room_id)
-                if not game:
-                    continue
-
-                res = game.check_timeout()
-                if res and isinstance(res, dict) and res.get('success'):
-                    # Timeout caused an action (Pass or AutoPlay)
-                    from server.handlers.game_lifecycle import (
-                        broadcast_game_update, handle_bot_turn,
-                        save_match_snapshot, auto_restart_round
-                    )
-                    room_manager.save_game(game)
-                    broadcast_game_update(sio, game, room_id)
-
-                    # Trigger Bot if next player is bot
-                    handle_bot_turn(sio, game, room_id)
-
-                    # Check finish
-                    if game.phase == "FINISHED":
-                        save_match_snapshot(game, room_id)
-                        sio.start_background_task(auto_restart_round, sio, game, room_id)
+            for room_id in deadlines.pop_due(now):
+                try:
+                    room_router.dispatch('room_timeout', None, {'roomId': room_id}, wait=False)
+                except Exception as e:
+                    logger.exception(f"Timeout check failed for room {room_id}: {e}")
+                    retry_room_timeout(room_id)  # Retry later, do not lose the room
 
         except Exception as e:
             logger.exception(f"Error in timer_background_task: {e}")
-            with open("logs/crash.log", "a") as f:
-                f.write(f"\n{time.time()} CRASH: {e}\n")
-                f.write(traceback.format_exc())
+            crash_log.error(f"CRASH: {e}\n{traceback.format_exc()}")
             sio.sleep(5.0)  # Backoff on error
@@ -1,13 +1,69 @@
+"""
+server/logging_utils.py — Structured, non-blocking logging.
+
+Every logger set up here (GameServer and the per-category debug logs) only
+puts records on an in-memory queue; one OS thread (a real thread even when
+gevent has monkey-patched ``threading``) formats them and writes the
+rotating files. Game greenlets never wait on the disk.
+
+- Categories: "server" is the GameServer logger (server_manual.log plus
+  the console); get_category_logger('sherlock' | 'timer' | 'client' | ...)
+  returns the logger for one of the debug files in CATEGORY_FILES.
+- Level gates and sampling per category: BALOOT_LOG_LEVELS="sherlock=WARNING"
+  and BALOOT_LOG_SAMPLING="client=0.1" (keep one record in ten).
+- Budget: at most BALOOT_LOG_BUDGET records per second below WARNING,
+  across all categories (0 = unlimited). WARNING and above always pass.
+- BALOOT_LOG_FORMAT=json writes one JSON object per line, with
+  GameLoggerAdapter's room_id and context as fields.
+- Forked processes (bot decision workers, MCTS and arena pools) get their
+  own queue, listener thread and sinks right after the fork, and flush
+  them when multiprocessing shuts the process down. Their sinks write
+  per-process files (sherlock_debug.<pid>.log): rotation is not safe with
+  several processes renaming the same file.
+"""
+import atexit
+import datetime
+import importlib
 import logging
+import logging.handlers
 import json
 import time
 import os
+import weakref
 
 # Ensure logs directory exists
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "server_manual.log")
 
+# Category → file in LOG_DIR
+CATEGORY_FILES = {
+    'server': 'server_manual.log',
+    'sherlock': 'sherlock_debug.log',
+    'timer': 'timer_monitor.log',
+    'client': 'client_debug.log',
+    'singleton': 'singleton_debug.log',
+    'crash': 'crash.log',
+}
+
+
+def _parse_category_map(value, convert):
+    """'sherlock=0.1,client=0.5' → {'sherlock': 0.1, 'client': 0.5}"""
+    result = {}
+    for item in value.split(','):
+        if '=' in item:
+            category, setting = item.split('=', 1)
+            result[category.strip()] = convert(setting.strip())
+    return result
+
+
+LOG_MAX_BYTES = int(os.environ.get('BALOOT_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUPS = int(os.environ.get('BALOOT_LOG_BACKUPS', '5'))
+LOG_BUDGET = float(os.environ.get('BALOOT_LOG_BUDGET', '500'))
+LOG_FORMAT = os.environ.get('BALOOT_LOG_FORMAT', 'text')
+LOG_LEVELS = _parse_category_map(os.environ.get('BALOOT_LOG_LEVELS', ''), str.upper)
+LOG_SAMPLING = _parse_category_map(os.environ.get('BALOOT_LOG_SAMPLING', ''), float)
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  Structured Formatter
@@ -69,26 +125,305 @@ class GameLoggerAdapter(logging.LoggerAdapter):
         return msg, kwargs
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; GameLoggerAdapter context becomes fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'room_id': getattr(record, 'room_id', '-'),
+            'msg': record.getMessage(),
+        }
+        for key, value in getattr(record, '_extras', {}).items():
+            payload.setdefault(key, value)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class LineFormatter(logging.Formatter):
+    """Debug-file lines: ISO timestamp, then the message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.datetime.fromtimestamp(record.created).isoformat()
+        return f"{timestamp} {record.getMessage()}"
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Sampling & Budget
+# ═══════════════════════════════════════════════════════════════════
+
+class LogBudget:
+    """Token bucket shared by all categories: ``rate`` records per second."""
+
+    def __init__(self, rate: float, clock=time.monotonic):
+        self.rate = rate
+        self.tokens = rate
+        self._clock = clock
+        self._last = clock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = self._clock()
+        self.tokens = min(self.rate, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class LogGate(logging.Filter):
+    """
+    Caller-side filter of one category: keeps ``sample`` of the records
+    (evenly spaced, not random) within the shared budget. WARNING and above
+    always pass. Stamps the category on passing records for routing.
+    """
+
+    def __init__(self, category: str, sample: float = 1.0, budget: LogBudget = None):
+        super().__init__()
+        self.category = category
+        self.sample = sample
+        self.budget = budget
+        self._seen = 0
+        self.passed = 0
+        self.sampled_out = 0
+        self.over_budget = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            if self.sample < 1.0:
+                self._seen += 1
+                if int(self._seen * self.sample) == int((self._seen - 1) * self.sample):
+                    self.sampled_out += 1
+                    return False
+            if self.budget is not None and not self.budget.take():
+                self.over_budget += 1
+                return False
+        record.log_category = self.category
+        self.passed += 1
+        return True
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Queue Backend
+# ═══════════════════════════════════════════════════════════════════
+
+def _original(module: str, name: str):
+    """``module.name`` as it was before gevent monkey-patching, if any."""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched(module):
+            return monkey.get_original(module, name)
+    except ImportError:
+        pass
+    return getattr(importlib.import_module(module), name)
+
+
+class _Flush:
+    """Queue marker: released once everything queued before it is written."""
+
+    def __init__(self):
+        self.done = _original('_thread', 'allocate_lock')()
+        self.done.acquire()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues the record itself with its message merged (args never cross
+    threads): cheaper than the stdlib copy-and-format, and the caller is
+    the hot path.
+    """
+
+    def prepare(self, record):
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{_traceback_formatter.formatException(record.exc_info)}"
+        if record.stack_info:
+            message = f"{message}\n{record.stack_info}"
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class _SinkListener(logging.handlers.QueueListener):
+    """
+    QueueListener on a native thread that sends each record to the sinks of
+    its category only.
+    """
+
+    def __init__(self, queue, routes):
+        super().__init__(queue)
+        self.routes = routes
+        self._stopped = None
+
+    def start(self):
+        self._stopped = _original('_thread', 'allocate_lock')()
+        self._stopped.acquire()
+        _original('_thread', 'start_new_thread')(self._run, ())
+
+    def _run(self):
+        try:
+            self._monitor()
+        finally:
+            self._stopped.release()
+
+    def handle(self, record):
+        if isinstance(record, _Flush):
+            record.done.release()
+            return
+        for sink in self.routes.get(getattr(record, 'log_category', None), ()):
+            if record.levelno >= sink.level:
+                sink.handle(record)
+
+    def stop(self, timeout: float = 5.0):
+        if self._stopped is None:
+            return
+        self.enqueue_sentinel()
+        self._stopped.acquire(timeout=timeout)
+        self._stopped = None
+
+
+_backends = weakref.WeakSet()
+
+
+def _restart_after_fork():
+    for backend in list(_backends):
+        backend._restart_in_child()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+class LogBackend:
+    """
+    The shared queue, its listener thread and the rotating file sinks.
+    Loggers from logger() only enqueue; sinks are opened lazily by the
+    listener thread.
+    """
+
+    def __init__(self, log_dir: str = LOG_DIR, budget: float = LOG_BUDGET,
+                 levels: dict = None, sampling: dict = None, fmt: str = LOG_FORMAT,
+                 max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.log_dir = log_dir
+        self.budget = LogBudget(budget)
+        self.levels = LOG_LEVELS if levels is None else levels
+        self.sampling = LOG_SAMPLING if sampling is None else sampling
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.gates = {}
+        self.consoles = {}   # category -> whether its sinks include the console
+        self.handlers = []
+        self.pid = None      # Set in forked children: their files carry the pid
+        self._start({})
+        _backends.add(self)
+
+    def _start(self, routes):
+        self.queue = _original('queue', 'SimpleQueue')()
+        self.listener = _SinkListener(self.queue, routes)
+        self.listener.start()
+        for handler in self.handlers:
+            handler.queue = self.queue
+
+    def _restart_in_child(self):
+        """
+        After fork: the listener thread did not survive it and the sinks'
+        locks may have been copied while held, so the child gets a fresh
+        queue, listener and sinks. The inherited file objects are dropped
+        unflushed (the parent still writes through its own).
+        """
+        self.pid = os.getpid()
+        self._start({category: self._sinks(category, console)
+                     for category, console in self.consoles.items()})
+        from multiprocessing import util
+        util.Finalize(self, self.stop, exitpriority=0)  # Pool workers exit without atexit
+
+    def logger(self, category: str, name: str = None, console: bool = False) -> logging.Logger:
+        """The logger for ``category`` (named ``baloot.<category>`` by default)."""
+        log = logging.getLogger(name or f"baloot.{category}")
+        log.setLevel(self.levels.get(category, logging.INFO))
+        log.propagate = False
+        # Prevent duplicate handlers on reload
+        if not log.handlers:
+            if category not in self.gates:
+                self.gates[category] = LogGate(category, self.sampling.get(category, 1.0), self.budget)
+                self.consoles[category] = console
+                self.listener.routes[category] = self._sinks(category, console)
+            handler = _QueueHandler(self.queue)
+            handler.addFilter(self.gates[category])
+            self.handlers.append(handler)
+            log.addHandler(handler)
+        return log
+
+    def _sinks(self, category, console):
+        filename = CATEGORY_FILES.get(category, f"{category}.log")
+        if self.pid is not None:
+            base, ext = os.path.splitext(filename)
+            filename = f"{base}.{self.pid}{ext}"
+        sink = logging.handlers.RotatingFileHandler(
+            os.path.join(self.log_dir, filename), maxBytes=self.max_bytes,
+            backupCount=self.backups, encoding='utf-8', delay=True)
+        if self.fmt == 'json':
+            sink.setFormatter(JsonFormatter())
+        elif category == 'server':
+            sink.setFormatter(structured_formatter)
+        else:
+            sink.setFormatter(LineFormatter())
+        sinks = [sink]
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(structured_formatter)
+            sinks.append(console_handler)
+        for handler in sinks:
+            # Only the listener thread uses the sinks: a native lock, not gevent's
+            handler.lock = _original('threading', 'RLock')()
+        return sinks
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until every record queued so far is written."""
+        marker = _Flush()
+        self.queue.put(marker)
+        return marker.done.acquire(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            category: {'passed': gate.passed, 'sampled_out': gate.sampled_out,
+                       'over_budget': gate.over_budget}
+            for category, gate in self.gates.items()
+        }
+
+    def stop(self):
+        _backends.discard(self)
+        self.listener.stop()
+        for sinks in self.listener.routes.values():
+            for sink in sinks:
+                sink.close()
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  Logger Setup
 # ═══════════════════════════════════════════════════════════════════
 
 structured_formatter = StructuredFormatter()
 
-file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
-file_handler.setFormatter(structured_formatter)
+log_backend = LogBackend()
+atexit.register(log_backend.stop)
 
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(structured_formatter)
+logger = log_backend.logger('server', 'GameServer', console=True)
 
-logger = logging.getLogger("GameServer")
-logger.setLevel(logging.INFO)
-logger.propagate = False
 
-# Prevent duplicate handlers on reload
-if not logger.handlers:
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+def get_category_logger(category: str) -> logging.Logger:
+    """Queue-backed logger writing to the category's file in CATEGORY_FILES."""
+    return log_backend.logger(category)
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -24,16 +24,14 @@ def run():
         port = int(os.environ.get("PORT", 3005))
         server = pywsgi.WSGIServer(('0.0.0.0', port), app, handler_class=WebSocketHandler)
         
-        # Start Heartbeat
-        from server.common import redis_client
-        from server.process_manager import Heartbeat
+        # Start Heartbeat (also renews this worker's room leases)
+        from server.room_leases import room_leases
         import gevent
-        
-        hb = Heartbeat("game_server", redis_client)
+
         def heartbeat_loop():
             while True:
-                hb.beat()
-                gevent.sleep(5)
+                room_leases.renew()
+                gevent.sleep(room_leases.heartbeat.ttl / 3)
         gevent.spawn(heartbeat_loop)
         
         server.serve_forever()
@@ -0,0 +1,294 @@
+"""
+server/metrics.py — Latency histograms for the hot paths.
+
+Timings are recorded into HDR-style histograms: exact below 64µs, then 32
+linear sub-buckets per power of two (~3% relative error) up to 60s, so
+record() is one index computation and a list increment, and quantiles
+stay accurate over six orders of magnitude.
+
+- ``@metrics.timed(name, **labels)`` for functions, ``metrics.timer(name,
+  **labels)`` as a context manager around a stage, ``metrics.observe()``
+  for durations measured anyway. Hot sites look their histogram up once
+  (``metrics.histogram()`` at import) and time with ``metrics.timing(h)``.
+- ``metrics.counter(name, **labels)`` returns a counter to inc(), looked up
+  once like a histogram.
+- BALOOT_METRICS=0 disables the layer: timed() returns the function
+  undecorated, timer() a shared no-op context manager and counter() a
+  shared no-op counter.
+- Processes that time work for another (bot decision workers) drain() their
+  histograms and counters and the owner merge()s them.
+- render() is the Prometheus text exposition served at /metrics.
+"""
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+METRICS_ENABLED = os.environ.get('BALOOT_METRICS', '1') != '0'
+
+SUB_BITS = 5
+SUB_BUCKETS = 1 << SUB_BITS
+MAX_MICROS = 60_000_000
+# Prometheus bucket bounds (seconds)
+EXPORT_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _index(micros):
+    if micros < 2 * SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (micros >> shift) - SUB_BUCKETS
+
+
+def _lowest(index):
+    """Smallest value (µs) counted in bucket ``index``."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+
+
+NUM_BUCKETS = _index(MAX_MICROS) + 1
+
+
+# ── Histogram ─────────────────────────────────────────────────────
+
+class LatencyHistogram:
+    """Counts of durations in log-linear microsecond buckets."""
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        self.reset()
+
+    def record(self, seconds):
+        micros = int(seconds * 1_000_000)
+        if micros < 2 * SUB_BUCKETS:
+            index = micros if micros > 0 else 0
+        else:
+            if micros > MAX_MICROS:
+                micros = MAX_MICROS
+            shift = micros.bit_length() - SUB_BITS - 1
+            index = (shift << SUB_BITS) + (micros >> shift)  # _index(), inlined
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q):
+        """Approximate ``q`` quantile in seconds (bucket midpoint)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, q * self.count)
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                low = _lowest(index)
+                high = _lowest(index + 1)
+                return (low + high - 1) / 2 / 1_000_000
+        return MAX_MICROS / 1_000_000
+
+    def cumulative(self, bounds=EXPORT_BOUNDS):
+        """Counts at or below each bound (seconds), Prometheus-style."""
+        result = []
+        seen, index = 0, 0
+        for bound in bounds:
+            last = _index(min(int(bound * 1_000_000), MAX_MICROS))
+            while index <= last:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def merge(self, counts, count, total):
+        for index, n in counts.items():
+            self.counts[index] += n
+        self.count += count
+        self.total += total
+
+    def reset(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+
+    def sparse(self):
+        return {i: n for i, n in enumerate(self.counts) if n}
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = nullcontext()
+
+
+class Counter:
+    """A monotonically increasing count (reset only by drain())."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class _NullCounter:
+    __slots__ = ()
+    value = 0
+
+    def inc(self, amount=1):
+        pass
+
+
+_NULL_COUNTER = _NullCounter()
+
+
+# ── Registry ──────────────────────────────────────────────────────
+
+class MetricsRegistry:
+    """Histograms and counters keyed by metric name and label set."""
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, **labels):
+        key = _key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def counter(self, name, **labels):
+        if not self.enabled:
+            return _NULL_COUNTER
+        key = _key(name, labels)
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(key, Counter())
+        return counter
+
+    def timer(self, name, **labels):
+        """Context manager timing its block."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, **labels))
+
+    def timing(self, histogram):
+        """timer() for a histogram looked up beforehand."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(histogram)
+
+    def timed(self, name, **labels):
+        """Decorator timing every call (the function itself when disabled)."""
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+            histogram = self.histogram(name, **labels)
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds, **labels):
+        if self.enabled:
+            self.histogram(name, **labels).record(seconds)
+
+    def drain(self):
+        """
+        Everything recorded since the last drain, picklable; resets.
+        Histograms drain to (counts, count, total), counters to their value.
+        """
+        drained = {}
+        for key, histogram in list(self._histograms.items()):
+            if histogram.count:
+                drained[key] = (histogram.sparse(), histogram.count, histogram.total)
+                histogram.reset()
+        for key, counter in list(self._counters.items()):
+            if counter.value:
+                drained[key] = counter.value
+                counter.value = 0
+        return drained
+
+    def merge(self, drained):
+        for (name, labels), value in drained.items():
+            if isinstance(value, tuple):
+                self.histogram(name, **dict(labels)).merge(*value)
+            else:
+                self.counter(name, **dict(labels)).inc(value)
+
+    def render(self, gauges=None):
+        """
+        Prometheus text format: every histogram and counter, then ``gauges``
+        (a dict of name → value or name → {label tuple: value}).
+        """
+        lines = []
+        families = {}
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            families.setdefault(name, []).append((labels, histogram))
+        for name, series in families.items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series:
+                for bound, n in zip(EXPORT_BOUNDS, histogram.cumulative()):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {n}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.total:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        counters = {}
+        for (name, labels), counter in sorted(self._counters.items()):
+            counters.setdefault(name, []).append((labels, counter))
+        for name, series in counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for labels, counter in series:
+                lines.append(f"{name}{_labels(labels)} {counter.value}")
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            series = value if isinstance(value, dict) else {(): value}
+            for labels, v in series.items():
+                lines.append(f"{name}{_labels(labels)} {v}")
+        return "\n".join(lines) + "\n"
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())) if len(labels) > 1 else tuple(labels.items()))
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Singleton Instance
+metrics = MetricsRegistry()
@@ -6,16 +6,22 @@ from redis import Redis
 
 logger = logging.getLogger(__name__)
 
+
+def heartbeat_key(service_name: str, instance: str) -> str:
+    return f"heartbeat:{service_name}:{instance}"
+
+
 class Heartbeat:
-    def __init__(self, service_name: str, redis_client: Redis, ttl: int = 10):
+    def __init__(self, service_name: str, redis_client: Redis, ttl: int = 10, instance: str = None):
         self.service_name = service_name
         self.redis = redis_client
         self.ttl = ttl
         self.pid = os.getpid()
-        self.key = f"heartbeat:{service_name}:{self.pid}"
-        
-    def beat(self, status: str = "running"):
-        """Send a heartbeat to Redis"""
+        self.instance = instance or str(self.pid)
+        self.key = heartbeat_key(service_name, self.instance)
+
+    def beat(self, status: str = "running") -> bool:
+        """Send a heartbeat to Redis; False if it did not get there"""
         try:
             self.redis.hset(self.key, mapping={
                 "pid": self.pid,
@@ -24,9 +30,11 @@ class Heartbeat:
                 "cpu_percent": psutil.Process(self.pid).cpu_percent()
             })
             self.redis.expire(self.key, self.ttl)
+            return True
         except Exception as e:
             # Don't crash on heartbeat failure, but log it
             logger.debug(f"Heartbeat beat failed: {e}")
+            return False
 
     def stop(self):
         """Clean up on exit"""
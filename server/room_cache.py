@@ -0,0 +1,227 @@
+"""
+server/room_cache.py — The rooms a worker keeps in memory, bounded by count and bytes.
+
+Every change to a room is already in its Redis snapshot (room_manager.py),
+so a room nobody has touched for a while can hibernate: its Game leaves
+the process and is rehydrated from the snapshot on its next access. This
+cache holds the live Games in least-recently-used order and decides:
+- which rooms hibernate (victims): idle for IDLE_SECONDS, plus the least
+  recently used while over MAX_ENTRIES rooms or the memory budget, never
+  one used in the last MIN_IDLE_SECONDS (a bot loop or timer may hold it);
+- whether a new room is admitted (admits): memory headroom for a typical
+  room, measured against the budget and, if set, the process RSS limit.
+Room sizes are estimates of the Game object graph (estimate_size, about a
+millisecond each), taken by sweeps a few rooms at a time (refresh_sizes),
+never on get_game's path; a room not measured yet counts as typical.
+"""
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+
+try:
+    import psutil
+except ImportError:  # RSS limit unavailable: the estimate budget alone decides
+    psutil = None
+
+MB = 1024 * 1024
+MAX_ENTRIES = int(os.environ.get('BALOOT_ROOM_CACHE_SIZE', '500'))
+MEMORY_BUDGET = int(os.environ.get('BALOOT_ROOM_MEMORY_MB', '256')) * MB
+MAX_RSS = int(os.environ.get('BALOOT_MAX_RSS_MB', '0')) * MB  # 0 = no process limit
+IDLE_SECONDS = float(os.environ.get('BALOOT_ROOM_IDLE_SECONDS', '600'))
+MIN_IDLE_SECONDS = float(os.environ.get('BALOOT_ROOM_MIN_IDLE_SECONDS', '30'))
+RESIZE_SECONDS = 60.0   # Age after which a room's size is re-estimated
+RESIZE_BATCH = 16       # Re-estimates per sweep (about a millisecond each)
+DEFAULT_ROOM_BYTES = 96 * 1024  # Until a room has been measured
+
+_CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+_OWNED_MODULES = ('game_engine.',)
+
+
+def estimate_size(game):
+    """
+    Bytes held by a Game: sys.getsizeof over the containers and game_engine
+    objects reachable from it. Anything else (the deadline queue among its
+    observers, modules, classes) is counted shallow and not followed, so
+    process-wide objects are not charged to every room.
+    """
+    seen = set()
+    stack = [game]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        cls = type(obj)
+        if cls is dict:
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, _CONTAINERS):
+            stack.extend(obj)
+        elif cls.__module__.startswith(_OWNED_MODULES):
+            attrs = getattr(obj, '__dict__', None)
+            if attrs is not None:
+                stack.append(attrs)
+            for slot in getattr(cls, '__slots__', ()):
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+
+class _Entry:
+    __slots__ = ('game', 'last_used', 'size', 'sized_at')
+
+    def __init__(self, game, now):
+        self.game = game
+        self.last_used = now
+        self.size = None  # Not measured yet
+        self.sized_at = float('-inf')
+
+
+class RoomCache:
+    """room_id -> live Game, least recently used first (the dict-like part RoomManager uses)."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, budget=MEMORY_BUDGET, max_rss=MAX_RSS,
+                 idle_seconds=IDLE_SECONDS, min_idle_seconds=MIN_IDLE_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.budget = budget
+        self.max_rss = max_rss
+        self.idle_seconds = idle_seconds
+        self.min_idle_seconds = min_idle_seconds
+        self.clock = clock
+        self.hibernated = 0   # Counted by RoomManager
+        self.rehydrated = 0
+        self._entries = OrderedDict()
+
+    # ── Mapping ──────────────────────────────────────────────────────
+
+    def get(self, room_id, default=None):
+        """The room's Game, marking it as just used."""
+        entry = self._entries.get(room_id)
+        if entry is None:
+            return default
+        entry.last_used = self.clock()
+        self._entries.move_to_end(room_id)
+        return entry.game
+
+    def peek(self, room_id):
+        entry = self._entries.get(room_id)
+        return entry.game if entry is not None else None
+
+    def __getitem__(self, room_id):
+        game = self.get(room_id, self)
+        if game is self:
+            raise KeyError(room_id)
+        return game
+
+    def __setitem__(self, room_id, game):
+        entry = self._entries.get(room_id)
+        if entry is not None and entry.game is game:
+            self.get(room_id)
+            return
+        self._entries[room_id] = _Entry(game, self.clock())
+        self._entries.move_to_end(room_id)
+
+    def __delitem__(self, room_id):
+        del self._entries[room_id]
+
+    def pop(self, room_id, default=None):
+        entry = self._entries.pop(room_id, None)
+        return entry.game if entry is not None else default
+
+    def __contains__(self, room_id):
+        return room_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def items(self):
+        return [(room_id, entry.game) for room_id, entry in self._entries.items()]
+
+    def clear(self):
+        self._entries.clear()
+
+    # ── Memory ───────────────────────────────────────────────────────
+
+    def refresh_sizes(self, batch=RESIZE_BATCH):
+        """Estimates up to ``batch`` rooms never measured or measured over RESIZE_SECONDS ago."""
+        now = self.clock()
+        stale = sorted((e for e in self._entries.values() if now - e.sized_at >= RESIZE_SECONDS),
+                       key=lambda e: e.sized_at)
+        for entry in stale[:batch]:
+            entry.size = estimate_size(entry.game)
+            entry.sized_at = now
+
+    def size_of(self, room_id):
+        entry = self._entries.get(room_id)
+        if entry is None:
+            return 0
+        return entry.size if entry.size is not None else self.typical_size()
+
+    def typical_size(self):
+        sizes = [e.size for e in self._entries.values() if e.size is not None]
+        return sum(sizes) // len(sizes) if sizes else DEFAULT_ROOM_BYTES
+
+    def total_bytes(self):
+        typical = self.typical_size()
+        return sum(e.size if e.size is not None else typical for e in self._entries.values())
+
+    def headroom(self):
+        """Bytes a new room may still use: the budget, and the RSS limit when one is set."""
+        room = self.budget - self.total_bytes()
+        if self.max_rss and psutil is not None:
+            room = min(room, self.max_rss - psutil.Process().memory_info().rss)
+        return room
+
+    def admits(self):
+        """Is there room for one more live room?"""
+        return len(self._entries) < self.max_entries and self.headroom() >= self.typical_size()
+
+    def victims(self, incoming=0):
+        """
+        Rooms to hibernate, least recently used first: the idle ones, then
+        enough others (used at least MIN_IDLE_SECONDS ago) to get back under
+        the entry and memory limits with ``incoming`` new rooms added.
+        """
+        now = self.clock()
+        typical = self.typical_size()
+        count = len(self._entries) + incoming
+        used = self.total_bytes() + incoming * typical
+        chosen = []
+        for room_id, entry in self._entries.items():
+            idle = now - entry.last_used
+            over = count > self.max_entries or used > self.budget
+            if idle >= self.idle_seconds or (over and idle >= self.min_idle_seconds):
+                chosen.append(room_id)
+                count -= 1
+                used -= entry.size if entry.size is not None else typical
+            else:
+                break  # LRU order: everything after this was used more recently
+        return chosen
+
+    def report(self):
+        """
+        Per-room estimates, largest first, plus the totals. Rooms are not
+        named: a room id is all join_room needs.
+        """
+        now = self.clock()
+        rooms = [{'bytes': self.size_of(room_id),
+                  'idleSeconds': round(now - entry.last_used, 1)}
+                 for room_id, entry in self._entries.items()]
+        rooms.sort(key=lambda r: r['bytes'], reverse=True)
+        return {**self.stats(), 'perRoom': rooms}
+
+    def stats(self):
+        return {
+            'rooms': len(self._entries),
+            'bytes': self.total_bytes(),
+            'budget_bytes': self.budget,
+            'headroom_bytes': self.headroom(),
+            'hibernated': self.hibernated,
+            'rehydrated': self.rehydrated,
+        }
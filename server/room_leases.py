@@ -0,0 +1,260 @@
+"""
+server/room_leases.py — Which game-server worker owns which room.
+
+With several gevent workers behind nginx (BALOOT_CLUSTER=1), each room is
+owned by exactly one of them and only the owner runs its events:
+- lease: room:owner:{room_id} = the owner's worker id. The lease has no
+  heartbeat of its own: it holds while the owner's process_manager.Heartbeat
+  key is alive, so one beat renews every room a worker owns. A room whose
+  owner's heartbeat expired is claimed by the next worker that needs it
+  (WATCH/MULTI), which reloads the game from its Redis snapshot.
+- routing: an event for a room owned elsewhere is pushed to the owner's
+  inbox list (room:inbox:{worker}); the owner runs the same handler and
+  pushes the ack to a one-shot reply key the sender waits on. Emits and
+  enter_room reach clients on any worker through socketio.RedisManager.
+Without BALOOT_CLUSTER every room is local and nothing here touches Redis.
+"""
+import functools
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+
+from server.common import redis_client
+from server.process_manager import Heartbeat, heartbeat_key
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # No redis client: leases are never shared
+    class WatchError(Exception): pass
+
+logger = logging.getLogger(__name__)
+
+CLUSTER = os.environ.get('BALOOT_CLUSTER', '0') == '1'
+WORKER_ID = os.environ.get('BALOOT_WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+SERVICE_NAME = 'game_server'
+HEARTBEAT_TTL = int(os.environ.get('BALOOT_HEARTBEAT_TTL', '10'))  # Seconds a silent owner keeps its rooms
+LEASE_TTL = 3600  # Idle lifetime, as room_manager.GAME_TTL; save_game refreshes both
+FORWARD_TIMEOUT = float(os.environ.get('BALOOT_FORWARD_TIMEOUT', '5'))
+REPLY_TTL = 30
+MAX_ROOM_ID_LEN = 64
+
+
+def lease_key(room_id):
+    return f"room:owner:{room_id}"
+
+
+def inbox_key(worker_id):
+    return f"room:inbox:{worker_id}"
+
+
+class RoomLeases:
+    """This worker's room leases, renewed by its heartbeat."""
+
+    def __init__(self, heartbeat, shared=CLUSTER, clock=time.time):
+        self.heartbeat = heartbeat
+        self.redis = heartbeat.redis if shared else None
+        self.worker_id = heartbeat.instance
+        self.clock = clock
+        self.on_takeover = []  # callback(room_id, previous_owner) after claiming a dead worker's room
+        self._owned = set()
+        self._fresh_until = 0.0  # Our heartbeat key exists at least until then
+
+    @property
+    def shared(self):
+        return self.redis is not None
+
+    def renew(self):
+        """
+        One heartbeat. After a gap longer than the TTL our key may have
+        expired and another worker taken our rooms: owned rooms are checked
+        against Redis again on their next event.
+        """
+        now = self.clock()
+        if now >= self._fresh_until:
+            self._owned.clear()
+        if self.heartbeat.beat():
+            self._fresh_until = now + self.heartbeat.ttl
+
+    def owns(self, room_id):
+        return not self.shared or (room_id in self._owned and self.clock() < self._fresh_until)
+
+    def owner(self, room_id):
+        """The room's leaseholder, dead or alive, or None."""
+        if not self.shared:
+            return self.worker_id
+        return self.redis.get(lease_key(room_id))
+
+    def acquire(self, room_id):
+        """
+        The worker that runs the room's events: its live owner, else this
+        worker, claiming the lease first (and running on_takeover when the
+        previous owner's heartbeat had expired).
+        """
+        if self.owns(room_id):
+            return self.worker_id
+        key = lease_key(room_id)
+        with self.redis.pipeline() as pipe:
+            pipe.watch(key)
+            owner = pipe.get(key)
+            if owner != self.worker_id:
+                if owner is not None and pipe.exists(heartbeat_key(SERVICE_NAME, owner)):
+                    return owner
+                pipe.multi()
+                pipe.set(key, self.worker_id, ex=LEASE_TTL)
+                try:
+                    pipe.execute()
+                except WatchError:
+                    return self.acquire(room_id)  # Another worker moved first: look again
+        self._owned.add(room_id)
+        if owner is not None and owner != self.worker_id:
+            logger.warning(f"[LEASES] Took over room {room_id} from {owner} (heartbeat expired)")
+            for callback in self.on_takeover:
+                callback(room_id, owner)
+        return self.worker_id
+
+    def release(self, room_id):
+        """Drops the lease if it is ours (room removed)."""
+        self._owned.discard(room_id)
+        if not self.shared:
+            return
+        key = lease_key(room_id)
+        with self.redis.pipeline() as pipe:
+            pipe.watch(key)
+            if pipe.get(key) != self.worker_id:
+                return
+            pipe.multi()
+            pipe.delete(key)
+            try:
+                pipe.execute()
+            except WatchError:
+                pass  # Moved on: not ours to delete
+
+
+def _spawn_thread(fn, *args):
+    """A greenlet under gevent's monkey patching, a thread otherwise."""
+    threading.Thread(target=fn, args=args, daemon=True).start()
+
+
+class RoomRouter:
+    """Runs socket events for a room on the worker that owns it."""
+
+    def __init__(self, leases, timeout=FORWARD_TIMEOUT, spawn=_spawn_thread):
+        self.leases = leases
+        self.timeout = timeout
+        self.spawn = spawn
+        self.users = {}  # sid -> auth data (socket_handler.connected_users), sent along with the event
+        self._handlers = {}
+        self._on_failure = {}  # event -> callback(sid, data) when a forwarded event was not handled
+
+    def routed(self, fn):
+        """Decorator for a handler(sid, data) whose data names the room in 'roomId'."""
+        event = fn.__name__
+        self._handlers[event] = fn
+
+        @functools.wraps(fn)
+        def handler(sid, data):
+            return self.dispatch(event, sid, data)
+        return handler
+
+    def register(self, event, fn, on_failure=None):
+        """
+        ``on_failure(sid, data)`` runs on the receiving worker when a forwarded
+        event fails or the room moved on: the sender may not be waiting.
+        """
+        self._handlers[event] = fn
+        if on_failure is not None:
+            self._on_failure[event] = on_failure
+
+    def dispatch(self, event, sid, data, wait=True):
+        """Runs the event here if this worker owns (or just claimed) the room, else on its owner."""
+        fn = self._handlers[event]
+        room_id = data.get('roomId') if isinstance(data, dict) else None
+        if not self.leases.shared or not isinstance(room_id, str) or not 0 < len(room_id) <= MAX_ROOM_ID_LEN:
+            return fn(sid, data)  # Single worker, or an invalid request the handler rejects
+        try:
+            owner = self.leases.acquire(room_id)
+        except Exception as e:
+            logger.error(f"[LEASES] Lease lookup failed for {room_id}, handling locally: {e}")
+            return fn(sid, data)
+        if owner == self.leases.worker_id:
+            return fn(sid, data)
+        return self.forward(owner, event, sid, data, wait)
+
+    # ── Forwarding ───────────────────────────────────────────────────
+
+    def forward(self, owner, event, sid, data, wait=True):
+        """Pushes the event to the owner's inbox; returns the owner's ack (None if not waiting)."""
+        reply = f"room:reply:{uuid.uuid4().hex}" if wait else None
+        message = json.dumps({'event': event, 'sid': sid, 'data': data,
+                              'user': self.users.get(sid), 'reply': reply})
+        redis = self.leases.redis
+        with redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(inbox_key(owner), message)
+            pipe.expire(inbox_key(owner), REPLY_TTL)
+            pipe.execute()
+        if reply is None:
+            return None
+        answer = redis.blpop([reply], timeout=math.ceil(self.timeout))
+        if answer is None:
+            logger.error(f"[LEASES] {owner} did not answer '{event}' for room {data.get('roomId')}")
+            return {'success': False, 'error': 'Room server not responding, please retry'}
+        return json.loads(answer[1])
+
+    def handle(self, raw):
+        """Runs one forwarded event and pushes its ack to the sender."""
+        message = json.loads(raw)
+        sid, data = message['sid'], message['data']
+        user = message.get('user')
+        borrowed = user is not None and sid not in self.users
+        if borrowed:
+            self.users[sid] = user
+        failed = True
+        try:
+            if self.leases.acquire(data['roomId']) != self.leases.worker_id:
+                result = {'success': False, 'error': 'Room moved, please retry'}  # Forwarded once, never twice
+            else:
+                result = self._handlers[message['event']](sid, data)
+                failed = False
+        except Exception as e:
+            logger.exception(f"[LEASES] Forwarded '{message.get('event')}' failed: {e}")
+            result = {'success': False, 'error': 'Internal error'}
+        finally:
+            if borrowed:
+                self.users.pop(sid, None)
+        on_failure = self._on_failure.get(message['event'])
+        if failed and on_failure is not None:
+            try:
+                on_failure(sid, data)
+            except Exception as e:
+                logger.error(f"[LEASES] Failure hook for '{message['event']}' failed: {e}")
+        if message.get('reply'):
+            with self.leases.redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(message['reply'], json.dumps(result))
+                pipe.expire(message['reply'], REPLY_TTL)
+                pipe.execute()
+
+    def serve_once(self, timeout=1):
+        item = self.leases.redis.blpop([inbox_key(self.leases.worker_id)], timeout=timeout)
+        if item is not None:
+            self.spawn(self.handle, item[1])
+
+    def serve_forever(self):
+        """Background task: runs the events other workers forward to this one."""
+        logger.info(f"[LEASES] Worker {self.leases.worker_id} serving its room inbox")
+        while True:
+            try:
+                self.serve_once()
+            except Exception as e:
+                logger.error(f"[LEASES] Inbox read failed: {e}")
+                time.sleep(1.0)
+
+
+# Global instances
+room_leases = RoomLeases(Heartbeat(SERVICE_NAME, redis_client, ttl=HEARTBEAT_TTL,
+                                   instance=WORKER_ID if CLUSTER else None))
+room_router = RoomRouter(room_leases)
@@ -1,21 +1,60 @@
 """
-server/room_manager.py — Game persistence via Redis using JSON serialization.
+server/room_manager.py — Game persistence via Redis.
 
-Single source of truth for game state storage. Uses Game.to_json() / Game.from_json()
-instead of pickle for security and compatibility.
+Single source of truth for game state storage. A game is a Redis hash
+game:{room_id} of binary sections (game_serializer.serialize_sections, no
+pickle) plus a version field 'v':
+- save_game writes only the sections whose bytes changed since this process
+  last synced the key, and bumps 'v' in the same transaction. When another
+  process wrote in between, our changed sections are merged over theirs if
+  they touched different sections; otherwise the save is aborted (never a
+  blind overwrite) and the next get_game reloads their state. With leases,
+  the transaction also WATCHes room:owner:{id} and a worker that no longer
+  holds it does not write (nor extend the lease);
+- get_game reads 'v' alone and serves the in-process object when it matches,
+  deserializing only when another process wrote in between.
+Legacy JSON strings (Game.to_json) under the same key are still read.
+
+With several workers (server/room_leases.py) each room has one owner: a
+worker only serves its in-process copy of a room it owns, the sid/email
+session maps live in Redis hashes every worker sees, and a room taken over
+from a dead worker is reloaded from its snapshot.
+
+Live games sit in a RoomCache (server/room_cache.py): rooms left idle, or
+the least recently used when the worker is over its room count or memory
+budget, hibernate (only the Redis snapshot remains) and are rehydrated by
+the next get_game. New rooms are admitted on memory headroom.
 """
 from game_engine.logic.game import Game
+from game_engine.logic.game_serializer import serialize_sections, deserialize_sections
 import json
+import time
 import uuid
 import logging
 import os
+from server.broadcast import drop_stream
 from server.common import redis_client, redis_store
-from server.exceptions import RedisPersistenceError, SerializationError
+from server.deadlines import deadlines
+from server.exceptions import RedisPersistenceError, SerializationError, StaleWriteError
 from server.logging_utils import GameLoggerAdapter
+from server.metrics import metrics
+from server.room_cache import RoomCache
+from server.room_leases import lease_key, room_leases
+
+try:
+    from redis.exceptions import ResponseError, WatchError
+except ImportError:  # No redis client: redis_store is None and these never fire
+    class ResponseError(Exception): pass
+    class WatchError(Exception): pass
 
 logger = logging.getLogger(__name__)
 
-MAX_ROOMS = 500  # Maximum concurrent rooms to prevent memory exhaustion
+GAME_TTL = 3600
+VERSION_FIELD = 'v'
+SAVE_ATTEMPTS = 3  # WATCH retries before a save that keeps losing the race is aborted
+SID_MAP_KEY = 'rooms:by_sid'      # Hash: SID → room_id (shared between workers)
+EMAIL_MAP_KEY = 'rooms:by_email'  # Hash: email → JSON {room_id, seat_index, timestamp}
+_LOCAL = object()  # The session maps are this process's dicts (single worker, or Redis failed)
 
 
 class RoomManager:
@@ -24,42 +63,66 @@ class RoomManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(RoomManager, cls).__new__(cls)
-            cls._instance._local_cache = {}
+            cls._instance._local_cache = RoomCache()  # room_id → live Game, LRU
+            cls._instance._versions: dict[str, int] = {}  # room_id → Redis 'v' of the cached game
+            cls._instance._synced: dict[str, dict] = {}   # room_id → section bytes as last read/written
             cls._instance._sid_to_room: dict[str, str] = {}  # SID → room_id
             cls._instance._email_to_room: dict[str, dict] = {}  # email → {room_id, seat_index, timestamp}
         return cls._instance
 
     def create_room(self):
-        # Enforce max rooms limit
-        active_count = len(self._local_cache)
-        if active_count >= MAX_ROOMS:
-            logger.warning(f"Max rooms limit reached ({MAX_ROOMS}). Denying create_room.")
+        # Admission: hibernate what can go, then require memory headroom for one more room
+        self.hibernate_idle(incoming=1)
+        if not self._local_cache.admits():
+            stats = self._local_cache.stats()
+            logger.warning(f"No headroom for a new room ({stats['rooms']} live, {stats['bytes'] // 1024} KB "
+                           f"of {stats['budget_bytes'] // 1024} KB). Denying create_room.")
             return None
 
         room_id = str(uuid.uuid4())[:8]
+        try:
+            room_leases.acquire(room_id)
+        except Exception as e:
+            logger.error(f"Could not lease new room {room_id}: {e}")
         game = Game(room_id)
         self.save_game(game)
         rlog = GameLoggerAdapter(logger, room_id=room_id)
         rlog.info("Created room (Persisted to Redis)")
         return room_id
 
+    # ── Session maps (Redis hashes when workers share rooms) ─────────
+
+    def _shared_map(self, op, key, *args):
+        """Runs a hash command on the shared maps; _LOCAL when not shared or Redis failed."""
+        if not room_leases.shared:
+            return _LOCAL
+        try:
+            return getattr(room_leases.redis, op)(key, *args)
+        except Exception as e:
+            logger.error(f"Shared session map {op} failed, using this worker's copy: {e}")
+            return _LOCAL
+
     def track_player(self, sid: str, room_id: str):
         """Track which room a player (SID) belongs to for disconnect cleanup."""
-        self._sid_to_room[sid] = room_id
+        if self._shared_map('hset', SID_MAP_KEY, sid, room_id) is _LOCAL:
+            self._sid_to_room[sid] = room_id
 
     def track_player_email(self, email: str, room_id: str, seat_index: int):
         """Track authenticated player's active game for session recovery."""
-        import time as _time
-        self._email_to_room[email] = {
+        session = {
             'room_id': room_id,
             'seat_index': seat_index,
-            'timestamp': _time.time(),
+            'timestamp': time.time(),
         }
+        if self._shared_map('hset', EMAIL_MAP_KEY, email, json.dumps(session)) is _LOCAL:
+            self._email_to_room[email] = session
         logger.info(f"Session tracked: {email} → room {room_id} seat {seat_index}")
 
     def untrack_player_email(self, email: str):
         """Remove email-to-room mapping (on game end or explicit leave)."""
-        removed = self._email_to_room.pop(email, None)
+        removed = self._shared_map('hdel', EMAIL_MAP_KEY, email)
+        if removed is _LOCAL:
+            removed = self._email_to_room.pop(email, None)
         if removed:
             logger.info(f"Session untracked: {email}")
 
@@ -69,24 +132,30 @@ class RoomManager:
         Returns dict with room_id, seat_index, timestamp if the game still
         exists in Redis/cache and hasn't expired.
         """
-        session = self._email_to_room.get(email)
+        shared = self._shared_map('hget', EMAIL_MAP_KEY, email)
+        session = self._email_to_room.get(email) if shared is _LOCAL else shared and json.loads(shared)
         if not session:
             return None
         # Verify the game still exists
         game = self.get_game(session['room_id'])
         if not game:
-            self._email_to_room.pop(email, None)
+            self.untrack_player_email(email)
             return None
         return session
 
     def untrack_player(self, sid: str):
         """Remove player tracking on disconnect."""
-        self._sid_to_room.pop(sid, None)
+        if self._shared_map('hdel', SID_MAP_KEY, sid) is _LOCAL:
+            self._sid_to_room.pop(sid, None)
 
     def get_room_for_sid(self, sid: str):
         """Return the room_id a given SID is in, or None."""
-        return self._sid_to_room.get(sid)
+        room_id = self._shared_map('hget', SID_MAP_KEY, sid)
+        return self._sid_to_room.get(sid) if room_id is _LOCAL else room_id
+
+    # ── Games ────────────────────────────────────────────────────────
 
+    @metrics.timed('baloot_room_seconds', op='get_game')
     def get_game(self, room_id):
         if not room_id: return None
         rlog = GameLoggerAdapter(logger, room_id=room_id)
@@ -94,45 +163,77 @@ class RoomManager:
         # 1. Try Redis (Primary Truth)
         try:
             if redis_store:
-                data = redis_store.get(f"game:{room_id}")
-                if data:
-                    game_dict = json.loads(data)
-                    g = Game.from_json(game_dict)
-                    if self._instance: 
-                        self._instance._local_cache[room_id] = g
+                key = f"game:{room_id}"
+                try:
+                    version = redis_store.hget(key, VERSION_FIELD)
+                except ResponseError:
+                    return self._load_legacy(room_id, redis_store.get(key))
+                if version is not None:
+                    version = int(version)
+                    local = self._local_cache.get(room_id)
+                    if local is not None and self._versions.get(room_id) == version:
+                        return local  # Nobody wrote since we did: no deserialization
+                    sections = {k.decode() if isinstance(k, bytes) else k: v
+                                for k, v in redis_store.hgetall(key).items()}
+                    version = int(sections.pop(VERSION_FIELD, version))
+                    g = deserialize_sections(sections)
+                    if local is None:
+                        self._local_cache.rehydrated += 1
+                    self._remember(g, version, sections)
                     return g
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
             rlog.error(f"Deserialization Error: {e}")
         except ConnectionError as e:
             rlog.error(f"Redis Connection Error: {e}")
         except Exception as e:
             rlog.exception(f"Unexpected Redis GET Error: {e}")
         
-        # 2. Fallback to Local Memory
+        # 2. Fallback to Local Memory (only ours: another worker's copy may have moved on)
         local = self._local_cache.get(room_id)
-        if local:
+        if local and room_leases.owns(room_id):
              rlog.warning("Serving Local Stale Game (Redis Miss)")
-        return local
+             return local
+        return None
+
+    def _load_legacy(self, room_id, data):
+        """Games saved as a single JSON string before the sectioned format."""
+        if not data:
+            return None
+        g = Game.from_json(json.loads(data))
+        self._local_cache[room_id] = g
+        self._versions.pop(room_id, None)
+        self._synced.pop(room_id, None)
+        return g
 
+    def _remember(self, game, version, sections):
+        self._local_cache[game.room_id] = game
+        self._versions[game.room_id] = version
+        self._synced[game.room_id] = sections
+
+    @metrics.timed('baloot_room_seconds', op='save_game')
     def save_game(self, game):
         if not game: return
         rlog = GameLoggerAdapter(logger, room_id=game.room_id)
         try:
             if redis_store:
-                def _json_fallback(obj):
-                    """Safety net for objects that slip through to_json()."""
-                    if hasattr(obj, 'to_dict'):
-                        return obj.to_dict()
-                    if hasattr(obj, 'value'):  # Enum
-                        return obj.value
-                    raise TypeError(f"Unable to serialize: {type(obj)}")
-                game_json = json.dumps(game.to_json(), default=_json_fallback)
-                redis_store.setex(f"game:{game.room_id}", 3600, game_json)
-                # Update local cache ONLY after Redis write succeeds
-                self._local_cache[game.room_id] = game
+                sections = serialize_sections(game)
+                try:
+                    version, merged = self._write_sections(game.room_id, sections)
+                except StaleWriteError as e:
+                    rlog.error(str(e))
+                    self.forget(game.room_id)  # Not the latest copy: the next get_game reloads
+                    return
+                if merged:
+                    # Redis now holds their sections too: reload rather than serve this copy
+                    self.forget(game.room_id)
+                else:
+                    # Update local cache ONLY after Redis write succeeds
+                    self._remember(game, version, sections)
+                deadlines.attach(game)
             else:
                 # No Redis — local cache is the only storage
                 self._local_cache[game.room_id] = game
+                deadlines.attach(game)
                 rlog.info("Redis SAVE -> SKIPPED (No RedisStore)")
         except (TypeError, ValueError) as e:
             rlog.error(f"Serialization Error: {e}")
@@ -140,13 +241,132 @@ class RoomManager:
             rlog.error(f"Redis Connection Error saving: {e}")
             # Still update local cache as fallback when Redis is down
             self._local_cache[game.room_id] = game
+            self._versions.pop(game.room_id, None)
+            deadlines.attach(game)
         except Exception as e:
             rlog.exception(f"Unexpected error saving game: {e}")
 
+    def _write_sections(self, room_id, sections):
+        """
+        HSETs the sections that differ from what this process last synced
+        (all of them for a new or legacy key), bumping the version in the
+        same WATCHed transaction. Returns (new version, merged): merged when
+        another writer got in first and our sections went over theirs.
+        Raises StaleWriteError rather than overwrite a section they changed,
+        or when this worker no longer holds the room's lease.
+        """
+        key = f"game:{room_id}"
+        watched = [key, lease_key(room_id)] if room_leases.shared else [key]
+        for _ in range(SAVE_ATTEMPTS):
+            with redis_store.pipeline() as pipe:
+                pipe.watch(*watched)
+                if room_leases.shared:
+                    owner = pipe.get(lease_key(room_id))
+                    owner = owner.decode() if isinstance(owner, bytes) else owner
+                    if owner != room_leases.worker_id:
+                        raise StaleWriteError(room_id, f"lease held by {owner or 'nobody'}, "
+                                                       f"not this worker ({room_leases.worker_id})")
+                try:
+                    current = pipe.hget(key, VERSION_FIELD)
+                except ResponseError:
+                    pipe.unwatch()
+                    redis_store.delete(key)  # Legacy JSON string
+                    pipe.watch(*watched)
+                    current = None
+                synced = self._synced.get(room_id)
+                merged = False
+                if current is None:
+                    changed = sections
+                elif synced and int(current) == self._versions.get(room_id):
+                    changed = {f: b for f, b in sections.items() if synced.get(f) != b}
+                else:
+                    changed = self._merge(pipe, key, room_id, sections, synced)
+                    merged = True
+                pipe.multi()
+                if changed:
+                    pipe.hset(key, mapping=changed)
+                    pipe.hincrby(key, VERSION_FIELD, 1)
+                pipe.expire(key, GAME_TTL)
+                if room_leases.shared:
+                    pipe.expire(lease_key(room_id), GAME_TTL)  # Ours (checked above): lives as long as the game
+                try:
+                    results = pipe.execute()
+                except WatchError:
+                    continue  # Another writer in between: compare again
+                return (int(results[1]) if changed else int(current)), merged
+        raise StaleWriteError(room_id, f"key kept changing over {SAVE_ATTEMPTS} attempts")
+
+    @staticmethod
+    def _merge(pipe, key, room_id, sections, synced):
+        """
+        Another process wrote since we synced: our changed sections, if
+        none of them was also changed by the other writer.
+        """
+        if not synced:
+            raise StaleWriteError(room_id, "written elsewhere and no synced copy to merge from")
+        mine = {f: b for f, b in sections.items() if synced.get(f) != b}
+        if not mine:
+            return mine
+        theirs = dict(zip(mine, pipe.hmget(key, list(mine))))
+        conflicts = sorted(f for f, b in mine.items() if theirs[f] not in (synced.get(f), b))
+        if conflicts:
+            raise StaleWriteError(room_id, f"sections {', '.join(conflicts)} changed by another writer")
+        return mine
+
+    def forget(self, room_id):
+        """Drops this process's copy of a room; the next get_game reads the snapshot."""
+        self._local_cache.pop(room_id, None)
+        self._versions.pop(room_id, None)
+        self._synced.pop(room_id, None)
+
+    # ── Hibernation ──────────────────────────────────────────────────
+
+    def hibernate(self, room_id):
+        """
+        Drops a room's live Game and keeps only its Redis snapshot; the next
+        get_game rehydrates it. Changes not in the snapshot yet are saved
+        first, and a room whose snapshot cannot be brought up to date stays.
+        """
+        game = self._local_cache.peek(room_id)
+        if game is None or not redis_store:
+            return False
+        if self._synced.get(room_id) != serialize_sections(game):
+            self.save_game(game)
+            if self._synced.get(room_id) != serialize_sections(game):
+                return False  # Save failed: this copy is the only up-to-date one
+        self.forget(room_id)
+        drop_stream(room_id)
+        self._local_cache.hibernated += 1
+        return True
+
+    def hibernate_idle(self, incoming=0):
+        """
+        Hibernates idle rooms, and the least recently used while over the
+        cache's limits with ``incoming`` rooms to come. Returns how many went.
+        """
+        if not redis_store:
+            return 0  # The live Game is the only copy
+        self._local_cache.refresh_sizes()
+        return sum(self.hibernate(room_id) for room_id in self._local_cache.victims(incoming))
+
+    def memory_stats(self):
+        """Live room count, estimated bytes, budget/headroom, hibernation counters."""
+        return self._local_cache.stats()
+
+    def memory_report(self):
+        """memory_stats() plus every live room's estimated bytes."""
+        return self._local_cache.report()
+
+    def _taken_over(self, room_id, previous_owner):
+        """Failover: reload from the snapshot, and let the timer pick up whatever the room waits for."""
+        self.forget(room_id)
+        deadlines.set(room_id, time.time())
+
     def remove_room(self, room_id):
-        if room_id in self._local_cache:
-            del self._local_cache[room_id]
-            
+        self.forget(room_id)
+        deadlines.cancel(room_id)
+        room_leases.release(room_id)
+
         if redis_store:
             redis_store.delete(f"game:{room_id}")
             return True
@@ -176,7 +396,7 @@ class RoomManager:
     @property
     def games(self):
         all_games = {}
-        if not redis_store: return self._local_cache
+        if not redis_store: return dict(self._local_cache.items())
 
         try:
             # Use SCAN instead of KEYS to avoid blocking Redis
@@ -192,13 +412,14 @@ class RoomManager:
             return all_games
         except ConnectionError as e:
              logger.error(f"Error listing Redis games (connection): {e}")
-             return self._local_cache
+             return dict(self._local_cache.items())
         except Exception as e:
              if "111 connecting to" in str(e) or "Connection refused" in str(e):
                  logger.error(f"Redis unavailable for listing games: {e}")
              else:
                  logger.error(f"Error listing Redis games: {e}")
-             return self._local_cache
+             return dict(self._local_cache.items())
 
 # Global instance
 room_manager = RoomManager()
+room_leases.on_takeover.append(room_manager._taken_over)
@@ -0,0 +1,52 @@
+"""
+Metrics routes: latency histograms and pool/logging/room counters in
+Prometheus text format, and per-room memory estimates as JSON (signed-in
+users only; rooms are reported by size, never by id).
+"""
+from py4web import action, response
+from server.metrics import metrics
+from server.routes.auth import token_required
+
+
+def collect_gauges():
+    """Counters owned by other subsystems, as render() gauges."""
+    from server.bot_workers import decision_pool
+    from server.logging_utils import log_backend
+    from server.room_manager import room_manager
+
+    pool = decision_pool.stats()
+    gauges = {f"baloot_bot_pool_{key}": value for key, value in pool.items()}
+    log_stats = log_backend.stats()
+    for field in ('passed', 'sampled_out', 'over_budget'):
+        gauges[f"baloot_log_records_{field}"] = {
+            (('category', category),): counts[field] for category, counts in log_stats.items()
+        }
+    rooms = room_manager.memory_stats()
+    gauges['baloot_live_rooms'] = rooms['rooms']
+    gauges['baloot_live_room_bytes'] = rooms['bytes']
+    gauges['baloot_room_budget_bytes'] = rooms['budget_bytes']
+    gauges['baloot_room_headroom_bytes'] = rooms['headroom_bytes']
+    gauges['baloot_rooms_hibernated_total'] = rooms['hibernated']
+    gauges['baloot_rooms_rehydrated_total'] = rooms['rehydrated']
+    return gauges
+
+
+@action('metrics', method=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint."""
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return metrics.render(collect_gauges())
+
+
+@action('metrics/rooms', method=['GET'])
+@token_required
+def get_room_memory():
+    """Estimated memory of each live room, largest first, with the cache totals."""
+    from server.room_manager import room_manager
+    return room_manager.memory_report()
+
+
+def bind_metrics(safe_mount):
+    """Bind the metrics routes to the app."""
+    safe_mount('/metrics', 'GET', get_metrics)
+    safe_mount('/metrics/rooms', 'GET', get_room_memory)
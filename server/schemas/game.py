@@ -30,6 +30,7 @@ class TimerState(BaseModel):
     duration: float
     elapsed: float
     active: bool
+    paused: bool = False
 
 class AnalyticsModel(BaseModel):
     winProbability: List[Union[float, Dict[str, Any]]] = []
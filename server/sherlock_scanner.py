@@ -5,24 +5,24 @@ Extracted from bot_orchestrator.py for separation of concerns.
 Runs independently to detect illegal card plays and trigger Qayd via QaydEngine.
 """
 import logging
-import datetime
 import traceback
 
-from ai_worker.agent import bot_agent
+from server.bot_workers import decision_pool
 from server.broadcast import broadcast_game_update
 from server.room_manager import room_manager
+from server.logging_utils import get_category_logger
 import server.settings as settings
 
 logger = logging.getLogger(__name__)
+sherlock_log = get_category_logger('sherlock')
 
 # Timing config (from centralized settings)
 QAYD_RESULT_DELAY = settings.QAYD_RESULT_DELAY
 
 
 def _sherlock_log(msg):
-    """Write debug line to sherlock_debug.log"""
-    with open('logs/sherlock_debug.log', 'a', encoding='utf-8') as f:
-        f.write(f"{datetime.datetime.now().isoformat()} {msg}\n")
+    """Queue a debug line for sherlock_debug.log"""
+    sherlock_log.info(msg)
 
 
 def _clear_illegal_flags_on_game(game):
@@ -94,7 +94,7 @@ def run_sherlock_scan(sio, game, room_id):
                 if game.phase not in ("PLAYING", "FINISHED") or game.qayd_state.get('active') or game.is_locked:
                     break
                 
-                decision = bot_agent.get_decision(state, player.index)
+                decision = decision_pool.decide(state, player.index, room_id, sleep=sio.sleep)
                 action = decision.get('action')
                 _sherlock_log(f"Bot {player.name} decided: {action}")
                 
@@ -114,7 +114,7 @@ def run_sherlock_scan(sio, game, room_id):
                         
                         # Re-query same bot for accusation data now that Qayd is active
                         state = game.get_game_state()  # Refresh state
-                        follow_up = bot_agent.get_decision(state, player.index)
+                        follow_up = decision_pool.decide(state, player.index, room_id, sleep=sio.sleep)
                         _sherlock_log(f"  Follow-up decision: action={follow_up.get('action')}")
                         if follow_up.get('action') == 'QAYD_ACCUSATION':
                             accusation_data = follow_up.get('accusation', {})
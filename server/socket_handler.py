@@ -20,11 +20,20 @@ from server.cors_config import get_socketio_cors
 
 _cors_origins = get_socketio_cors()
 
-# Create a Socket.IO server
-sio = socketio.Server(async_mode='gevent', cors_allowed_origins=_cors_origins)
+from server.room_leases import CLUSTER, room_router
+
+# Create a Socket.IO server. With several workers (BALOOT_CLUSTER=1) emits and
+# room membership go through Redis so a room's owner reaches every client.
+_client_manager = None
+if CLUSTER:
+    import server.settings as settings
+    _client_manager = socketio.RedisManager(settings.REDIS_URL)
+sio = socketio.Server(async_mode='gevent', cors_allowed_origins=_cors_origins,
+                      client_manager=_client_manager)
 
 # Shared state
 connected_users = {}  # sid -> {user_id, email, username, ...}
+room_router.users = connected_users  # Forwarded with events run on another worker
 
 # --- Register Handlers from Sub-Modules ---
 from server.handlers import telemetry, room_lifecycle, game_actions, matchmaking_handler
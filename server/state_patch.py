@@ -0,0 +1,98 @@
+"""
+server/state_patch.py — JSON-patch (RFC 6902 subset) diffs between game states.
+
+Only 'add', 'remove' and 'replace' are produced. Lists are trimmed of their
+common head and tail: a pure insertion or removal (a card played from a hand,
+appended to the table) becomes add/remove ops and an equal-size middle is
+diffed element-wise; anything else replaces the list (game lists are short).
+"""
+import copy
+
+
+def _escape(key) -> str:
+    key = str(key)
+    if '~' in key or '/' in key:
+        return key.replace('~', '~0').replace('/', '~1')
+    return key
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(old, new, path: str = '') -> list:
+    """Operations that turn ``old`` into ``new`` (both JSON documents)."""
+    if type(old) is not type(new):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    if isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({'op': 'add', 'path': f"{path}/{_escape(key)}", 'value': value})
+            elif old[key] != value:
+                ops.extend(make_patch(old[key], value, f"{path}/{_escape(key)}"))
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        return ops
+
+    if isinstance(new, list):
+        # Trim the common ends; a pure insertion / removal / same-size edit is patched in place
+        n_old, n_new = len(old), len(new)
+        p = 0
+        while p < n_old and p < n_new and old[p] == new[p]:
+            p += 1
+        q = 0
+        while q < n_old - p and q < n_new - p and old[n_old - 1 - q] == new[n_new - 1 - q]:
+            q += 1
+        old_mid, new_mid = old[p:n_old - q], new[p:n_new - q]
+        if not old_mid:
+            if q == 0:
+                return [{'op': 'add', 'path': f"{path}/-", 'value': v} for v in new_mid]
+            return [{'op': 'add', 'path': f"{path}/{p + i}", 'value': v} for i, v in enumerate(new_mid)]
+        if not new_mid:
+            return [{'op': 'remove', 'path': f"{path}/{p}"} for _ in old_mid]
+        if len(old_mid) == len(new_mid):
+            ops = []
+            for i, (a, b) in enumerate(zip(old_mid, new_mid)):
+                if a != b:
+                    ops.extend(make_patch(a, b, f"{path}/{p + i}"))
+            return ops
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    if old != new:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    return []
+
+
+def apply_patch(doc, patch: list):
+    """Returns a new document with ``patch`` applied (``doc`` is not modified)."""
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        path = op['path']
+        if path == '':
+            doc = copy.deepcopy(op['value'])
+            continue
+        tokens = [_unescape(t) for t in path.split('/')[1:]]
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            if op['op'] == 'add':
+                value = copy.deepcopy(op['value'])
+                if last == '-':
+                    parent.append(value)
+                else:
+                    parent.insert(int(last), value)
+            elif op['op'] == 'remove':
+                del parent[int(last)]
+            else:
+                parent[int(last)] = copy.deepcopy(op['value'])
+        else:
+            if op['op'] == 'remove':
+                del parent[last]
+            else:
+                parent[last] = copy.deepcopy(op['value'])
+    return doc
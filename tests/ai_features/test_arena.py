@@ -0,0 +1,110 @@
+"""Seeded duplicate-deal arena (game_engine/arena.py)."""
+import logging
+import unittest
+
+from game_engine.arena import Arena, ArenaReport, DealStream, imps, run_matches, _wilson
+from game_engine.logic.game import Game
+from ai_worker.strategies.bidding import BiddingStrategy
+from ai_worker.strategies.playing import PlayingStrategy
+
+
+def _heuristic_bots():
+    """Production strategies without the MCTS oracle: a match takes about a second."""
+    playing = PlayingStrategy()
+    playing.cognitive.enabled = False
+    return playing, BiddingStrategy()
+
+
+BOTS = (_heuristic_bots, _heuristic_bots)
+
+
+def _dealt_game(seed):
+    game = Game('deal_room')
+    game.deal_rng = DealStream(seed)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    return game
+
+
+class TestSeededDeals(unittest.TestCase):
+    def test_same_seed_same_deal_and_dealer(self):
+        a, b, c = _dealt_game(7), _dealt_game(7), _dealt_game(8)
+        hands = lambda g: [[str(card) for card in p.hand] for p in g.players]
+        self.assertEqual(hands(a), hands(b))
+        self.assertEqual(a.dealer_index, b.dealer_index)
+        self.assertNotEqual(hands(a), hands(c))
+
+    def test_deal_n_does_not_depend_on_earlier_play(self):
+        stream = DealStream(3)
+        first = list(range(32))
+        stream.shuffle(first)
+        later = DealStream(3)
+        later.dealt = 1
+        second, again = list(range(32)), list(range(32))
+        stream.shuffle(second)
+        later.shuffle(again)
+        self.assertEqual(second, again)
+        self.assertNotEqual(first, second)
+
+
+class TestReport(unittest.TestCase):
+    def _result(self, seed, swapped, winner, rounds):
+        a = 'them' if swapped else 'us'
+        return {'match_id': f"m{seed}{swapped}", 'seed': seed, 'swapped': swapped, 'a_team': a,
+                'winner': winner, 'final_scores': {'us': 152, 'them': 100} if winner == 'us' else {'us': 100, 'them': 152},
+                'rounds': rounds}
+
+    def test_duplicate_tables_pair_by_board(self):
+        report = ArenaReport()
+        # Board 0: A makes 26 at one table, concedes 16 at the other -> +10 swing
+        report.add(self._result(1, False, 'us', [{'board': 0, 'us': 26, 'them': 0},
+                                                 {'board': 1, 'us': 0, 'them': 16}]))
+        self.assertEqual(report.summary()['boards'], 0)  # Waiting for the other table
+        report.add(self._result(1, True, 'us', [{'board': 0, 'us': 16, 'them': 0}]))
+        summary = report.summary()
+        self.assertEqual(summary['boards'], 1)  # Board 1 was only played at one table
+        self.assertEqual(summary['board_swing'], 10)
+        self.assertEqual(summary['imps_per_board'], imps(10))
+        self.assertEqual((summary['matches'], summary['a_wins']), (2, 1))
+
+    def test_imps_and_intervals(self):
+        self.assertEqual(imps(0), 0)
+        self.assertEqual(imps(-3), -1)
+        self.assertGreater(imps(100), imps(30))
+        lo, hi = _wilson(50, 100)
+        self.assertLess(lo, 0.5)
+        self.assertGreater(hi, 0.5)
+        self.assertLess(hi - lo, 0.2)
+
+
+class TestMatches(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_seeded_match_is_reproducible_across_processes(self):
+        local = Arena(BOTS).run_match('repro', seed=11, keep_history=False)
+        self.assertIsNotNone(local['winner'])
+        self.assertTrue(local['rounds'])
+        self.assertEqual(sum(r['us'] for r in local['rounds']), local['final_scores']['us'])
+
+        pooled = list(run_matches(1, seed=0, duplicate=True, workers=2, bots=BOTS))
+        self.assertEqual(sorted(r['swapped'] for r in pooled), [False, True])
+        again = Arena(BOTS).run_match('again', seed=pooled[0]['seed'], swapped=pooled[0]['swapped'],
+                                      keep_history=False)
+        self.assertEqual(again['rounds'], pooled[0]['rounds'])
+        self.assertEqual(again['final_scores'], pooled[0]['final_scores'])
+
+        report = ArenaReport()
+        for res in pooled:
+            report.add(res)
+        self.assertGreater(report.summary()['boards'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from ai_worker.bot_context import BotContext
+from ai_worker.learning.dataset_logger import DatasetLogger
+from ai_worker.learning.dataset_shards import (
+    SAMPLE_DTYPE, ShardDataset, ShardWriter, convert_legacy, open_shards, shard_paths,
+)
+from ai_worker.memory import CardMemory
+from game_engine.models.card import Card
+
+
+def _rows(n, start=0):
+    rows = np.zeros(n, dtype=SAMPLE_DTYPE)
+    rows['features'][:, 0] = np.arange(start, start + n) % 2
+    rows['features'][:, 128] = 0.5
+    rows['label'] = (np.arange(start, start + n) % 32)
+    rows['game_id'] = [f"g{i}".encode() for i in range(start, start + n)]
+    return rows
+
+
+class TestShardStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_round_trip_across_shards(self):
+        """Appends roll over to new shards and read back in order"""
+        writer = ShardWriter(self.dir, shard_rows=4)
+        writer.append(_rows(3))
+        writer.append(_rows(7, start=3))
+        self.assertEqual(len(shard_paths(self.dir)), 3)
+
+        rows = np.concatenate(open_shards(self.dir))
+        self.assertEqual(rows['game_id'].tolist(), [f"g{i}".encode() for i in range(10)])
+        np.testing.assert_array_equal(rows['label'], np.arange(10))
+
+    def test_truncated_record_is_ignored(self):
+        """A partial trailing record (crashed writer) is not read"""
+        ShardWriter(self.dir).append(_rows(2))
+        with open(shard_paths(self.dir)[0], 'ab') as f:
+            f.write(b'\x00' * 10)
+        self.assertEqual(len(open_shards(self.dir)[0]), 2)
+
+    def test_batch_indexing(self):
+        """Index lists gather one batch across shard boundaries"""
+        ShardWriter(self.dir, shard_rows=4).append(_rows(10))
+        dataset = ShardDataset(self.dir)
+        self.assertEqual(len(dataset), 10)
+
+        batch = dataset[[9, 0, 5, 4]]
+        self.assertEqual(batch['label'].tolist(), [9, 0, 5, 4])
+        self.assertEqual(tuple(batch['vector'].shape), (4, 138))
+        self.assertEqual(batch['vector'][:, 128].tolist(), [0.5] * 4)
+        self.assertEqual(dataset[3]['label'].item(), 3)
+
+        seen = [b['label'].tolist() for b in dataset.loader(range(10), batch_size=4)]
+        self.assertEqual(seen, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        shuffled = sum((b['label'].tolist() for b in dataset.loader(range(10), 3, shuffle=True)), [])
+        self.assertEqual(sorted(shuffled), list(range(10)))
+
+    def test_convert_legacy(self):
+        """JSONL and CSV exports convert to the same samples; bad rows are skipped"""
+        vector = [0.0] * 138
+        vector[5] = 1.0
+        vector[130] = 0.1234
+        jsonl = os.path.join(self.dir, "yolo_dataset.jsonl")
+        with open(jsonl, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"ts": 1, "game_id": "a", "mode": "HOKUM", "vector": vector,
+                                "target_card": "♥A", "confidence": 0.97, "visits": 400}) + "\n")
+            f.write(json.dumps({"vector": vector, "target_card": "None"}) + "\n")
+        csv_path = os.path.join(self.dir, "dataset.csv")
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("ts,game_id,vector,mcts_move_idx,target,win_rate\n")
+            f.write(f'2,b,"{",".join(map(str, vector))}",0,AH,0.9\n')
+            f.write(f'3,c,"1,0",0,AH,0.9\n')
+
+        out = os.path.join(self.dir, "shards")
+        self.assertEqual(convert_legacy([jsonl, csv_path], out), 2)
+        rows = np.concatenate(open_shards(out))
+        self.assertEqual(rows['label'].tolist(), [15, 15])  # ♥ is suit 1, A is rank 7
+        self.assertEqual(rows['game_id'].tolist(), [b'a', b'b'])
+        self.assertEqual(rows['mode'].tolist(), [1, 0])
+        self.assertAlmostEqual(float(rows['features'][0, 130]), 0.1234, places=3)
+
+
+class TestDatasetLoggerShards(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_logger_writes_label_and_policy(self):
+        ctx = MagicMock(spec=BotContext)
+        ctx.hand = [Card('S', '7'), Card('H', 'A'), Card('D', '10')]
+        ctx.memory = MagicMock(spec=CardMemory)
+        ctx.memory.played_cards = set()
+        ctx.raw_state = {'gameId': 'game-1'}
+        ctx.trump = None
+        ctx.mode = 'SUN'
+
+        logger = DatasetLogger(data_dir=self.dir, min_confidence=0.9, buffer_size=2)
+        details = {0: {'win_rate': 0.5, 'visits': 100}, 1: {'win_rate': 0.95, 'visits': 300}}
+        logger.log_sample(ctx, 0, details)  # Below threshold
+        logger.log_sample(ctx, 1, details)
+        self.assertEqual(len(logger.buffer), 1)
+        logger.flush()
+
+        [row] = np.concatenate(open_shards(logger.shard_dir))
+        self.assertEqual(row['label'], 15)
+        self.assertEqual(row['game_id'], b'game-1')
+        self.assertEqual(row['visits'], 300)
+        self.assertAlmostEqual(float(row['policy'][15]), 0.75, places=3)
+        self.assertAlmostEqual(float(row['policy'][0]), 0.25, places=3)
+        self.assertEqual(row['features'][:32].sum(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Exact constraint-satisfying deal sampling (ai_worker/mcts/deal_sampler.py)."""
+import itertools
+import random
+import unittest
+from collections import Counter
+
+from game_engine.models.card import Card
+from ai_worker.bot_context import BotContext
+from ai_worker.mcts.deal_sampler import DealSampler
+from ai_worker.mcts.utils import generate_distributions
+
+from tests.ai_features.test_pimc import _mid_round_state
+
+
+def _cards(spec):
+    return [Card(s, r) for s, ranks in spec.items() for r in ranks]
+
+
+def _legal_deals(cards, capacities, voids):
+    """Every deal by brute force, as frozensets of (seat, card)."""
+    seats = list(capacities)
+    deals = set()
+    for owners in itertools.product(seats, repeat=len(cards)):
+        if any(owners.count(s) != capacities[s] for s in seats):
+            continue
+        if any(c.suit in voids.get(o, ()) for o, c in zip(owners, cards)):
+            continue
+        deals.add(frozenset((o, str(c)) for o, c in zip(owners, cards)))
+    return deals
+
+
+def _key(deal):
+    return frozenset((seat, str(c)) for seat, hand in deal.items() for c in hand)
+
+
+class TestDealSampler(unittest.TestCase):
+    CARDS = _cards({'♠': ['7', 'K', 'A'], '♥': ['8', '10'], '♦': ['J', 'Q']})
+    CAPACITIES = {'Right': 2, 'Top': 3, 'Left': 2}
+    VOIDS = {'Right': {'♥'}, 'Left': {'♠', '♦'}}
+
+    def test_count_matches_brute_force(self):
+        for voids in ({}, self.VOIDS, {'Top': {'♠', '♥', '♦'}}):
+            sampler = DealSampler(self.CARDS, self.CAPACITIES, voids=voids)
+            self.assertEqual(sampler.total, len(_legal_deals(self.CARDS, self.CAPACITIES, voids)))
+
+    def test_draws_are_uniform_over_legal_deals(self):
+        legal = _legal_deals(self.CARDS, self.CAPACITIES, self.VOIDS)
+        sampler = DealSampler(self.CARDS, self.CAPACITIES, voids=self.VOIDS)
+        draws = 400 * len(legal)
+        seen = Counter(_key(d) for d in sampler.sample_batch(draws, random.Random(5)))
+        self.assertEqual(set(seen), legal)
+        for n in seen.values():
+            self.assertLess(abs(n - 400), 100)
+
+    def test_weights_tilt_suits_towards_a_seat(self):
+        sampler = DealSampler(self.CARDS, self.CAPACITIES,
+                              weights={'Right': {'♠': 10.0}, 'Top': {'♠': 0.1}})
+        deals = sampler.sample_batch(2000, random.Random(1))
+        right = sum(c.suit == '♠' for d in deals for c in d['Right'])
+        top = sum(c.suit == '♠' for d in deals for c in d['Top'])
+        self.assertGreater(right, 3 * top)
+
+    def test_late_round_voids_never_fall_back(self):
+        # 3 cards each left, every seat void in two suits
+        cards = _cards({'♠': ['7', '8', '9'], '♥': ['7', '8', '9'], '♣': ['7', '8', '9']})
+        capacities = {'Right': 3, 'Top': 3, 'Left': 3}
+        voids = {'Right': {'♥', '♣'}, 'Top': {'♠', '♣'}, 'Left': {'♠', '♥'}}
+        sampler = DealSampler(cards, capacities, voids=voids)
+        self.assertEqual(sampler.total, 1)
+        deal = sampler.sample()
+        self.assertEqual({c.suit for c in deal['Right']}, {'♠'})
+        self.assertEqual({c.suit for c in deal['Left']}, {'♣'})
+
+    def test_infeasible_constraints(self):
+        sampler = DealSampler(self.CARDS, self.CAPACITIES, voids={'Right': {'♠', '♥', '♦'}})
+        self.assertFalse(sampler.feasible)
+        with self.assertRaises(ValueError):
+            sampler.sample()
+        self.assertFalse(DealSampler(self.CARDS, {'Right': 2, 'Top': 2, 'Left': 2}).feasible)
+
+
+class TestContextDistributions(unittest.TestCase):
+    def test_batch_respects_counts_and_voids(self):
+        ctx = BotContext(_mid_round_state(), 0)
+        deals = generate_distributions(ctx, 20, random.Random(0))
+        self.assertEqual(len(deals), 20)
+        for hands in deals:
+            self.assertEqual([len(h) for h in hands], [6, 6, 6, 6])
+            self.assertFalse(any(c.suit == '♥' for c in hands[1] + hands[3]))
+            self.assertEqual(len({str(c) for h in hands for c in h}), 24)
+        self.assertGreater(len({_key(dict(enumerate(h))) for h in deals}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Bitboard FastGame must agree with the reference rule engine."""
+import random
+import unittest
+
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+from game_engine.logic.validation import is_move_legal, get_trick_winner_index
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.bitboard import card_id, cards_to_mask, mask_to_ids, get_tables
+
+POS = ['Bottom', 'Right', 'Top', 'Left']
+TEAM_MAP = {'Bottom': 'us', 'Right': 'them', 'Top': 'us', 'Left': 'them'}
+
+
+def _deal(rng):
+    deck = [Card(s, r) for s in SUITS for r in RANKS]
+    rng.shuffle(deck)
+    return [deck[i * 8:(i + 1) * 8] for i in range(4)]
+
+
+def _reference_legal(game):
+    hand = game.hands[game.current_turn]
+    table = [{'card': c, 'playedBy': POS[p]} for p, c in game.played_cards_in_trick]
+    return [
+        i for i, c in enumerate(hand)
+        if is_move_legal(c, hand, table, game.mode, game.trump,
+                         game.teams[game.current_turn], TEAM_MAP)
+    ]
+
+
+class TestBitboard(unittest.TestCase):
+    def test_card_id_matches_feature_layout(self):
+        self.assertEqual(card_id(Card('♠', '7')), 0)
+        self.assertEqual(card_id(Card('S', 'A')), 7)
+        self.assertEqual(card_id({'suit': '♣', 'rank': 'A'}), 31)
+        self.assertEqual(card_id(Card('X', '7')), -1)
+
+    def test_mask_round_trip(self):
+        cards = [Card('♥', '10'), Card('♦', 'J'), Card('♠', '7')]
+        mask = cards_to_mask(cards)
+        self.assertEqual(sorted(card_id(c) for c in cards), mask_to_ids(mask))
+
+    def test_hokum_points_total(self):
+        tables = get_tables('HOKUM', '♥')
+        self.assertEqual(sum(tables.points), 152)
+        self.assertEqual(sum(get_tables('SUN', None).points), 120)
+
+
+class TestFastGameEquivalence(unittest.TestCase):
+    def test_legal_moves_match_validator(self):
+        rng = random.Random(7)
+        for deal_no in range(150):
+            mode = 'HOKUM' if deal_no % 2 else 'SUN'
+            trump = SUITS[deal_no % 4] if mode == 'HOKUM' else None
+            game = FastGame(_deal(rng), trump=trump, mode=mode,
+                            current_turn=deal_no % 4, dealer_index=0)
+            while not game.is_terminal():
+                legal = game.get_legal_moves()
+                self.assertEqual(legal, _reference_legal(game))
+                game.apply_move(rng.choice(legal))
+
+    def test_trick_winner_and_points_match_reference(self):
+        rng = random.Random(11)
+        for deal_no in range(100):
+            mode = 'HOKUM' if deal_no % 2 else 'SUN'
+            trump = SUITS[deal_no % 4] if mode == 'HOKUM' else None
+            game = FastGame(_deal(rng), trump=trump, mode=mode,
+                            current_turn=0, dealer_index=0)
+            points = get_tables(mode, trump).points
+            while not game.is_terminal():
+                for _ in range(3):
+                    game.apply_move(rng.choice(game.get_legal_moves()))
+                before = dict(game.scores)
+                last = rng.choice(game.get_legal_moves())
+                plays = game.played_cards_in_trick + [
+                    (game.current_turn, game.hands[game.current_turn][last])
+                ]
+                table = [{'card': c, 'playedBy': POS[p]} for p, c in plays]
+                expected_winner = plays[get_trick_winner_index(table, mode, trump)][0]
+                expected_pts = sum(points[card_id(c)] for _, c in plays)
+                game.apply_move(last)
+
+                self.assertEqual(game.current_turn, expected_winner)
+                team = game.teams[expected_winner]
+                bonus = 10 if game.is_terminal() else 0
+                self.assertEqual(game.scores[team] - before[team], expected_pts + bonus)
+
+    def test_table_cards_resume_mid_trick(self):
+        hands = [
+            [Card('♠', 'A'), Card('♥', '7')],
+            [Card('♠', '10')],
+            [Card('♠', 'K'), Card('♦', '8')],
+            [Card('♠', '7'), Card('♦', '9')],
+        ]
+        table = [{'card': {'suit': '♠', 'rank': '10'}, 'playedBy': 'Right'}]
+        game = FastGame(hands, trump=None, mode='SUN', current_turn=0,
+                        dealer_index=0, table_cards=table)
+        self.assertEqual(game.current_turn, 2)
+        self.assertEqual(game.get_legal_moves(), [0])
+        self.assertEqual(game._get_trick_winner_idx(), 1)
+
+    def test_rollout_total_points(self):
+        rng = random.Random(3)
+        for deal_no in range(40):
+            mode = 'HOKUM' if deal_no % 2 else 'SUN'
+            trump = SUITS[deal_no % 4] if mode == 'HOKUM' else None
+            game = FastGame(_deal(rng), trump=trump, mode=mode,
+                            current_turn=deal_no % 4, dealer_index=0)
+            game.play_greedy()
+            self.assertTrue(game.is_terminal())
+            total = game.scores['us'] + game.scores['them']
+            self.assertEqual(total, 162 if mode == 'HOKUM' else 130)
+            self.assertEqual(game.tricks_collected['us'] + game.tricks_collected['them'], 8)
+            self.assertEqual(game.hands, [[], [], [], []])
+
+    def test_clone_is_independent(self):
+        game = FastGame(_deal(random.Random(5)), trump='♦', mode='HOKUM',
+                        current_turn=1, dealer_index=0)
+        game.apply_move(game.get_legal_moves()[0])
+        copy = game.clone()
+        copy.play_greedy()
+        self.assertTrue(copy.is_terminal())
+        self.assertFalse(game.is_terminal())
+        self.assertEqual([len(h) for h in game.hands], [8, 7, 8, 8])
+        self.assertEqual(len(game.played_cards_in_trick), 1)
+
+    def test_partial_rollout_keeps_lists_in_sync(self):
+        # Unequal hands: rollout stops when the player to act is empty-handed
+        hands = [
+            [Card('♠', 'A'), Card('♠', '8')],
+            [Card('♠', '10')],
+            [Card('♠', 'K'), Card('♠', '9')],
+            [Card('♠', '7'), Card('♠', 'J')],
+        ]
+        game = FastGame(hands, trump=None, mode='SUN', current_turn=0, dealer_index=0)
+        game.play_greedy()
+        self.assertFalse(game.is_terminal())
+        self.assertEqual(game.hands[game.current_turn], [])
+        for p in range(4):
+            self.assertEqual(cards_to_mask(game.hands[p]), game.hand_masks[p])
+
+
+if __name__ == '__main__':
+    unittest.main()
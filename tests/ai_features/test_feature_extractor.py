@@ -1,10 +1,42 @@
 
+import random
 import unittest
 from unittest.mock import MagicMock
+
+import numpy as np
+
 from ai_worker.learning.feature_extractor import FeatureExtractor
 from ai_worker.bot_context import BotContext
 from game_engine.models.card import Card
 from ai_worker.memory import CardMemory
+from game_engine.models.constants import SUITS, RANKS
+
+
+def _random_contexts(n, seed=11):
+    """Mocked BotContexts with mixed suit spellings, table dicts/Cards and scores."""
+    rng = random.Random(seed)
+    aliases = {'♠': 'Ss♠', '♥': 'Hh♥', '♦': 'Dd♦', '♣': 'Cc♣'}
+    contexts, legal = [], []
+    for _ in range(n):
+        deck = [(s, r) for s in SUITS for r in RANKS]
+        rng.shuffle(deck)
+        spell = lambda s: rng.choice(aliases[s])
+        ctx = MagicMock(spec=BotContext)
+        ctx.hand = [Card(spell(s), r) for s, r in deck[:rng.randrange(9)]]
+        table = []
+        for s, r in deck[8:8 + rng.randrange(4)]:
+            card = {'suit': spell(s), 'rank': r} if rng.random() < 0.7 else Card(spell(s), r)
+            table.append({'card': card, 'playedBy': 'Bottom'})
+        if rng.random() < 0.1:
+            table.append({'card': None})
+        ctx.raw_state = {'tableCards': table}
+        if rng.random() < 0.8:
+            ctx.raw_state['matchScores'] = {'us': rng.randrange(152), 'them': rng.randrange(152)}
+        ctx.trump = rng.choice([None, 'S', '♥', 'd', 'X'])
+        ctx.mode = rng.choice(['SUN', 'HOKUM', None])
+        contexts.append(ctx)
+        legal.append(rng.choice([None, [], rng.sample(range(10), rng.randrange(5))]))
+    return contexts, legal
 
 class TestFeatureExtractor(unittest.TestCase):
     def setUp(self):
@@ -34,5 +66,19 @@ class TestFeatureExtractor(unittest.TestCase):
         vec = self.extractor.encode(self.ctx)
         self.assertEqual(len(vec), 138)
 
+    def test_encode_batch_matches_encode(self):
+        """Every batched row equals the per-sample encoder"""
+        contexts, legal = _random_contexts(200)
+        batch = self.extractor.encode_batch(contexts, legal)
+        self.assertEqual(batch.shape, (200, 138))
+        self.assertEqual(batch.dtype, np.float32)
+        for row, ctx, moves in zip(batch, contexts, legal):
+            expected = np.array(self.extractor.encode(ctx, moves), dtype=np.float32)
+            np.testing.assert_array_equal(row, expected)
+
+        plain = self.extractor.encode_batch(contexts[:5])
+        for row, ctx in zip(plain, contexts[:5]):
+            np.testing.assert_array_equal(row, np.array(self.extractor.encode(ctx), dtype=np.float32))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+"""Shared inference sessions (ONNX Runtime / torch) for the bot models."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ai_worker.learning import inference
+from ai_worker.learning.inference import load_session, onnx_path_for, clear_sessions
+from ai_worker.strategies.neural import NeuralStrategy, _build_strategy_net
+from ai_worker.mind_client import MindClient, _build_mind_reader
+
+MODELS = os.path.join(os.path.dirname(__file__), '..', '..', 'ai_worker', 'models')
+STRATEGY_PTH = os.path.join(MODELS, 'strategy_net_best.pth')
+RETRAINED_PTH = os.path.join(MODELS, 'strategy_net_final.pth')  # Same net, other weights
+MIND_PTH = os.path.join(MODELS, 'mind_reader_v1.pth')
+
+HAS_ONNX = inference.ort is not None and os.path.exists(onnx_path_for(STRATEGY_PTH))
+
+
+class TestLoadSession(unittest.TestCase):
+    def setUp(self):
+        clear_sessions()
+
+    def tearDown(self):
+        clear_sessions()
+
+    def test_one_session_per_process(self):
+        a = NeuralStrategy(STRATEGY_PTH)
+        b = NeuralStrategy(STRATEGY_PTH)
+        self.assertTrue(a.enabled)
+        self.assertIs(a.session, b.session)
+
+    def test_missing_model_disables(self):
+        strategy = NeuralStrategy('/nonexistent/model.pth')
+        self.assertFalse(strategy.enabled)
+        self.assertIsNone(load_session('/nonexistent/model.pth', _build_strategy_net))
+
+    def test_torch_backend_forced(self):
+        session = load_session(STRATEGY_PTH, _build_strategy_net, backend='torch')
+        self.assertEqual(session.backend, 'torch')
+
+
+@unittest.skipUnless(HAS_ONNX, "onnxruntime or exported models not available")
+class TestStaleExport(unittest.TestCase):
+    def setUp(self):
+        clear_sessions()
+        self.addCleanup(clear_sessions)
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.pth = os.path.join(self.dir, 'model.pth')
+        self.onnx = onnx_path_for(self.pth)
+        shutil.copy(STRATEGY_PTH, self.pth)
+        shutil.copy(onnx_path_for(STRATEGY_PTH), self.onnx)
+
+    def test_shipped_exports_match_their_checkpoints(self):
+        for pth in (STRATEGY_PTH, MIND_PTH):
+            self.assertTrue(inference.export_is_current(pth, onnx_path_for(pth)))
+
+    def test_retrained_checkpoint_is_served_by_torch(self):
+        inference.record_export(self.pth, self.onnx)
+        self.assertEqual(load_session(self.pth, _build_strategy_net).backend, 'onnx')
+        clear_sessions()
+        shutil.copy(RETRAINED_PTH, self.pth)
+        self.assertFalse(inference.export_is_current(self.pth, self.onnx))
+        self.assertEqual(load_session(self.pth, _build_strategy_net).backend, 'torch')
+        self.assertEqual(load_session(self.pth, _build_strategy_net, backend='onnx').backend, 'torch')
+
+    def test_unrecorded_export_older_than_checkpoint_is_stale(self):
+        os.utime(self.onnx, (1000, 1000))
+        self.assertEqual(load_session(self.pth, _build_strategy_net).backend, 'torch')
+        clear_sessions()
+        os.utime(self.pth, (500, 500))
+        self.assertEqual(load_session(self.pth, _build_strategy_net).backend, 'onnx')
+
+
+@unittest.skipUnless(HAS_ONNX, "onnxruntime or exported models not available")
+class TestOnnxParity(unittest.TestCase):
+    def setUp(self):
+        clear_sessions()
+
+    def tearDown(self):
+        clear_sessions()
+
+    def test_strategy_net_matches_torch(self):
+        onnx = load_session(STRATEGY_PTH, _build_strategy_net, backend='onnx')
+        torch_ = load_session(STRATEGY_PTH, _build_strategy_net, backend='torch')
+        self.assertEqual(onnx.backend, 'onnx')
+        x = np.random.rand(8, 138).astype(np.float32)
+        np.testing.assert_allclose(onnx.run(x)[0], torch_.run(x)[0], atol=1e-4)
+
+    def test_mind_reader_matches_torch(self):
+        onnx = load_session(MIND_PTH, _build_mind_reader, backend='onnx')
+        torch_ = load_session(MIND_PTH, _build_mind_reader, backend='torch')
+        for length in (1, 9, 40):
+            tokens = np.random.randint(0, 100, (1, length)).astype(np.int64)
+            for a, b in zip(onnx.run(tokens), torch_.run(tokens)):
+                np.testing.assert_allclose(a, b, atol=1e-4)
+
+    def test_mind_client_probabilities(self):
+        client = MindClient(MIND_PTH, backend='onnx')
+        state = {'bid': {'type': 'SUN'}, 'tableCards': [{'card': {'suit': '♥', 'rank': 'A'}}]}
+        probs = client.infer_hands(state)
+        self.assertEqual(sorted(probs), [1, 2, 3])
+        for p in probs.values():
+            self.assertEqual(p.shape, (32,))
+            self.assertTrue(((p >= 0) & (p <= 1)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
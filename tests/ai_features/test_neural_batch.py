@@ -0,0 +1,95 @@
+"""Batched policy evaluation for PUCT MCTS."""
+import random
+import unittest
+
+import numpy as np
+import torch
+
+from game_engine.models.card import Card
+from game_engine.models.constants import SUITS, RANKS
+from ai_worker.learning.feature_extractor import FeatureExtractor
+from ai_worker.learning.inference import TorchSession
+from ai_worker.learning.model import StrategyNet
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSNode, MCTSSolver
+from ai_worker.strategies.neural import NeuralStrategy
+
+
+def _random_positions(n, seed=3):
+    """FastGames at random points of random deals (tricks in progress included)."""
+    rng = random.Random(seed)
+    games = []
+    for i in range(n):
+        deck = [Card(s, r) for s in SUITS for r in RANKS]
+        rng.shuffle(deck)
+        mode = 'SUN' if i % 3 == 0 else 'HOKUM'
+        trump = None if mode == 'SUN' else rng.choice(SUITS)
+        game = FastGame([deck[p * 8:(p + 1) * 8] for p in range(4)], trump=trump, mode=mode,
+                        current_turn=rng.randrange(4), dealer_index=0)
+        for _ in range(rng.randrange(31)):
+            game.apply_move(rng.choice(game.get_legal_moves()))
+        games.append(game)
+    return games
+
+
+def _random_net_strategy():
+    torch.manual_seed(0)
+    return NeuralStrategy(session=TorchSession(StrategyNet()))
+
+
+class TestEncodeFastBatch(unittest.TestCase):
+    def test_rows_match_encode_fast(self):
+        extractor = FeatureExtractor()
+        games = _random_positions(40)
+        batch = extractor.encode_fast_batch(games)
+        self.assertEqual(batch.shape, (40, 138))
+        self.assertEqual(batch.dtype, np.float32)
+        for row, game in zip(batch, games):
+            expected = np.array(extractor.encode_fast(game, game.get_legal_moves()), dtype=np.float32)
+            np.testing.assert_array_equal(row, expected)
+
+
+class TestPolicyBatch(unittest.TestCase):
+    def test_matches_single_predictions(self):
+        strategy = _random_net_strategy()
+        games = _random_positions(12, seed=5)
+        batched = strategy.predict_policy_batch(games)
+        for game, policy in zip(games, batched):
+            single = strategy.predict_policy(game)
+            self.assertEqual(set(policy), set(single))
+            for idx in single:
+                self.assertAlmostEqual(policy[idx], single[idx], places=5)
+
+    def test_disabled_model_is_uniform(self):
+        strategy = NeuralStrategy(model_path=None)
+        game = _random_positions(1)[0]
+        policy = strategy.predict_policy_batch([game])[0]
+        legal = game.get_legal_moves()
+        self.assertEqual(set(policy), set(legal))
+        self.assertAlmostEqual(sum(policy.values()), 1.0)
+
+
+class TestBatchedSearch(unittest.TestCase):
+    def test_budget_and_virtual_loss_are_exact(self):
+        solver = MCTSSolver(neural_strategy=_random_net_strategy(), batch_size=8)
+        game = _random_positions(1, seed=9)[0]
+        root = MCTSNode(move_idx=-1)
+        root.untried_moves = game.get_legal_moves()
+        best, details = solver.search_with_details(game, timeout_ms=10000, max_iterations=200,
+                                                   root_node_override=root)
+        self.assertIn(best, game.get_legal_moves())
+        self.assertEqual(root.visits, 200)
+
+        # Every virtual loss was taken back: no node has more visits than its parent's subtree
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            child_visits = sum(c.visits for c in node.children.values())
+            self.assertLessEqual(child_visits, node.visits)
+            self.assertGreaterEqual(node.wins, 0.0)
+            self.assertLessEqual(node.wins, node.visits)
+            stack.extend(node.children.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Root-parallel MCTS over the shared process pool."""
+import pickle
+import time
+import unittest
+from unittest.mock import patch
+
+from game_engine.models.card import Card
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts import parallel
+from ai_worker.mcts.parallel import ParallelSolver, shutdown_pool
+
+
+def _world():
+    hands = [
+        [Card('♠', 'A'), Card('♥', '7'), Card('♦', 'K')],
+        [Card('♠', '10'), Card('♥', '8'), Card('♦', '7')],
+        [Card('♠', 'K'), Card('♥', '9'), Card('♣', 'A')],
+        [Card('♠', '7'), Card('♥', 'J'), Card('♣', '8')],
+    ]
+    return FastGame(hands, trump='♥', mode='HOKUM', current_turn=0, dealer_index=3)
+
+
+class TestFastGamePickling(unittest.TestCase):
+    def test_round_trip_rebuilds_tables(self):
+        game = _world()
+        game.apply_move(0)
+        copy = pickle.loads(pickle.dumps(game))
+        self.assertIs(copy._tables, game._tables)
+        self.assertEqual(copy.hand_masks, game.hand_masks)
+        self.assertEqual(copy.get_legal_moves(), game.get_legal_moves())
+
+
+class TestParallelSolver(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def test_root_parallel_merges_worker_trees(self):
+        solver = ParallelSolver(workers=2)
+        best, details = solver.search_with_details([_world()], timeout_ms=5000, max_iterations=200)
+        self.assertIn(best, _world().get_legal_moves())
+        # Each of the two trees ran half the budget
+        self.assertEqual(sum(d['visits'] for d in details.values()), 200)
+
+    def test_worlds_are_split_across_workers(self):
+        solver = ParallelSolver(workers=2)
+        worlds = [_world() for _ in range(3)]
+        _, details = solver.search_with_details(worlds, timeout_ms=5000, max_iterations=300)
+        self.assertEqual(sum(d['visits'] for d in details.values()), 300)
+
+    def test_pool_is_free_again_after_a_missed_deadline(self):
+        solver = ParallelSolver(workers=2)
+        pool = parallel.get_pool(2)
+        busy = [pool.submit(time.sleep, 1.0) for _ in range(2)]  # Both workers taken
+        solver.search_with_details([_world()], timeout_ms=600)  # Gives up before they free up
+        for future in busy:
+            future.result()
+
+        start = time.time()
+        _, details = solver.search_with_details([_world()], timeout_ms=5000, max_iterations=20)
+        self.assertEqual(sum(d['visits'] for d in details.values()), 20)
+        self.assertLess(time.time() - start, 0.4)  # Not queued behind the abandoned jobs
+
+    def test_expired_job_does_no_work(self):
+        self.assertEqual(parallel._search_job([_world()], 5000, None, 1.414, 0, expires=time.time() - 1), {})
+
+    def test_degrades_to_serial_without_pool(self):
+        solver = ParallelSolver(workers=4)
+        with patch.object(parallel, 'get_pool', return_value=None):
+            best, details = solver.search_with_details([_world()], timeout_ms=5000, max_iterations=50)
+        self.assertEqual(sum(d['visits'] for d in details.values()), 50)
+        self.assertIn(best, details)
+
+    def test_serial_when_single_worker(self):
+        solver = ParallelSolver(workers=1)
+        with patch.object(parallel, 'get_pool') as get_pool:
+            solver.search_with_details([_world()], timeout_ms=5000, max_iterations=20)
+        get_pool.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
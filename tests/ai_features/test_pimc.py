@@ -0,0 +1,114 @@
+"""PIMC (multi-world) search and its CognitiveOptimizer wiring."""
+import importlib
+import os
+import unittest
+from unittest import mock
+
+from game_engine.models.card import Card
+from ai_worker.bot_context import BotContext
+from ai_worker.cognitive import CognitiveOptimizer, SEARCH_PIMC, SEARCH_SINGLE
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.pimc import PIMCSolver
+
+
+def _c(suit, rank):
+    return {'suit': suit, 'rank': rank}
+
+
+def _play(suit, rank, pos):
+    return {'card': _c(suit, rank), 'playedBy': pos}
+
+
+def _mid_round_state():
+    """Two tricks played; Right and Left both failed to follow hearts."""
+    tricks = [
+        {'cards': [_play('♥', 'A', 'Bottom'), _play('♠', '9', 'Right'),
+                   _play('♥', '7', 'Top'), _play('♣', '9', 'Left')], 'winner': 'Bottom'},
+        {'cards': [_play('♥', '10', 'Bottom'), _play('♠', '10', 'Right'),
+                   _play('♥', '8', 'Top'), _play('♣', '10', 'Left')], 'winner': 'Bottom'},
+    ]
+    hand = [_c('♥', 'K'), _c('♥', 'Q'), _c('♠', '7'), _c('♠', '8'), _c('♦', 'A'), _c('♣', 'A')]
+    players = [
+        {'hand': hand if i == 0 else [], 'position': pos, 'name': pos,
+         'team': 'us' if i % 2 == 0 else 'them'}
+        for i, pos in enumerate(['Bottom', 'Right', 'Top', 'Left'])
+    ]
+    return {
+        'players': players,
+        'phase': 'PLAYING',
+        'gameMode': 'SUN',
+        'trumpSuit': None,
+        'dealerIndex': 3,
+        'tableCards': [],
+        'currentRoundTricks': tricks,
+        'teamScores': {'us': 0, 'them': 0},
+        'matchScores': {'us': 0, 'them': 0},
+    }
+
+
+class TestPIMCSolver(unittest.TestCase):
+    def _world(self):
+        hands = [
+            [Card('♠', 'A'), Card('♥', '7')],
+            [Card('♠', '10'), Card('♥', '8')],
+            [Card('♠', 'K'), Card('♥', '9')],
+            [Card('♠', '7'), Card('♥', 'J')],
+        ]
+        return FastGame(hands, trump=None, mode='SUN', current_turn=0, dealer_index=3)
+
+    def test_root_stats_are_summed_across_worlds(self):
+        solver = PIMCSolver()
+        best, details = solver.search_with_details(
+            [self._world(), self._world()], timeout_ms=5000, max_iterations=100
+        )
+        self.assertIn(best, (0, 1))
+        self.assertEqual(sum(d['visits'] for d in details.values()), 100)
+        for d in details.values():
+            self.assertEqual(set(d), {'visits', 'wins', 'win_rate', 'prior'})
+            self.assertAlmostEqual(d['win_rate'], d['wins'] / d['visits'])
+        self.assertEqual(best, max(details, key=lambda m: details[m]['visits']))
+
+    def test_empty_world_list(self):
+        self.assertEqual(PIMCSolver().search_with_details([]), (-1, {}))
+
+
+class TestCognitiveWorlds(unittest.TestCase):
+    def setUp(self):
+        self.ctx = BotContext(_mid_round_state(), 0)
+
+    def test_worlds_respect_voids(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_PIMC, num_worlds=6)
+        worlds = optimizer._sample_worlds(self.ctx)
+        self.assertEqual(len(worlds), 6)
+        for world in worlds:
+            self.assertEqual([len(h) for h in world.hands], [6, 6, 6, 6])
+            self.assertFalse(any(c.suit == '♥' for c in world.hands[1]))
+            self.assertFalse(any(c.suit == '♥' for c in world.hands[3]))
+            self.assertEqual(sorted(c.rank for c in world.hands[2] if c.suit == '♥'), ['9', 'J'])
+
+    def test_single_mode_samples_one_world(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE, num_worlds=6)
+        self.assertEqual(len(optimizer._sample_worlds(self.ctx)), 1)
+
+    def test_pimc_is_opt_in(self):
+        from ai_worker import cognitive
+        self.addCleanup(importlib.reload, cognitive)
+        with mock.patch.dict(os.environ):
+            os.environ.pop('BALOOT_MCTS_SEARCH', None)
+            self.assertEqual(importlib.reload(cognitive).CognitiveOptimizer().search_mode, SEARCH_SINGLE)
+            os.environ['BALOOT_MCTS_SEARCH'] = SEARCH_PIMC
+            os.environ['BALOOT_MCTS_WORLDS'] = '5'
+            optimizer = importlib.reload(cognitive).CognitiveOptimizer()
+        self.assertEqual((optimizer.search_mode, optimizer.num_worlds), (SEARCH_PIMC, 5))
+
+    def test_decision_uses_combined_worlds(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_PIMC, num_worlds=4, timeout_ms=2000)
+        optimizer.dataset_logger = None
+        optimizer._calculate_budget = lambda ctx: 200
+        decision = optimizer.get_decision(self.ctx)
+        self.assertIn(decision['cardIndex'], self.ctx.get_legal_moves())
+        self.assertIn('Worlds 4', decision['reasoning'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""Transposition table and subtree reuse between decisions."""
+import random
+import unittest
+
+from game_engine.models.card import Card
+from ai_worker.bot_context import BotContext
+from ai_worker.cognitive import CognitiveOptimizer, SEARCH_SINGLE
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+from ai_worker.mcts.transposition import TranspositionTable, zobrist_key
+
+
+def _c(suit, rank):
+    return {'suit': suit, 'rank': rank}
+
+
+def _play(suit, rank, pos):
+    return {'card': _c(suit, rank), 'playedBy': pos}
+
+
+def _state(hand, tricks, seat=0):
+    players = [
+        {'hand': hand if i == seat else [], 'position': pos, 'name': pos,
+         'team': 'us' if i % 2 == 0 else 'them'}
+        for i, pos in enumerate(['Bottom', 'Right', 'Top', 'Left'])
+    ]
+    return {
+        'roomId': 'room-1',
+        'players': players,
+        'phase': 'PLAYING',
+        'gameMode': 'SUN',
+        'trumpSuit': None,
+        'dealerIndex': 3,
+        'tableCards': [],
+        'currentRoundTricks': tricks,
+        'teamScores': {'us': 0, 'them': 0},
+        'matchScores': {'us': 0, 'them': 0},
+    }
+
+
+def _world(hands):
+    return FastGame([[Card(s, r) for s, r in h] for h in hands],
+                    trump=None, mode='SUN', current_turn=0, dealer_index=3)
+
+
+OPENING = [
+    [('♠', 'A'), ('♥', '7'), ('♦', 'K')],
+    [('♠', '10'), ('♥', '8'), ('♦', '7')],
+    [('♠', 'K'), ('♥', '9'), ('♣', 'A')],
+    [('♠', '7'), ('♥', 'J'), ('♣', '8')],
+]
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        tt = TranspositionTable(max_entries=2)
+        tt.put(1, 'a')
+        tt.put(2, 'b')
+        self.assertEqual(tt.get(1), 'a')  # 1 is now most recent
+        tt.put(3, 'c')
+        self.assertIsNone(tt.get(2))
+        self.assertEqual(tt.stats(), {'entries': 2, 'hits': 1, 'misses': 1,
+                                      'evictions': 1, 'hit_rate': 0.5})
+
+    def test_key_depends_on_position_not_path(self):
+        played = _world(OPENING)
+        for _ in range(4):
+            played.apply_move(0)  # ♠ trick, won by Bottom's ♠A (25 points)
+        rest = [h[1:] for h in OPENING]
+        fresh = FastGame([[Card(s, r) for s, r in h] for h in rest],
+                         trump=None, mode='SUN', current_turn=0, dealer_index=3, us_score=25)
+        self.assertEqual(zobrist_key(played), zobrist_key(fresh))
+        self.assertNotEqual(zobrist_key(played), zobrist_key(_world(OPENING)))
+
+    def test_key_depends_on_hand_order(self):
+        swapped = [list(h) for h in OPENING]
+        swapped[1] = [swapped[1][1], swapped[1][0], swapped[1][2]]
+        self.assertNotEqual(zobrist_key(_world(OPENING)), zobrist_key(_world(swapped)))
+
+    def test_search_resumes_stored_root(self):
+        tt = TranspositionTable()
+        solver = MCTSSolver(transposition_table=tt)
+        solver.search_with_details(_world(OPENING), timeout_ms=5000, max_iterations=100)
+        _, details = solver.search_with_details(_world(OPENING), timeout_ms=5000, max_iterations=150)
+        # Only the missing 50 visits are searched
+        self.assertEqual(sum(d['visits'] for d in details.values()), 150)
+        self.assertGreater(tt.hits, 0)
+
+
+class TestSubtreeReuse(unittest.TestCase):
+    HAND = [_c('♠', 'A'), _c('♥', '7'), _c('♦', 'K')]
+
+    def test_world_is_carried_over_to_next_decision(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE)
+        first = BotContext(_state(self.HAND, []), 0)
+        world = _world(OPENING)
+        optimizer._search([world], 5000, 200)
+        optimizer._remember_worlds(first, [world])
+
+        # Bottom leads ♠A and wins; same seat to act again
+        trick = {'cards': [_play('♠', 'A', 'Bottom'), _play('♠', '10', 'Right'),
+                           _play('♠', 'K', 'Top'), _play('♠', '7', 'Left')], 'winner': 'Bottom'}
+        second = BotContext(_state(self.HAND[1:], [trick]), 0)
+        worlds = optimizer._sample_worlds(second)
+        self.assertEqual(len(worlds), 1)
+        self.assertEqual([len(h) for h in worlds[0].hands], [2, 2, 2, 2])
+        self.assertEqual(worlds[0].scores['us'], 25)
+
+        tt = optimizer.transposition_table
+        root = tt.get(zobrist_key(worlds[0]))
+        self.assertGreater(root.visits, 0)  # Grown by the first decision
+        optimizer._search(worlds, 5000, 200)
+        self.assertIs(tt.get(zobrist_key(worlds[0])), root)
+        self.assertEqual(root.visits, 200)
+
+    def test_world_is_carried_over_for_bot_not_at_bottom(self):
+        # Worlds are bot-relative: Right's world index 0 is Right itself
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE)
+        first = BotContext(_state(self.HAND, [], seat=1), 1)
+        world = _world(OPENING)
+        optimizer._search([world], 5000, 200)
+        optimizer._remember_worlds(first, [world])
+
+        # Right leads ♠A and wins; Top, Left and Bottom are world seats 1-3
+        trick = {'cards': [_play('♠', 'A', 'Right'), _play('♠', '10', 'Top'),
+                           _play('♠', 'K', 'Left'), _play('♠', '7', 'Bottom')], 'winner': 'Right'}
+        second = BotContext(_state(self.HAND[1:], [trick], seat=1), 1)
+        worlds = optimizer._carry_over_worlds(second, 1)
+        self.assertEqual(len(worlds), 1)
+        self.assertEqual(worlds[0].scores['us'], 25)
+        self.assertGreater(optimizer.transposition_table.get(zobrist_key(worlds[0])).visits, 0)
+
+    def test_carried_over_and_fresh_worlds_score_alike(self):
+        # The carried-over world has replayed the ♠ trick (us 25); a fresh
+        # sample of the same position starts at 0: the outcome must not differ
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE)
+        optimizer._remember_worlds(BotContext(_state(self.HAND, []), 0), [_world(OPENING)])
+        trick = {'cards': [_play('♠', 'A', 'Bottom'), _play('♠', '10', 'Right'),
+                           _play('♠', 'K', 'Top'), _play('♠', '7', 'Left')], 'winner': 'Bottom'}
+        [carried] = optimizer._carry_over_worlds(BotContext(_state(self.HAND[1:], [trick]), 0), 1)
+        fresh = _world([h[1:] for h in OPENING])
+        self.assertEqual((carried.scores['us'], fresh.scores['us']), (25, 0))
+
+        results = []
+        for world in (carried, fresh):
+            random.seed(11)
+            results.append(MCTSSolver().search_with_details(world, timeout_ms=5000, max_iterations=40))
+        self.assertEqual(results[0], results[1])
+
+    def test_inconsistent_world_is_resampled(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE)
+        first = BotContext(_state(self.HAND, []), 0)
+        optimizer._remember_worlds(first, [_world(OPENING)])
+
+        # Right showed ♣Q, which the stored world never dealt to Right
+        trick = {'cards': [_play('♠', 'A', 'Bottom'), _play('♣', 'Q', 'Right'),
+                           _play('♠', 'K', 'Top'), _play('♠', '7', 'Left')], 'winner': 'Bottom'}
+        second = BotContext(_state(self.HAND[1:], [trick]), 0)
+        self.assertEqual(optimizer._carry_over_worlds(second, 1), [])
+
+    def test_reuse_can_be_disabled(self):
+        optimizer = CognitiveOptimizer(search_mode=SEARCH_SINGLE, reuse_tree=False)
+        self.assertIsNone(optimizer.solver.transposition_table)
+        first = BotContext(_state(self.HAND, []), 0)
+        optimizer._remember_worlds(first, [_world(OPENING)])
+        self.assertEqual(len(optimizer._carried), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
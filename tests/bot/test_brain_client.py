@@ -0,0 +1,137 @@
+"""Local Brain cache, known-hash snapshot and batched analysis queue."""
+import json
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from ai_worker import brain_client
+from ai_worker.brain_client import ANALYZE_QUEUE, OVERRIDE_KEY, BrainClient
+
+MOVE = {'rank': 'A', 'suit': '♠', 'reason': 'taught'}
+
+
+class TestBrainLookups(unittest.TestCase):
+    def setUp(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.redis.set('brain:correct:known', json.dumps(MOVE))
+        self.brain = BrainClient(redis_client=self.redis)
+
+    def _round_trips(self):
+        return mock.patch.object(self.redis, 'pipeline', wraps=self.redis.pipeline)
+
+    def test_snapshot_answers_misses_locally(self):
+        self.brain.refresh_snapshot()
+        with self._round_trips() as pipeline:
+            for i in range(50):
+                self.assertIsNone(self.brain.lookup_move(f"miss{i}"))
+            self.assertEqual(self.brain.lookup_move('known'), MOVE)
+            self.assertEqual(self.brain.lookup_move('known'), MOVE)  # Cached
+        self.assertEqual(pipeline.call_count, 1)
+        stats = self.brain.stats()
+        self.assertEqual((stats['snapshot_misses'], stats['redis_lookups'], stats['hits']), (50, 1, 1))
+        self.assertEqual(stats['known_hashes'], 1)
+
+    def test_lookups_are_published_as_metrics(self):
+        from server.metrics import metrics
+        metrics.drain()
+        self.brain.refresh_snapshot()
+        for context_hash in ('miss', 'known', 'known'):
+            self.brain.lookup_move(context_hash)
+        drained = metrics.drain()
+        lookups = {dict(labels)['result']: value for (name, labels), value in drained.items()
+                   if name == 'baloot_brain_lookups_total'}
+        self.assertEqual(lookups, {'snapshot_miss': 1, 'redis': 1, 'hit': 1})
+
+    def test_negative_cache_without_snapshot(self):
+        with mock.patch.object(self.brain, '_maybe_refresh'), self._round_trips() as pipeline:
+            self.assertIsNone(self.brain.lookup_move('miss'))
+            self.assertIsNone(self.brain.lookup_move('miss'))
+            self.assertEqual(self.brain.lookup_move('known'), MOVE)
+        self.assertEqual(pipeline.call_count, 2)
+        self.assertEqual(self.brain.stats()['negative_hits'], 1)
+
+    def test_snapshot_refresh_sees_new_and_deleted_moves(self):
+        self.brain.refresh_snapshot()
+        self.assertIsNone(self.brain.lookup_move('later'))
+        self.assertEqual(self.brain.lookup_move('known'), MOVE)
+
+        self.redis.set('brain:correct:later', json.dumps(MOVE))
+        self.redis.delete('brain:correct:known')
+        self.brain.refresh_snapshot()
+        self.assertEqual(self.brain.lookup_move('later'), MOVE)
+        self.assertIsNone(self.brain.lookup_move('known'))  # Cached entry dropped
+
+    def test_override_key_still_applies(self):
+        self.redis.set(OVERRIDE_KEY, json.dumps({'action': 'PASS'}))
+        self.brain.refresh_snapshot()
+        self.assertEqual(self.brain.lookup_move('anything'), {'action': 'PASS'})
+        self.assertEqual(self.brain.lookup_move('known'), MOVE)
+
+    def test_stale_snapshot_is_not_trusted(self):
+        self.brain.refresh_snapshot()
+        self.redis.set('brain:correct:new', json.dumps(MOVE))
+        self.brain._snapshot_at -= brain_client.SNAPSHOT_MAX_AGE
+        with mock.patch.object(self.brain, '_maybe_refresh'):
+            self.assertEqual(self.brain.lookup_move('new'), MOVE)
+
+    def test_background_refresh(self):
+        self.brain.lookup_move('x')  # Starts the first refresh
+        deadline = time.monotonic() + 5
+        while self.brain.stats()['snapshots'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.brain.stats()['snapshots'], 1)
+        before = self.brain.stats()['snapshot_misses']
+        self.assertIsNone(self.brain.lookup_move('y'))
+        self.assertEqual(self.brain.stats()['snapshot_misses'], before + 1)
+
+    def test_returned_moves_are_copies(self):
+        self.brain.refresh_snapshot()
+        self.brain.lookup_move('known')['rank'] = 'X'
+        self.assertEqual(self.brain.lookup_move('known'), MOVE)
+
+
+class TestAnalysisQueue(unittest.TestCase):
+    def setUp(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.brain = BrainClient(redis_client=self.redis)
+
+    def test_batched_in_order(self):
+        n = brain_client.QUEUE_BATCH
+        with mock.patch.object(self.redis, 'lpush', wraps=self.redis.lpush) as lpush:
+            for i in range(n + 3):
+                self.brain.queue_analysis({'i': i})
+            self.assertEqual(lpush.call_count, 1)
+            self.brain.flush_analysis()
+            self.assertEqual(lpush.call_count, 2)
+        # Same list as one LPUSH per payload: newest first
+        queued = [json.loads(v)['i'] for v in self.redis.lrange(ANALYZE_QUEUE, 0, -1)]
+        self.assertEqual(queued, list(reversed(range(n + 3))))
+
+    def test_old_payloads_flush_on_next_lookup(self):
+        self.brain.queue_analysis({'i': 0})
+        self.brain._queue_since -= brain_client.QUEUE_FLUSH_SECONDS
+        self.brain.lookup_move('x')
+        self.assertEqual(self.redis.llen(ANALYZE_QUEUE), 1)
+
+    def test_background_thread_flushes_without_lookups(self):
+        self.brain.queue_analysis({'i': 0})
+        deadline = time.monotonic() + 5
+        while not self.redis.llen(ANALYZE_QUEUE) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.redis.llen(ANALYZE_QUEUE), 1)
+
+    def test_pool_worker_exit_flushes_buffer(self):
+        """Pool workers exit through multiprocessing's finalizers, not atexit"""
+        with mock.patch.object(brain_client, 'QUEUE_FLUSH_SECONDS', 60):
+            self.brain.queue_analysis({'i': 0})
+            self.assertEqual(self.redis.llen(ANALYZE_QUEUE), 0)
+            self.brain._exit_flush()  # What multiprocessing runs as the worker exits
+        self.assertEqual(self.redis.llen(ANALYZE_QUEUE), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,51 @@
 """Tests for the endgame solver (minimax with alpha-beta pruning).
 
-The endgame solver activates when each player holds 1-3 cards, making
-exhaustive search feasible. Tests cover optimal play detection, trump
-timing, sweep pressure, fallback heuristics, and edge cases.
+The endgame solver activates when each player holds up to
+ENDGAME_MAX_CARDS cards, making exhaustive search feasible. Tests cover
+optimal play detection, trump timing, sweep pressure, fallback heuristics,
+edge cases, and agreement with a brute-force FastGame minimax.
 """
 from __future__ import annotations
 
+import random
 import unittest
 from game_engine.models.card import Card
 
-from ai_worker.strategies.components.endgame_solver import solve_endgame, resolve_trick
+from ai_worker.mcts.bitboard import card_id, id_to_card
+from ai_worker.mcts.fast_game import FastGame
+from ai_worker.mcts.mcts import MCTSSolver
+from ai_worker.strategies.components.endgame_solver import (
+    DoubleDummySolver, POSITIONS, solve_endgame, resolve_trick,
+)
+
+
+def _brute_force(game):
+    """Plain minimax over FastGame: team 'us' points from here on."""
+    if game.is_finished:
+        return game.scores['us']
+    values = []
+    for move in game.get_legal_moves():
+        child = game.clone()
+        child.apply_move(move)
+        values.append(_brute_force(child))
+    return max(values) if game.teams[game.current_turn] == 'us' else min(values)
+
+
+def _random_endgame(rng, n):
+    """Random n-card endgame with 0-3 cards already on the table."""
+    deck = list(range(32))
+    rng.shuffle(deck)
+    mode, trump = rng.choice(['SUN', 'HOKUM']), rng.choice(['♠', '♥', '♦', '♣'])
+    leader = rng.randrange(4)
+    hands = [deck[i * n:(i + 1) * n] for i in range(4)]
+    trick = []
+    for j in range(rng.randrange(4)):
+        seat = (leader + j) % 4
+        trick.append((seat, hands[seat].pop()))
+    game = FastGame([[id_to_card(c) for c in h] for h in hands], trump, mode, leader, 0,
+                    table_cards=[{'card': id_to_card(c), 'playedBy': POSITIONS[s]} for s, c in trick])
+    masks = [sum(1 << c for c in h) for h in hands]
+    return game, mode, trump, masks, leader, trick
 
 
 class TestEndgameSolver(unittest.TestCase):
@@ -235,5 +271,61 @@ class TestEndgameSolver(unittest.TestCase):
         self.assertIn("Minimax", result["reasoning"])
 
 
+    def test_table_cards_are_respected(self):
+        """Right's A♠ wins the trick on the table whatever Bottom plays, so
+        Bottom keeps the 10♠ to beat Right's last 8♠ rather than give it away."""
+        my_hand = [Card("♠", "10"), Card("♠", "7")]
+        known_hands = {
+            "Right": [Card("♠", "8")],
+            "Top":   [Card("♥", "8")],
+            "Left":  [Card("♥", "9"), Card("♦", "10")],
+        }
+        table = [{"card": Card("♠", "A"), "playedBy": "Right"},
+                 {"card": Card("♠", "K"), "playedBy": "Top"}]
+        result = solve_endgame(my_hand, known_hands, "Bottom", "Right", "SUN",
+                               table_cards=table)
+        self.assertIn("Not our turn", result["reasoning"])  # Left is next
+
+        known_hands["Left"] = [Card("♥", "9")]
+        table.append({"card": Card("♦", "10"), "playedBy": "Left"})
+        result = solve_endgame(my_hand, known_hands, "Bottom", "Right", "SUN",
+                               table_cards=table)
+        self.assertIn("Minimax", result["reasoning"])
+        self.assertEqual(result["cardIndex"], 1)
+
+class TestDoubleDummyExact(unittest.TestCase):
+    """The bitmask solver against brute force on random small endgames."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for n, count in ((2, 60), (3, 25)):
+            for _ in range(count):
+                game, mode, trump, masks, leader, trick = _random_endgame(rng, n)
+                solver = DoubleDummySolver(mode, trump)
+                self.assertEqual(solver.value(masks, leader, trick), _brute_force(game))
+
+                seat = (leader + len(trick)) % 4
+                values = solver.move_values(masks, leader, trick)
+                legal = {card_id(game.hands[seat][i]): i for i in game.get_legal_moves()}
+                self.assertEqual(set(values), set(legal))  # Partition twins included
+                for cid, value in values.items():
+                    child = game.clone()
+                    child.apply_move(legal[cid])
+                    self.assertEqual(value, _brute_force(child))
+
+    def test_inconsistent_hand_sizes_raise(self):
+        solver = DoubleDummySolver('SUN')
+        with self.assertRaises(ValueError):
+            solver.value([0b11, 0b1100, 0b110000, 0b1000000], 0)
+
+    def test_mcts_exact_leaf_is_final_score_diff(self):
+        rng = random.Random(3)
+        for _ in range(10):
+            game, mode, trump, masks, _, trick = _random_endgame(rng, 2)
+            exact = MCTSSolver(exact_leaf_cards=2)._exact_score_diff(game.clone())
+            total = DoubleDummySolver(mode, trump).total_points(masks, trick)
+            self.assertEqual(exact, 2 * _brute_force(game) - total)
+        self.assertIsNone(MCTSSolver(exact_leaf_cards=1)._exact_score_diff(game))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+"""Incremental per-seat card knowledge fed by game events."""
+import unittest
+
+from game_engine.logic.game import Game
+from game_engine.models.constants import GamePhase
+from ai_worker.knowledge import KnowledgeRegistry
+from ai_worker.memory import CardMemory
+from ai_worker.bot_context import BotContext
+
+MEMORY_FIELDS = ('played_cards', 'voids', 'discards', 'suspected_crimes',
+                 'suit_probability', 'cards_remaining')
+
+
+def _playing_game(room_id='knowledge_room', mode='HOKUM'):
+    game = Game(room_id)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    game.strictMode = False
+    game.handle_bid(game.current_turn, mode)
+    if game.phase != GamePhase.PLAYING.value:
+        game.phase = GamePhase.PLAYING.value
+    return game
+
+
+def _play_one(game, pick_illegal=False):
+    idx = game.current_turn
+    hand = game.players[idx].hand
+    legal = [i for i, c in enumerate(hand) if game.is_valid_move(c, hand)]
+    illegal = [i for i in range(len(hand)) if i not in legal]
+    card_idx = illegal[0] if (pick_illegal and illegal) else legal[0]
+    return game.play_card(idx, card_idx)
+
+
+class TestKnowledgeRegistry(unittest.TestCase):
+    def assertMemoryEqual(self, live, fresh):
+        for field in MEMORY_FIELDS:
+            self.assertEqual(getattr(live, field), getattr(fresh, field), field)
+
+    def test_events_keep_memory_equal_to_rebuild(self):
+        game = _playing_game()
+        registry = KnowledgeRegistry()
+        registry.attach(game)
+        registry.attach(game)  # Idempotent
+        self.assertEqual(game.observers.count(registry), 1)
+
+        plays = 0
+        while game.phase == GamePhase.PLAYING.value and plays < 32:
+            state = game.get_game_state()
+            for seat in range(4):
+                memory, tracker = registry.lookup(state, seat)
+                fresh = CardMemory()
+                fresh.populate_from_state(state)
+                self.assertMemoryEqual(memory, fresh)
+                ctx = BotContext(state, seat)
+                self.assertEqual(tracker._played, ctx.tracker._played)
+                self.assertEqual(tracker._void, ctx.tracker._void)
+                self.assertEqual(tracker._hand, ctx.tracker._hand)
+            # Off-suit plays exercise void / crime inference
+            self.assertTrue(_play_one(game, pick_illegal=plays % 5 == 2).get('success'))
+            plays += 1
+
+        # Seeded once per seat, everything after came from events
+        self.assertGreater(plays, 8)
+        self.assertEqual(registry.rebuilds, 4)
+        self.assertEqual(registry.hits, 4 * plays - 4)
+
+    def test_missed_events_are_caught_up(self):
+        game = _playing_game()
+        registry = KnowledgeRegistry()
+        registry.attach(game)
+        registry.lookup(game.get_game_state(), 0)
+        game.observers.remove(registry)
+        for _ in range(3):
+            _play_one(game)
+
+        state = game.get_game_state()
+        memory, _ = registry.lookup(state, 0)
+        fresh = CardMemory()
+        fresh.populate_from_state(state)
+        self.assertMemoryEqual(memory, fresh)
+        self.assertEqual((registry.rebuilds, registry.catch_ups), (1, 1))
+
+    def test_diverged_history_falls_back_to_rebuild(self):
+        game = _playing_game()
+        registry = KnowledgeRegistry()
+        _play_one(game)
+        registry.lookup(game.get_game_state(), 0)
+
+        # The card the view has seen is not the one the state shows
+        state = game.get_game_state()
+        other = next(c for c in CardMemory().get_remaining_cards()
+                     if f"{c['rank']}{c['suit']}" not in {f"{tc['card']['rank']}{tc['card']['suit']}"
+                                                          for tc in state['tableCards']})
+        state['tableCards'][0]['card'] = other
+        memory, _ = registry.lookup(state, 0)
+        fresh = CardMemory()
+        fresh.populate_from_state(state)
+        self.assertMemoryEqual(memory, fresh)
+        self.assertEqual((registry.rebuilds, registry.catch_ups), (2, 0))
+
+    def test_unattached_registry_catches_up_from_state(self):
+        """A decision worker never sees the game's events: lookups apply the missing plays"""
+        game = _playing_game()
+        registry = KnowledgeRegistry()
+        plays = 0
+        while game.phase == GamePhase.PLAYING.value and plays < 20:
+            state = game.get_game_state()
+            seat = game.current_turn
+            memory, tracker = registry.lookup(state, seat)
+            fresh = CardMemory()
+            fresh.populate_from_state(state)
+            self.assertMemoryEqual(memory, fresh)
+            ctx = BotContext(state, seat)
+            self.assertEqual(tracker._played, ctx.tracker._played)
+            self.assertEqual(tracker._void, ctx.tracker._void)
+            self.assertTrue(_play_one(game, pick_illegal=plays % 5 == 2).get('success'))
+            plays += 1
+
+        self.assertEqual(registry.rebuilds, 4)  # First lookup per seat only
+        self.assertEqual(registry.catch_ups, plays - 4)
+
+    def test_verify_reseeds_diverged_memory(self):
+        game = _playing_game()
+        registry = KnowledgeRegistry(verify=True)
+        registry.attach(game)
+        memory, _ = registry.lookup(game.get_game_state(), 1)
+        memory.mark_void('Top', '♠')  # Corrupt without touching the counts
+
+        state = game.get_game_state()
+        memory, _ = registry.lookup(state, 1)
+        self.assertEqual(registry.mismatches, 1)
+        fresh = CardMemory()
+        fresh.populate_from_state(state)
+        self.assertMemoryEqual(memory, fresh)
+
+    def test_new_round_forgets_room(self):
+        game = _playing_game()
+        registry = KnowledgeRegistry()
+        registry.attach(game)
+        registry.lookup(game.get_game_state(), 0)
+        game.reset_round_state()
+        self.assertEqual(registry.stats()['rooms'], 0)
+
+    def test_rooms_are_lru_bounded(self):
+        registry = KnowledgeRegistry(max_rooms=2)
+        for room in ('a', 'b', 'c'):
+            registry.lookup(_playing_game(room).get_game_state(), 0)
+        self.assertEqual(registry.stats()['rooms'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
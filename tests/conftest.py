@@ -4,3 +4,10 @@ import os
 # Add the project root directory to sys.path
 # This ensures that tests in this directory can import modules from the project root
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Some modules replace sys.modules['redis'] with a mock at import time; load
+# fakeredis against the real client first so later tests can still use it.
+try:
+    import fakeredis  # noqa: F401
+except ImportError:
+    pass
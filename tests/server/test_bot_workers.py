@@ -0,0 +1,231 @@
+"""Bot decisions in worker processes (server/bot_workers.py)."""
+import os
+import time
+import unittest
+from unittest import mock
+
+import gevent
+
+from ai_worker.knowledge import KnowledgeRegistry
+from game_engine.logic.game import Game
+from game_engine.models.constants import GamePhase
+from server.bot_workers import DecisionPool, _run_in_worker, agent_decision, rules_decision
+from server.metrics import metrics
+
+
+def _worker_pid(game_state, player_index):
+    return {'action': 'PASS', 'pid': os.getpid(), 'seat': player_index}
+
+
+def _think(game_state, player_index):
+    """CPU-bound like an MCTS search: never yields."""
+    end = time.perf_counter() + game_state.get('think', 0.3)
+    while time.perf_counter() < end:
+        pass
+    return {'action': 'PASS', 'pid': os.getpid()}
+
+
+def _crash(game_state, player_index):
+    if game_state.get('crash'):
+        os._exit(1)
+    return {'action': 'PASS', 'pid': os.getpid()}
+
+
+def _timed_stage(game_state, player_index):
+    metrics.observe('test_worker_stage_seconds', 0.25, stage='mcts')
+    return {'action': 'PASS', 'pid': os.getpid()}
+
+
+_knowledge = KnowledgeRegistry()
+
+
+def _knowledge_stats(game_state, player_index):
+    """The worker's own registry, which no game events reach."""
+    _knowledge.lookup(game_state, player_index)
+    return _knowledge.stats()
+
+
+def _fallback(game_state, player_index):
+    return {'action': 'PASS', 'reasoning': 'fallback'}
+
+
+class TestDecisionPool(unittest.TestCase):
+    def setUp(self):
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.shutdown()
+
+    def _pool(self, **kwargs):
+        kwargs.setdefault('fallback_fn', _fallback)
+        pool = DecisionPool(**kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def test_inline_when_no_workers(self):
+        pool = self._pool(workers=0, decide_fn=_worker_pid)
+        self.assertEqual(pool.decide({}, 2)['pid'], os.getpid())
+
+    def test_rooms_stick_to_one_worker(self):
+        pool = self._pool(workers=2, decide_fn=_worker_pid)
+        first = pool.decide({}, 1, room_id='room-a')
+        self.assertNotEqual(first['pid'], os.getpid())
+        self.assertEqual(first['seat'], 1)
+        for _ in range(3):
+            self.assertEqual(pool.decide({}, 0, room_id='room-a')['pid'], first['pid'])
+        self.assertEqual(pool.stats()['completed'], 4)
+
+    def test_deadline_falls_back_to_heuristic(self):
+        pool = self._pool(workers=1, deadline=0.2, decide_fn=_think)
+        waits = []
+        start = time.monotonic()
+        decision = pool.decide({'think': 2.0}, 0, room_id='slow', sleep=lambda s: (waits.append(s), time.sleep(s)))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(decision['reasoning'], 'fallback')
+        self.assertEqual(pool.timeouts, 1)
+        self.assertTrue(waits)  # Waited through the cooperative sleep
+
+    def test_overrun_worker_does_not_hold_up_its_slot(self):
+        """A stuck decision is killed at its deadline; the room queued behind it gets a real one"""
+        pool = self._pool(workers=1, deadline=1.0, decide_fn=_think)
+        pool.decide({'think': 0}, 0, room_id='warm')
+        stuck = gevent.spawn(pool.decide, {'think': 30}, 0, 'stuck', gevent.sleep)
+        gevent.sleep(0.5)
+        start = time.monotonic()
+        queued = gevent.spawn(pool.decide, {'think': 0.05}, 0, 'queued', gevent.sleep)
+        gevent.joinall([stuck, queued])
+        self.assertEqual(stuck.value['reasoning'], 'fallback')
+        self.assertNotIn('reasoning', queued.value)  # Decided by the fresh worker
+        self.assertLess(time.monotonic() - start, 1.0)  # Well before its own deadline
+        self.assertEqual((pool.timeouts, pool.failures), (1, 0))
+
+    def test_queued_timeout_leaves_the_busy_worker_alone(self):
+        """A request that only waited in the queue falls back without killing the running decision"""
+        pool = self._pool(workers=1, deadline=0.3, decide_fn=_think)
+        pool.decide({'think': 0}, 0, room_id='warm')
+        executor = pool._executor(0)
+        healthy = executor.submit(_run_in_worker, _think, {'think': 1.0}, 0)  # Another room's decision
+        time.sleep(0.1)
+        self.assertEqual(pool.decide({'think': 0}, 0, room_id='queued')['reasoning'], 'fallback')
+        self.assertIs(pool._executors[0], executor)  # Worker kept
+        self.assertEqual(healthy.result(timeout=5)[0]['action'], 'PASS')
+        self.assertEqual(pool.timeouts, 1)
+
+    def test_dead_worker_is_replaced(self):
+        pool = self._pool(workers=1, decide_fn=_crash)
+        self.assertEqual(pool.decide({'crash': True}, 0)['reasoning'], 'fallback')
+        self.assertEqual(pool.failures, 1)
+        self.assertIn('pid', pool.decide({}, 0))
+
+    def test_event_loop_stays_responsive(self):
+        """Greenlets keep running while several bots think in workers"""
+        pool = self._pool(workers=2, deadline=10, decide_fn=_think)
+        pool.decide({'think': 0}, 0, room_id='r0')  # Start the workers
+        pool.decide({'think': 0}, 0, room_id='r1')
+        gaps, done = [], []
+
+        def ticker():
+            last = time.perf_counter()
+            while not done:
+                gevent.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = gevent.spawn(ticker)
+        bots = [gevent.spawn(pool.decide, {'think': 0.3}, 0, f'r{i % 2}', gevent.sleep) for i in range(4)]
+        gevent.joinall(bots)
+        done.append(True)
+        tick.join()
+        self.assertTrue(all(b.value['action'] == 'PASS' for b in bots))
+        self.assertLess(max(gaps), 0.1)
+
+    def test_worker_metrics_reach_the_server(self):
+        metrics.observe('test_worker_stage_seconds', 0.25, stage='mcts')  # Inherited through fork, not resent
+        pool = self._pool(workers=1, decide_fn=_timed_stage)
+        for _ in range(2):
+            self.assertNotEqual(pool.decide({}, 0)['pid'], os.getpid())
+        histogram = metrics.histogram('test_worker_stage_seconds', stage='mcts')
+        self.assertEqual(histogram.count, 3)
+        self.assertAlmostEqual(histogram.total, 0.75)
+        metrics.drain()
+
+    def test_worker_card_memory_stays_incremental(self):
+        game = Game('knowledge_pool_room')
+        for i in range(4):
+            game.add_player(f"p{i}", f"Bot {i}")
+        game.start_game()
+        game.handle_bid(game.current_turn, 'SUN', None)
+        while game.phase != GamePhase.PLAYING.value:
+            game.handle_bid(game.current_turn, 'PASS', None)
+        pool = self._pool(workers=1, deadline=30, decide_fn=_knowledge_stats)
+        for _ in range(12):
+            stats = pool.decide(game.get_game_state(), game.current_turn, 'knowledge_pool_room')
+            decision = rules_decision(game.get_game_state(), game.current_turn)
+            self.assertTrue(game.play_card(game.current_turn, decision['cardIndex']).get('success'))
+        self.assertEqual(stats['rebuilds'], 4)
+        self.assertEqual(stats['catch_ups'], 8)
+
+    def test_real_agent_decision(self):
+        game = Game('pool_room')
+        for i in range(4):
+            game.add_player(f"p{i}", f"Bot {i}")
+        game.start_game()
+        pool = self._pool(workers=1, deadline=30, decide_fn=agent_decision)
+        decision = pool.decide(game.get_game_state(), game.current_turn, 'pool_room')
+        self.assertIn(decision.get('action'), ('PASS', 'SUN', 'HOKUM', 'ASHKAL', 'KAWESH'))
+        self.assertEqual(pool.stats()['completed'], 1)
+
+
+class TestRulesDecision(unittest.TestCase):
+    def test_rules_decisions_are_legal(self):
+        game = Game('rules_room')
+        for i in range(4):
+            game.add_player(f"p{i}", f"Bot {i}")
+        game.start_game()
+        opening = rules_decision(game.get_game_state(), game.current_turn)
+        self.assertTrue(game.handle_bid(game.current_turn, opening['action'], opening.get('suit')).get('success'))
+        if game.phase == 'BIDDING' and not game.bid.get('type'):
+            game.handle_bid(game.current_turn, 'SUN', None)
+        while game.phase != 'PLAYING':
+            game.handle_bid(game.current_turn, 'PASS', None)
+        for _ in range(12):
+            decision = rules_decision(game.get_game_state(), game.current_turn)
+            self.assertEqual(decision['action'], 'PLAY')
+            self.assertTrue(game.play_card(game.current_turn, decision['cardIndex']).get('success'))
+
+    def test_each_bidding_phase_gets_a_legal_action(self):
+        game = Game('rules_phases')
+        for i in range(4):
+            game.add_player(f"p{i}", f"Bot {i}")
+        game.start_game()
+        bidder = game.current_turn
+        game.handle_bid(bidder, 'HOKUM', game.floor_card.suit)
+        state = game.get_game_state()
+        state['phase'] = 'BIDDING'
+        state['bid'] = {'type': 'HOKUM', 'bidder': game.players[bidder].position,
+                        'suit': game.floor_card.suit, 'doubled': False}
+        legal = {
+            'ROUND_1': {'PASS', 'SUN', 'HOKUM', 'ASHKAL'},
+            'ROUND_2': {'PASS', 'SUN', 'HOKUM', 'ASHKAL'},
+            'DOUBLING': {'PASS', 'DOUBLE'},
+            'VARIANT_SELECTION': {'OPEN', 'CLOSED'},
+        }
+        for bidding_phase, actions in legal.items():
+            seat = bidder if bidding_phase == 'VARIANT_SELECTION' else (bidder + 1) % 4
+            for reported in ({'biddingPhase': bidding_phase},
+                             {'phase': bidding_phase, 'biddingPhase': None}):
+                decision = rules_decision({**state, **reported}, seat)
+                self.assertIn(decision['action'], actions, f"{bidding_phase} via {reported}")
+
+    def test_heuristic_failure_falls_back_to_the_phase_default(self):
+        state = {'phase': 'VARIANT_SELECTION', 'players': []}
+        with mock.patch('ai_worker.strategies.bidding.BiddingStrategy.get_decision', side_effect=RuntimeError):
+            self.assertEqual(rules_decision(state, 0)['action'], 'OPEN')
+        with mock.patch('ai_worker.strategies.bidding.BiddingStrategy.get_decision', return_value={'action': 'PASS'}):
+            self.assertEqual(rules_decision(state, 0)['action'], 'OPEN')
+
+
+if __name__ == '__main__':
+    unittest.main()
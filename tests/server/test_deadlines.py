@@ -0,0 +1,181 @@
+"""Event-driven room timeouts (server/deadlines.py, handlers/timer.check_room_timeout)."""
+import sys
+import time
+import types
+import unittest
+from unittest import mock
+
+import pytest
+
+from game_engine.logic.game import Game
+from server.deadlines import DeadlineQueue, EXPIRY_SLACK
+from server.handlers import timer as timer_handler
+
+
+def _bidding_game(room_id):
+    game = Game(room_id)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    return game
+
+
+class TestNextDeadline(unittest.TestCase):
+    def test_follows_timer_reset_pause_resume(self):
+        game = _bidding_game('deadline_room')
+        game.reset_timer(5)
+        self.assertAlmostEqual(game.next_deadline(), game.timer.start_time + 5)
+        game.pause_timer()
+        self.assertIsNone(game.next_deadline())
+        game.resume_timer()
+        self.assertAlmostEqual(game.next_deadline(), game.timer.start_time + 5)
+        game.phase = 'FINISHED'
+        self.assertIsNone(game.next_deadline())
+
+    def test_timer_changes_reach_the_queue(self):
+        queue = DeadlineQueue()
+        game = _bidding_game('deadline_room')
+        queue.attach(game)
+        game.reset_timer(7)
+        self.assertAlmostEqual(queue.next_deadline(), game.timer.start_time + 7 + EXPIRY_SLACK)
+        game.pause_timer()
+        self.assertEqual(len(queue), 0)
+        self.assertIsNone(queue.next_deadline())
+
+
+class TestLocalQueue(unittest.TestCase):
+    def test_due_rooms_in_order_and_rescheduling_replaces(self):
+        queue = DeadlineQueue()
+        queue.set('a', 10)
+        queue.set('b', 5)
+        queue.set('c', 30)
+        queue.set('a', 20)  # Reset: the old entry at 10 is stale
+        self.assertEqual(queue.pop_due(now=15), ['b'])
+        self.assertEqual(queue.pop_due(now=25), ['a'])
+        self.assertEqual(queue.pop_due(now=25), [])
+        queue.set('c', None)
+        self.assertEqual(queue.pop_due(now=100), [])
+
+    def test_stale_entries_are_compacted(self):
+        queue = DeadlineQueue()
+        for i in range(1000):
+            queue.set('room', float(i))
+        self.assertLess(len(queue._heap), 100)
+        self.assertEqual(queue.pop_due(now=2000), ['room'])
+
+
+class TestSharedQueue(unittest.TestCase):
+    def setUp(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+
+    def test_each_expiry_is_claimed_by_one_worker(self):
+        a, b = DeadlineQueue(self.redis), DeadlineQueue(self.redis)
+        a.set('r1', 10)
+        b.set('r2', 12)
+        a.set('r3', 50)
+        claimed_a = a.pop_due(now=20)
+        claimed_b = b.pop_due(now=20)
+        self.assertEqual(sorted(claimed_a + claimed_b), ['r1', 'r2'])
+        self.assertEqual(b.pop_due(now=60), ['r3'])
+
+    def test_falls_back_to_local_deadlines_when_redis_fails(self):
+        broken = mock.MagicMock()
+        broken.zadd.side_effect = ConnectionError('down')
+        queue = DeadlineQueue(broken)
+        queue.set('r1', 10)
+        self.assertEqual(queue.pop_due(now=20), ['r1'])
+        broken.zrangebyscore.assert_not_called()  # Backing off after the failure
+
+    def test_outage_deadlines_reach_redis_when_it_returns(self):
+        queue = DeadlineQueue(self.redis)
+        queue.set('gone', 15)
+        with mock.patch.object(self.redis, 'zadd', side_effect=ConnectionError('down')):
+            queue.set('r1', 10)
+        queue.set('r2', 12)  # Still backing off: local only
+        queue.cancel('gone')
+        queue._redis_down_until = 0  # Retry window over
+
+        other = DeadlineQueue(self.redis)  # Another worker, reading only the shared set
+        self.assertEqual(queue.pop_due(now=1), [])  # Reconnects and writes back
+        self.assertEqual(sorted(other.pop_due(now=20)), ['r1', 'r2'])
+
+
+class TestTimerTask(unittest.TestCase):
+    def setUp(self):
+        self.queue = DeadlineQueue()
+        patcher = mock.patch.object(timer_handler, 'deadlines', self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rooms = mock.MagicMock()
+
+    def test_expired_room_times_out_and_is_rescheduled(self):
+        game = _bidding_game('expired_room')
+        self.queue.attach(game)
+        game.timer.start_time = time.time() - 100
+        self.queue.schedule(game)
+        self.rooms.get_game.return_value = game
+        turn = game.current_turn
+
+        # The real follow-ups (broadcast, bots, snapshots) are exercised elsewhere
+        lifecycle = types.ModuleType('server.handlers.game_lifecycle')
+        for name in ('broadcast_game_update', 'handle_bot_turn', 'save_match_snapshot', 'auto_restart_round'):
+            setattr(lifecycle, name, mock.MagicMock())
+        for room_id in self.queue.pop_due():
+            with mock.patch('server.handlers.timer.room_manager'), \
+                 mock.patch.dict(sys.modules, {'server.handlers.game_lifecycle': lifecycle}):
+                timer_handler.check_room_timeout(mock.MagicMock(), self.rooms, room_id)
+
+        self.rooms.get_game.assert_called_once_with('expired_room')
+        self.assertNotEqual(game.current_turn, turn)  # Timed-out bidder passed
+        lifecycle.broadcast_game_update.assert_called_once()
+        self.assertGreater(self.queue.next_deadline(), time.time())
+
+    def _routers(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        from server.process_manager import Heartbeat
+        from server.room_leases import RoomLeases, RoomRouter
+        server = fakeredis.FakeServer()
+        routers = []
+        for name in ('A', 'B'):
+            redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+            leases = RoomLeases(Heartbeat('game_server', redis, ttl=10, instance=name), shared=True)
+            leases.renew()
+            router = RoomRouter(leases, spawn=lambda fn, *args: fn(*args))
+            timer_handler.register_room_timeout(router, mock.MagicMock(), self.rooms)
+            routers.append(router)
+        return routers
+
+    def test_forwarded_timeout_for_a_moved_room_is_retried(self):
+        a, b = self._routers()
+        b.leases.acquire('moved_room')
+        a.dispatch('room_timeout', None, {'roomId': 'moved_room'}, wait=False)  # Queued for B
+
+        # B's heartbeat lapses and A takes the room before B reads its inbox
+        b.leases._owned.clear()
+        b.leases.redis.delete(b.leases.heartbeat.key)
+        a.leases.acquire('moved_room')
+        b.serve_once(timeout=1)
+        self.rooms.get_game.assert_not_called()
+        self.assertIn('moved_room', self.queue._deadlines)
+
+    def test_forwarded_timeout_that_fails_is_retried(self):
+        a, b = self._routers()
+        b.leases.acquire('broken_room')
+        self.rooms.get_game.side_effect = RuntimeError('boom')
+        a.dispatch('room_timeout', None, {'roomId': 'broken_room'}, wait=False)
+        b.serve_once(timeout=1)
+        self.assertIn('broken_room', self.queue._deadlines)
+        self.assertGreater(self.queue.next_deadline(), time.time())
+
+    def test_idle_rooms_are_not_loaded(self):
+        for i in range(50):
+            game = _bidding_game(f"idle_{i}")
+            game.reset_timer(30)
+            self.queue.attach(game)
+        self.assertEqual(self.queue.pop_due(), [])
+        self.rooms.get_game.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Queue-backed logging backend: routing, gates, budget, JSON (server/logging_utils.py)."""
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from server.logging_utils import GameLoggerAdapter, LogBackend, LogBudget, LogGate
+
+
+_forked_backend = None
+
+
+def _log_in_child(message, flush):
+    """Runs in a forked pool worker."""
+    logging.getLogger('test.forked.sherlock').warning(message)
+    return os.getpid(), _forked_backend.flush(timeout=2) if flush else None
+
+
+class TestLogBackend(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.backends = []
+
+    def tearDown(self):
+        for backend in self.backends:
+            backend.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _backend(self, **kwargs):
+        kwargs.setdefault('budget', 0)
+        backend = LogBackend(log_dir=self.dir, **kwargs)
+        self.backends.append(backend)
+        return backend
+
+    def _logger(self, backend, category):
+        return backend.logger(category, f"test.{self.id()}.{category}")
+
+    def _lines(self, filename):
+        with open(os.path.join(self.dir, filename), encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "needs fork")
+    def test_forked_workers_write_their_records(self):
+        global _forked_backend
+        _forked_backend = backend = self._backend()
+        backend.logger('sherlock', 'test.forked.sherlock')
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as pool:
+            pid, flushed = pool.submit(_log_in_child, "flushed in child", True).result(timeout=10)
+            self.assertTrue(flushed)
+            self.assertNotEqual(pid, os.getpid())
+            pool.submit(_log_in_child, "written at worker exit", False).result(timeout=10)
+        # The child writes its own file; only the parent rotates sherlock_debug.log
+        lines = self._lines(f'sherlock_debug.{pid}.log')
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith(" flushed in child"))
+        self.assertTrue(lines[1].endswith(" written at worker exit"))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'sherlock_debug.log')))
+
+    def test_categories_write_their_own_files(self):
+        backend = self._backend()
+        self._logger(backend, 'sherlock').info("scan")
+        self._logger(backend, 'client').info("[INFO] [UI] click")
+        self.assertTrue(backend.flush())
+        self.assertTrue(self._lines('sherlock_debug.log')[0].endswith(" scan"))
+        self.assertTrue(self._lines('client_debug.log')[0].endswith(" [INFO] [UI] click"))
+
+    def test_sinks_rotate(self):
+        backend = self._backend(max_bytes=200, backups=2)
+        log = self._logger(backend, 'timer')
+        for i in range(20):
+            log.info(f"HEARTBEAT {i} " + "x" * 40)
+        backend.flush()
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ['timer_monitor.log', 'timer_monitor.log.1', 'timer_monitor.log.2'])
+
+    def test_level_gate_and_sampling(self):
+        backend = self._backend(levels={'sherlock': 'WARNING'}, sampling={'client': 0.25})
+        self._logger(backend, 'sherlock').info("dropped")
+        self._logger(backend, 'sherlock').warning("kept")
+        client = self._logger(backend, 'client')
+        for i in range(100):
+            client.info(f"msg {i}")
+        backend.flush()
+        self.assertEqual(len(self._lines('sherlock_debug.log')), 1)
+        self.assertEqual(len(self._lines('client_debug.log')), 25)
+        self.assertEqual(backend.stats()['client']['sampled_out'], 75)
+
+    def test_budget_spares_warnings(self):
+        backend = self._backend(budget=10)
+        log = self._logger(backend, 'client')
+        for i in range(100):
+            log.info(f"msg {i}")
+        log.error("still written")
+        backend.flush()
+        lines = self._lines('client_debug.log')
+        self.assertLess(len(lines), 20)
+        self.assertTrue(lines[-1].endswith("still written"))
+        self.assertGreater(backend.stats()['client']['over_budget'], 80)
+
+    def test_json_keeps_adapter_context(self):
+        backend = self._backend(fmt='json')
+        log = GameLoggerAdapter(self._logger(backend, 'server'), room_id='room-1', player='Abu Fahad')
+        log.info("Player joined", extra={'seat': 2})
+        backend.flush()
+        record = json.loads(self._lines('server_manual.log')[0])
+        self.assertEqual((record['room_id'], record['player'], record['seat']), ('room-1', 'Abu Fahad', 2))
+        self.assertEqual(record['msg'], "Player joined")
+
+    def test_callers_never_wait_for_the_disk(self):
+        backend = self._backend()
+        log = self._logger(backend, 'sherlock')
+        backend.flush()  # Opens the sink
+        writer_threads = set()
+        sink = backend.listener.routes['sherlock'][0]
+        emit = sink.emit
+
+        def slow_emit(record):
+            writer_threads.add(threading.get_ident())
+            time.sleep(0.05)
+            emit(record)
+        sink.emit = slow_emit
+
+        start = time.perf_counter()
+        for i in range(10):
+            log.info(f"line {i}")
+        self.assertLess(time.perf_counter() - start, 0.05)
+        backend.flush()
+        self.assertEqual(len(self._lines('sherlock_debug.log')), 10)
+        self.assertNotIn(threading.get_ident(), writer_threads)
+
+
+class TestLogBudget(unittest.TestCase):
+    def test_refills_at_rate(self):
+        now = [0.0]
+        budget = LogBudget(5, clock=lambda: now[0])
+        self.assertEqual(sum(budget.take() for _ in range(10)), 5)
+        now[0] += 0.4
+        self.assertEqual(sum(budget.take() for _ in range(10)), 2)
+
+    def test_gate_samples_evenly(self):
+        gate = LogGate('client', sample=0.5)
+        record = logging.LogRecord('x', logging.INFO, __file__, 0, "m", None, None)
+        self.assertEqual([gate.filter(record) for _ in range(4)], [False, True, False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Latency histograms and Prometheus rendering (server/metrics.py)."""
+import random
+import unittest
+
+from server.metrics import LatencyHistogram, MetricsRegistry
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles_within_bucket_precision(self):
+        rng = random.Random(3)
+        values = sorted(rng.lognormvariate(-6, 1.5) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for v in values:
+            histogram.record(v)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(histogram.quantile(q), exact, delta=exact * 0.04 + 2e-6)
+        self.assertAlmostEqual(histogram.total, sum(values))
+
+    def test_cumulative_bounds(self):
+        histogram = LatencyHistogram()
+        for v in (0.00005, 0.0003, 0.002, 0.002, 3.0, 100.0):
+            histogram.record(v)
+        self.assertEqual(histogram.cumulative((0.0001, 0.001, 0.01, 5.0)), [1, 2, 4, 5])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_timed_and_timer_record(self):
+        registry = MetricsRegistry(enabled=True)
+
+        @registry.timed('op_seconds', op='x')
+        def work(a, b=1):
+            return a + b
+
+        self.assertEqual(work(1, b=2), 3)
+        with registry.timer('stage_seconds', stage='brain'):
+            pass
+        registry.observe('stage_seconds', 0.5, stage='brain')
+        self.assertEqual(registry.histogram('op_seconds', op='x').count, 1)
+        self.assertEqual(registry.histogram('stage_seconds', stage='brain').count, 2)
+
+    def test_disabled_is_a_no_op(self):
+        registry = MetricsRegistry(enabled=False)
+
+        def work():
+            return 1
+
+        self.assertIs(registry.timed('op_seconds')(work), work)
+        with registry.timer('stage_seconds', stage='mcts'):
+            pass
+        registry.observe('stage_seconds', 0.5)
+        self.assertEqual(registry.render(), "\n")
+
+    def test_drain_and_merge(self):
+        worker, server = MetricsRegistry(enabled=True), MetricsRegistry(enabled=True)
+
+        @worker.timed('decision_seconds')
+        def decide():
+            return 'PASS'
+
+        decide()
+        server.merge(worker.drain())
+        decide()  # Still recorded after a drain
+        server.merge(worker.drain())
+        self.assertEqual(server.histogram('decision_seconds').count, 2)
+        self.assertEqual(worker.drain(), {})
+
+    def test_counters_drain_merge_and_render(self):
+        worker, server = MetricsRegistry(enabled=True), MetricsRegistry(enabled=True)
+        hits = worker.counter('lookups_total', result='hit')
+        hits.inc()
+        hits.inc(2)
+        server.counter('lookups_total', result='hit').inc()
+        server.merge(worker.drain())
+        self.assertEqual(worker.drain(), {})
+        hits.inc()  # The looked-up counter keeps counting after a drain
+        server.merge(worker.drain())
+        lines = server.render().splitlines()
+        self.assertIn('# TYPE lookups_total counter', lines)
+        self.assertIn('lookups_total{result="hit"} 5', lines)
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.observe('baloot_room_seconds', 0.002, op='get_game')
+        text = registry.render({'baloot_bot_pool_timeouts': 3,
+                                'baloot_log_records_passed': {(('category', 'client'),): 7}})
+        lines = text.splitlines()
+        self.assertIn("# TYPE baloot_room_seconds histogram", lines)
+        self.assertIn('baloot_room_seconds_bucket{op="get_game",le="0.001"} 0', lines)
+        self.assertIn('baloot_room_seconds_bucket{op="get_game",le="0.0025"} 1', lines)
+        self.assertIn('baloot_room_seconds_bucket{op="get_game",le="+Inf"} 1', lines)
+        self.assertIn('baloot_room_seconds_count{op="get_game"} 1', lines)
+        self.assertIn("baloot_bot_pool_timeouts 3", lines)
+        self.assertIn('baloot_log_records_passed{category="client"} 7', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Bounded LRU of live rooms with hibernation to Redis (server/room_cache.py + RoomManager)."""
+import unittest
+from unittest import mock
+
+import pytest
+
+from game_engine.logic.game import Game
+from server.room_cache import RoomCache, estimate_size
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _game(room_id, started=True):
+    game = Game(room_id)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    if started:
+        game.start_game()
+    return game
+
+
+class TestEstimateSize(unittest.TestCase):
+    def test_grows_with_the_game_and_skips_shared_objects(self):
+        empty, dealt = Game('size_a'), _game('size_b')
+        self.assertGreater(estimate_size(dealt), estimate_size(empty))
+        shared = object()
+        big = {'payload': 'x' * 100_000}
+        dealt.observers.append(shared)
+        before = estimate_size(dealt)
+        dealt.observers.append(mock.Mock(state=big))  # Not a game_engine object: not followed
+        self.assertLess(estimate_size(dealt) - before, 10_000)
+
+
+class TestRoomCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = RoomCache(max_entries=3, budget=10 ** 9, max_rss=0, idle_seconds=600,
+                               min_idle_seconds=30, clock=self.clock)
+
+    def _fill(self, *room_ids):
+        for room_id in room_ids:
+            self.cache[room_id] = Game(room_id)
+            self.clock.now += 60
+
+    def test_idle_rooms_are_victims_in_lru_order(self):
+        self._fill('a', 'b', 'c')
+        self.cache.get('a')  # Most recent now
+        self.clock.now += 600
+        self.assertEqual(self.cache.victims(), ['b', 'c', 'a'])
+
+    def test_pressure_spares_recently_used_rooms(self):
+        self._fill('a', 'b', 'c')
+        self.assertEqual(self.cache.victims(incoming=1), ['a'])
+        self.cache.get('a')
+        self.cache.get('b')
+        self.cache.get('c')
+        self.assertEqual(self.cache.victims(incoming=1), [])  # All used in the last 30s
+
+    def test_memory_budget_drives_admission_and_victims(self):
+        self._fill('a', 'b')
+        self.cache.budget = self.cache.total_bytes() + self.cache.typical_size() // 2
+        self.assertFalse(self.cache.admits())
+        self.assertEqual(self.cache.victims(incoming=1), ['a'])
+        self.cache.pop('a')
+        self.assertTrue(self.cache.admits())
+
+    def test_report_lists_every_room(self):
+        self._fill('a', 'b')
+        report = self.cache.report()
+        self.assertEqual(report['rooms'], 2)
+        self.assertEqual(len(report['perRoom']), 2)
+        self.assertFalse(any('roomId' in r for r in report['perRoom']))  # Ids would let anyone join
+        self.assertEqual(report['bytes'], sum(r['bytes'] for r in report['perRoom']))
+
+
+class TestHibernation(unittest.TestCase):
+    def setUp(self):
+        from server.room_manager import RoomManager
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch('server.room_manager.redis_store', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rm = RoomManager()
+        self.clock = Clock()
+        cache = RoomCache(max_entries=2, budget=10 ** 9, max_rss=0, idle_seconds=600,
+                          min_idle_seconds=30, clock=self.clock)
+        patcher = mock.patch.object(self.rm, '_local_cache', cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rm._versions.clear()
+        self.rm._synced.clear()
+
+    def test_idle_room_hibernates_and_rehydrates(self):
+        game = _game('sleepy')
+        self.rm.save_game(game)
+        self.clock.now += 601
+        self.assertEqual(self.rm.hibernate_idle(), 1)
+        self.assertNotIn('sleepy', self.rm._local_cache)
+        self.assertNotIn('sleepy', self.rm._synced)
+
+        woken = self.rm.get_game('sleepy')
+        self.assertIsNot(woken, game)
+        self.assertEqual(woken.get_game_state()['players'], game.get_game_state()['players'])
+        self.assertEqual(self.rm.memory_stats()['rehydrated'], 1)
+        self.assertIs(self.rm.get_game('sleepy'), woken)
+
+    def test_unsaved_changes_are_written_before_hibernating(self):
+        game = _game('dirty')
+        self.rm.save_game(game)
+        game.turn_duration = 42  # Changed in place, never saved
+        self.assertTrue(self.rm.hibernate('dirty'))
+        self.assertEqual(self.rm.get_game('dirty').turn_duration, 42)
+
+    def test_create_room_makes_room_by_hibernating(self):
+        for room_id in ('r1', 'r2'):
+            self.rm.save_game(_game(room_id, started=False))
+            self.clock.now += 60
+        room_id = self.rm.create_room()
+        self.assertIsNotNone(room_id)
+        self.assertEqual(sorted(self.rm._local_cache), sorted(['r2', room_id]))
+        self.assertIsNotNone(self.rm.get_game('r1'))  # Still in Redis
+
+    def test_no_headroom_denies_new_rooms(self):
+        self.rm.save_game(_game('busy'))
+        self.rm._local_cache.budget = 1
+        self.assertIsNone(self.rm.create_room())  # 'busy' was just used: nothing can go
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""Room ownership across workers (server/room_leases.py) on a shared fakeredis."""
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from game_engine.logic.game import Game
+from server.process_manager import Heartbeat
+from server.room_leases import RoomLeases, RoomRouter, lease_key
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _worker(server, name, clock, ttl=10):
+    """One worker's leases + router, as a separate process would build them."""
+    redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+    leases = RoomLeases(Heartbeat('game_server', redis, ttl=ttl, instance=name), shared=True, clock=clock)
+    leases.renew()
+    router = RoomRouter(leases, timeout=2, spawn=lambda fn, *args: fn(*args))
+    ran = []
+
+    @router.routed
+    def game_action(sid, data):
+        ran.append((sid, data['action'], router.users.get(sid)))
+        return {'success': True, 'worker': name}
+
+    return leases, router, game_action, ran
+
+
+class TestRoomLeases(unittest.TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.clock = Clock()
+        self.a, self.router_a, self.action_a, self.ran_a = _worker(self.server, 'A', self.clock)
+        self.b, self.router_b, self.action_b, self.ran_b = _worker(self.server, 'B', self.clock)
+
+    def _expire_heartbeat(self, leases):
+        leases.redis.delete(leases.heartbeat.key)
+
+    def test_first_worker_owns_the_room(self):
+        self.assertEqual(self.a.acquire('r1'), 'A')
+        self.assertEqual(self.b.acquire('r1'), 'A')
+        self.assertEqual(self.b.owner('r1'), 'A')
+        self.assertTrue(self.a.owns('r1'))
+        self.assertFalse(self.b.owns('r1'))
+
+    def test_dead_owner_is_taken_over(self):
+        taken = []
+        self.b.on_takeover.append(lambda room_id, previous: taken.append((room_id, previous)))
+        self.a.acquire('r1')
+        self._expire_heartbeat(self.a)
+        self.assertEqual(self.b.acquire('r1'), 'B')
+        self.assertEqual(taken, [('r1', 'A')])
+
+    def test_heartbeat_gap_drops_local_ownership(self):
+        self.a.acquire('r1')
+        self.clock.now += 11  # A missed its beats for longer than the TTL...
+        self._expire_heartbeat(self.a)
+        self.b.acquire('r1')  # ...and B took the room meanwhile
+        self.a.renew()
+        self.assertFalse(self.a.owns('r1'))
+        self.assertEqual(self.a.acquire('r1'), 'B')
+
+    def test_release_only_own_lease(self):
+        self.a.acquire('r1')
+        self.b.release('r1')
+        self.assertEqual(self.a.owner('r1'), 'A')
+        self.a.release('r1')
+        self.assertIsNone(self.a.owner('r1'))
+
+
+class TestRoomRouter(unittest.TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.clock = Clock()
+        self.a, self.router_a, self.action_a, self.ran_a = _worker(self.server, 'A', self.clock)
+        self.b, self.router_b, self.action_b, self.ran_b = _worker(self.server, 'B', self.clock)
+
+    def test_owner_runs_locally(self):
+        result = self.action_a('sid1', {'roomId': 'r1', 'action': 'BID'})
+        self.assertEqual(result, {'success': True, 'worker': 'A'})
+        self.assertEqual(len(self.ran_a), 1)
+
+    def test_event_is_forwarded_to_the_owner(self):
+        self.a.acquire('r1')
+        self.router_b.users['sid9'] = {'email': 'p@x.com'}
+        owner = threading.Thread(target=self.router_a.serve_once, kwargs={'timeout': 2})
+        owner.start()
+        result = self.action_b('sid9', {'roomId': 'r1', 'action': 'PLAY'})
+        owner.join()
+        self.assertEqual(result, {'success': True, 'worker': 'A'})
+        self.assertEqual(self.ran_a, [('sid9', 'PLAY', {'email': 'p@x.com'})])
+        self.assertEqual(self.ran_b, [])
+        self.assertNotIn('sid9', self.router_a.users)  # Only borrowed for the event
+
+    def test_silent_owner_times_out(self):
+        self.a.acquire('r1')
+        self.router_b.timeout = 1
+        result = self.action_b('sid9', {'roomId': 'r1', 'action': 'PLAY'})
+        self.assertFalse(result['success'])
+
+    def test_invalid_room_id_is_left_to_the_handler(self):
+        self.action_b('sid9', {'action': 'PLAY'})
+        self.assertEqual(len(self.ran_b), 1)
+
+
+class TestRoomManagerAcrossWorkers(unittest.TestCase):
+    """The RoomManager singleton as worker A; worker B only holds leases."""
+
+    def setUp(self):
+        from server.room_manager import RoomManager
+        self.server = fakeredis.FakeServer()
+        self.clock = Clock()
+        store = fakeredis.FakeRedis(server=self.server)
+        self.a, _, _, _ = _worker(self.server, 'A', self.clock)
+        self.b, _, _, _ = _worker(self.server, 'B', self.clock)
+        for target, value in (('server.room_manager.redis_store', store),
+                              ('server.room_manager.room_leases', self.a)):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.rm = RoomManager()
+        for cache in (self.rm._local_cache, self.rm._versions, self.rm._synced,
+                      self.rm._sid_to_room, self.rm._email_to_room):
+            cache.clear()
+        self.a.on_takeover.append(self.rm._taken_over)
+
+    def test_session_maps_are_shared(self):
+        self.b.redis.hset('rooms:by_sid', 'sid7', 'room7')  # Tracked by worker B
+        self.assertEqual(self.rm.get_room_for_sid('sid7'), 'room7')
+        self.rm.track_player('sid1', 'room1')
+        self.assertEqual(self.b.redis.hget('rooms:by_sid', 'sid1'), 'room1')
+        self.rm.untrack_player('sid7')
+        self.assertIsNone(self.b.redis.hget('rooms:by_sid', 'sid7'))
+
+    def test_save_keeps_the_lease_alive(self):
+        room_id = self.rm.create_room()
+        self.assertEqual(self.b.owner(room_id), 'A')
+        self.assertGreater(self.b.redis.ttl(lease_key(room_id)), 0)
+
+    def test_former_owner_cannot_save(self):
+        room_id = self.rm.create_room()
+        game = self.rm.get_game(room_id)
+        self.b.redis.delete(self.a.heartbeat.key)  # A's heartbeat expired: B takes the room
+        self.assertEqual(self.b.acquire(room_id), 'B')
+        self.b.redis.expire(lease_key(room_id), 100)
+        game.add_player('late', 'Late')
+        self.rm.save_game(game)  # A still thinks it owns the room
+        snapshot = self.rm.get_game(room_id)
+        self.assertEqual(snapshot.players, [])
+        self.assertLessEqual(self.b.redis.ttl(lease_key(room_id)), 100)  # Not extended by A
+
+    def test_lease_lost_between_watch_and_write_aborts(self):
+        room_id = self.rm.create_room()
+        game = self.rm.get_game(room_id)
+        from server import room_manager
+        store = room_manager.redis_store
+        execute = store.pipeline().__class__.execute
+
+        def lose_lease(pipe, *args, **kwargs):
+            if pipe.watching:
+                self.b.redis.set(lease_key(room_id), 'B')
+            return execute(pipe, *args, **kwargs)
+
+        game.add_player('late', 'Late')
+        with mock.patch.object(store.pipeline().__class__, 'execute', lose_lease):
+            self.rm.save_game(game)
+        self.assertEqual(self.rm.get_game(room_id).players, [])
+
+    def test_failover_reloads_the_snapshot(self):
+        game = Game('fail_room')
+        for i in range(4):
+            game.add_player(f"p{i}", f"P{i}")
+        game.start_game()
+        self.b.acquire('fail_room')
+        with mock.patch('server.room_manager.room_leases', self.b):
+            self.rm.save_game(game)  # B's last save before it died
+        phase = game.phase
+        stale = self.rm._local_cache['fail_room']
+        stale.phase = 'STALE'  # Not saved: only in this process
+        self.b.redis.delete(self.b.heartbeat.key)
+
+        self.assertEqual(self.a.acquire('fail_room'), 'A')
+        reloaded = self.rm.get_game('fail_room')
+        self.assertIsNot(reloaded, stale)
+        self.assertEqual(reloaded.phase, phase)
+        self.assertEqual([p.id for p in reloaded.players], ['p0', 'p1', 'p2', 'p3'])
+
+    def test_stale_copy_of_a_foreign_room_is_not_served(self):
+        self.b.acquire('other_room')
+        self.rm._local_cache['other_room'] = Game('other_room')
+        self.assertIsNone(self.rm.get_game('other_room'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Sectioned binary game snapshots in Redis (game_serializer + RoomManager)."""
+import json
+import unittest
+from unittest import mock
+
+import pytest
+
+from game_engine.logic.game import Game
+from game_engine.logic.game_serializer import (
+    deserialize_sections, pack_cards, serialize_game, serialize_sections, unpack_cards,
+)
+from game_engine.models.card import Card
+from game_engine.models.constants import GamePhase, SUITS, RANKS
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+def _game(room_id='persist_room', plays=0):
+    game = Game(room_id)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    if plays:
+        game.handle_bid(game.current_turn, 'HOKUM')
+        if game.phase != GamePhase.PLAYING.value:
+            game.phase = GamePhase.PLAYING.value
+        for _ in range(plays):
+            _play_one(game)
+    return game
+
+
+def _play_one(game):
+    idx = game.current_turn
+    hand = game.players[idx].hand
+    game.play_card(idx, next(i for i, c in enumerate(hand) if game.is_valid_move(c, hand)))
+
+
+def _via_json(game):
+    return Game.from_json(json.loads(json.dumps(game.to_json())))
+
+
+class TestSections(unittest.TestCase):
+    def test_cards_are_one_byte(self):
+        cards = [Card(s, r) for s in SUITS for r in RANKS]
+        packed = pack_cards(cards)
+        self.assertEqual(len(packed), 32)
+        self.assertEqual(unpack_cards(packed), [{'suit': c.suit, 'rank': c.rank} for c in cards])
+
+    def test_matches_json_round_trip(self):
+        for plays in (0, 6, 13):
+            game = _game(plays=plays)
+            restored = deserialize_sections(serialize_sections(game))
+            expected = serialize_game(_via_json(game))
+            actual = serialize_game(restored)
+            actual['timer_state'] = expected['timer_state'] = None  # Restarted on load
+            self.assertEqual(actual, expected, f"after {plays} plays")
+
+    def test_smaller_than_json(self):
+        game = _game(plays=9)
+        binary = sum(len(b) for b in serialize_sections(game).values())
+        self.assertLess(binary, len(json.dumps(game.to_json())) * 0.7)
+
+
+class TestRoomManagerRedis(unittest.TestCase):
+    def setUp(self):
+        from server.room_manager import RoomManager
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch('server.room_manager.redis_store', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rm = RoomManager()
+        self.rm._local_cache.clear()
+        self.rm._versions.clear()
+        self.rm._synced.clear()
+
+    def test_unchanged_redis_serves_in_process_game(self):
+        game = _game(plays=2)
+        self.rm.save_game(game)
+        with mock.patch('server.room_manager.deserialize_sections') as des:
+            self.assertIs(self.rm.get_game(game.room_id), game)
+            des.assert_not_called()
+
+    def test_only_dirty_sections_are_written(self):
+        game = _game(plays=4)  # Mid-trick: the next card does not touch trick history
+        self.rm.save_game(game)
+        key = f"game:{game.room_id}"
+        self.redis.hset(key, mapping={'history': b'untouched', 'fmt': b'untouched'})
+        _play_one(game)
+        self.rm.save_game(game)
+        self.assertEqual(self.redis.hget(key, 'history'), b'untouched')
+        self.assertEqual(self.redis.hget(key, 'fmt'), b'untouched')
+        self.assertEqual(self.redis.hget(key, 'players'), serialize_sections(game)['players'])
+        self.assertEqual(self.redis.hget(key, 'table'), serialize_sections(game)['table'])
+
+    def test_other_writer_forces_reload(self):
+        game = _game(plays=3)
+        self.rm.save_game(game)
+        # Another worker plays a card and saves
+        other = deserialize_sections(self.redis.hgetall(f"game:{game.room_id}"))
+        _play_one(other)
+        key = f"game:{game.room_id}"
+        self.redis.hset(key, mapping=serialize_sections(other))
+        self.redis.hincrby(key, 'v', 1)
+
+        loaded = self.rm.get_game(game.room_id)
+        self.assertIsNot(loaded, game)
+        self.assertEqual(len(loaded.table_cards), len(other.table_cards))
+
+        # Our next save, based on the reloaded copy, is a clean partial write
+        _play_one(loaded)
+        self.rm.save_game(loaded)
+        again = deserialize_sections(self.redis.hgetall(key))
+        self.assertEqual(serialize_game(again)['table_cards'], serialize_game(loaded)['table_cards'])
+
+    def test_other_writers_sections_are_merged_not_overwritten(self):
+        game = _game(plays=4)  # Mid-trick: the next card does not touch trick history
+        self.rm.save_game(game)
+        key = f"game:{game.room_id}"
+        self.redis.hset(key, 'fmt', b'theirs')  # Someone else wrote a section we leave alone
+        self.redis.hincrby(key, 'v', 1)
+        _play_one(game)
+        self.rm.save_game(game)
+        self.assertEqual(self.redis.hget(key, 'fmt'), b'theirs')
+        self.assertEqual(self.redis.hget(key, 'table'), serialize_sections(game)['table'])
+        self.assertEqual(int(self.redis.hget(key, 'v')), 3)
+        self.assertNotIn(game.room_id, self.rm._versions)  # Next get_game reads the merged state
+
+    def test_conflicting_write_is_aborted(self):
+        game = _game(plays=3)
+        self.rm.save_game(game)
+        key = f"game:{game.room_id}"
+        self.redis.hincrby(key, 'v', 1)  # Someone else wrote the table we are about to change
+        self.redis.hset(key, 'table', b'theirs')
+        _play_one(game)
+        self.rm.save_game(game)
+        self.assertEqual(self.redis.hget(key, 'table'), b'theirs')
+        self.assertEqual(int(self.redis.hget(key, 'v')), 2)
+        self.assertNotIn(game.room_id, self.rm._local_cache)
+
+    def test_write_racing_another_writer_is_compared_again(self):
+        game = _game(plays=4)
+        self.rm.save_game(game)
+        key = f"game:{game.room_id}"
+        execute = self.redis.pipeline().__class__.execute
+        raced = []
+
+        def racing_execute(pipe, *args, **kwargs):
+            if not raced and pipe.watching:
+                raced.append(True)
+                self.redis.hset(key, 'table', b'theirs')  # Lands between our WATCH and EXEC
+                self.redis.hincrby(key, 'v', 1)
+            return execute(pipe, *args, **kwargs)
+
+        _play_one(game)
+        with mock.patch.object(self.redis.pipeline().__class__, 'execute', racing_execute):
+            self.rm.save_game(game)
+        self.assertTrue(raced)
+        self.assertEqual(self.redis.hget(key, 'table'), b'theirs')  # Not clobbered on retry
+
+    def test_legacy_json_key_is_read_and_upgraded(self):
+        game = _game(plays=2)
+        key = f"game:{game.room_id}"
+        self.redis.set(key, json.dumps(game.to_json()))
+        loaded = self.rm.get_game(game.room_id)
+        self.assertEqual(len(loaded.players), 4)
+        self.rm.save_game(loaded)
+        self.assertEqual(self.redis.type(key), b'hash')
+        self.assertIs(self.rm.get_game(game.room_id), loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""Versioned game_update deltas (server/broadcast.py, server/state_patch.py)."""
+import random
+import time
+import unittest
+from unittest import mock
+
+from game_engine.logic.game import Game
+from game_engine.models.constants import GamePhase
+from server import broadcast
+from server.broadcast import broadcast_game_update, delta_room, get_stream, subscribe_deltas
+from server.state_patch import apply_patch, make_patch
+
+
+def _playing_game(room_id):
+    game = Game(room_id)
+    for i in range(4):
+        game.add_player(f"p{i}", f"P{i}")
+    game.start_game()
+    game.strictMode = False
+    game.handle_bid(game.current_turn, 'HOKUM')
+    if game.phase != GamePhase.PLAYING.value:
+        game.phase = GamePhase.PLAYING.value
+    return game
+
+
+def _play_one(game, pick_illegal=False):
+    idx = game.current_turn
+    hand = game.players[idx].hand
+    legal = [i for i, c in enumerate(hand) if game.is_valid_move(c, hand)]
+    illegal = [i for i in range(len(hand)) if i not in legal]
+    game.play_card(idx, illegal[0] if (pick_illegal and illegal) else legal[0])
+
+
+class FakeSio:
+    def __init__(self):
+        self.emits = []
+        self.rooms = {}
+
+    def emit(self, event, data, room=None, skip_sid=None):
+        self.emits.append((event, data, room, skip_sid))
+
+    def enter_room(self, sid, room):
+        self.rooms.setdefault(sid, set()).add(room)
+
+    def take(self):
+        emits, self.emits = self.emits, []
+        return emits
+
+
+class TestStatePatch(unittest.TestCase):
+    def test_round_trip_on_structures(self):
+        old = {'a': 1, 'b': {'c': [1, 2], 'd': 'x'}, 'e': [1], 'f/g': {'~': 1}, 'h': None}
+        new = {'a': 2, 'b': {'c': [1, 3], 'k': True}, 'e': [1, 2, 3], 'f/g': {'~': 2}, 'h': {'z': 1}}
+        patch = make_patch(old, new)
+        self.assertEqual(apply_patch(old, patch), new)
+        self.assertEqual(old['e'], [1])  # Input untouched
+        self.assertIn({'op': 'add', 'path': '/e/-', 'value': 2}, patch)
+        self.assertEqual(make_patch(new, new), [])
+
+    def test_round_trip_over_a_game(self):
+        game = _playing_game('patch_room')
+        prev = game.get_game_state()
+        rng = random.Random(4)
+        while game.phase == GamePhase.PLAYING.value:
+            _play_one(game, pick_illegal=rng.random() < 0.1)
+            cur = game.get_game_state()
+            self.assertEqual(apply_patch(prev, make_patch(prev, cur)), cur)
+            prev = cur
+
+
+class TestBroadcastStream(unittest.TestCase):
+    def setUp(self):
+        broadcast._streams.clear()
+        broadcast._delta_sids.clear()
+        self.sio = FakeSio()
+        self.game = _playing_game('stream_room')
+
+    def test_legacy_clients_get_full_state_and_deltas_get_patches(self):
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        [(event, data, room, skip)] = self.sio.take()
+        self.assertEqual((event, room, skip), ('game_update', 'stream_room', None))
+
+        client = subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        self.assertIn('gameState', client)
+        self.assertIn(delta_room('stream_room'), self.sio.rooms['sid1'])
+        state, version = client['gameState'], client['version']
+
+        for _ in range(6):
+            _play_one(self.game)
+            broadcast_game_update(self.sio, self.game, 'stream_room')
+            emits = self.sio.take()
+            self.assertEqual([e[0] for e in emits], ['game_update', 'game_patch'])
+            self.assertEqual(emits[0][3], ['sid1'])  # Legacy emit skips delta clients
+            patch = emits[1][1]
+            self.assertEqual(patch['baseVersion'], version)
+            state, version = apply_patch(state, patch['patch']), patch['version']
+            self.assertEqual(state, get_stream('stream_room').snapshot)
+
+    def test_unchanged_state_is_not_re_emitted_or_re_versioned(self):
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        version = get_stream('stream_room').version
+        self.sio.take()
+        broadcast_game_update(self.sio, self.game, 'stream_room')  # serverTime moved, nothing else
+        self.assertEqual(self.sio.take(), [])
+        self.assertEqual(get_stream('stream_room').version, version)
+
+    def test_timer_restart_is_a_new_version(self):
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        version = get_stream('stream_room').version
+        self.sio.take()
+        with mock.patch('time.time', return_value=time.time() + 3):  # Only remaining/elapsed move
+            broadcast_game_update(self.sio, self.game, 'stream_room')
+        self.assertEqual(self.sio.take(), [])
+        self.game.timer.reset()  # Same turn and duration, new start time
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        self.assertEqual([e[0] for e in self.sio.take()], ['game_update'])
+        self.assertEqual(get_stream('stream_room').version, version + 1)
+        self.assertEqual(get_stream('stream_room').snapshot['timerStartTime'], self.game.timer.start_time)
+        self.game.timer.pause()  # Start time and duration unchanged, remaining frozen
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        self.assertEqual(get_stream('stream_room').version, version + 2)
+        self.assertTrue(get_stream('stream_room').snapshot['timer']['paused'])
+
+    def test_subscribing_to_an_unchanged_state_keeps_the_version(self):
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        version = get_stream('stream_room').version
+        subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        subscribe_deltas(self.sio, 'sid2', 'stream_room', self.game)
+        self.assertEqual(get_stream('stream_room').version, version)
+        self.assertEqual([e[0] for e in self.sio.take()], ['game_update'])
+
+    def test_subscriber_gets_the_current_state_not_the_last_broadcast(self):
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        first = subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        self.sio.take()
+        _play_one(self.game)  # Not broadcast yet
+        second = subscribe_deltas(self.sio, 'sid2', 'stream_room', self.game)
+        self.assertEqual(second['gameState']['tableCards'], get_stream('stream_room').snapshot['tableCards'])
+        self.assertEqual(len(second['gameState']['tableCards']), len(self.game.table_cards))
+        # sid1 is carried along to the same version
+        [(event, patch, room, _)] = self.sio.take()
+        self.assertEqual((event, room, patch['baseVersion']), ('game_patch', delta_room('stream_room'), first['version']))
+        self.assertEqual(apply_patch(first['gameState'], patch['patch']), second['gameState'])
+
+    def test_resync_after_gap(self):
+        subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        stream = get_stream('stream_room')
+        old_version, old_state = stream.version, stream.snapshot
+        for _ in range(3):
+            _play_one(self.game)
+            broadcast_game_update(self.sio, self.game, 'stream_room')
+
+        catch_up = subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game, stream.epoch, old_version)
+        self.assertEqual(catch_up['baseVersion'], old_version)
+        self.assertEqual(apply_patch(old_state, catch_up['patch']), stream.snapshot)
+
+        # Unknown epoch (server restarted) or version out of history: full state
+        self.assertIn('gameState', subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game, 'other', old_version))
+        self.assertIn('gameState', subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game, stream.epoch, -5))
+
+    def test_subscribers_outlive_an_evicted_stream(self):
+        client = subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        with mock.patch.object(broadcast, 'MAX_STREAMS', 1):
+            get_stream('other_room')  # Evicts stream_room
+        self.assertNotIn('stream_room', broadcast._streams)
+        _play_one(self.game)
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        emits = self.sio.take()
+        self.assertEqual(emits[0][3], ['sid1'])  # Still skipped by the legacy emit
+        [resync] = [e[1] for e in emits if e[0] == 'game_patch']
+        self.assertNotEqual(resync['epoch'], client['epoch'])
+        self.assertEqual(resync['gameState'], get_stream('stream_room').snapshot)
+
+        broadcast.unsubscribe_deltas('sid1')
+        self.assertEqual(broadcast._delta_sids, {})
+
+    def test_failed_validation_restarts_epoch(self):
+        subscribe_deltas(self.sio, 'sid1', 'stream_room', self.game)
+        epoch = get_stream('stream_room').epoch
+        with mock.patch('server.schemas.game.GameStateModel', side_effect=ValueError('bad')):
+            broadcast_game_update(self.sio, self.game, 'stream_room')
+        self.assertEqual(self.sio.take()[0][0], 'game_update')  # Raw fallback
+        broadcast_game_update(self.sio, self.game, 'stream_room')
+        patch = [e for e in self.sio.take() if e[0] == 'game_patch'][0][1]
+        self.assertNotEqual(patch['epoch'], epoch)
+        self.assertIn('gameState', patch)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Micro-benchmark suite (scripts/benchmarks): every case runs, and the regression gate."""
+import logging
+import unittest
+
+from scripts.benchmarks import CASES, compare, keep_fastest
+from scripts.benchmarks.cases import Case, quiet_engine_logs
+
+
+def _results(**normalized):
+    return {'results': {name: {'normalized': value} for name, value in normalized.items()}}
+
+
+class TestBenchmarkCases(unittest.TestCase):
+    def test_every_case_runs(self):
+        quiet_engine_logs()
+        try:
+            for case in CASES:
+                with self.subTest(case=case.name):
+                    run, ops = case.setup(7)
+                    self.assertGreater(ops, 0)
+                    run()
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+class TestRegressionGate(unittest.TestCase):
+    CASES = [Case('a', None, None), Case('b', None, None), Case('noisy', None, 0.5), Case('fresh', None, None)]
+
+    def test_compare_verdicts(self):
+        baseline = _results(a=1.0, b=1.0, noisy=1.0)
+        current = _results(a=1.3, b=0.7, noisy=1.3, fresh=2.0)
+        verdicts = {name: status for name, _, _, status in compare(current, baseline, self.CASES, 0.25)}
+        self.assertEqual(verdicts, {'a': 'REGRESSION', 'b': 'faster', 'noisy': 'ok', 'fresh': 'new'})
+
+    def test_keep_fastest(self):
+        results = keep_fastest(_results(a=1.4, b=1.0), _results(a=1.1, b=1.2))
+        self.assertEqual(results['results']['a']['normalized'], 1.1)
+        self.assertEqual(results['results']['b']['normalized'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()